@@ -16,13 +16,17 @@ from urllib.parse import urlsplit
 
 from fastapi import BackgroundTasks, Depends, FastAPI, HTTPException, Query, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import ValidationError
 
+from fightcamp.batch import PlanningPool, default_batch_workers, dedupe_intakes, plan_intake
 from fightcamp.logging_utils import bind_log_context, clear_log_context, configure_logging
-from fightcamp.plan_pipeline import prime_plan_banks
+from fightcamp.bank_registry import BANK_REGISTRY
+from fightcamp.bank_reload import start_bank_reload_watcher
+from fightcamp.plan_pipeline import prime_plan_banks, reload_plan_banks
 from fightcamp.sparring_advisories import build_plan_advisories
+from fightcamp.stage2_batch_validation import ValidationPool, default_validation_workers, summarize_records
 from fightcamp.stage2_pipeline import build_stage2_retry, review_stage2_output
 
 from .auth import AuthService, AuthenticatedUser, SupabaseAuthService
@@ -32,6 +36,7 @@ from .models import (
     AdminAthleteRecord,
     AdminPlanOutputs,
     AdminPlanSummary,
+    BankReloadResponse,
     GenerationJobResponse,
     ManualStage2SubmissionRequest,
     MeResponse,
@@ -45,6 +50,9 @@ from .models import (
     PlanSummary,
     ProfileRecord,
     ProfileUpdateRequest,
+    Stage2MetricsResponse,
+    Stage2ValidationBatchRequest,
+    Stage2ValidationBatchResponse,
 )
 from .nutrition_workspace import (
     build_nutrition_workspace,
@@ -62,6 +70,8 @@ from .stage2_automation import (
     Stage2Automator,
     build_default_stage2_automator,
 )
+from .stage2_hedging import HedgePolicy, get_hedge_stats
+from .stage2_provider import get_stage2_limiter
 from .store import AppStore, SupabaseAppStore
 
 Planner = Callable[[dict[str, Any]], dict[str, Any]]
@@ -601,6 +611,40 @@ def _has_existing_triage_resume_approval(plan_row: dict[str, Any]) -> bool:
     return bool(why_log.get("triage_regeneration_cleared"))
 
 
+def _admin_batch_max_intakes() -> int:
+    raw_value = os.getenv("UNLXCK_ADMIN_BATCH_MAX_INTAKES", "200").strip()
+    try:
+        return max(1, int(raw_value))
+    except ValueError:
+        logger.warning("[admin] invalid UNLXCK_ADMIN_BATCH_MAX_INTAKES=%r; falling back to 200", raw_value)
+        return 200
+
+
+def _parse_batch_plan_requests(body: str) -> list[tuple[int, dict[str, Any]]]:
+    entries: list[tuple[int, dict[str, Any]]] = []
+    for line_number, raw_line in enumerate(body.splitlines(), start=1):
+        line = raw_line.strip()
+        if not line:
+            continue
+        try:
+            plan_request = PlanRequest.model_validate_json(line)
+        except ValidationError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail={"line": line_number, "errors": exc.errors(include_url=False, include_context=False)},
+            ) from exc
+        entries.append((line_number, plan_request.to_payload()))
+    if not entries:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="batch body must contain at least one intake")
+    max_intakes = _admin_batch_max_intakes()
+    if len(entries) > max_intakes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"batch is limited to {max_intakes} intakes",
+        )
+    return entries
+
+
 def create_app(
     *,
     store: AppStore,
@@ -615,7 +659,14 @@ def create_app(
     @asynccontextmanager
     async def _app_lifespan(_: FastAPI):
         await asyncio.to_thread(prime_plan_banks, logger=logger)
-        yield
+        bank_watcher = start_bank_reload_watcher()
+        try:
+            yield
+        finally:
+            if bank_watcher is not None:
+                bank_watcher.stop()
+            await asyncio.to_thread(app.state.stage2_validation_pool.shutdown)
+            await asyncio.to_thread(app.state.plan_batch_pool.shutdown)
 
     app = FastAPI(
         title="UNLXCK Fight Camp API",
@@ -628,6 +679,8 @@ def create_app(
     app.state.planner = planner
     app.state.stage2_automator = stage2_automator or build_default_stage2_automator()
     app.state.mode_label = mode_label
+    app.state.stage2_validation_pool = ValidationPool(default_validation_workers())
+    app.state.plan_batch_pool = PlanningPool(default_batch_workers())
     app.state.enable_in_process_generation = enable_in_process_generation
     app.state.active_generation_tasks = set()
     rate_limit_requests = _plan_generate_rate_limit_requests()
@@ -1031,6 +1084,101 @@ def create_app(
     ) -> list[AdminPlanSummary]:
         return [_map_admin_plan_summary(row) for row in store.list_admin_plans(limit=limit, offset=offset)]
 
+    @app.post("/api/admin/banks/reload", response_model=BankReloadResponse)
+    async def reload_data_banks(
+        force: bool = Query(False),
+        profile: ProfileRecord = Depends(require_admin),
+    ) -> BankReloadResponse:
+        # Only reloads the process serving this request; set
+        # UNLXCK_BANK_RELOAD_INTERVAL_SECONDS to have every worker pick up edits.
+        reloaded = await asyncio.to_thread(reload_plan_banks, force=force, logger=logger)
+        logger.info("[admin] banks_reload athlete_id=%s reloaded=%s", profile.athlete_id, ",".join(reloaded) or "-")
+        return BankReloadResponse(
+            reloaded=reloaded,
+            generation=BANK_REGISTRY.generation,
+            versions=BANK_REGISTRY.versions(),
+        )
+
+    @app.get("/api/admin/stage2/metrics", response_model=Stage2MetricsResponse)
+    async def get_stage2_metrics(_: ProfileRecord = Depends(require_admin)) -> Stage2MetricsResponse:
+        # Counters are per process, like the bank reload above.
+        return Stage2MetricsResponse(
+            hedging=get_hedge_stats().snapshot(HedgePolicy.from_env()),
+            limiter=get_stage2_limiter().stats(),
+        )
+
+    @app.post("/api/admin/plans/batch")
+    async def run_admin_plan_batch(
+        request: Request,
+        _: ProfileRecord = Depends(require_admin),
+        skip_hash: list[str] = Query(default=[]),
+        planner_fn: Planner = Depends(get_planner),
+    ) -> StreamingResponse:
+        intakes = dedupe_intakes(_parse_batch_plan_requests((await request.body()).decode("utf-8")))
+        completed = set(skip_hash)
+        pending = [intake for intake in intakes if intake.intake_hash not in completed]
+        pool: PlanningPool = app.state.plan_batch_pool
+        # The stock planner is Stage 1 itself, so it runs on the shared process
+        # pool with per-stage timings; injected planners run one at a time in a
+        # thread and only report their total.
+        use_pool = planner_fn is _default_planner and pool.workers > 1
+        logger.info(
+            "[admin] plan_batch:start unique=%d pending=%d skipped=%d workers=%d",
+            len(intakes),
+            len(pending),
+            len(intakes) - len(pending),
+            pool.workers if use_pool else 1,
+        )
+
+        async def _sequential_records():
+            batch_planner = None if planner_fn is _default_planner else planner_fn
+            for intake in pending:
+                outcome = await asyncio.to_thread(plan_intake, intake.payload, planner=batch_planner)
+                yield {"intake_hash": intake.intake_hash, "sources": intake.sources, **outcome}
+
+        async def _stream_records():
+            # Pooled records arrive in completion order, like the batch CLI.
+            records = pool.stream(pending) if use_pool else _sequential_records()
+            async for record in records:
+                yield json.dumps(record, ensure_ascii=False, default=str) + "\n"
+
+        return StreamingResponse(_stream_records(), media_type="application/x-ndjson")
+
+    @app.post("/api/admin/plans/validate-stage2", response_model=Stage2ValidationBatchResponse)
+    async def validate_stage2_batch(
+        batch: Stage2ValidationBatchRequest,
+        _: ProfileRecord = Depends(require_admin),
+        store: AppStore = Depends(get_store),
+    ) -> Stage2ValidationBatchResponse:
+        plan_ids = [item.plan_id for item in batch.items]
+        rows = {
+            str(row["id"]): row
+            for row in await asyncio.to_thread(store.get_plan_validation_rows, plan_ids)
+        }
+        missing = [plan_id for plan_id in plan_ids if plan_id not in rows]
+        items = [
+            {
+                "plan_id": item.plan_id,
+                "final_plan_text": (
+                    item.final_plan_text if item.final_plan_text is not None else rows[item.plan_id].get("final_plan_text")
+                ),
+                "planning_brief": rows[item.plan_id].get("planning_brief"),
+            }
+            for item in batch.items
+            if item.plan_id in rows
+        ]
+        records = await asyncio.to_thread(app.state.stage2_validation_pool.run, items)
+        records.extend({"plan_id": plan_id, "status": "error", "error": "plan not found"} for plan_id in missing)
+        order = {plan_id: index for index, plan_id in enumerate(plan_ids)}
+        records.sort(key=lambda record: order[record["plan_id"]])
+        summary = summarize_records(records)
+        logger.info(
+            "[admin] validate_stage2 plans=%d statuses=%s",
+            len(records),
+            ",".join(f"{key}:{count}" for key, count in summary["statuses"].items()),
+        )
+        return Stage2ValidationBatchResponse(results=records, summary=summary)
+
     @app.post("/api/admin/plans/{plan_id}/manual-stage2", response_model=PlanDetail)
     def submit_manual_stage2(
         plan_id: str,
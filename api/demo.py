@@ -15,6 +15,10 @@ def _now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _plan_validation_row(row: dict[str, Any]) -> dict[str, Any]:
+    return {key: row.get(key) for key in ("id", "planning_brief", "final_plan_text")}
+
+
 class DemoAuthService:
     def get_user_from_token(self, token: str) -> AuthenticatedUser:
         normalized = token.strip().lower()
@@ -173,6 +177,15 @@ class DemoStore:
             row = self.plans.get(plan_id)
             return dict(row) if row else None
 
+    def get_plan_validation_rows(self, plan_ids: list[str]) -> list[dict[str, Any]]:
+        with self._lock:
+            return [_plan_validation_row(self.plans[plan_id]) for plan_id in plan_ids if plan_id in self.plans]
+
+    def list_plan_validation_rows(self, *, limit: int = 500, offset: int = 0) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = sorted(self.plans.values(), key=lambda row: (row["created_at"], row["id"]))
+            return [_plan_validation_row(row) for row in rows[offset : offset + limit]]
+
     def rename_plan(self, plan_id: str, plan_name: str) -> dict[str, Any]:
         with self._lock:
             row = self.plans.get(plan_id)
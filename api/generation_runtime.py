@@ -11,6 +11,7 @@ from typing import Any, Callable
 from fastapi import BackgroundTasks, HTTPException, status
 
 from fightcamp.main import generate_plan_sync
+from fightcamp.tracing import Trace, export_trace, span, start_trace
 
 from .models import PlanRequest, ProfileUpdateRequest
 from .stage2_automation import Stage2AutomationError, Stage2AutomationUnavailableError, Stage2Automator
@@ -121,6 +122,16 @@ async def heartbeat_generation_job(job_id: str, store: AppStore, stop_event: asy
                 logger.exception("[jobs] generation:heartbeat_failed job_id=%s", job_id)
 
 
+async def persist_generation_trace(job_id: str, store: AppStore, trace: Trace) -> None:
+    blob = trace.to_dict()
+    await asyncio.to_thread(export_trace, trace)
+    try:
+        await asyncio.to_thread(store.update_generation_job, job_id, trace=blob)
+    except Exception:
+        # Tracing must never fail a job (e.g. before the trace column migration).
+        logger.warning("[jobs] generation:trace_persist_failed job_id=%s", job_id, exc_info=True)
+
+
 async def run_generation_job(
     *,
     job_id: str,
@@ -128,6 +139,28 @@ async def run_generation_job(
     planner_fn: Planner,
     stage2: Stage2Automator,
     active_tasks: set[str],
+) -> None:
+    with start_trace("generation_job", job_id=job_id) as trace:
+        try:
+            await _run_generation_job(
+                job_id=job_id,
+                store=store,
+                planner_fn=planner_fn,
+                stage2=stage2,
+                active_tasks=active_tasks,
+            )
+        finally:
+            if trace is not None:
+                await persist_generation_trace(job_id, store, trace)
+
+
+async def _run_generation_job(
+    *,
+    job_id: str,
+    store: AppStore,
+    planner_fn: Planner,
+    stage2: Stage2Automator,
+    active_tasks: set[str],
 ) -> None:
     t_start = time.perf_counter()
     stop_event = asyncio.Event()
@@ -181,7 +214,8 @@ async def run_generation_job(
                 triage_override = raw_request_payload.get(_TRIAGE_RESUME_OVERRIDE_KEY)
                 if isinstance(triage_override, dict):
                     planner_payload[_TRIAGE_RESUME_OVERRIDE_KEY] = triage_override
-            stage1_result = await run_stage1_planner(planner_fn, planner_payload)
+            with span("stage1"):
+                stage1_result = await run_stage1_planner(planner_fn, planner_payload)
             if stage1_result.get("status") == "invalid_input":
                 raise HTTPException(
                     status_code=422,
@@ -202,7 +236,9 @@ async def run_generation_job(
             if should_skip_stage2(stage1_result):
                 final_result = {**stage1_result, "full_name": request_body.athlete.full_name}
             else:
-                finalized_result = await stage2.finalize(stage1_result=stage1_result)
+                with span("stage2.finalize") as stage2_span:
+                    finalized_result = await stage2.finalize(stage1_result=stage1_result)
+                    stage2_span.set_attribute("stage2_status", str(finalized_result.get("stage2_status") or ""))
                 final_result = {**finalized_result, "full_name": request_body.athlete.full_name}
             job = await asyncio.to_thread(
                 store.update_generation_job,
@@ -607,6 +607,56 @@ class ManualStage2SubmissionRequest(BaseModel):
         return normalized
 
 
+STAGE2_VALIDATION_BATCH_LIMIT = 500
+
+
+class Stage2ValidationItem(BaseModel):
+    plan_id: str
+    # None validates the plan's stored final text.
+    final_plan_text: str | None = None
+
+    @field_validator("plan_id")
+    @classmethod
+    def validate_plan_id(cls, value: str) -> str:
+        normalized = str(value or "").strip()
+        if not normalized:
+            raise ValueError("plan_id is required")
+        return normalized
+
+
+class Stage2ValidationBatchRequest(BaseModel):
+    items: list[Stage2ValidationItem]
+
+    @field_validator("items")
+    @classmethod
+    def validate_items(cls, value: list[Stage2ValidationItem]) -> list[Stage2ValidationItem]:
+        if not value:
+            raise ValueError("items is required")
+        if len(value) > STAGE2_VALIDATION_BATCH_LIMIT:
+            raise ValueError(f"at most {STAGE2_VALIDATION_BATCH_LIMIT} items per request")
+        plan_ids = [item.plan_id for item in value]
+        if len(set(plan_ids)) != len(plan_ids):
+            raise ValueError("plan_id values must be unique")
+        return value
+
+
+class Stage2ValidationRecord(BaseModel):
+    plan_id: str
+    status: str
+    needs_retry: bool | None = None
+    error: str | None = None
+    error_count: int = 0
+    warning_count: int = 0
+    blocking_warning_count: int = 0
+    codes: dict[str, int] = Field(default_factory=dict)
+    report: dict[str, Any] = Field(default_factory=dict)
+
+
+class Stage2ValidationBatchResponse(BaseModel):
+    results: list[Stage2ValidationRecord] = Field(default_factory=list)
+    summary: dict[str, Any] = Field(default_factory=dict)
+
+
 class ApproveAndResumeGenerationRequest(BaseModel):
     reason: str
 
@@ -762,3 +812,14 @@ class AdminAthleteRecord(BaseModel):
 
 class AdminPlanSummary(PlanSummary):
     athlete_email: str
+
+
+class BankReloadResponse(BaseModel):
+    reloaded: list[str] = Field(default_factory=list)
+    generation: int
+    versions: dict[str, str] = Field(default_factory=dict)
+
+
+class Stage2MetricsResponse(BaseModel):
+    hedging: dict[str, Any] = Field(default_factory=dict)
+    limiter: dict[str, int] = Field(default_factory=dict)
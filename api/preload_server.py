@@ -0,0 +1,221 @@
+"""Pre-forking API server that shares warmed banks copy-on-write.
+
+``uvicorn --workers N`` spawns fresh interpreters, so every worker loads the
+banks, spaCy and the PhraseMatchers on its own. This entry point imports the
+app, warms those resources once (``fightcamp.preload.warm_process``), freezes
+the heap and then forks N uvicorn workers onto one listening socket; the
+warmed data stays shared until a worker writes to it.
+
+Usage (Render start command):
+    python -m api.preload_server --host 0.0.0.0 --port $PORT --workers 2
+
+The parent only supervises: it restarts workers that die, forwards
+SIGTERM/SIGINT for a graceful shutdown and, with
+``UNLXCK_MEMORY_REPORT_INTERVAL_SECONDS`` set, logs each worker's RSS/PSS.
+Restarts back off exponentially per worker slot; a slot that keeps dying
+shortly after start (``--max-restarts`` times in a row) stops the server with
+a nonzero exit instead of fork-looping.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from dataclasses import dataclass
+
+from fightcamp.logging_utils import configure_logging
+from fightcamp.preload import format_memory_report, freeze_heap, memory_report, warm_process
+
+logger = logging.getLogger(__name__)
+
+MEMORY_REPORT_INTERVAL_ENV = "UNLXCK_MEMORY_REPORT_INTERVAL_SECONDS"
+_SUPERVISE_POLL_SECONDS = 0.5
+_STARTUP_FAILURE_EXIT_CODE = 3
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve the API from pre-forked, pre-warmed workers.")
+    parser.add_argument("--app", default="api.app:app", help="ASGI app as module:attribute.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument(
+        "--max-restarts",
+        type=int,
+        default=5,
+        help="Consecutive quick worker deaths tolerated per slot before the server exits.",
+    )
+    return parser.parse_args(argv)
+
+
+def _load_app(target: str):
+    module_name, _, attribute = target.partition(":")
+    return getattr(importlib.import_module(module_name), attribute or "app")
+
+
+def _bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _memory_report_interval() -> float:
+    raw_value = os.environ.get(MEMORY_REPORT_INTERVAL_ENV, "").strip()
+    try:
+        return max(0.0, float(raw_value)) if raw_value else 0.0
+    except ValueError:
+        logger.warning("[preload] invalid %s=%r; memory reports disabled", MEMORY_REPORT_INTERVAL_ENV, raw_value)
+        return 0.0
+
+
+@dataclass
+class RestartBackoff:
+    """Restart delay for one worker slot.
+
+    Each quick death doubles the delay from ``initial_seconds`` up to
+    ``max_seconds``; a worker that stayed up for ``stable_seconds`` resets it.
+    """
+
+    max_failures: int = 5
+    initial_seconds: float = 0.5
+    max_seconds: float = 30.0
+    stable_seconds: float = 30.0
+    failures: int = 0
+
+    def next_delay(self, uptime_seconds: float) -> float | None:
+        """Seconds to wait before restarting, or None once the slot gives up."""
+        if uptime_seconds >= self.stable_seconds:
+            self.failures = 0
+        self.failures += 1
+        if self.failures > self.max_failures:
+            return None
+        return min(self.max_seconds, self.initial_seconds * 2 ** (self.failures - 1))
+
+
+def _run_worker(app, sock: socket.socket, index: int) -> int:
+    import uvicorn
+
+    # The parent's handlers only forward signals; uvicorn installs its own.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    logger.info("[preload] worker=%d started %s", index, format_memory_report(memory_report()))
+    server = uvicorn.Server(uvicorn.Config(app, log_config=None, lifespan="on"))
+    server.run(sockets=[sock])
+    # uvicorn returns instead of raising when lifespan startup fails.
+    return 0 if server.started else _STARTUP_FAILURE_EXIT_CODE
+
+
+def _fork_worker(app, sock: socket.socket, index: int) -> int:
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 0
+        try:
+            exit_code = _run_worker(app, sock, index)
+        except BaseException:
+            logger.exception("[preload] worker=%d crashed", index)
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+    return pid
+
+
+def serve(args: argparse.Namespace) -> int:
+    app = _load_app(args.app)
+    sock = _bind_socket(args.host, args.port)
+    warm_process(logger=logger)
+    frozen = freeze_heap()
+    logger.info(
+        "[preload] listening host=%s port=%d workers=%d gc_frozen=%d %s",
+        args.host,
+        sock.getsockname()[1],
+        args.workers,
+        frozen,
+        format_memory_report(memory_report()),
+    )
+
+    stopping = False
+    exit_code = 0
+    workers = {_fork_worker(app, sock, index): index for index in range(args.workers)}
+    started_at = {index: time.monotonic() for index in range(args.workers)}
+    backoffs = {index: RestartBackoff(max_failures=args.max_restarts) for index in range(args.workers)}
+    pending_restarts: dict[int, float] = {}
+
+    def _stop_workers() -> None:
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def _shutdown(signum, _frame) -> None:
+        nonlocal stopping
+        stopping = True
+        pending_restarts.clear()
+        _stop_workers()
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    report_interval = _memory_report_interval()
+    next_report = time.monotonic() + report_interval
+    while workers or pending_restarts:
+        now = time.monotonic()
+        for index, restart_at in sorted(pending_restarts.items()):
+            if now >= restart_at:
+                del pending_restarts[index]
+                workers[_fork_worker(app, sock, index)] = index
+                started_at[index] = time.monotonic()
+        pid, status = os.waitpid(-1, os.WNOHANG) if workers else (0, 0)
+        if pid == 0:
+            if report_interval and time.monotonic() >= next_report:
+                for worker_pid, index in sorted(workers.items(), key=lambda item: item[1]):
+                    logger.info("[preload] worker=%d %s", index, format_memory_report(memory_report(worker_pid)))
+                next_report = time.monotonic() + report_interval
+            time.sleep(_SUPERVISE_POLL_SECONDS)
+            continue
+        index = workers.pop(pid, None)
+        if index is None or stopping:
+            continue
+        delay = backoffs[index].next_delay(time.monotonic() - started_at[index])
+        if delay is None:
+            logger.error(
+                "[preload] worker=%d pid=%d exited status=%d after %d quick restarts; stopping server",
+                index,
+                pid,
+                status,
+                args.max_restarts,
+            )
+            stopping = True
+            exit_code = 1
+            pending_restarts.clear()
+            _stop_workers()
+            continue
+        logger.warning(
+            "[preload] worker=%d pid=%d exited status=%d; restarting in %.1fs", index, pid, status, delay
+        )
+        pending_restarts[index] = time.monotonic() + delay
+    sock.close()
+    logger.info("[preload] stopped")
+    return exit_code
+
+
+def main(argv: list[str] | None = None) -> int:
+    configure_logging()
+    args = parse_args(argv)
+    if not hasattr(os, "fork"):
+        print("api.preload_server needs os.fork(); use uvicorn --workers instead.", file=sys.stderr)
+        return 2
+    return serve(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
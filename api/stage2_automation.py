@@ -1,16 +1,30 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
+import time
 from dataclasses import dataclass
-from typing import Any, Protocol
+from typing import Any, Callable, Protocol
 
-from fightcamp.stage2_pipeline import build_stage2_package, build_stage2_retry, review_stage2_output
+from fightcamp.profiling import profile_run
+from fightcamp.stage2_pipeline import (
+    autofix_stage2_output,
+    build_stage2_package,
+    build_stage2_retry,
+    review_stage2_output,
+)
+from fightcamp.stage2_prompt import Stage2Prompt
+from fightcamp.tracing import add_counter, span
+
+from .stage2_hedging import HedgePolicy, get_hedge_stats
+from .stage2_provider import ClientStage2Provider, LimitedStage2Provider, build_stage2_provider_from_env
 
 _APP_STATUS_READY = "ready"
 _APP_STATUS_REVIEW_REQUIRED = "review_required"
 _STAGE2_PASS = "stage2_pass"
 _STAGE2_RETRY_PASS = "stage2_retry_pass"
+_STAGE2_AUTOFIX_PASS = "stage2_autofix_pass"
 _STAGE2_FAILED = "stage2_failed"
 
 logger = logging.getLogger(__name__)
@@ -63,6 +77,42 @@ def _extract_response_text(response: Any) -> str:
     return _strip_wrapping_code_fence(combined)
 
 
+def _request_input(prompt: Stage2Prompt) -> list[dict[str, Any]]:
+    # The static context goes in its own part ahead of the athlete's data so
+    # the request prefix stays byte-identical across athletes in one mode.
+    parts = (prompt.static_context, prompt.athlete_context)
+    return [
+        {
+            "role": "user",
+            "content": [{"type": "input_text", "text": part} for part in parts if part],
+        }
+    ]
+
+
+def _prompt_cache_usage(usage: Any) -> tuple[int, int] | None:
+    """``(cached, uncached)`` input tokens from the response usage, when reported."""
+    input_tokens = getattr(usage, "input_tokens", None)
+    if not isinstance(input_tokens, int):
+        return None
+    cached = getattr(getattr(usage, "input_tokens_details", None), "cached_tokens", None)
+    cached = cached if isinstance(cached, int) else 0
+    return cached, input_tokens - cached
+
+
+def _record_usage_counters(request_span: Any, usage: Any) -> tuple[int, int] | None:
+    if usage is None:
+        return None
+    for field_name in ("input_tokens", "output_tokens", "total_tokens"):
+        value = getattr(usage, field_name, None)
+        if isinstance(value, int):
+            request_span.add_counter(field_name, value)
+    cache_usage = _prompt_cache_usage(usage)
+    if cache_usage is not None:
+        request_span.add_counter("cached_input_tokens", cache_usage[0])
+        request_span.add_counter("uncached_input_tokens", cache_usage[1])
+    return cache_usage
+
+
 def _base_result(stage1_result: dict[str, Any], *, draft_plan_text: str) -> dict[str, Any]:
     return {
         **stage1_result,
@@ -119,6 +169,37 @@ def _review_required_result(
     }
 
 
+async def _first_accepted(
+    primary: asyncio.Task[str], hedge: asyncio.Task[str], *, accept: Callable[[str], bool] | None
+) -> tuple[asyncio.Task[str], str]:
+    """``(task, text)`` for the first output ``accept`` approves, else the first
+    output to arrive; the losing request is cancelled."""
+    pending: set[asyncio.Task[str]] = {primary, hedge}
+    fallback: tuple[asyncio.Task[str], str] | None = None
+    error: BaseException | None = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # Check the primary first when both land together.
+            for task in sorted(done, key=lambda task: task is not primary):
+                if task.exception() is not None:
+                    error = error or task.exception()
+                    continue
+                text = task.result()
+                if accept is None or accept(text):
+                    return task, text
+                fallback = fallback or (task, text)
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    if fallback is not None:
+        return fallback
+    assert error is not None
+    raise error
+
+
 @dataclass
 class DisabledStage2Automator:
     reason: str
@@ -132,60 +213,175 @@ class OpenAIStage2Automator:
     client: Any
     model: str
     max_output_tokens: int | None = None
+    section_repair: bool = True
+    autofix: bool = True
+    hedge: HedgePolicy | None = None
+    # Requests go through the provider; an injected client is wrapped so it
+    # shares the process-wide limiter and retry policy.
+    provider: Any = None
+
+    def __post_init__(self) -> None:
+        if self.provider is None:
+            self.provider = LimitedStage2Provider(ClientStage2Provider(self.client))
 
     @classmethod
     def from_env(cls) -> Stage2Automator:
-        api_key = os.getenv("OPENAI_API_KEY", "").strip()
-        if not api_key:
-            return DisabledStage2Automator(
-                "OPENAI_API_KEY is required for automated Stage 2 finalization."
-            )
-
-        try:
-            from openai import AsyncOpenAI
-        except ImportError:
-            return DisabledStage2Automator(
-                "The openai package is required for automated Stage 2 finalization."
-            )
+        provider, unavailable_reason = build_stage2_provider_from_env()
+        if provider is None:
+            return DisabledStage2Automator(unavailable_reason)
 
         model = os.getenv("UNLXCK_STAGE2_MODEL", "gpt-5-mini").strip() or "gpt-5-mini"
-        timeout_seconds = float(os.getenv("UNLXCK_STAGE2_TIMEOUT_SECONDS", "90"))
         max_output_tokens = os.getenv("UNLXCK_STAGE2_MAX_OUTPUT_TOKENS", "").strip()
-        client = AsyncOpenAI(api_key=api_key, timeout=timeout_seconds, max_retries=2)
+        section_repair = os.getenv("UNLXCK_STAGE2_SECTION_REPAIR", "1").strip() != "0"
+        autofix = os.getenv("UNLXCK_STAGE2_AUTOFIX", "1").strip() != "0"
         return cls(
-            client=client,
+            client=None,
             model=model,
             max_output_tokens=int(max_output_tokens) if max_output_tokens else None,
+            section_repair=section_repair,
+            autofix=autofix,
+            provider=provider,
+            hedge=HedgePolicy.from_env(),
         )
 
-    async def _generate_text(self, prompt: str, *, attempt_label: str) -> str:
+    def _build_request(self, prompt: Stage2Prompt, *, model: str) -> dict[str, Any]:
         request: dict[str, Any] = {
-            "model": self.model,
-            "input": prompt,
+            "model": model,
+            "input": _request_input(prompt),
         }
+        if prompt.instructions:
+            request["instructions"] = prompt.instructions
         if self.max_output_tokens is not None:
             request["max_output_tokens"] = self.max_output_tokens
+        return request
+
+    async def _request_text(self, prompt: Stage2Prompt, *, model: str, attempt_label: str) -> str:
+        request = self._build_request(prompt, model=model)
+        prompt_chars = len(prompt.text)
+        prefix_chars = len(prompt.prefix_text)
         logger.info(
-            "[stage2] sending %s prompt to model=%s chars=%s",
+            "[stage2] sending %s prompt to model=%s chars=%s prefix_chars=%s",
             attempt_label,
-            self.model,
-            len(prompt),
+            model,
+            prompt_chars,
+            prefix_chars,
         )
-        try:
-            response = await self.client.responses.create(**request)
-        except Exception as exc:  # pragma: no cover - provider failure surfaces via integration
-            raise Stage2AutomationError(f"Stage 2 model request failed: {exc}") from exc
-        response_id = getattr(response, "id", None) or "unknown"
-        text = _extract_response_text(response)
+        with span(
+            "stage2.model_request",
+            attempt=attempt_label,
+            model=model,
+            prompt_chars=prompt_chars,
+            prefix_chars=prefix_chars,
+        ) as request_span:
+            try:
+                response = await self.provider.create(request)
+            except Exception as exc:  # pragma: no cover - provider failure surfaces via integration
+                raise Stage2AutomationError(f"Stage 2 model request failed: {exc}") from exc
+            response_id = getattr(response, "id", None) or "unknown"
+            text = _extract_response_text(response)
+            request_span.set_attribute("response_chars", len(text))
+            cache_usage = _record_usage_counters(request_span, getattr(response, "usage", None))
+        cached_tokens, uncached_tokens = cache_usage if cache_usage is not None else ("unknown", "unknown")
         logger.info(
-            "[stage2] received %s response id=%s chars=%s",
+            "[stage2] received %s response id=%s chars=%s cached_input_tokens=%s uncached_input_tokens=%s",
             attempt_label,
             response_id,
             len(text),
+            cached_tokens,
+            uncached_tokens,
         )
         return text
 
+    def _limiter_saturated(self) -> bool:
+        limiter = getattr(self.provider, "limiter", None)
+        return limiter is not None and limiter.stats()["waiting"] > 0
+
+    async def _generate_text(
+        self,
+        prompt: Stage2Prompt,
+        *,
+        attempt_label: str,
+        accept: Callable[[str], bool] | None = None,
+    ) -> str:
+        """Model output for ``prompt``; with hedging on, a slow request races a
+        second one and the first output ``accept`` approves is returned."""
+        if self.hedge is None:
+            return await self._request_text(prompt, model=self.model, attempt_label=attempt_label)
+
+        stats = get_hedge_stats()
+        deadline = stats.deadline(attempt_label, self.hedge)
+        started = time.perf_counter()
+        primary = asyncio.create_task(self._request_text(prompt, model=self.model, attempt_label=attempt_label))
+        try:
+            done, _pending = await asyncio.wait({primary}, timeout=deadline)
+            if done or self._limiter_saturated():
+                if not done:
+                    # Hedging into a full limiter only adds queued load.
+                    stats.record_skipped()
+                    await asyncio.wait({primary})
+                stats.record(attempt_label, time.perf_counter() - started, hedged=False)
+                return primary.result()
+
+            hedge_model = self.hedge.model or self.model
+            logger.info(
+                "[stage2] %s no response after %.1fs; hedging with model=%s",
+                attempt_label,
+                deadline,
+                hedge_model,
+            )
+            add_counter("stage2_hedges")
+            hedge = asyncio.create_task(
+                self._request_text(prompt, model=hedge_model, attempt_label=f"{attempt_label}_hedge")
+            )
+            winner, text = await _first_accepted(primary, hedge, accept=accept)
+        except BaseException:
+            primary.cancel()
+            raise
+        hedge_won = winner is hedge
+        stats.record(attempt_label, time.perf_counter() - started, hedged=True, hedge_won=hedge_won)
+        if hedge_won:
+            add_counter("stage2_hedge_wins")
+        logger.info("[stage2] %s hedge race won_by=%s", attempt_label, "hedge" if hedge_won else "primary")
+        return text
+
+    async def _repair_text(
+        self,
+        retry: dict[str, Any],
+        *,
+        failed_plan_text: str,
+        review: Callable[[str], dict[str, Any]],
+    ) -> str:
+        section_repair = retry.get("section_repair") if self.section_repair else None
+        if section_repair is not None:
+            sections_text = await self._generate_text(
+                section_repair.prompt,
+                attempt_label="section_retry_pass",
+                accept=lambda text: section_repair.splice(text) is not None,
+            )
+            spliced_text = section_repair.splice(sections_text)
+            if spliced_text is not None:
+                logger.info(
+                    "[stage2] spliced repaired sections=%s into previous plan chars=%s->%s",
+                    ",".join(section_repair.target_keys),
+                    len(failed_plan_text),
+                    len(spliced_text),
+                )
+                return spliced_text
+            logger.warning(
+                "[stage2] section repair output missed sections=%s; falling back to full-plan repair",
+                ",".join(section_repair.target_keys),
+            )
+        return await self._generate_text(
+            retry["repair_prompt_parts"],
+            attempt_label="retry_pass",
+            accept=lambda text: review(text)["status"] == "PASS",
+        )
+
     async def finalize(self, *, stage1_result: dict[str, Any]) -> dict[str, Any]:
+        with profile_run("stage2_finalize", stage1_result):
+            return await self._finalize(stage1_result=stage1_result)
+
+    async def _finalize(self, *, stage1_result: dict[str, Any]) -> dict[str, Any]:
         package = build_stage2_package(stage1_result=stage1_result)
         draft_plan_text = str(package.get("draft_plan_text") or "")
         handoff_text = str(package["handoff_text"])
@@ -196,11 +392,24 @@ class OpenAIStage2Automator:
             len(draft_plan_text),
         )
 
-        first_pass_text = await self._generate_text(handoff_text, attempt_label="first_pass")
-        first_review = review_stage2_output(
-            planning_brief=package["planning_brief"],
-            final_plan_text=first_pass_text,
+        reviews: dict[str, dict[str, Any]] = {}
+
+        def _review(plan_text: str, attempt: str) -> dict[str, Any]:
+            # Hedge races review candidates early; reuse those reviews.
+            if plan_text not in reviews:
+                with span("stage2.review", attempt=attempt):
+                    reviews[plan_text] = review_stage2_output(
+                        planning_brief=package["planning_brief"],
+                        final_plan_text=plan_text,
+                    )
+            return reviews[plan_text]
+
+        first_pass_text = await self._generate_text(
+            package["handoff_parts"],
+            attempt_label="first_pass",
+            accept=lambda text: _review(text, "first_pass")["status"] == "PASS",
         )
+        first_review = _review(first_pass_text, "first_pass")
         logger.info(
             "[stage2] first_pass review status=%s needs_retry=%s",
             first_review["status"],
@@ -217,6 +426,35 @@ class OpenAIStage2Automator:
                 stage2_status=_STAGE2_PASS,
             )
 
+        auto_fixes: list[dict[str, Any]] = []
+        if self.autofix:
+            with span("stage2.autofix") as autofix_span:
+                autofix = autofix_stage2_output(
+                    planning_brief=package["planning_brief"],
+                    final_plan_text=first_pass_text,
+                    validator_report=first_review["validator_report"],
+                )
+                autofix_span.add_counter("fixes", len(autofix["fixes"]))
+            if autofix["review"] is not None:
+                auto_fixes = autofix["fixes"]
+                first_pass_text = autofix["plan_text"]
+                first_review = autofix["review"]
+                logger.info(
+                    "[stage2] applied %s local fixes (%s); review status=%s",
+                    len(auto_fixes),
+                    ",".join(sorted({fix["action"] for fix in auto_fixes})),
+                    first_review["status"],
+                )
+                if first_review["status"] == "PASS":
+                    return _approved_result(
+                        stage1_result,
+                        draft_plan_text=draft_plan_text,
+                        final_plan_text=first_pass_text,
+                        validator_report=first_review["validator_report"],
+                        attempt_count=1,
+                        stage2_status=_STAGE2_AUTOFIX_PASS,
+                    )
+
         retry = build_stage2_retry(
             stage1_result=stage1_result,
             final_plan_text=first_pass_text,
@@ -234,22 +472,27 @@ class OpenAIStage2Automator:
                 retry_text="",
             )
 
-        second_pass_text = await self._generate_text(retry_text, attempt_label="retry_pass")
-        second_review = review_stage2_output(
-            planning_brief=package["planning_brief"],
-            final_plan_text=second_pass_text,
+        second_pass_text = await self._repair_text(
+            retry,
+            failed_plan_text=first_pass_text,
+            review=lambda text: _review(text, "retry_pass"),
         )
+        second_review = _review(second_pass_text, "retry_pass")
         logger.info(
             "[stage2] retry_pass review status=%s needs_retry=%s",
             second_review["status"],
             second_review["needs_retry"],
         )
+        second_report = second_review["validator_report"]
+        if auto_fixes:
+            # The retry started from the locally fixed plan.
+            second_report = {**second_report, "auto_fixes": auto_fixes}
         if second_review["status"] == "PASS":
             return _approved_result(
                 stage1_result,
                 draft_plan_text=draft_plan_text,
                 final_plan_text=second_pass_text,
-                validator_report=second_review["validator_report"],
+                validator_report=second_report,
                 attempt_count=2,
                 stage2_status=_STAGE2_RETRY_PASS,
                 retry_text=retry_text,
@@ -260,7 +503,7 @@ class OpenAIStage2Automator:
             stage1_result,
             draft_plan_text=draft_plan_text,
             latest_plan_text=second_pass_text,
-            validator_report=second_review["validator_report"],
+            validator_report=second_report,
             retry_text=retry_text,
         )
 
@@ -0,0 +1,102 @@
+"""Hedged Stage 2 requests for tail-latency control.
+
+With ``UNLXCK_STAGE2_HEDGE=1`` a Stage 2 request that has not answered by its
+deadline gets a second, concurrent request (to ``UNLXCK_STAGE2_HEDGE_MODEL``
+when set, otherwise the same model). The first answer that validates wins and
+the other request is cancelled.
+
+The deadline is the ``UNLXCK_STAGE2_HEDGE_PERCENTILE`` (default ``90``)
+latency of recent primary requests of the same kind, floored at
+``UNLXCK_STAGE2_HEDGE_MIN_SECONDS``; until enough latencies are recorded it is
+``UNLXCK_STAGE2_HEDGE_INITIAL_SECONDS``. :class:`HedgeStats` keeps the
+process-wide hedge rate and win rate.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+from collections import defaultdict, deque
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    percentile: float = 90.0
+    initial_delay_seconds: float = 30.0
+    min_delay_seconds: float = 5.0
+    min_samples: int = 20
+    model: str | None = None
+
+    @classmethod
+    def from_env(cls) -> "HedgePolicy | None":
+        if os.getenv("UNLXCK_STAGE2_HEDGE", "0").strip() != "1":
+            return None
+        return cls(
+            percentile=float(os.getenv("UNLXCK_STAGE2_HEDGE_PERCENTILE", "90")),
+            initial_delay_seconds=float(os.getenv("UNLXCK_STAGE2_HEDGE_INITIAL_SECONDS", "30")),
+            min_delay_seconds=float(os.getenv("UNLXCK_STAGE2_HEDGE_MIN_SECONDS", "5")),
+            model=os.getenv("UNLXCK_STAGE2_HEDGE_MODEL", "").strip() or None,
+        )
+
+
+def _nearest_rank(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    rank = max(1, math.ceil(len(ordered) * min(max(pct, 0.0), 100.0) / 100.0))
+    return ordered[rank - 1]
+
+
+class HedgeStats:
+    """Recent primary latencies per attempt kind plus hedge counters."""
+
+    def __init__(self, window: int = 200):
+        self._lock = threading.Lock()
+        self._latencies: dict[str, deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._counters: dict[str, int] = defaultdict(int)
+
+    def deadline(self, attempt_label: str, policy: HedgePolicy) -> float:
+        with self._lock:
+            latencies = list(self._latencies[attempt_label])
+        if len(latencies) < policy.min_samples:
+            return policy.initial_delay_seconds
+        return max(policy.min_delay_seconds, _nearest_rank(latencies, policy.percentile))
+
+    def record(self, attempt_label: str, primary_seconds: float, *, hedged: bool, hedge_won: bool = False) -> None:
+        """Record one request; a cancelled primary records its elapsed time
+        as a lower bound so slow periods keep raising the deadline."""
+        with self._lock:
+            self._latencies[attempt_label].append(primary_seconds)
+            self._counters["requests"] += 1
+            self._counters["hedged"] += int(hedged)
+            self._counters["hedge_wins"] += int(hedge_won)
+
+    def record_skipped(self) -> None:
+        with self._lock:
+            self._counters["skipped_saturated"] += 1
+
+    def snapshot(self, policy: HedgePolicy | None = None) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            labels = list(self._latencies)
+        requests = counters.get("requests", 0)
+        hedged = counters.get("hedged", 0)
+        hedge_wins = counters.get("hedge_wins", 0)
+        snapshot = {
+            "requests": requests,
+            "hedged": hedged,
+            "hedge_wins": hedge_wins,
+            "skipped_saturated": counters.get("skipped_saturated", 0),
+            "hedge_rate": round(hedged / requests, 4) if requests else 0.0,
+            "win_rate": round(hedge_wins / hedged, 4) if hedged else 0.0,
+        }
+        if policy is not None:
+            snapshot["deadline_seconds"] = {label: round(self.deadline(label, policy), 3) for label in labels}
+        return snapshot
+
+
+_STATS = HedgeStats()
+
+
+def get_hedge_stats() -> HedgeStats:
+    return _STATS
@@ -0,0 +1,103 @@
+"""Deterministic local stand-in for the OpenAI Responses API.
+
+Serves ``POST /v1/responses`` with :func:`api.stage2_provider.mock_response_payload`
+so the real client path (pool, limiter, retries, HTTP) can be load-tested
+offline. Point the app or worker at it with ``OPENAI_BASE_URL``.
+
+Usage:
+    python -m api.stage2_mock_server --port 8765 --latency 0.5 --rate-limit-every 10
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=mock python -m api.worker
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fightcamp.logging_utils import configure_logging
+
+from .stage2_provider import mock_response_payload
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve canned or echoed Stage 2 responses offline.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--mode", choices=("echo", "canned"), default="echo")
+    parser.add_argument("--canned-file", help="Plan text returned in canned mode.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each response.")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Answer every Nth request with a 429.")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on injected 429s.")
+    return parser.parse_args(argv)
+
+
+def build_server(args: argparse.Namespace) -> ThreadingHTTPServer:
+    canned_text = ""
+    if args.canned_file:
+        with open(args.canned_file, encoding="utf-8") as handle:
+            canned_text = handle.read()
+    counter = itertools.count(1)
+    counter_lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, payload: dict, headers: dict[str, str] | None = None) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self) -> None:  # noqa: N802 - http.server naming
+            if self.path.rstrip("/") not in {"/v1/responses", "/responses"}:
+                self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                request = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError:
+                self._send_json(400, {"error": {"message": "request body is not JSON"}})
+                return
+            with counter_lock:
+                request_number = next(counter)
+            if args.latency:
+                time.sleep(args.latency)
+            if args.rate_limit_every and request_number % args.rate_limit_every == 0:
+                self._send_json(
+                    429,
+                    {"error": {"message": "mock rate limit", "type": "rate_limit_error"}},
+                    headers={"retry-after": str(args.retry_after)},
+                )
+                return
+            self._send_json(200, mock_response_payload(request, mode=args.mode, canned_text=canned_text))
+
+        def log_message(self, format: str, *log_args) -> None:  # noqa: A002 - http.server signature
+            logger.debug("[stage2-mock] " + format, *log_args)
+
+    return ThreadingHTTPServer((args.host, args.port), Handler)
+
+
+def main(argv: list[str] | None = None) -> None:
+    configure_logging()
+    args = parse_args(argv)
+    server = build_server(args)
+    logger.info("[stage2-mock] serving mode=%s on http://%s:%s/v1", args.mode, args.host, server.server_port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,441 @@
+"""Stage 2 model provider layer: pooled clients, a process-wide limiter and retries.
+
+Every Stage 2 request goes through :class:`LimitedStage2Provider`:
+
+- OpenAI clients come from a shared pool (one per event loop and
+  configuration) instead of one per automator, with the SDK's own retries off;
+- a process-wide :class:`Stage2Limiter` caps in-flight requests
+  (``UNLXCK_STAGE2_MAX_CONCURRENCY``) and estimated input tokens per minute
+  (``UNLXCK_STAGE2_TOKENS_PER_MINUTE``) across the worker loop, API requests
+  and any other event loop in the process;
+- rate limits, overloads and connection failures are retried up to
+  ``UNLXCK_STAGE2_MAX_ATTEMPTS`` times with full-jitter backoff, waiting at
+  least the provider's ``Retry-After``.
+
+``UNLXCK_STAGE2_PROVIDER=mock`` swaps in :class:`MockStage2Provider`, a
+deterministic offline provider for load tests; ``python -m api.stage2_mock_server``
+serves the same responses over HTTP for the real OpenAI client.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import hashlib
+import logging
+import os
+import random
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Protocol
+
+from fightcamp.stage2_compaction import estimate_tokens
+from fightcamp.tracing import add_counter
+
+logger = logging.getLogger(__name__)
+
+_RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+_RETRYABLE_ERROR_NAMES = frozenset({"APIConnectionError", "APITimeoutError"})
+
+
+class Stage2Provider(Protocol):
+    async def create(self, request: dict[str, Any]) -> Any: ...
+
+
+class Stage2ProviderError(RuntimeError):
+    """A provider-side HTTP failure; carries the status code and response headers."""
+
+    def __init__(self, message: str, *, status_code: int, headers: dict[str, str] | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.headers = dict(headers or {})
+
+
+# ---------------------------------------------------------------------------
+# Client pool
+# ---------------------------------------------------------------------------
+
+# httpx connection pools belong to the loop that opened them, so clients are
+# shared per event loop; within a loop every automator reuses one client.
+_CLIENT_POOL: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple, Any]]" = weakref.WeakKeyDictionary()
+_CLIENT_POOL_LOCK = threading.Lock()
+
+
+def pooled_openai_client(*, api_key: str, base_url: str | None, timeout_seconds: float) -> Any:
+    from openai import AsyncOpenAI
+
+    loop = asyncio.get_running_loop()
+    key = (hashlib.sha256(api_key.encode()).hexdigest(), base_url, timeout_seconds)
+    with _CLIENT_POOL_LOCK:
+        clients = _CLIENT_POOL.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            # Retries happen in LimitedStage2Provider, which can see the limiter.
+            client = AsyncOpenAI(api_key=api_key, base_url=base_url, timeout=timeout_seconds, max_retries=0)
+            clients[key] = client
+        return client
+
+
+@dataclass(frozen=True)
+class OpenAIStage2Provider:
+    api_key: str
+    base_url: str | None = None
+    timeout_seconds: float = 90.0
+
+    async def create(self, request: dict[str, Any]) -> Any:
+        client = pooled_openai_client(
+            api_key=self.api_key, base_url=self.base_url, timeout_seconds=self.timeout_seconds
+        )
+        return await client.responses.create(**request)
+
+
+@dataclass(frozen=True)
+class ClientStage2Provider:
+    """Adapter for an already-built client exposing ``responses.create``."""
+
+    client: Any
+
+    async def create(self, request: dict[str, Any]) -> Any:
+        return await self.client.responses.create(**request)
+
+
+# ---------------------------------------------------------------------------
+# Limiter
+# ---------------------------------------------------------------------------
+
+class Stage2Limiter:
+    """Process-wide cap on in-flight Stage 2 requests and input tokens per minute.
+
+    Works across event loops and threads: state sits behind a thread lock and
+    waiters are futures on their own loop, woken thread-safely in FIFO order.
+    ``tokens_per_minute=0`` disables the token bucket.
+    """
+
+    def __init__(self, max_concurrency: int, tokens_per_minute: int = 0, *, clock=time.monotonic):
+        self.max_concurrency = max(1, max_concurrency)
+        self.tokens_per_minute = max(0, tokens_per_minute)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._tokens = float(self.tokens_per_minute)
+        self._refilled_at = clock()
+        self._peak_active = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "active": self._active,
+                "waiting": len(self._waiters),
+                "peak_active": self._peak_active,
+                "max_concurrency": self.max_concurrency,
+                "tokens_per_minute": self.tokens_per_minute,
+            }
+
+    async def _acquire_slot(self) -> None:
+        with self._lock:
+            if self._active < self.max_concurrency and not self._waiters:
+                self._active += 1
+                self._peak_active = max(self._peak_active, self._active)
+                return
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                queued = waiter in self._waiters
+                if queued:
+                    self._waiters.remove(waiter)
+            # A slot handed over just before the cancellation landed is ours to
+            # return; a cancelled hand-over is returned by _hand_over.
+            if not queued and waiter.done() and not waiter.cancelled():
+                self._release_slot()
+            raise
+
+    def _release_slot(self) -> None:
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if waiter.cancelled():
+                    continue
+                # The slot passes straight to the waiter; _active is unchanged.
+                waiter.get_loop().call_soon_threadsafe(self._hand_over, waiter)
+                return
+            self._active -= 1
+
+    def _hand_over(self, waiter: asyncio.Future) -> None:
+        if waiter.done():
+            self._release_slot()
+        else:
+            waiter.set_result(None)
+
+    def _take_tokens(self, tokens: int) -> float:
+        """Seconds to wait before ``tokens`` are available; 0 when taken."""
+        if not self.tokens_per_minute:
+            return 0.0
+        tokens = min(tokens, self.tokens_per_minute)
+        rate = self.tokens_per_minute / 60.0
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.tokens_per_minute, self._tokens + (now - self._refilled_at) * rate)
+            self._refilled_at = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / rate
+
+    @asynccontextmanager
+    async def slot(self, tokens: int = 0) -> AsyncIterator[float]:
+        """Hold one request slot; yields the seconds spent waiting for it."""
+        started = self._clock()
+        await self._acquire_slot()
+        try:
+            while (delay := self._take_tokens(tokens)) > 0:
+                await asyncio.sleep(delay)
+            yield self._clock() - started
+        finally:
+            self._release_slot()
+
+
+_LIMITER: Stage2Limiter | None = None
+_LIMITER_LOCK = threading.Lock()
+
+
+def get_stage2_limiter() -> Stage2Limiter:
+    global _LIMITER
+    with _LIMITER_LOCK:
+        if _LIMITER is None:
+            _LIMITER = Stage2Limiter(
+                max_concurrency=int(os.getenv("UNLXCK_STAGE2_MAX_CONCURRENCY", "8")),
+                tokens_per_minute=int(os.getenv("UNLXCK_STAGE2_TOKENS_PER_MINUTE", "0")),
+            )
+        return _LIMITER
+
+
+# ---------------------------------------------------------------------------
+# Retries
+# ---------------------------------------------------------------------------
+
+def _error_status(exc: BaseException) -> int | None:
+    status_code = getattr(exc, "status_code", None)
+    return status_code if isinstance(status_code, int) else None
+
+
+def is_retryable_error(exc: BaseException) -> bool:
+    status_code = _error_status(exc)
+    if status_code is not None:
+        return status_code in _RETRYABLE_STATUS_CODES
+    return type(exc).__name__ in _RETRYABLE_ERROR_NAMES or isinstance(exc, (ConnectionError, asyncio.TimeoutError))
+
+
+def retry_after_seconds(exc: BaseException, *, now: float | None = None) -> float | None:
+    """``Retry-After``/``retry-after-ms`` from the error's response headers."""
+    headers = getattr(exc, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000.0)
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(retry_after).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at - (time.time() if now is None else now))
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 4
+    base_delay_seconds: float = 1.0
+    max_delay_seconds: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        return cls(max_attempts=max(1, int(os.getenv("UNLXCK_STAGE2_MAX_ATTEMPTS", "4"))))
+
+    def delay(self, attempt: int, exc: BaseException, rng: random.Random) -> float:
+        """Full-jitter backoff for retry ``attempt`` (1-based), never under ``Retry-After``."""
+        backoff = rng.uniform(0, min(self.max_delay_seconds, self.base_delay_seconds * 2 ** (attempt - 1)))
+        retry_after = retry_after_seconds(exc)
+        if retry_after is None:
+            return backoff
+        # Spread retries that were all told the same Retry-After.
+        return retry_after + rng.uniform(0, self.base_delay_seconds)
+
+
+def _request_text(request: dict[str, Any]) -> str:
+    return "\n\n".join(
+        str(part.get("text") or "")
+        for message in request.get("input") or []
+        for part in message.get("content") or []
+    )
+
+
+def _request_tokens(request: dict[str, Any]) -> int:
+    return estimate_tokens(str(request.get("instructions") or "") + _request_text(request))
+
+
+@dataclass
+class LimitedStage2Provider:
+    provider: Any
+    limiter: Stage2Limiter = field(default_factory=get_stage2_limiter)
+    retry_policy: RetryPolicy = field(default_factory=RetryPolicy.from_env)
+    rng: random.Random = field(default_factory=random.Random)
+
+    async def create(self, request: dict[str, Any]) -> Any:
+        tokens = _request_tokens(request)
+        for attempt in range(1, self.retry_policy.max_attempts + 1):
+            async with self.limiter.slot(tokens) as waited_seconds:
+                if waited_seconds >= 0.001:
+                    add_counter("limiter_wait_ms", round(waited_seconds * 1000.0, 3))
+                try:
+                    return await self.provider.create(request)
+                except Exception as exc:
+                    if attempt >= self.retry_policy.max_attempts or not is_retryable_error(exc):
+                        raise
+                    delay = self.retry_policy.delay(attempt, exc, self.rng)
+                    add_counter("provider_retries")
+                    logger.warning(
+                        "[stage2] provider request failed status=%s attempt=%s/%s; retrying in %.2fs",
+                        _error_status(exc) or type(exc).__name__,
+                        attempt,
+                        self.retry_policy.max_attempts,
+                        delay,
+                    )
+            # Back off outside the slot so other requests can use it.
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+
+# ---------------------------------------------------------------------------
+# Mock provider
+# ---------------------------------------------------------------------------
+
+# Prompt sections the echo mock answers with, most specific first.
+_ECHO_SECTIONS = ("SECTIONS TO REVISE\n", "PREVIOUS FINAL PLAN\n", "STAGE 1 DRAFT PLAN\n")
+
+
+def mock_response_text(request: dict[str, Any], *, mode: str = "echo", canned_text: str = "") -> str:
+    """Deterministic response text: the canned plan, or the plan the prompt carries."""
+    if mode == "canned":
+        return canned_text
+    text = _request_text(request)
+    for heading in _ECHO_SECTIONS:
+        if heading in text:
+            return text.split(heading, 1)[1].split("\n\n---\n\n", 1)[0].strip()
+    return text.strip()
+
+
+def mock_response_payload(request: dict[str, Any], *, mode: str = "echo", canned_text: str = "") -> dict[str, Any]:
+    """A Responses API payload for ``request``; the id is a hash of the request."""
+    output_text = mock_response_text(request, mode=mode, canned_text=canned_text)
+    digest = hashlib.sha256(repr(sorted(request.items())).encode()).hexdigest()[:24]
+    input_tokens = _request_tokens(request)
+    output_tokens = estimate_tokens(output_text)
+    return {
+        "id": f"resp_mock_{digest}",
+        "object": "response",
+        "model": str(request.get("model") or "mock"),
+        "status": "completed",
+        "output": [
+            {
+                "id": f"msg_mock_{digest}",
+                "type": "message",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": output_text, "annotations": []}],
+            }
+        ],
+        "usage": {
+            "input_tokens": input_tokens,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens": output_tokens,
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": input_tokens + output_tokens,
+        },
+    }
+
+
+@dataclass
+class MockStage2Provider:
+    """Offline provider: echoes the prompt's plan (or returns canned text).
+
+    ``rate_limit_every=N`` answers every Nth request with a 429 carrying
+    ``Retry-After: retry_after_seconds`` to exercise the retry path.
+    """
+
+    mode: str = "echo"
+    canned_text: str = ""
+    latency_seconds: float = 0.0
+    rate_limit_every: int = 0
+    retry_after_seconds: float = 0.0
+    requests: int = 0
+
+    @classmethod
+    def from_env(cls) -> "MockStage2Provider":
+        return cls(
+            mode=os.getenv("UNLXCK_STAGE2_MOCK_MODE", "echo").strip() or "echo",
+            canned_text=os.getenv("UNLXCK_STAGE2_MOCK_TEXT", ""),
+            latency_seconds=float(os.getenv("UNLXCK_STAGE2_MOCK_LATENCY_SECONDS", "0")),
+            rate_limit_every=int(os.getenv("UNLXCK_STAGE2_MOCK_RATE_LIMIT_EVERY", "0")),
+        )
+
+    async def create(self, request: dict[str, Any]) -> Any:
+        self.requests += 1
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        if self.rate_limit_every and self.requests % self.rate_limit_every == 0:
+            raise Stage2ProviderError(
+                "mock rate limit",
+                status_code=429,
+                headers={"retry-after": str(self.retry_after_seconds)},
+            )
+        payload = mock_response_payload(request, mode=self.mode, canned_text=self.canned_text)
+        usage = payload["usage"]
+        return SimpleNamespace(
+            id=payload["id"],
+            output_text=payload["output"][0]["content"][0]["text"],
+            usage=SimpleNamespace(
+                input_tokens=usage["input_tokens"],
+                output_tokens=usage["output_tokens"],
+                total_tokens=usage["total_tokens"],
+                input_tokens_details=SimpleNamespace(cached_tokens=0),
+            ),
+        )
+
+
+def build_stage2_provider_from_env() -> tuple[Any, str | None]:
+    """``(provider, None)``, or ``(None, reason)`` when Stage 2 cannot run here."""
+    if os.getenv("UNLXCK_STAGE2_PROVIDER", "openai").strip().lower() == "mock":
+        return LimitedStage2Provider(MockStage2Provider.from_env()), None
+    api_key = os.getenv("OPENAI_API_KEY", "").strip()
+    if not api_key:
+        return None, "OPENAI_API_KEY is required for automated Stage 2 finalization."
+    try:
+        import openai  # noqa: F401
+    except ImportError:
+        return None, "The openai package is required for automated Stage 2 finalization."
+    provider = OpenAIStage2Provider(
+        api_key=api_key,
+        base_url=os.getenv("OPENAI_BASE_URL", "").strip() or None,
+        timeout_seconds=float(os.getenv("UNLXCK_STAGE2_TIMEOUT_SECONDS", "90")),
+    )
+    return LimitedStage2Provider(provider), None
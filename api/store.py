@@ -13,12 +13,18 @@ from fastapi import HTTPException, status
 from postgrest.exceptions import APIError as PostgrestAPIError
 from supabase import Client, create_client
 
+from fightcamp.tracing import span
+
 from .auth import AuthenticatedUser
 from .models import PlanRequest, ProfileUpdateRequest
 
 logger = logging.getLogger(__name__)
 
 PLAN_SUMMARY_SELECT = "id, athlete_id, full_name, fight_date, technical_style, plan_name, status, pdf_url, created_at"
+# Just what batch Stage 2 validation reads; "*" would also pull every plan's
+# draft, handoff text, payload and reports.
+PLAN_VALIDATION_SELECT = "id, planning_brief, final_plan_text"
+_PLAN_VALIDATION_ID_CHUNK = 100
 GENERATION_JOB_SELECT = "*"
 
 _TRANSIENT_SUPABASE_ERRORS = (
@@ -107,6 +113,10 @@ class AppStore(Protocol):
 
     def get_plan(self, plan_id: str) -> dict[str, Any] | None: ...
 
+    def get_plan_validation_rows(self, plan_ids: list[str]) -> list[dict[str, Any]]: ...
+
+    def list_plan_validation_rows(self, *, limit: int = 500, offset: int = 0) -> list[dict[str, Any]]: ...
+
     def get_latest_plan(self, athlete_id: str) -> dict[str, Any] | None: ...
 
     def rename_plan(self, plan_id: str, plan_name: str) -> dict[str, Any]: ...
@@ -318,22 +328,24 @@ class SupabaseAppStore:
         attempts: int = 3,
         backoff_seconds: float = 0.25,
     ) -> Any:
-        for attempt in range(1, attempts + 1):
-            try:
-                return fn()
-            except _STORE_CLIENT_ERRORS as exc:
-                transient = self._is_transient_store_error(exc)
-                logger.warning(
-                    "[store] %s:failure attempt=%s transient=%s error_type=%s error=%s",
-                    operation,
-                    attempt,
-                    transient,
-                    type(exc).__name__,
-                    exc,
-                )
-                if not transient or attempt >= attempts:
-                    raise
-                time.sleep(backoff_seconds * attempt)
+        with span(f"store.{operation}") as store_span:
+            for attempt in range(1, attempts + 1):
+                store_span.add_counter("attempts")
+                try:
+                    return fn()
+                except _STORE_CLIENT_ERRORS as exc:
+                    transient = self._is_transient_store_error(exc)
+                    logger.warning(
+                        "[store] %s:failure attempt=%s transient=%s error_type=%s error=%s",
+                        operation,
+                        attempt,
+                        transient,
+                        type(exc).__name__,
+                        exc,
+                    )
+                    if not transient or attempt >= attempts:
+                        raise
+                    time.sleep(backoff_seconds * attempt)
 
         raise RuntimeError(f"{operation} exhausted retries")
 
@@ -662,6 +674,25 @@ class SupabaseAppStore:
     def get_plan(self, plan_id: str) -> dict[str, Any] | None:
         return self._select_first(self.client.table("plans").select("*").eq("id", plan_id))
 
+    def get_plan_validation_rows(self, plan_ids: list[str]) -> list[dict[str, Any]]:
+        rows: list[dict[str, Any]] = []
+        for start in range(0, len(plan_ids), _PLAN_VALIDATION_ID_CHUNK):
+            chunk = plan_ids[start : start + _PLAN_VALIDATION_ID_CHUNK]
+            response = self.client.table("plans").select(PLAN_VALIDATION_SELECT).in_("id", chunk).execute()
+            rows.extend(getattr(response, "data", None) or [])
+        return rows
+
+    def list_plan_validation_rows(self, *, limit: int = 500, offset: int = 0) -> list[dict[str, Any]]:
+        response = (
+            self.client.table("plans")
+            .select(PLAN_VALIDATION_SELECT)
+            .order("created_at")
+            .order("id")
+            .range(offset, offset + limit - 1)
+            .execute()
+        )
+        return getattr(response, "data", None) or []
+
     def get_latest_plan(self, athlete_id: str) -> dict[str, Any] | None:
         return self._select_first(
             self.client.table("plans")
@@ -5,7 +5,9 @@ import logging
 import os
 from typing import Any
 
+from fightcamp.bank_reload import start_bank_reload_watcher
 from fightcamp.logging_utils import configure_logging
+from fightcamp.preload import format_memory_report, freeze_heap, memory_report, warm_process
 
 from .demo import DemoAuthService, get_demo_store
 from .generation_runtime import default_planner, is_stale_job, run_generation_job
@@ -74,9 +76,20 @@ async def run_worker() -> None:
         stale_after_seconds,
     )
 
-    while True:
-        await _tick(store=store, active_tasks=active_tasks, stale_after_seconds=stale_after_seconds)
-        await asyncio.sleep(interval_seconds)
+    # Warm before the first claim so the first job does not pay the bank,
+    # spaCy and matcher load; freezing keeps the GC off those objects.
+    await asyncio.to_thread(warm_process, logger=logger)
+    freeze_heap()
+    logger.info("[worker] warmed %s", format_memory_report(memory_report()))
+
+    bank_watcher = start_bank_reload_watcher()
+    try:
+        while True:
+            await _tick(store=store, active_tasks=active_tasks, stale_after_seconds=stale_after_seconds)
+            await asyncio.sleep(interval_seconds)
+    finally:
+        if bank_watcher is not None:
+            bank_watcher.stop()
 
 
 def main() -> None:
@@ -0,0 +1 @@
+"""Stage 1 benchmark harness (``python -m benchmarks.stage1``)."""
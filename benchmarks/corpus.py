@@ -0,0 +1,94 @@
+"""Fixed intake corpus for the Stage 1 benchmarks.
+
+Scenarios reuse the API test fixtures (``tests/support.py``) and the sample
+``test_data.json`` payload so the benchmark exercises the same inputs the
+suite already trusts. Fight dates are rebased onto the reference date so each
+scenario keeps its intended days-out window no matter when it runs.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+TESTS_DIR = ROOT / "tests"
+TEST_DATA_PATH = ROOT / "test_data.json"
+
+_FIGHT_DATE_LABEL = "When is your next fight?"
+
+
+def _support_module():
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    if str(TESTS_DIR) not in sys.path:
+        sys.path.insert(0, str(TESTS_DIR))
+    import support
+
+    return support
+
+
+def _system_scenario_overrides(key: str) -> dict[str, Any]:
+    support = _support_module()
+    scenario = next(item for item in support.SYSTEM_SCENARIOS if item.key == key)
+    return copy.deepcopy(scenario.request_overrides)
+
+
+def _fixture_payload(overrides: dict[str, Any], *, fight_date: date, random_seed: int) -> dict[str, Any]:
+    support = _support_module()
+    merged = {**overrides, "fight_date": fight_date.isoformat(), "random_seed": random_seed}
+    return support._build_request(merged).to_payload()
+
+
+def _sample_payload(*, fight_date: date, random_seed: int) -> dict[str, Any]:
+    payload = json.loads(TEST_DATA_PATH.read_text(encoding="utf-8"))
+    for item in payload["data"]["fields"]:
+        if item.get("label") == _FIGHT_DATE_LABEL:
+            item["value"] = fight_date.isoformat()
+    payload["random_seed"] = random_seed
+    return payload
+
+
+def build_corpus(reference_date: date | None = None) -> dict[str, dict[str, Any]]:
+    """Return the named benchmark intakes as planner payloads."""
+    today = reference_date or date.today()
+
+    multi_injury = _system_scenario_overrides("messy_injury_input")
+    multi_injury["injuries"] = (
+        f"{multi_injury['injuries']}, low back tight on deadlifts, right knee sore after roadwork"
+    )
+
+    return {
+        "sample_intake": _sample_payload(fight_date=today + timedelta(weeks=8), random_seed=101),
+        "short_notice": _fixture_payload(
+            _system_scenario_overrides("short_notice_contradictory"),
+            fight_date=today + timedelta(days=14),
+            random_seed=102,
+        ),
+        "late_fight": _fixture_payload({}, fight_date=today + timedelta(days=6), random_seed=103),
+        "multi_injury": _fixture_payload(
+            multi_injury,
+            fight_date=today + timedelta(weeks=7),
+            random_seed=104,
+        ),
+        "boxing_crowded_week": _fixture_payload(
+            {
+                "weekly_training_frequency": 6,
+                "training_availability": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"],
+                "hard_sparring_days": ["Tuesday", "Thursday", "Saturday"],
+                "technical_skill_days": ["Monday", "Wednesday"],
+                "support_work_days": ["Friday"],
+            },
+            fight_date=today + timedelta(weeks=6),
+            random_seed=105,
+        ),
+        "heavy_weight_cut": _fixture_payload(
+            _system_scenario_overrides("severe_cut_pressure") | {"athlete": {"weight_kg": 77.0, "target_weight_kg": 70.0}},
+            fight_date=today + timedelta(weeks=5),
+            random_seed=106,
+        ),
+    }
@@ -0,0 +1,203 @@
+"""Late-fight allocator benchmark over the worst legal countdown windows.
+
+Late-fight intakes (D-13 down to D-1) are the urgent ones, and role
+allocation is the part of their Stage 1 whose cost grows with the window:
+more legal countdown days, more declared hard days and more optional roles.
+This times ``_late_fight_allocation_plan`` for every window against the
+athlete shapes that produce the most candidate roles (every weekday as the
+submission day, crowded and sparse declared hard days, full and thin
+availability) and reports p50/p95/max per window.
+
+The search microbenchmark isolates the placement search itself: for each
+window's heaviest athlete it builds the score tables once, then times
+repeated searches and reports the cost per placement tried (one role put on
+one countdown day and scored).
+
+Usage::
+
+    python -m benchmarks.late_fight_allocator
+    python -m benchmarks.late_fight_allocator --max-ms 50 --output late_fight.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from itertools import product
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+from fightcamp.stage2_payload_late_fight import (
+    _late_fight_allocation_plan,
+    _late_fight_candidate_roles,
+    _late_fight_locked_label,
+    _late_fight_permission_policy,
+    _late_fight_placement_tables,
+    _late_fight_search_placements,
+)
+
+from .stage1 import percentile
+
+WINDOW_DAYS = tuple(range(13, 0, -1))
+_WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+_HARD_DAY_PATTERNS = (
+    ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday"),
+    ("monday", "wednesday", "friday"),
+    ("tuesday", "thursday"),
+    (),
+)
+_TRAINING_DAY_PATTERNS = (
+    _WEEKDAYS,
+    ("monday", "wednesday", "friday"),
+)
+DEFAULT_MAX_MS = 50.0
+
+_BASE_ATHLETE: dict[str, Any] = {
+    "full_name": "Benchmark Athlete",
+    "sport": "boxing",
+    "status": "amateur",
+    "rounds_format": "3x3",
+    "camp_length_weeks": 6,
+    "support_work_days": ["friday"],
+    "fatigue": "moderate",
+    "fatigue_level": "moderate",
+    "weight_cut_risk": False,
+    "weight_cut_pct": 0.0,
+    "readiness_flags": [],
+    "injuries": [],
+}
+
+
+def window_athletes(days_until_fight: int) -> list[dict[str, Any]]:
+    """Athlete models for one countdown window, one per submission/schedule shape."""
+    return [
+        {
+            **_BASE_ATHLETE,
+            "days_until_fight": days_until_fight,
+            "plan_creation_weekday": weekday,
+            "training_days": list(training_days),
+            "hard_sparring_days": list(hard_days),
+        }
+        for weekday, hard_days, training_days in product(_WEEKDAYS, _HARD_DAY_PATTERNS, _TRAINING_DAY_PATTERNS)
+    ]
+
+
+def _candidate_count(days_until_fight: int, athlete: dict[str, Any]) -> int:
+    policy = _late_fight_permission_policy(days_until_fight, athlete)
+    return len(_late_fight_candidate_roles(days_until_fight, athlete, policy))
+
+
+def run(*, iterations: int, windows: tuple[int, ...] = WINDOW_DAYS) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    for days in windows:
+        athletes = window_athletes(days)
+        samples: list[float] = []
+        for _ in range(iterations):
+            for athlete in athletes:
+                started = perf_counter()
+                _late_fight_allocation_plan(days, athlete)
+                samples.append(perf_counter() - started)
+        results[f"D-{days}"] = {
+            "athletes": len(athletes),
+            "max_candidates": max(_candidate_count(days, athlete) for athlete in athletes),
+            "p50_ms": round(percentile(samples, 50) * 1000, 3),
+            "p95_ms": round(percentile(samples, 95) * 1000, 3),
+            "max_ms": round(max(samples) * 1000, 3),
+        }
+    return results
+
+
+def _search_tables(days_until_fight: int, athlete: dict[str, Any]):
+    policy = _late_fight_permission_policy(days_until_fight, athlete)
+    labels = list(policy.get("legal_countdown_labels", []))
+    label_to_weekday = {
+        label: str(weekday).strip().lower()
+        for label, weekday in policy.get("countdown_weekday_map", {}).items()
+        if label in labels and str(weekday or "").strip()
+    }
+    roles = [
+        role
+        for role in _late_fight_candidate_roles(days_until_fight, athlete, policy)
+        if not (role.get("locked_day") and label_to_weekday and _late_fight_locked_label(role, label_to_weekday) is None)
+    ]
+    return _late_fight_placement_tables(roles, labels, label_to_weekday)
+
+
+def _any_roles(_mask: int) -> bool:
+    return True
+
+
+def run_search(*, iterations: int, windows: tuple[int, ...] = WINDOW_DAYS) -> dict[str, Any]:
+    """Per-placement cost of the uncapped search for each window's heaviest athlete."""
+    results: dict[str, Any] = {}
+    for days in windows:
+        heaviest = None
+        for athlete in window_athletes(days):
+            tables = _search_tables(days, athlete)
+            if tables is None:
+                continue
+            placements = _late_fight_search_placements(tables, _any_roles)[1]
+            if heaviest is None or placements > heaviest[1]:
+                heaviest = (tables, placements)
+        if heaviest is None:
+            continue
+        tables, placements = heaviest
+        started = perf_counter()
+        for _ in range(iterations):
+            _late_fight_search_placements(tables, _any_roles)
+        elapsed = perf_counter() - started
+        results[f"D-{days}"] = {
+            "roles": tables.role_count,
+            "days": tables.label_count,
+            "placements": placements,
+            "search_us": round(elapsed / iterations * 1e6, 1),
+            "ns_per_placement": round(elapsed / (iterations * placements) * 1e9, 1),
+        }
+    return results
+
+
+def over_budget(results: dict[str, Any], *, max_ms: float) -> list[str]:
+    return [
+        f"{window} max {summary['max_ms']:.3f}ms > {max_ms:.3f}ms"
+        for window, summary in results.items()
+        if summary["max_ms"] > max_ms
+    ]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark late-fight role allocation over every countdown window.")
+    parser.add_argument("--iterations", type=int, default=3, help="Timed passes over each window's athletes.")
+    parser.add_argument("--search-iterations", type=int, default=20, help="Timed searches per window in the microbenchmark.")
+    parser.add_argument("--max-ms", type=float, default=DEFAULT_MAX_MS, help="Fail when any allocation is slower.")
+    parser.add_argument("--output", type=Path, default=None, help="Write the results JSON here.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    results = run(iterations=max(1, args.iterations))
+    for window, summary in results.items():
+        print(
+            f"{window:>5} athletes={summary['athletes']} candidates<={summary['max_candidates']} "
+            f"p50={summary['p50_ms']:.3f}ms p95={summary['p95_ms']:.3f}ms max={summary['max_ms']:.3f}ms"
+        )
+    search = run_search(iterations=max(1, args.search_iterations))
+    for window, summary in search.items():
+        print(
+            f"{window:>5} search roles={summary['roles']} days={summary['days']} "
+            f"placements={summary['placements']} {summary['search_us']:.1f}us "
+            f"{summary['ns_per_placement']:.1f}ns/placement"
+        )
+    if args.output is not None:
+        payload = {"allocation": results, "search": search}
+        args.output.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    failures = over_budget(results, max_ms=args.max_ms)
+    for failure in failures:
+        print(f"over budget: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
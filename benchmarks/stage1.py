@@ -0,0 +1,223 @@
+"""Stage 1 benchmark: per-stage p50/p95 and peak RSS over the fixed corpus.
+
+Cold runs plan each scenario as the first generation in a fresh interpreter,
+so they include bank loading. Warm runs reuse one primed process. Results are
+written as a JSON baseline; ``--compare`` checks a new run against a baseline
+and exits non-zero when a stage's p50/p95 or the peak RSS regresses past the
+threshold.
+
+Usage::
+
+    python -m benchmarks.stage1 --output benchmarks/baseline.json
+    python -m benchmarks.stage1 --compare benchmarks/baseline.json --threshold 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import platform
+import resource
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+from .corpus import ROOT, build_corpus
+
+REPORTED_STAGES = (
+    "parse_input",
+    "injury_triage",
+    "prime_banks",
+    "strength",
+    "conditioning",
+    "coach_review",
+    "stage2_outputs",
+    "total",
+)
+DEFAULT_THRESHOLD = 0.25
+# Stages faster than this are dominated by timer noise; ignore their ratios.
+DEFAULT_MIN_DELTA_S = 0.02
+DEFAULT_MIN_RSS_DELTA_MB = 16.0
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Linear-interpolated percentile (``pct`` in 0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return ordered[lower]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def _peak_rss_mb(who: int = resource.RUSAGE_SELF) -> float:
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def _quiet_logging() -> None:
+    from fightcamp.logging_utils import configure_logging
+
+    configure_logging()
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+def plan_with_timings(payload: dict[str, Any]) -> dict[str, float]:
+    """Run one generation and return its stage timings plus ``total``."""
+    from fightcamp.main import generate_plan_sync
+
+    timings: dict[str, float] = {}
+    started = perf_counter()
+    generate_plan_sync(payload, generate_pdf=False, timings=timings)
+    timings["total"] = perf_counter() - started
+    return timings
+
+
+def summarize(samples: list[dict[str, float]], *, peak_rss_mb: float) -> dict[str, Any]:
+    stages: dict[str, dict[str, float]] = {}
+    for stage in REPORTED_STAGES:
+        values = [sample[stage] for sample in samples if stage in sample]
+        if not values:
+            continue
+        stages[stage] = {
+            "p50": round(percentile(values, 50), 4),
+            "p95": round(percentile(values, 95), 4),
+            "n": len(values),
+        }
+    return {"stages": stages, "peak_rss_mb": peak_rss_mb}
+
+
+def run_cold(scenarios: dict[str, dict[str, Any]], *, repeats: int) -> dict[str, Any]:
+    samples: list[dict[str, float]] = []
+    for _ in range(repeats):
+        for name in scenarios:
+            completed = subprocess.run(
+                [sys.executable, "-m", "benchmarks.stage1", "--cold-child", name],
+                cwd=ROOT,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            samples.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    return summarize(samples, peak_rss_mb=_peak_rss_mb(resource.RUSAGE_CHILDREN))
+
+
+def run_warm(scenarios: dict[str, dict[str, Any]], *, iterations: int) -> dict[str, Any]:
+    from fightcamp.plan_pipeline import prime_plan_banks
+
+    prime_plan_banks()
+    # One untimed pass so the first-run bank tag inference is not counted.
+    for payload in scenarios.values():
+        plan_with_timings(payload)
+    samples = [plan_with_timings(payload) for _ in range(iterations) for payload in scenarios.values()]
+    return summarize(samples, peak_rss_mb=_peak_rss_mb())
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_s: float = DEFAULT_MIN_DELTA_S,
+    min_rss_delta_mb: float = DEFAULT_MIN_RSS_DELTA_MB,
+) -> list[str]:
+    """Return human-readable regressions of ``current`` against ``baseline``."""
+    regressions: list[str] = []
+    for mode in ("cold", "warm"):
+        base_mode = baseline.get(mode) or {}
+        cur_mode = current.get(mode) or {}
+        for stage, base_stats in (base_mode.get("stages") or {}).items():
+            cur_stats = (cur_mode.get("stages") or {}).get(stage)
+            if not cur_stats:
+                continue
+            for key in ("p50", "p95"):
+                before = float(base_stats.get(key, 0.0))
+                after = float(cur_stats.get(key, 0.0))
+                if after - before > min_delta_s and after > before * (1 + threshold):
+                    regressions.append(f"{mode} {stage} {key}: {before:.4f}s -> {after:.4f}s")
+        before_rss = float(base_mode.get("peak_rss_mb") or 0.0)
+        after_rss = float(cur_mode.get("peak_rss_mb") or 0.0)
+        if before_rss and after_rss - before_rss > min_rss_delta_mb and after_rss > before_rss * (1 + threshold):
+            regressions.append(f"{mode} peak_rss_mb: {before_rss:.1f} -> {after_rss:.1f}")
+    return regressions
+
+
+def _cold_child(name: str) -> int:
+    _quiet_logging()
+    payload = build_corpus()[name]
+    print(json.dumps(plan_with_timings(payload)))
+    return 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark Stage 1 plan generation over the fixed intake corpus.")
+    parser.add_argument("--output", type=Path, default=None, help="Write the results JSON here.")
+    parser.add_argument("--compare", type=Path, default=None, help="Baseline JSON to gate against.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed relative slowdown (0.25 = 25%%).")
+    parser.add_argument("--warm-iterations", type=int, default=5, help="Timed warm passes over the corpus.")
+    parser.add_argument("--cold-repeats", type=int, default=1, help="Fresh-process passes over the corpus.")
+    parser.add_argument("--skip-cold", action="store_true", help="Only run the warm benchmark.")
+    parser.add_argument("--scenario", action="append", default=None, help="Limit to these corpus scenarios.")
+    parser.add_argument("--cold-child", default=None, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.cold_child:
+        return _cold_child(args.cold_child)
+
+    _quiet_logging()
+    corpus = build_corpus()
+    if args.scenario:
+        unknown = sorted(set(args.scenario) - set(corpus))
+        if unknown:
+            print(f"unknown scenarios: {', '.join(unknown)}", file=sys.stderr)
+            return 2
+        corpus = {name: corpus[name] for name in args.scenario}
+
+    results: dict[str, Any] = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scenarios": list(corpus),
+            "warm_iterations": args.warm_iterations,
+            "cold_repeats": 0 if args.skip_cold else args.cold_repeats,
+        }
+    }
+    if not args.skip_cold:
+        results["cold"] = run_cold(corpus, repeats=args.cold_repeats)
+    results["warm"] = run_warm(corpus, iterations=args.warm_iterations)
+
+    rendered = json.dumps(results, indent=2)
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(rendered + "\n", encoding="utf-8")
+    else:
+        print(rendered)
+
+    if args.compare is None:
+        return 0
+    baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+    regressions = compare(results, baseline, threshold=args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    if regressions:
+        return 1
+    print(f"no regressions past {args.threshold:.0%} against {args.compare}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
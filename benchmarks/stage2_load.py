@@ -0,0 +1,145 @@
+"""Offline Stage 2 load test: concurrent generation jobs against the mock provider.
+
+Builds one real Stage 1 result for the sample intake, then runs ``--jobs``
+``run_generation_job`` calls at once against the in-memory test store, with
+every Stage 2 request going through the production provider path (process
+limiter, retries) into :class:`api.stage2_provider.MockStage2Provider`. The
+mock echoes the plan each prompt carries, waits ``--latency`` seconds and can
+answer every Nth request with a 429, so bursts, back-pressure and retry
+behaviour are measurable without network access or an API key.
+
+Usage::
+
+    python -m benchmarks.stage2_load
+    python -m benchmarks.stage2_load --jobs 64 --max-concurrency 8 --latency 0.5 --rate-limit-every 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+from api.generation_runtime import default_planner, run_generation_job
+from api.stage2_automation import OpenAIStage2Automator
+from api.stage2_provider import LimitedStage2Provider, MockStage2Provider, RetryPolicy, Stage2Limiter
+
+from .corpus import _support_module, build_corpus
+from .stage1 import percentile
+
+
+async def _run_jobs(
+    *,
+    jobs: int,
+    stage1_result: dict[str, Any],
+    provider: LimitedStage2Provider,
+) -> tuple[list[float], Counter]:
+    support = _support_module()
+    store = support.FakeStore()
+    athlete = support.AuthenticatedUser(user_id="load-athlete", email="load@example.com", full_name="Load Test", metadata={})
+    store.ensure_profile(athlete)
+    request_payload = support._build_request().model_dump(mode="json")
+    job_ids = [
+        store.create_or_get_generation_job(
+            athlete_id=athlete.user_id,
+            client_request_id=f"load-{index}",
+            source="stage2_load",
+            request_payload=request_payload,
+        )["id"]
+        for index in range(jobs)
+    ]
+    automator = OpenAIStage2Automator(client=None, model="mock", provider=provider)
+
+    async def _timed(job_id: str) -> float:
+        started = perf_counter()
+        await run_generation_job(
+            job_id=job_id,
+            store=store,
+            planner_fn=lambda _payload: copy.deepcopy(stage1_result),
+            stage2=automator,
+            active_tasks=set(),
+        )
+        return perf_counter() - started
+
+    durations = await asyncio.gather(*(_timed(job_id) for job_id in job_ids))
+    outcomes = Counter(
+        f"{job['status']}:{(job.get('final_result') or {}).get('stage2_status') or '-'}"
+        for job in (store.get_generation_job(job_id) for job_id in job_ids)
+    )
+    return list(durations), outcomes
+
+
+def run(
+    *,
+    jobs: int,
+    max_concurrency: int,
+    latency: float,
+    rate_limit_every: int,
+    retry_after: float,
+    tokens_per_minute: int = 0,
+) -> dict[str, Any]:
+    stage1_result = default_planner(build_corpus()["sample_intake"])
+    mock = MockStage2Provider(latency_seconds=latency, rate_limit_every=rate_limit_every, retry_after_seconds=retry_after)
+    limiter = Stage2Limiter(max_concurrency, tokens_per_minute)
+    provider = LimitedStage2Provider(mock, limiter=limiter, retry_policy=RetryPolicy(base_delay_seconds=0.05))
+
+    started = perf_counter()
+    durations, outcomes = asyncio.run(_run_jobs(jobs=jobs, stage1_result=stage1_result, provider=provider))
+    wall_seconds = perf_counter() - started
+    return {
+        "jobs": jobs,
+        "wall_s": round(wall_seconds, 3),
+        "jobs_per_s": round(jobs / wall_seconds, 3) if wall_seconds else 0.0,
+        "job_p50_s": round(percentile(durations, 50), 3),
+        "job_p95_s": round(percentile(durations, 95), 3),
+        "job_max_s": round(max(durations, default=0.0), 3),
+        "provider_requests": mock.requests,
+        "peak_in_flight": limiter.stats()["peak_active"],
+        "max_concurrency": max_concurrency,
+        "outcomes": dict(sorted(outcomes.items())),
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run concurrent generation jobs against the offline Stage 2 mock.")
+    parser.add_argument("--jobs", type=int, default=32, help="Generation jobs started at once.")
+    parser.add_argument("--max-concurrency", type=int, default=8, help="Stage 2 requests allowed in flight.")
+    parser.add_argument("--tokens-per-minute", type=int, default=0, help="Input token budget per minute (0 = off).")
+    parser.add_argument("--latency", type=float, default=0.25, help="Mock seconds per Stage 2 response.")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Mock a 429 on every Nth request.")
+    parser.add_argument("--retry-after", type=float, default=0.1, help="Retry-After seconds on mocked 429s.")
+    parser.add_argument("--output", type=Path, default=None, help="Write the results JSON here.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    results = run(
+        jobs=max(1, args.jobs),
+        max_concurrency=max(1, args.max_concurrency),
+        latency=args.latency,
+        rate_limit_every=args.rate_limit_every,
+        retry_after=args.retry_after,
+        tokens_per_minute=args.tokens_per_minute,
+    )
+    print(
+        f"jobs={results['jobs']} wall={results['wall_s']:.3f}s ({results['jobs_per_s']:.2f} jobs/s) "
+        f"p50={results['job_p50_s']:.3f}s p95={results['job_p95_s']:.3f}s max={results['job_max_s']:.3f}s "
+        f"requests={results['provider_requests']} peak_in_flight={results['peak_in_flight']}/{results['max_concurrency']}"
+    )
+    for outcome, count in results["outcomes"].items():
+        print(f"  {outcome}: {count}")
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    failed = sum(count for outcome, count in results["outcomes"].items() if outcome.startswith("failed"))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+"""Single-load registry for the JSON data banks.
+
+Every bank under ``data/`` that plan generation reads is declared once in
+``BANK_SPECS``: the files it is built from and the loader that parses and
+normalizes it. :data:`BANK_REGISTRY` loads each bank on first use, interns its
+tag strings, freezes list banks into :class:`FrozenRecord` items (with their
+tag-ID sets precomputed, see ``tagging.item_tag_ids``) and versions the result
+by the content hash of its source files, so every consumer (``strength``,
+``conditioning``, ``rehab_protocols``, bank tooling) shares one read-only copy
+per process.
+
+The module getters (``strength.get_exercise_bank`` and friends) keep a local
+reference to the registry items for speed. :meth:`BankRegistry.swap` replaces
+a set of banks in one assignment and then runs the ``on_swap`` callbacks those
+modules register, so derived caches (module references, conditioning views,
+the injury decision cache) are invalidated in one place. :meth:`refresh`
+reloads the banks whose files changed on disk (cheap ``stat`` first, content
+hash only for touched files) and swaps them in.
+
+Other ``data/*.json`` files (``tag_vocabulary.json``, ``regex_patterns.json``,
+``injury_exclusion_map.json``) are not banks: their contents are compiled into
+module-level patterns and tag IDs at import, or only written by tooling, so
+they cannot be swapped under running code. :meth:`refresh` logs a warning when
+one of them changes so the edit is not silently ignored until a restart.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import logging
+import sys
+from dataclasses import dataclass
+from threading import Lock, RLock
+from typing import Any, Callable, Iterable, Mapping
+
+from .bank_schema import freeze_bank
+from .config import DATA_DIR
+from .tagging import prime_item_tag_ids
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BankSpec:
+    name: str
+    sources: tuple[str, ...]
+    loader: str | Callable[[], Any]  # "module:function" is resolved lazily to avoid import cycles
+    freeze: bool = True
+
+
+@dataclass(frozen=True)
+class BankEntry:
+    name: str
+    items: Any
+    version: str
+
+
+BANK_SPECS: tuple[BankSpec, ...] = (
+    BankSpec(
+        "style_specific_exercises",
+        ("style_specific_exercises.json", "style_specific_exercises"),
+        "fightcamp.injury_filtering:_load_style_specific_exercises",
+    ),
+    BankSpec("exercise_bank", ("exercise_bank.json",), "fightcamp.strength:_load_exercise_bank"),
+    BankSpec(
+        "universal_gpp_strength",
+        ("universal_gpp_strength.json",),
+        "fightcamp.strength:_load_universal_strength",
+    ),
+    BankSpec(
+        "conditioning_bank",
+        ("conditioning_bank.json",),
+        "fightcamp.conditioning:_load_conditioning_bank",
+    ),
+    BankSpec(
+        "style_conditioning_bank",
+        ("style_conditioning_bank.json",),
+        "fightcamp.conditioning:_load_style_conditioning_bank",
+    ),
+    BankSpec(
+        "universal_gpp_conditioning",
+        ("universal_gpp_conditioning.json",),
+        "fightcamp.conditioning:_load_universal_conditioning",
+    ),
+    BankSpec(
+        "style_taper_conditioning",
+        ("style_taper_conditioning.json",),
+        "fightcamp.conditioning:_load_style_taper_conditioning",
+    ),
+    BankSpec(
+        "coordination_bank",
+        ("coordination_bank.json",),
+        "fightcamp.conditioning:_load_coordination_bank",
+    ),
+    BankSpec(
+        "format_energy_weights",
+        ("format_energy_weights.json",),
+        "fightcamp.conditioning:_load_format_weights",
+        freeze=False,
+    ),
+    BankSpec("rehab_bank", ("rehab_bank.json",), "fightcamp.rehab_protocols:_load_rehab_bank", freeze=False),
+    BankSpec(
+        "bank_inferred_tags",
+        ("bank_inferred_tags.json",),
+        "fightcamp.injury_filtering:_load_inferred_tag_table",
+        freeze=False,
+    ),
+)
+
+
+def _intern_tags(items: Any) -> None:
+    if not isinstance(items, list):
+        return
+    for item in items:
+        if isinstance(item, dict) and isinstance(item.get("tags"), list):
+            item["tags"] = [sys.intern(tag) if isinstance(tag, str) else tag for tag in item["tags"]]
+
+
+class BankRegistry:
+    """Loads each registered bank once and hands out the shared items."""
+
+    def __init__(self, specs: Iterable[BankSpec] = BANK_SPECS, *, data_dir=DATA_DIR):
+        self._specs = {spec.name: spec for spec in specs}
+        self._data_dir = data_dir
+        # Replaced wholesale (never mutated) so lock-free readers always see a
+        # consistent mapping.
+        self._entries: dict[str, BankEntry] = {}
+        self._callbacks: dict[str, Callable[[frozenset[str]], None]] = {}
+        # (mtime, size) of each loaded bank's sources, so polling only hashes
+        # files that were touched.
+        self._stamps: dict[str, tuple] = {}
+        self._lock = RLock()
+        self._refresh_lock = Lock()
+        self.generation = 0
+        self._unwatched: dict[str, tuple] = self._unwatched_stamps({})
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        return tuple(self._specs)
+
+    def source_version(self, name: str) -> str:
+        """Content hash of the files ``name`` is built from."""
+        digest = hashlib.sha256()
+        for source in self._specs[name].sources:
+            path = self._data_dir / source
+            digest.update(source.encode() + b"\0")
+            if path.is_file():
+                digest.update(path.read_bytes())
+            else:
+                digest.update(b"<missing>")
+        return digest.hexdigest()[:16]
+
+    def _source_stamp(self, name: str) -> tuple:
+        stamp = []
+        for source in self._specs[name].sources:
+            try:
+                stat = (self._data_dir / source).stat()
+            except OSError:
+                stamp.append((source, None, None))
+            else:
+                stamp.append((source, stat.st_mtime_ns, stat.st_size))
+        return tuple(stamp)
+
+    def _unwatched_stamps(self, previous: Mapping[str, tuple]) -> dict[str, tuple]:
+        """``(mtime, size, content hash)`` of the ``data/*.json`` files no bank is built from."""
+        watched = {source for spec in self._specs.values() for source in spec.sources}
+        stamps = {}
+        for path in sorted(self._data_dir.glob("*.json")):
+            if path.name in watched:
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            known = previous.get(path.name)
+            if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+                stamps[path.name] = known
+                continue
+            try:
+                digest = hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+            except OSError:
+                continue
+            stamps[path.name] = (stat.st_mtime_ns, stat.st_size, digest)
+        return stamps
+
+    def unwatched_changes(self) -> list[str]:
+        """``data/*.json`` files outside the registry whose content changed since the last check."""
+        previous = self._unwatched
+        self._unwatched = current = self._unwatched_stamps(previous)
+        return sorted(
+            name
+            for name in previous.keys() | current.keys()
+            if previous.get(name, ())[2:] != current.get(name, ())[2:]
+        )
+
+    def load(self, name: str) -> BankEntry:
+        """Build a fresh entry for ``name`` without installing it."""
+        spec = self._specs[name]
+        if callable(spec.loader):
+            loader = spec.loader
+        else:
+            module_name, _, function_name = spec.loader.partition(":")
+            loader = getattr(importlib.import_module(module_name), function_name)
+        version = self.source_version(name)
+        items = loader()
+        _intern_tags(items)
+        if spec.freeze:
+            items = freeze_bank(items)
+            prime_item_tag_ids(items)
+        return BankEntry(name=name, items=items, version=version)
+
+    def load_all(self, names: Iterable[str] | None = None) -> dict[str, BankEntry]:
+        return {name: self.load(name) for name in (names or self.names)}
+
+    def entry(self, name: str) -> BankEntry:
+        entry = self._entries.get(name)
+        if entry is not None:
+            return entry
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                stamp = self._source_stamp(name)
+                entry = self.load(name)
+                self._entries = {**self._entries, name: entry}
+                self._stamps[name] = stamp
+                logger.debug("[bank-registry] loaded bank=%s version=%s", name, entry.version)
+        return entry
+
+    def get(self, name: str) -> Any:
+        return self.entry(name).items
+
+    def versions(self) -> dict[str, str]:
+        return {name: entry.version for name, entry in self._entries.items()}
+
+    def is_loaded(self, name: str | None = None) -> bool:
+        return bool(self._entries) if name is None else name in self._entries
+
+    def on_swap(self, key: str, callback: Callable[[frozenset[str]], None]) -> None:
+        """Run ``callback(swapped_names)`` after every swap; ``key`` dedupes re-registration."""
+        with self._lock:
+            self._callbacks[key] = callback
+
+    def swap(self, entries: Mapping[str, BankEntry]) -> int:
+        """Atomically install ``entries`` and invalidate derived caches."""
+        unknown = set(entries) - set(self._specs)
+        if unknown:
+            raise KeyError(f"unknown banks: {sorted(unknown)}")
+        with self._lock:
+            self._entries = {**self._entries, **entries}
+            self.generation += 1
+            swapped = frozenset(entries)
+            for callback in list(self._callbacks.values()):
+                callback(swapped)
+            generation = self.generation
+        logger.info("[bank-registry] swapped banks=%s generation=%d", ",".join(sorted(swapped)), generation)
+        return generation
+
+    def reload(self, names: Iterable[str] | None = None) -> int:
+        """Rebuild ``names`` (default: all) from disk and swap them in."""
+        return self.swap(self.load_all(names))
+
+    def changed_banks(self) -> list[str]:
+        """Loaded banks whose source files no longer match their version."""
+        changed = []
+        for name, entry in self._entries.items():
+            stamp = self._source_stamp(name)
+            if stamp == self._stamps.get(name):
+                continue
+            if self.source_version(name) != entry.version:
+                changed.append(name)
+            else:
+                self._stamps[name] = stamp
+        return sorted(changed)
+
+    def refresh(self, *, force: bool = False) -> list[str]:
+        """Reload the changed banks (every loaded bank with ``force``).
+
+        The new banks are fully built before the swap, so readers see either
+        the old or the new set. A bank that fails to load keeps serving the
+        previous version.
+        """
+        with self._refresh_lock:
+            unwatched = self.unwatched_changes()
+            if unwatched:
+                logger.warning(
+                    "[bank-registry] not_reloadable files=%s changed; restart the process to apply them",
+                    ",".join(unwatched),
+                )
+            names = sorted(self._entries) if force else self.changed_banks()
+            if not names:
+                return []
+            stamps = {name: self._source_stamp(name) for name in names}
+            try:
+                entries = self.load_all(names)
+            except Exception:
+                logger.exception("[bank-registry] reload_failed banks=%s", ",".join(names))
+                return []
+            self.swap(entries)
+            self._stamps.update(stamps)
+            return names
+
+
+BANK_REGISTRY = BankRegistry()
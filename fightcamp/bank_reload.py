@@ -0,0 +1,68 @@
+"""Background polling that hot-reloads edited data banks.
+
+Set ``UNLXCK_BANK_RELOAD_INTERVAL_SECONDS`` (default ``0``, off) to have each
+API and generation-worker process check ``data/`` on that interval. A tick
+costs one ``stat`` per bank file; only touched files are content-hashed, and
+only banks whose hash changed are rebuilt and swapped in through
+:func:`reload_plan_banks`.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from typing import Callable
+
+from .plan_pipeline_runtime import reload_plan_banks
+
+logger = logging.getLogger(__name__)
+
+BANK_RELOAD_INTERVAL_ENV = "UNLXCK_BANK_RELOAD_INTERVAL_SECONDS"
+
+
+def bank_reload_interval() -> float:
+    raw_value = os.environ.get(BANK_RELOAD_INTERVAL_ENV, "").strip()
+    if not raw_value:
+        return 0.0
+    try:
+        return max(0.0, float(raw_value))
+    except ValueError:
+        logger.warning("[bank-reload] invalid %s=%r; polling disabled", BANK_RELOAD_INTERVAL_ENV, raw_value)
+        return 0.0
+
+
+class BankReloadWatcher:
+    """Calls ``reload`` every ``interval`` seconds on a daemon thread."""
+
+    def __init__(self, interval: float, *, reload: Callable[[], list[str]] | None = None):
+        self.interval = interval
+        self._reload = reload or (lambda: reload_plan_banks(logger=logger))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="bank-reload", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self._reload()
+            except Exception:
+                logger.exception("[bank-reload] poll_failed")
+
+
+def start_bank_reload_watcher(interval: float | None = None) -> BankReloadWatcher | None:
+    """Start polling when configured; returns ``None`` when polling is off."""
+    interval = bank_reload_interval() if interval is None else interval
+    if interval <= 0:
+        return None
+    watcher = BankReloadWatcher(interval)
+    watcher.start()
+    logger.info("[bank-reload] watching data banks interval_seconds=%s", interval)
+    return watcher
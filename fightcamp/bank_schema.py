@@ -1,3 +1,4 @@
+import copy
 import logging
 
 from .phases import PHASE_VALUES
@@ -79,3 +80,56 @@ def validate_training_item(
             raise ValueError(f"Missing required 'system' for '{name}' in {source}.")
 
     return item
+
+
+class FrozenRecord(dict):
+    """A shared bank item that refuses in-place mutation.
+
+    Banks are loaded once per process and shared by every request, thread and
+    forked worker, so per-request decoration must go through ``copy()`` or
+    ``overlay()``, both of which return a plain mutable dict. Values derived
+    from the record alone (resolved tags, movement pattern) are memoized with
+    ``derived()`` instead of being written back into the item.
+    """
+
+    __slots__ = ("_derived",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._derived: dict = {}
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(f"bank record {self.get('name', '<unnamed>')!r} is read-only; copy() it first")
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = __ior__ = _read_only
+
+    def copy(self) -> dict:
+        return dict(self)
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo) -> dict:
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+        return (FrozenRecord, (dict(self),))
+
+    def overlay(self, **fields) -> dict:
+        """Return a mutable copy with ``fields`` applied on top."""
+        decorated = dict(self)
+        decorated.update(fields)
+        return decorated
+
+    def derived(self, key: str, factory):
+        """Return ``factory(self)`` memoized on the record under ``key``."""
+        try:
+            return self._derived[key]
+        except KeyError:
+            value = self._derived[key] = factory(self)
+            return value
+
+
+def freeze_bank(items: list[dict]) -> list[FrozenRecord]:
+    """Freeze every item of a loaded (validated, tag-normalized) bank list."""
+    return [item if isinstance(item, FrozenRecord) else FrozenRecord(item) for item in items]
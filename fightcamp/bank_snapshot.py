@@ -0,0 +1,213 @@
+"""Pre-normalized bank snapshot for fast worker cold starts.
+
+``tools/build_bank_snapshot.py`` loads every bank in the bank registry through
+its normal loader (JSON parse, validation, tag normalization, freezing) plus
+the conditioning views, interns the strings and writes the result as a
+pickle-protocol-5 blob at ``data/banks.snapshot``. ``prime_plan_banks`` then
+swaps the whole set into the registry from one ``pickle.load`` instead of
+re-parsing and re-normalizing the JSON.
+
+The file holds two consecutive pickles: a small header (format version and the
+content hash of the bank JSON plus loader sources) and the bank payload. The
+header is checked before the payload is read, so a stale or foreign snapshot
+costs one hash of ``data/`` and falls back to the JSON loaders.
+
+``UNLXCK_BANK_SNAPSHOT`` overrides the snapshot path; ``0`` disables it.
+
+The snapshot is a trusted build artifact produced next to the code it is
+loaded by; never point ``UNLXCK_BANK_SNAPSHOT`` at a file from elsewhere.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import logging
+import os
+import pickle
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from . import conditioning
+from .bank_registry import BANK_REGISTRY
+from .bank_schema import FrozenRecord
+from .config import DATA_DIR
+from .tagging import prime_item_tag_ids
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_PATH_ENV = "UNLXCK_BANK_SNAPSHOT"
+DEFAULT_SNAPSHOT_PATH = DATA_DIR / "banks.snapshot"
+SNAPSHOT_SUFFIX = ".snapshot"
+
+# Modules whose code shapes the snapshot payload; editing any of them
+# invalidates an existing snapshot just like editing the bank JSON does.
+_LOADER_SOURCES = (
+    "bank_registry.py",
+    "bank_schema.py",
+    "bank_snapshot.py",
+    "conditioning.py",
+    "conditioning_boxing.py",
+    "injury_filtering.py",
+    "rehab_protocols.py",
+    "strength.py",
+    "tagging.py",
+)
+
+_CONDITIONING_VIEWS = "conditioning_views"
+
+
+def snapshot_path() -> Path | None:
+    raw_value = os.environ.get(SNAPSHOT_PATH_ENV, "").strip()
+    if not raw_value:
+        return DEFAULT_SNAPSHOT_PATH
+    if raw_value == "0":
+        return None
+    return Path(raw_value)
+
+
+def bank_source_hash(data_dir: Path = DATA_DIR) -> str:
+    """Content hash of every data file and loader module behind the snapshot."""
+    digest = hashlib.sha256(f"format={SNAPSHOT_FORMAT_VERSION}\0".encode())
+    data_files = sorted(
+        path for path in data_dir.rglob("*") if path.is_file() and not path.name.endswith(SNAPSHOT_SUFFIX)
+    )
+    for path in data_files:
+        digest.update(path.relative_to(data_dir).as_posix().encode() + b"\0")
+        digest.update(path.read_bytes())
+    package_dir = Path(__file__).resolve().parent
+    for name in _LOADER_SOURCES:
+        digest.update(name.encode() + b"\0")
+        digest.update((package_dir / name).read_bytes())
+    return digest.hexdigest()
+
+
+def _intern_strings(value: Any, memo: dict[int, Any]) -> Any:
+    """Rebuild ``value`` with interned strings, keeping shared objects shared."""
+    if isinstance(value, str):
+        return sys.intern(value)
+    cached = memo.get(id(value))
+    if cached is not None:
+        return cached
+    if isinstance(value, FrozenRecord):
+        result: Any = FrozenRecord(
+            {_intern_strings(key, memo): _intern_strings(item, memo) for key, item in value.items()}
+        )
+    elif isinstance(value, dict):
+        result = {_intern_strings(key, memo): _intern_strings(item, memo) for key, item in value.items()}
+    elif isinstance(value, list):
+        result = [_intern_strings(item, memo) for item in value]
+    elif isinstance(value, tuple):
+        result = tuple(_intern_strings(item, memo) for item in value)
+    elif isinstance(value, frozenset):
+        result = frozenset(_intern_strings(item, memo) for item in value)
+    elif isinstance(value, set):
+        result = {_intern_strings(item, memo) for item in value}
+    elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+        result = type(value)(
+            **{field.name: _intern_strings(getattr(value, field.name), memo) for field in dataclasses.fields(value)}
+        )
+    else:
+        return value
+    memo[id(value)] = result
+    return result
+
+
+def collect_snapshot_banks() -> dict[str, Any]:
+    """Collect every registry bank entry and the conditioning views built from them."""
+    banks: dict[str, Any] = {name: BANK_REGISTRY.entry(name) for name in BANK_REGISTRY.names}
+    conditioning.prime_conditioning_views()
+    banks[_CONDITIONING_VIEWS] = dict(conditioning._conditioning_view_cache)
+    # ``memo`` is keyed by id(), so the source objects must stay alive (they do:
+    # ``banks`` holds them) until interning finishes.
+    memo: dict[int, Any] = {}
+    return {name: _intern_strings(value, memo) for name, value in banks.items()}
+
+
+def build_snapshot(path: Path | None = None, *, source_hash: str | None = None) -> dict[str, Any]:
+    """Write a fresh snapshot atomically and return its header."""
+    path = path or DEFAULT_SNAPSHOT_PATH
+    banks = collect_snapshot_banks()
+    header = {
+        "format": SNAPSHOT_FORMAT_VERSION,
+        "source_hash": source_hash or bank_source_hash(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "banks": sorted(banks),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("wb") as fh:
+            pickle.dump(header, fh, protocol=5)
+            pickle.dump(banks, fh, protocol=5)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return header
+
+
+def read_snapshot_header(path: Path) -> dict[str, Any] | None:
+    try:
+        with path.open("rb") as fh:
+            header = pickle.load(fh)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError, TypeError):
+        logger.warning("[bank-snapshot] unreadable path=%s", path)
+        return None
+    return header if isinstance(header, dict) else None
+
+
+def load_bank_snapshot(path: Path | None = None, *, source_hash: str | None = None) -> dict[str, Any] | None:
+    """Return the snapshot payload, or ``None`` when missing, stale or corrupt."""
+    path = path or snapshot_path()
+    if path is None or not path.exists():
+        return None
+    try:
+        with path.open("rb") as fh:
+            header = pickle.load(fh)
+            if not isinstance(header, dict) or header.get("format") != SNAPSHOT_FORMAT_VERSION:
+                logger.warning("[bank-snapshot] stale path=%s reason=format", path)
+                return None
+            if header.get("source_hash") != (source_hash or bank_source_hash()):
+                logger.warning("[bank-snapshot] stale path=%s reason=source_hash", path)
+                return None
+            banks = pickle.load(fh)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError, TypeError):
+        logger.warning("[bank-snapshot] unreadable path=%s", path, exc_info=True)
+        return None
+    expected = set(BANK_REGISTRY.names) | {_CONDITIONING_VIEWS}
+    if not isinstance(banks, dict) or set(banks) != expected:
+        logger.warning("[bank-snapshot] stale path=%s reason=banks", path)
+        return None
+    return banks
+
+
+def install_bank_snapshot(banks: dict[str, Any]) -> None:
+    """Swap a loaded snapshot payload into the bank registry."""
+    entries = {name: entry for name, entry in banks.items() if name != _CONDITIONING_VIEWS}
+    BANK_REGISTRY.swap(entries)
+    # Record tag IDs are memoized on the records and not pickled.
+    for entry in entries.values():
+        if isinstance(entry.items, list):
+            prime_item_tag_ids(entry.items)
+    # The swap cleared the conditioning views; reuse the prebuilt ones.
+    conditioning._conditioning_view_cache.update(banks[_CONDITIONING_VIEWS])
+
+
+def prime_from_snapshot(path: Path | None = None) -> bool:
+    """Install the snapshot when it is fresh; ``False`` means use the JSON loaders.
+
+    Only a cold process is primed from the snapshot; once any bank is loaded
+    the registry already holds current data.
+    """
+    if BANK_REGISTRY.is_loaded():
+        return False
+    banks = load_bank_snapshot(path)
+    if banks is None:
+        return False
+    install_bank_snapshot(banks)
+    return True
@@ -0,0 +1,333 @@
+"""Batch planning for whole cohorts (fight cards, nightly regression sweeps).
+
+Reads a JSONL file of planner payloads, dedupes identical intakes by content
+hash, primes the plan banks once and fans the unique intakes out across a
+process pool. Results stream back as JSONL records carrying the per-stage
+timings from :func:`fightcamp.main.generate_plan_sync`.
+
+The output file doubles as the checkpoint: every record is flushed as soon as
+its plan finishes, and ``--resume`` skips intakes whose hash already has an
+``ok`` record in the output.
+
+The admin batch endpoint uses :class:`PlanningPool` instead: one shared
+``spawn`` pool per API process, streamed from asynchronously.
+
+Usage::
+
+    python -m fightcamp.batch intakes.jsonl --output results.jsonl --workers 4
+    python -m fightcamp.batch intakes.jsonl --output results.jsonl --resume
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, TextIO
+
+from .logging_utils import configure_logging
+from .main import generate_plan_sync
+from .normalization import stable_payload_hash
+from .plan_pipeline import prime_plan_banks
+from .process_pool import SharedProcessPool, default_pool_workers
+
+logger = logging.getLogger(__name__)
+
+Planner = Callable[[dict[str, Any]], dict[str, Any]]
+
+BATCH_RECORD_OK = "ok"
+BATCH_RECORD_ERROR = "error"
+
+
+@dataclass
+class BatchIntake:
+    """One unique intake plus every source position that submitted it."""
+
+    intake_hash: str
+    payload: dict[str, Any]
+    sources: list[int] = field(default_factory=list)
+
+
+def intake_hash(payload: dict[str, Any]) -> str:
+    """Return a stable content hash for a planner payload."""
+    return stable_payload_hash(payload)
+
+
+def read_intake_lines(lines: Iterable[str]) -> list[tuple[int, dict[str, Any]]]:
+    """Parse JSONL intake lines, returning ``(line_number, payload)`` pairs.
+
+    Blank lines are skipped; anything that is not a JSON object raises
+    ``ValueError`` naming the offending line.
+    """
+    entries: list[tuple[int, dict[str, Any]]] = []
+    for line_number, raw_line in enumerate(lines, start=1):
+        line = raw_line.strip()
+        if not line:
+            continue
+        try:
+            payload = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"line {line_number}: invalid JSON ({exc.msg})") from exc
+        if not isinstance(payload, dict):
+            raise ValueError(f"line {line_number}: expected a JSON object")
+        entries.append((line_number, payload))
+    return entries
+
+
+def dedupe_intakes(entries: Iterable[tuple[int, dict[str, Any]]]) -> list[BatchIntake]:
+    """Collapse identical payloads, keeping first-seen order."""
+    unique: dict[str, BatchIntake] = {}
+    for source, payload in entries:
+        digest = intake_hash(payload)
+        intake = unique.get(digest)
+        if intake is None:
+            intake = unique[digest] = BatchIntake(intake_hash=digest, payload=payload)
+        intake.sources.append(source)
+    return list(unique.values())
+
+
+def read_checkpoint(lines: Iterable[str]) -> set[str]:
+    """Return intake hashes that already have an ``ok`` record.
+
+    Unparseable lines (e.g. a record truncated by a crash) are ignored so the
+    intake is simply planned again.
+    """
+    completed: set[str] = set()
+    for raw_line in lines:
+        line = raw_line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(record, dict) and record.get("status") == BATCH_RECORD_OK and record.get("intake_hash"):
+            completed.add(str(record["intake_hash"]))
+    return completed
+
+
+def plan_intake(payload: dict[str, Any], *, planner: Planner | None = None) -> dict[str, Any]:
+    """Plan one intake and return ``{status, timings, elapsed_s, result|error}``.
+
+    Without a custom ``planner`` the Stage 1 pipeline runs directly so the
+    per-stage timings are captured; a custom planner only reports its total.
+    """
+    timings: dict[str, float] = {}
+    started = perf_counter()
+    try:
+        if planner is None:
+            result = generate_plan_sync(payload, generate_pdf=False, timings=timings)
+        else:
+            result = planner(payload)
+    except Exception as exc:
+        logger.exception("[batch] plan_failed")
+        return {
+            "status": BATCH_RECORD_ERROR,
+            "error": f"{type(exc).__name__}: {exc}",
+            "timings": _rounded_timings(timings),
+            "elapsed_s": round(perf_counter() - started, 4),
+        }
+    return {
+        "status": BATCH_RECORD_OK,
+        "plan_status": result.get("status") if isinstance(result, dict) else None,
+        "timings": _rounded_timings(timings),
+        "elapsed_s": round(perf_counter() - started, 4),
+        "result": result,
+    }
+
+
+def _rounded_timings(timings: dict[str, float]) -> dict[str, float]:
+    return {label: round(value, 4) for label, value in timings.items()}
+
+
+def _batch_record(intake: BatchIntake, outcome: dict[str, Any]) -> dict[str, Any]:
+    return {"intake_hash": intake.intake_hash, "sources": list(intake.sources), **outcome}
+
+
+def _init_batch_worker() -> None:
+    configure_logging()
+    prime_plan_banks(logger=logger)
+
+
+def _plan_intake_in_worker(payload: dict[str, Any]) -> dict[str, Any]:
+    return plan_intake(payload)
+
+
+def run_batch(
+    intakes: Iterable[BatchIntake],
+    *,
+    workers: int = 0,
+    completed: set[str] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Plan every intake not in ``completed`` and yield one record per intake.
+
+    ``workers <= 1`` plans in-process, in input order. Larger values fan out
+    across a process pool whose workers prime the banks once at start-up;
+    records are then yielded in completion order.
+    """
+    completed = completed or set()
+    intakes = list(intakes)
+    pending = [intake for intake in intakes if intake.intake_hash not in completed]
+    logger.info(
+        "[batch] start unique=%d pending=%d resumed=%d workers=%d",
+        len(intakes),
+        len(pending),
+        len(intakes) - len(pending),
+        workers,
+    )
+    if not pending:
+        return
+
+    prime_plan_banks(logger=logger)
+    if workers <= 1:
+        for intake in pending:
+            yield _batch_record(intake, plan_intake(intake.payload))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker) as executor:
+        futures = {executor.submit(_plan_intake_in_worker, intake.payload): intake for intake in pending}
+        for future in as_completed(futures):
+            intake = futures[future]
+            try:
+                outcome = future.result()
+            except Exception as exc:
+                # A worker crash (e.g. BrokenProcessPool) lands here; record it
+                # so --resume retries the intake instead of silently dropping it.
+                outcome = _crash_outcome(exc)
+            yield _batch_record(intake, outcome)
+
+
+def _crash_outcome(exc: BaseException) -> dict[str, Any]:
+    return {"status": BATCH_RECORD_ERROR, "error": f"{type(exc).__name__}: {exc}", "timings": {}}
+
+
+def default_batch_workers() -> int:
+    """``UNLXCK_ADMIN_BATCH_WORKERS``, defaulting to up to 4 CPUs."""
+    return default_pool_workers("UNLXCK_ADMIN_BATCH_WORKERS")
+
+
+class PlanningPool(SharedProcessPool):
+    """Shared ``spawn`` pool for the admin batch endpoint.
+
+    Workers prime the banks once when they start and are reused by later
+    batches; a pool broken by a dead worker is replaced on the next submit.
+    """
+
+    def __init__(self, workers: int):
+        super().__init__(workers, initializer=_init_batch_worker)
+
+    def _submit(self, payload: dict[str, Any]) -> asyncio.Future:
+        executor = self.executor()
+        try:
+            return asyncio.wrap_future(executor.submit(_plan_intake_in_worker, payload))
+        except BrokenProcessPool:
+            logger.warning("[batch] process pool broken; starting a new one")
+            self.discard(executor)
+            return asyncio.wrap_future(self.executor().submit(_plan_intake_in_worker, payload))
+
+    async def stream(self, intakes: Iterable[BatchIntake]) -> AsyncIterator[dict[str, Any]]:
+        """Yield one record per intake in completion order, ``2 * workers`` in flight at most."""
+        queue = iter(intakes)
+        in_flight: dict[asyncio.Future, BatchIntake] = {}
+        try:
+            while True:
+                while len(in_flight) < 2 * max(self.workers, 1):
+                    intake = next(queue, None)
+                    if intake is None:
+                        break
+                    in_flight[self._submit(intake.payload)] = intake
+                if not in_flight:
+                    return
+                done, _pending = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    intake = in_flight.pop(future)
+                    try:
+                        outcome = future.result()
+                    except Exception as exc:
+                        outcome = _crash_outcome(exc)
+                    yield _batch_record(intake, outcome)
+        finally:
+            # A client that disconnects mid-stream should not leave queued plans behind.
+            for future in in_flight:
+                future.cancel()
+
+
+def write_records(records: Iterable[dict[str, Any]], stream: TextIO) -> dict[str, int]:
+    """Write records as JSONL, flushing each line so the file stays resumable."""
+    counts = {BATCH_RECORD_OK: 0, BATCH_RECORD_ERROR: 0}
+    for record in records:
+        stream.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        stream.flush()
+        status = record.get("status")
+        counts[status] = counts.get(status, 0) + 1
+    return counts
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate plans for a JSONL file of intakes.")
+    parser.add_argument("input", type=Path, help="JSONL file with one planner payload per line.")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="JSONL results file (also the resume checkpoint). Defaults to stdout.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Process pool size. Use 1 to plan in-process.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip intakes that already have an ok record in --output and append new records.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    configure_logging()
+    if args.resume and args.output is None:
+        print("--resume requires --output", file=sys.stderr)
+        return 2
+
+    try:
+        with args.input.open("r", encoding="utf-8") as handle:
+            intakes = dedupe_intakes(read_intake_lines(handle))
+    except ValueError as exc:
+        print(f"{args.input}: {exc}", file=sys.stderr)
+        return 2
+
+    completed: set[str] = set()
+    if args.resume and args.output.exists():
+        with args.output.open("r", encoding="utf-8") as handle:
+            completed = read_checkpoint(handle)
+
+    records = run_batch(intakes, workers=args.workers, completed=completed)
+    if args.output is None:
+        counts = write_records(records, sys.stdout)
+    else:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with args.output.open("a" if args.resume else "w", encoding="utf-8") as handle:
+            counts = write_records(records, handle)
+
+    print(
+        f"unique={len(intakes)} resumed={len(completed & {i.intake_hash for i in intakes})} "
+        f"ok={counts.get(BATCH_RECORD_OK, 0)} error={counts.get(BATCH_RECORD_ERROR, 0)}",
+        file=sys.stderr,
+    )
+    return 1 if counts.get(BATCH_RECORD_ERROR) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
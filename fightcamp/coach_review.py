@@ -4,7 +4,7 @@ import logging
 from typing import Iterable
 
 from .conditioning import is_banned_drill, normalize_system, render_conditioning_block
-from .injury_filtering import injury_match_details
+from .injury_filtering import injury_match_details, with_ensured_tags
 from .injury_guard import choose_injury_replacement, injury_decision
 from .rehab_protocols import build_coach_review_entries
 from .strength import format_strength_block, is_banned_exercise
@@ -26,7 +26,7 @@ def _injury_log_details(
     *,
     fields: Iterable[str],
     region: str | None,
-) -> tuple[list[str], list[str], list[str]]:
+) -> tuple[Iterable[str], Iterable[str], Iterable[str]]:
     matches = injury_match_details(item, injuries, fields=fields, risk_levels=("exclude", "flag"))
     match = None
     if region:
@@ -286,6 +286,7 @@ def run_coach_review(
                 excluded_item=ex,
             )
             if replacement:
+                replacement = with_ensured_tags(replacement)
                 used_names.add(replacement.get("name"))
                 updated_exercises.append(replacement)
                 substitutions.append(
@@ -375,6 +376,7 @@ def run_coach_review(
                     excluded_item=drill,
                 )
                 if replacement:
+                    replacement = with_ensured_tags(replacement)
                     used_names.add(replacement.get("name"))
                     drills[idx] = replacement
                     substitutions.append(
@@ -7,17 +7,19 @@ from pathlib import Path
 import re
 from typing import Callable, Iterable
 from collections import defaultdict
+from dataclasses import dataclass
 from .training_context import (
     allocate_sessions,
     normalize_equipment_list,
     calculate_exercise_numbers,
 )
-from .bank_schema import KNOWN_SYSTEMS, SYSTEM_ALIASES, validate_training_item
-from .injury_filtering import injury_match_details, _log_exclusion, _log_replacement
+from .bank_registry import BANK_REGISTRY
+from .bank_schema import KNOWN_SYSTEMS, SYSTEM_ALIASES, FrozenRecord, validate_training_item
+from .injury_filtering import injury_match_details, _log_exclusion, _log_replacement, with_ensured_tags
 from .injury_guard import Decision, choose_injury_replacement, injury_decision, make_guarded_decision_factory
 from .restriction_filtering import evaluate_restriction_impact
 from .diagnostics import format_missing_system_block
-from .tagging import normalize_item_tags, normalize_tags
+from .tagging import normalize_item_tags, normalize_tags, normalized_tag_tuple
 from .tag_maps import GOAL_TAG_MAP, STYLE_TAG_MAP, WEAKNESS_TAG_MAP
 from .config import (
     PHASE_SYSTEM_RATIOS,
@@ -222,6 +224,60 @@ def _load_bank(path: Path, *, source: str, enforce_conditioning_systems: bool =
     return bank
 
 
+def _load_conditioning_bank():
+    return _load_bank(
+        DATA_DIR / "conditioning_bank.json",
+        source="conditioning_bank.json",
+        enforce_conditioning_systems=True,
+    )
+
+
+def _load_style_conditioning_bank():
+    return _load_bank(
+        DATA_DIR / "style_conditioning_bank.json",
+        source="style_conditioning_bank.json",
+        enforce_conditioning_systems=True,
+    )
+
+
+def _load_optional_conditioning_bank(filename: str) -> list[dict]:
+    try:
+        return _load_bank(DATA_DIR / filename, source=filename, enforce_conditioning_systems=True)
+    except Exception:
+        return []
+
+
+def _load_universal_conditioning() -> list[dict]:
+    return _load_optional_conditioning_bank("universal_gpp_conditioning.json")
+
+
+def _load_style_taper_conditioning() -> list[dict]:
+    return _load_optional_conditioning_bank("style_taper_conditioning.json")
+
+
+def _load_format_weights() -> dict:
+    return json.loads((DATA_DIR / "format_energy_weights.json").read_text(encoding="utf-8"))
+
+
+def _load_coordination_bank() -> list[dict]:
+    try:
+        coord_data = _load_bank(DATA_DIR / "coordination_bank.json", source="coordination_bank.json")
+    except FileNotFoundError:
+        logger.warning("[bank-load] optional coordination bank missing")
+        coord_data = []
+    except (json.JSONDecodeError, ValueError):
+        logger.exception("[bank-load-failed] bank=coordination_bank.json")
+        coord_data = []
+    loaded_coordination_bank: list[dict] = []
+    if isinstance(coord_data, list):
+        loaded_coordination_bank.extend(coord_data)
+    elif isinstance(coord_data, dict):
+        for val in coord_data.values():
+            if isinstance(val, list):
+                loaded_coordination_bank.extend(val)
+    return loaded_coordination_bank
+
+
 _conditioning_bank_cache = None
 _style_conditioning_bank_cache = None
 _format_weights_cache = None
@@ -232,31 +288,21 @@ coordination_bank = None
 def get_conditioning_bank():
     global _conditioning_bank_cache
     if _conditioning_bank_cache is None:
-        _conditioning_bank_cache = _load_bank(
-            DATA_DIR / "conditioning_bank.json",
-            source="conditioning_bank.json",
-            enforce_conditioning_systems=True,
-        )
+        _conditioning_bank_cache = BANK_REGISTRY.get("conditioning_bank")
     return _conditioning_bank_cache
 
 
 def get_style_conditioning_bank():
     global _style_conditioning_bank_cache
     if _style_conditioning_bank_cache is None:
-        _style_conditioning_bank_cache = _load_bank(
-            DATA_DIR / "style_conditioning_bank.json",
-            source="style_conditioning_bank.json",
-            enforce_conditioning_systems=True,
-        )
+        _style_conditioning_bank_cache = BANK_REGISTRY.get("style_conditioning_bank")
     return _style_conditioning_bank_cache
 
 
 def get_format_weights():
     global _format_weights_cache
     if _format_weights_cache is None:
-        _format_weights_cache = json.loads(
-            (DATA_DIR / "format_energy_weights.json").read_text(encoding="utf-8")
-        )
+        _format_weights_cache = BANK_REGISTRY.get("format_energy_weights")
     return _format_weights_cache
 
 
@@ -264,26 +310,9 @@ def get_coordination_bank():
     global _coordination_bank_cache, coordination_bank
     if coordination_bank is not None:
         return coordination_bank
-    if _coordination_bank_cache is not None:
-        coordination_bank = _coordination_bank_cache
-        return _coordination_bank_cache
-    try:
-        coord_data = _load_bank(DATA_DIR / "coordination_bank.json", source="coordination_bank.json")
-    except FileNotFoundError:
-        logger.warning("[bank-load] optional coordination bank missing")
-        coord_data = []
-    except (json.JSONDecodeError, ValueError):
-        logger.exception("[bank-load-failed] bank=coordination_bank.json")
-        coord_data = []
-    loaded_coordination_bank: list[dict] = []
-    if isinstance(coord_data, list):
-        loaded_coordination_bank.extend(coord_data)
-    elif isinstance(coord_data, dict):
-        for val in coord_data.values():
-            if isinstance(val, list):
-                loaded_coordination_bank.extend(val)
-    _coordination_bank_cache = loaded_coordination_bank
-    coordination_bank = loaded_coordination_bank
+    if _coordination_bank_cache is None:
+        _coordination_bank_cache = BANK_REGISTRY.get("coordination_bank")
+    coordination_bank = _coordination_bank_cache
     return _coordination_bank_cache
 
 def prime_conditioning_banks() -> None:
@@ -291,6 +320,7 @@ def prime_conditioning_banks() -> None:
     get_style_conditioning_bank()
     get_format_weights()
     get_coordination_bank()
+    prime_conditioning_views()
 
 def get_system_or_warn(drill: dict, *, source: str) -> str | None:
     system = normalize_system(drill.get("system"), source=source)
@@ -309,7 +339,145 @@ def get_system_or_warn(drill: dict, *, source: str) -> str | None:
     return None
 
 
-def _drill_text_injury_reasons(drill: dict, injuries: list[str]) -> list[dict]:
+# ---- Precomputed (format, phase) bank views ----
+
+# Technical style -> fight format used for drill selection.
+FIGHT_FORMAT_BY_TECH_STYLE = {
+    "mma": "mma",
+    "boxer": "boxing",
+    "boxing": "boxing",
+    "kickboxer": "kickboxing",
+    "kickboxing": "kickboxing",
+    "muay thai": "muay_thai",
+    "muaythai": "muay_thai",
+    "bjj": "mma",
+    "wrestler": "mma",
+    "wrestling": "wrestler",
+    "grappler": "mma",
+    "grappling": "grappler",
+    "karate": "kickboxing",
+}
+VIEW_PHASES = ("GPP", "SPP", "TAPER")
+
+
+@dataclass(frozen=True)
+class ConditioningViewEntry:
+    """Request-independent selection facts for one drill in a (format, phase) view.
+
+    ``drill`` is a read-only copy with the format's renames and tag rewrites
+    applied; callers take ``entry.drill.copy()`` before decorating it.
+    """
+
+    drill: FrozenRecord
+    system: str
+    tags: tuple[str, ...]
+    tag_set: frozenset[str]
+    details: str
+    restriction_text: str
+
+
+_VIEW_BANKS: dict[str, Callable[[], list[dict]]] = {
+    "conditioning_bank.json": get_conditioning_bank,
+    "style_conditioning_bank.json": get_style_conditioning_bank,
+}
+_conditioning_view_cache: dict[tuple[str, str, str], tuple[ConditioningViewEntry, ...]] = {}
+
+
+def _build_conditioning_view(
+    bank: list[dict], *, source: str, selection_format: str, phase: str
+) -> tuple[ConditioningViewEntry, ...]:
+    entries: list[ConditioningViewEntry] = []
+    for drill in bank:
+        if drill.get("placement", "conditioning").lower() != "conditioning":
+            continue
+        if phase not in drill.get("phases", []):
+            continue
+        d = drill.copy()
+        if selection_format == "boxing":
+            d["name"] = BOXING_NAME_MAP.get(d.get("name"), d.get("name"))
+            d["tags"] = [
+                "boxing" if t.lower() == "muay_thai" else t
+                for t in d.get("tags", [])
+            ]
+        d["name"] = _normalize_conditioning_name(d.get("name", ""), fight_format=selection_format)
+        if _violates_sport_language_blacklist(d, fight_format=selection_format):
+            continue
+        system = get_system_or_warn(d, source=source)
+        if system is None:
+            continue
+        if system == "alactic" and not _alactic_structure_ok(d):
+            continue
+        tags = tuple(normalize_tags(d.get("tags", [])))
+        entries.append(
+            ConditioningViewEntry(
+                drill=FrozenRecord(d),
+                system=system,
+                tags=tags,
+                tag_set=frozenset(tags),
+                details=" ".join(
+                    [
+                        d.get("duration", ""),
+                        d.get("notes", ""),
+                        d.get("modality", ""),
+                        d.get("equipment_note", ""),
+                    ]
+                ),
+                restriction_text=" ".join(
+                    [
+                        d.get("name", ""),
+                        d.get("modality", ""),
+                        d.get("notes", ""),
+                        d.get("equipment_note", ""),
+                    ]
+                ),
+            )
+        )
+    return tuple(entries)
+
+
+def get_conditioning_view(source: str, selection_format: str, phase: str) -> tuple[ConditioningViewEntry, ...]:
+    """Return the drills of ``source`` usable for ``selection_format`` in ``phase``.
+
+    Placement, phase membership, the sport-language blacklist, energy system
+    and alactic work:rest checks depend only on the bank, format and phase, so
+    they run once per view instead of on every request.
+    """
+    key = (source, selection_format, phase.upper())
+    view = _conditioning_view_cache.get(key)
+    if view is None:
+        view = _build_conditioning_view(
+            _VIEW_BANKS[source](),
+            source=source,
+            selection_format=selection_format,
+            phase=key[2],
+        )
+        _conditioning_view_cache[key] = view
+    return view
+
+
+def prime_conditioning_views() -> None:
+    formats = {_normalize_fight_format(fmt) for fmt in FIGHT_FORMAT_BY_TECH_STYLE.values()}
+    for source in _VIEW_BANKS:
+        for selection_format in sorted(formats):
+            for phase in VIEW_PHASES:
+                get_conditioning_view(source, selection_format, phase)
+
+
+def _reset_bank_caches(_swapped: frozenset[str]) -> None:
+    global _conditioning_bank_cache, _style_conditioning_bank_cache, _format_weights_cache
+    global _coordination_bank_cache, coordination_bank
+    _conditioning_bank_cache = None
+    _style_conditioning_bank_cache = None
+    _format_weights_cache = None
+    _coordination_bank_cache = None
+    coordination_bank = None
+    _conditioning_view_cache.clear()
+
+
+BANK_REGISTRY.on_swap(__name__, _reset_bank_caches)
+
+
+def _drill_text_injury_reasons(drill: dict, injuries: list[str]) -> tuple[dict, ...]:
     return injury_match_details(drill, injuries, fields=("name", "notes"))
 
 
@@ -344,7 +512,9 @@ def is_banned_drill(
 ) -> bool:
     """Return True if the drill should be removed for the given sport."""
     name = name.lower()
-    tags = normalize_tags(tags)
+    # Ban terms are substrings ("kick" in "body_kick"), so tags stay strings
+    # here; the normalized tuple is memoized per tag list.
+    tags = normalized_tag_tuple(tags)
     details = details.lower()
 
     tactical_styles = [s.lower().replace(" ", "_") for s in tactical_styles or []]
@@ -918,27 +1088,10 @@ def generate_conditioning_block(flags):
         'shoulder' in w.lower() for w in weaknesses
     )
 
-    style_map = {
-        "mma": "mma",
-        "boxer": "boxing",
-        "boxing": "boxing",
-        "kickboxer": "kickboxing",
-        "kickboxing": "kickboxing",
-        "muay thai": "muay_thai",
-        "muaythai": "muay_thai",
-        "bjj": "mma",
-        "wrestler": "mma",
-        "wrestling": "wrestler",
-        "grappler": "mma",
-        "grappling": "grappler",
-        "karate": "kickboxing",
-    }
-    fight_format = style_map.get(primary_tech, "mma")
+    fight_format = FIGHT_FORMAT_BY_TECH_STYLE.get(primary_tech, "mma")
     selection_format = _normalize_fight_format(fight_format)
     energy_weights = get_format_weights().get(selection_format, {})
 
-    rename_map = BOXING_NAME_MAP if selection_format == "boxing" else {}
-
     format_tag_map = {
         "mma": ["mma", "bjj", "wrestler"],
         "boxing": ["boxing"],
@@ -968,59 +1121,25 @@ def generate_conditioning_block(flags):
     restriction_warning_counts: dict[str, int] = defaultdict(int)
     restriction_blocked_items: list[dict] = []
 
-    for drill in get_conditioning_bank():
-        d = drill.copy()
-        if d.get("placement", "conditioning").lower() != "conditioning":
-            continue
-        if selection_format == "boxing":
-            d["name"] = rename_map.get(d.get("name"), d.get("name"))
-            d["tags"] = [
-                "boxing" if t.lower() == "muay_thai" else t
-                for t in d.get("tags", [])
-            ]
-        d["name"] = _normalize_conditioning_name(d.get("name", ""), fight_format=selection_format)
-        if phase.upper() not in d.get("phases", []):
-            continue
-
-        system = get_system_or_warn(d, source="conditioning_bank.json")
-        if system is None:
-            continue
-        if system == "alactic" and not _alactic_structure_ok(d):
-            continue
-
-        tags = normalize_tags(d.get("tags", []))
-        details = " ".join(
-            [
-                d.get("duration", ""),
-                d.get("notes", ""),
-                d.get("modality", ""),
-                d.get("equipment_note", ""),
-            ]
-        )
-        restriction_text = " ".join(
-            [
-                d.get("name", ""),
-                d.get("modality", ""),
-                d.get("notes", ""),
-                d.get("equipment_note", ""),
-            ]
-        )
+    for entry in get_conditioning_view("conditioning_bank.json", selection_format, phase):
+        system = entry.system
+        tags = entry.tags
+        restriction_text = entry.restriction_text
         if is_banned_drill(
-            d.get("name", ""),
+            entry.drill.get("name", ""),
             tags,
             selection_format,
-            details,
+            entry.details,
             style_names,
             tech_style_tags,
         ):
             continue
-        if _violates_sport_language_blacklist(d, fight_format=selection_format):
-            continue
+        d = entry.drill
 
         if (
             selection_format == "boxing"
             and phase.upper() == "TAPER"
-            and {"overhead", "rotational", "heavy_load"}.issubset(tags)
+            and {"overhead", "rotational", "heavy_load"}.issubset(entry.tag_set)
             and not (shoulder_focus and fatigue == "low")
         ):
             continue
@@ -1136,68 +1255,35 @@ def generate_conditioning_block(flags):
             "final_score": round(total_score, 4),
         }
 
-        system_drills[system].append((d, total_score, reasons))
+        system_drills[system].append((d.copy(), total_score, reasons))
 
     # ---- Style specific conditioning ----
     target_style_tags = set(style_names + tech_style_tags)
-    for drill in get_style_conditioning_bank():
-        d = drill.copy()
-        if d.get("placement", "conditioning").lower() != "conditioning":
+    for entry in get_conditioning_view("style_conditioning_bank.json", selection_format, phase):
+        if not target_style_tags.intersection(entry.tag_set):
             continue
-        if selection_format == "boxing":
-            d["name"] = rename_map.get(d.get("name"), d.get("name"))
-            d["tags"] = [
-                "boxing" if t.lower() == "muay_thai" else t
-                for t in d.get("tags", [])
-            ]
-        d["name"] = _normalize_conditioning_name(d.get("name", ""), fight_format=selection_format)
-        tags = normalize_tags(d.get("tags", []))
-        details = " ".join(
-            [
-                d.get("duration", ""),
-                d.get("notes", ""),
-                d.get("modality", ""),
-                d.get("equipment_note", ""),
-            ]
-        )
-        restriction_text = " ".join(
-            [
-                d.get("name", ""),
-                d.get("modality", ""),
-                d.get("notes", ""),
-                d.get("equipment_note", ""),
-            ]
-        )
+        system = entry.system
+        tags = entry.tags
+        restriction_text = entry.restriction_text
         if is_banned_drill(
-            d.get("name", ""),
+            entry.drill.get("name", ""),
             tags,
             selection_format,
-            details,
+            entry.details,
             style_names,
             tech_style_tags,
         ):
             continue
-        if _violates_sport_language_blacklist(d, fight_format=selection_format):
-            continue
-        if not target_style_tags.intersection(tags):
-            continue
-        if phase.upper() not in d.get("phases", []):
-            continue
+        d = entry.drill
 
         if (
             selection_format == "boxing"
             and phase.upper() == "TAPER"
-            and {"overhead", "rotational", "heavy_load"}.issubset(tags)
+            and {"overhead", "rotational", "heavy_load"}.issubset(entry.tag_set)
             and not (shoulder_focus and fatigue == "low")
         ):
             continue
 
-        system = get_system_or_warn(d, source="style_conditioning_bank.json")
-        if system is None:
-            continue
-        if system == "alactic" and not _alactic_structure_ok(d):
-            continue
-
         # Apply same fatigue/CNS suppression rules
         if (
             phase.upper() == "TAPER"
@@ -1307,9 +1393,10 @@ def generate_conditioning_block(flags):
             "final_score": round(score, 4),
         }
 
+        d = d.copy()
         style_system_drills[system].append((d, score, reasons))
         for st in style_names:
-            if st in tags:
+            if st in entry.tag_set:
                 style_drills_by_style[st][system].append((d, score, reasons))
 
     for drills in system_drills.values():
@@ -1608,14 +1695,7 @@ def generate_conditioning_block(flags):
 
     # --------- UNIVERSAL CONDITIONING INSERTION ---------
     if phase == "GPP":
-        try:
-            universal_conditioning = _load_bank(
-                DATA_DIR / "universal_gpp_conditioning.json",
-                source="universal_gpp_conditioning.json",
-                enforce_conditioning_systems=True,
-            )
-        except Exception:
-            universal_conditioning = []
+        universal_conditioning = BANK_REGISTRY.get("universal_gpp_conditioning")
 
         existing_cond_names = {d.get("name") for _, drills in final_drills for d in drills}
         goal_tags_set = set(goal_tags or [])
@@ -1657,7 +1737,7 @@ def generate_conditioning_block(flags):
                 continue
             drill_tags = set(normalize_tags(drill.get("tags", [])))
             if drill.get("name") in high_priority_names or drill_tags & (goal_tags_set | weakness_tags_set):
-                final_drills.append((system, [drill]))
+                final_drills.append((system, [with_ensured_tags(drill)]))
                 selected_drill_names.append(drill.get("name"))
                 reason_lookup[drill.get("name")] = {
                     "goal_hits": 0,
@@ -1674,14 +1754,7 @@ def generate_conditioning_block(flags):
 
     # --------- STYLE TAPER DRILL INSERTION ---------
     if phase == "TAPER":
-        try:
-            style_taper_bank = _load_bank(
-                DATA_DIR / "style_taper_conditioning.json",
-                source="style_taper_conditioning.json",
-                enforce_conditioning_systems=True,
-            )
-        except Exception:
-            style_taper_bank = []
+        style_taper_bank = BANK_REGISTRY.get("style_taper_conditioning")
 
         existing_cond_names = {d.get("name") for _, drills in final_drills for d in drills}
         style_set = set(style_names)
@@ -1721,7 +1794,7 @@ def generate_conditioning_block(flags):
                     continue
                 system = get_system_or_warn(drill, source="style_taper_conditioning.json")
                 if system is not None:
-                    _append_drill(system, drill, {
+                    _append_drill(system, with_ensured_tags(drill), {
                         "goal_hits": 0,
                         "weakness_hits": 0,
                         "style_hits": 0,
@@ -1,18 +1,21 @@
 from __future__ import annotations
 
-import copy
 import json
 import logging
 import os
 import re
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
+from threading import Lock
 from typing import Iterable
 
 from .injury_models import Decision
 from .injury_exclusion_rules import INJURY_REGION_KEYWORDS, INJURY_RULES
 from .injury_synonyms import parse_injury_phrase, remove_negated_phrases, split_injury_text
-from .bank_schema import validate_training_item
-from .tagging import normalize_item_tags, normalize_tags
+from .bank_registry import BANK_REGISTRY
+from .bank_schema import FrozenRecord, validate_training_item
+from .tagging import get_tag_vocabulary, normalize_item_tags, normalize_tags, tag_ids
 # Refactored: Import centralized DATA_DIR from config
 from .config import DATA_DIR
 from .normalization import normalize_text_for_matching as normalize_text, phrase_in_text
@@ -452,7 +455,69 @@ def _injury_debug_enabled() -> bool:
 
 
 _NORMALIZED_INJURY_REGION_CACHE: dict[tuple[str, ...], frozenset[str]] = {}
-_INJURY_MATCH_DETAILS_CACHE: dict[tuple[object, ...], list[dict]] = {}
+# Entries per level of the injury_match_details cache; 0 disables both.
+_INJURY_MATCH_CACHE_MAX_SIZE = max(0, int(os.environ.get("UNLXCK_INJURY_MATCH_CACHE_MAX_SIZE", "4096")))
+
+
+class _MatchDetailsCache:
+    """Bounded LRU for ``injury_match_details`` with hit/miss/eviction counts.
+
+    Plan units run on a shared thread pool, so lookups, inserts and
+    evictions share one lock.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[tuple, tuple] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: tuple) -> tuple | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: tuple, entry: tuple) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+        return count
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
+
+
+# Level one is keyed on the item itself (identity for shared bank records,
+# the raw fields tag resolution reads for mutable dicts) and is checked before
+# any tag work. Level two is keyed on the resolved tags and field text, so
+# distinct dicts describing the same exercise share one entry.
+_MATCH_DETAILS_BY_ITEM = _MatchDetailsCache(_INJURY_MATCH_CACHE_MAX_SIZE)
+_MATCH_DETAILS_BY_CONTENT = _MatchDetailsCache(_INJURY_MATCH_CACHE_MAX_SIZE)
 
 
 def _injury_strings_cache_key(injuries: Iterable[str]) -> tuple[str, ...]:
@@ -464,8 +529,9 @@ def _injury_strings_cache_key(injuries: Iterable[str]) -> tuple[str, ...]:
     return tuple(sorted(normalized))
 
 
-def _tags_cache_key(tags: Iterable[str]) -> tuple[str, ...]:
-    return tuple(sorted(str(tag).lower() for tag in tags if tag))
+def _tags_cache_key(tags: Iterable[str]) -> frozenset[int]:
+    id_for = get_tag_vocabulary().id_for
+    return frozenset(id_for(str(tag).lower()) for tag in tags if tag)
 
 
 
@@ -571,18 +637,34 @@ SHOULDER_TAG_EXCLUSIONS = {
 }
 
 
+_ALIAS_EXPANSION_CACHE: dict[frozenset[int], frozenset[str]] = {}
+
+
+def _alias_expansion(ids: frozenset[int]) -> frozenset[str]:
+    """Union of ``INJURY_TAG_ALIASES`` over a tag-ID set, memoized per set."""
+    cached = _ALIAS_EXPANSION_CACHE.get(ids)
+    if cached is None:
+        vocabulary = get_tag_vocabulary()
+        expanded: set[str] = set()
+        for tag_id in ids:
+            expanded.update(INJURY_TAG_ALIASES.get(vocabulary.name(tag_id), ()))
+        if len(_ALIAS_EXPANSION_CACHE) >= 20000:
+            _ALIAS_EXPANSION_CACHE.clear()
+        cached = _ALIAS_EXPANSION_CACHE[ids] = frozenset(expanded)
+    return cached
+
+
 def expand_injury_tags(tags: Iterable[str], *, item: dict | None = None) -> set[str]:
-    tag_set = {t for t in normalize_tags(tags) if t}
-    expanded: set[str] = set()
-    for tag in tag_set:
-        expanded.update(INJURY_TAG_ALIASES.get(tag, ()))
-    if "high_cns" in tag_set:
+    ids = tag_ids(tags)
+    vocabulary = get_tag_vocabulary()
+    expanded = set(_alias_expansion(ids))
+    if vocabulary.id_for("high_cns") in ids:
         name = str(item.get("name", "") or "") if item else ""
-        if not (tag_set & LOWER_BODY_CNS_TAGS) and not match_forbidden(
+        if not (ids & tag_ids(LOWER_BODY_CNS_TAGS)) and not match_forbidden(
             name, ["sprint", "sprints", "jump", "plyo", "hops", "bounds"], allowlist=INJURY_MATCH_ALLOWLIST
         ):
             expanded.add("high_cns_upper")
-    if "shoulders" in tag_set and item:
+    if vocabulary.id_for("shoulders") in ids and item:
         name = str(item.get("name", "") or "").lower()
         if name in SHOULDER_TAG_EXCLUSIONS:
             expanded.discard("dynamic_overhead")
@@ -714,7 +796,65 @@ def match_forbidden(text: str, patterns: Iterable[str], *, allowlist: Iterable[s
     return substring_matches
 
 
+@dataclass(frozen=True)
+class InferredTagTable:
+    """Build-time name inference for every bank item, keyed by normalized name."""
+
+    # Only names inferred identically everywhere they appear; spellings that
+    # normalize alike but infer differently fall back to the live rules.
+    by_name: dict[str, frozenset[str]]
+
+
+INFERRED_TAGS_FILE = "bank_inferred_tags.json"
+_inferred_tag_table_cache: InferredTagTable | None = None
+
+
+def _load_inferred_tag_table() -> InferredTagTable:
+    path = DATA_DIR / INFERRED_TAGS_FILE
+    entries = json.loads(path.read_text(encoding="utf-8")) if path.is_file() else []
+    by_name: dict[str, frozenset[str] | None] = {}
+    for entry in entries:
+        key = normalize_text(str(entry.get("name", "") or ""))
+        if not key:
+            continue
+        tags = frozenset(entry.get("inferred_tags", ()))
+        by_name[key] = tags if by_name.get(key, tags) == tags else None
+    return InferredTagTable(by_name={key: tags for key, tags in by_name.items() if tags is not None})
+
+
+def get_inferred_tag_table() -> InferredTagTable:
+    global _inferred_tag_table_cache
+    if _inferred_tag_table_cache is None:
+        _inferred_tag_table_cache = BANK_REGISTRY.get("bank_inferred_tags")
+    return _inferred_tag_table_cache
+
+
+def _reset_bank_caches(_swapped: frozenset[str]) -> None:
+    global _inferred_tag_table_cache
+    _inferred_tag_table_cache = None
+    # Level one pins swapped-out records by identity; drop both levels.
+    clear_injury_match_cache()
+
+
+BANK_REGISTRY.on_swap(__name__, _reset_bank_caches)
+
+
 def infer_tags_from_name(name: str) -> set[str]:
+    """Tags implied by an item name.
+
+    Bank item names are answered from ``data/bank_inferred_tags.json``, the
+    build-time output of the keyword rules below
+    (``tools/generate_injury_exclusion_maps.py`` rebuilds it and
+    ``tools/validate_banks.py`` fails when it is stale). Any other name, such
+    as Stage 2 text, runs the rules live.
+    """
+    tags = get_inferred_tag_table().by_name.get(normalize_text(name))
+    if tags is None:
+        return _infer_tags_from_name_live(name)
+    return set(tags)
+
+
+def _infer_tags_from_name_live(name: str) -> set[str]:
     inferred: set[str] = set()
     for rule in INFERRED_TAG_RULES:
         if match_forbidden(name, rule["keywords"], allowlist=INJURY_MATCH_ALLOWLIST):
@@ -747,28 +887,49 @@ def auto_tag(item: dict) -> set[str]:
     return {tag for tag in normalize_tags(tags) if tag}
 
 
-def ensure_tags(item: dict) -> list[str]:
-    # If already processed, return existing tags
-    if "_tag_source" in item:
-        return item.get("tags", [])
-    
+def _resolve_tags(item: dict) -> tuple[list[str], str]:
     raw_tags = normalize_tags([t for t in item.get("tags", []) if t])
     if raw_tags:
         name = str(item.get("name", "") or "")
         mech_tags = _infer_mechanism_tags_from_name(name)
         if mech_tags:
             raw_tags = normalize_tags([*raw_tags, *mech_tags])
-        item["tags"] = raw_tags
-        item["_tag_source"] = "explicit"
-        return raw_tags
+        return raw_tags, "explicit"
 
     inferred = sorted(auto_tag(item))
     if not inferred:
         inferred = ["untagged"]
+    return inferred, "inferred"
 
-    item["tags"] = inferred
-    item["_tag_source"] = "inferred"
-    return inferred
+
+def ensured_tags(item: dict) -> tuple[list[str], str]:
+    """Return ``(tags, tag_source)`` for ``item``, resolving them at most once.
+
+    Mutable items get the result written back (``tags``/``_tag_source``);
+    shared bank records keep it memoized on the record instead.
+    """
+    # If already processed, return existing tags
+    if "_tag_source" in item:
+        return item.get("tags", []), item["_tag_source"]
+    if isinstance(item, FrozenRecord):
+        return item.derived("ensured_tags", _resolve_tags)
+
+    tags, tag_source = _resolve_tags(item)
+    item["tags"] = tags
+    item["_tag_source"] = tag_source
+    return tags, tag_source
+
+
+def ensure_tags(item: dict) -> list[str]:
+    return ensured_tags(item)[0]
+
+
+def with_ensured_tags(item: dict) -> dict:
+    """Return ``item`` carrying its resolved tags, copying shared bank records."""
+    tags, tag_source = ensured_tags(item)
+    if isinstance(item, FrozenRecord):
+        return item.overlay(tags=tags, _tag_source=tag_source)
+    return item
 
 
 def _map_text_to_region(text: str) -> str | None:
@@ -894,31 +1055,87 @@ def filter_items_for_injuries(items: Iterable[dict], injuries: Iterable[str]) ->
     return [item for item in items if is_injury_safe(item, injuries)]
 
 
+def clear_injury_match_cache() -> int:
+    """Empty both levels of the match-details cache; returns entries dropped."""
+    return _MATCH_DETAILS_BY_ITEM.clear() + _MATCH_DETAILS_BY_CONTENT.clear()
+
+
+def injury_match_cache_stats() -> dict[str, dict[str, int]]:
+    """Hit, miss, eviction and size counts for each cache level."""
+    return {
+        "by_item": _MATCH_DETAILS_BY_ITEM.stats(),
+        "by_content": _MATCH_DETAILS_BY_CONTENT.stats(),
+    }
+
+
+def _match_details_item_key(
+    item: dict,
+    field_values: dict[str, str],
+    injury_list: list[str],
+    fields: tuple[str, ...],
+    risk_levels: tuple[str, ...],
+) -> tuple:
+    if isinstance(item, FrozenRecord):
+        # The level-one entry holds the record, so its id cannot be reused
+        # while the entry lives.
+        return ("record", id(item), tuple(injury_list), fields, risk_levels)
+    equipment = item.get("equipment", "")
+    if isinstance(equipment, (list, tuple, set)):
+        equipment = " ".join(str(e) for e in equipment if e)
+    return (
+        "item",
+        _module_for_item(item),
+        str(item.get("name", "") or ""),
+        str(item.get("purpose", "") or ""),
+        str(equipment or ""),
+        tuple(item.get("tags") or ()),
+        item.get("_tag_source"),
+        tuple(field_values.items()),
+        tuple(injury_list),
+        fields,
+        risk_levels,
+    )
+
+
 def injury_match_details(
     item: dict,
     injuries: Iterable[str],
     *,
     fields: Iterable[str] | None = None,
     risk_levels: Iterable[str] | None = None,
-) -> list[dict]:
+) -> tuple[FrozenRecord, ...]:
+    """Injury rule hits for ``item``, one read-only record per region and risk level.
+
+    Results are shared between callers through a two-level cache, so the
+    records and their ``fields``/``patterns``/``tags`` tuples are immutable.
+    """
     injury_list = [str(injury) for injury in injuries if injury]
     if not injury_list:
-        return []
+        return ()
     fields = tuple(fields or ("name",))
     risk_levels = tuple(sorted(set(risk_levels or ("exclude",))))
     field_values = {field: str(item.get(field, "") or "") for field in fields}
+    item_key = _match_details_item_key(item, field_values, injury_list, fields, risk_levels)
+    cached = _MATCH_DETAILS_BY_ITEM.get(item_key)
+    if cached is not None:
+        _record, resolved_tags, tag_source, details = cached
+        if not isinstance(item, FrozenRecord) and "_tag_source" not in item:
+            # Replay ensured_tags' write-back for mutable items.
+            item["tags"] = list(resolved_tags)
+            item["_tag_source"] = tag_source
+        return details
+
     name = field_values.get("name", "")
-    tags = set(ensure_tags(item))
-    tag_source = item.get("_tag_source", "explicit")
+    had_tag_source = "_tag_source" in item
+    resolved_tags, tag_source = ensured_tags(item)
+    tags = set(resolved_tags)
     tags |= infer_tags_from_name(name)
     expanded = expand_injury_tags(tags, item=item)
     tags_for_matching = tags | expanded
     if "low_impact" in tags_for_matching:
         tags_for_matching.discard("running_volume_high")
     module = _module_for_item(item)
-    allow_keyword_match = module in {"strength", "conditioning"}
-    region_list = sorted(normalize_injury_regions(injury_list))
-    cache_key = (
+    content_key = (
         module,
         tuple(sorted(field_values.items())),
         _injury_strings_cache_key(injury_list),
@@ -927,12 +1144,44 @@ def injury_match_details(
         tag_source,
         _tags_cache_key(tags_for_matching),
     )
-    cached = _INJURY_MATCH_DETAILS_CACHE.get(cache_key)
+    cached = _MATCH_DETAILS_BY_CONTENT.get(content_key)
     if cached is not None:
-        return copy.deepcopy(cached)
-
-    reasons: list[dict] = []
-    for region in region_list:
+        details = cached[0]
+    else:
+        details = _compute_injury_match_details(
+            name,
+            field_values,
+            injury_list,
+            risk_levels,
+            tag_source,
+            tags_for_matching,
+            allow_keyword_match=module in {"strength", "conditioning"},
+        )
+        _MATCH_DETAILS_BY_CONTENT.put(content_key, (details,))
+
+    entry = (item if isinstance(item, FrozenRecord) else None, tuple(resolved_tags), tag_source, details)
+    _MATCH_DETAILS_BY_ITEM.put(item_key, entry)
+    if not had_tag_source and not isinstance(item, FrozenRecord):
+        # ensured_tags just wrote tags back; the next call sees the new fields.
+        _MATCH_DETAILS_BY_ITEM.put(
+            _match_details_item_key(item, field_values, injury_list, fields, risk_levels),
+            entry,
+        )
+    return details
+
+
+def _compute_injury_match_details(
+    name: str,
+    field_values: dict[str, str],
+    injury_list: list[str],
+    risk_levels: tuple[str, ...],
+    tag_source: str,
+    tags_for_matching: set[str],
+    *,
+    allow_keyword_match: bool,
+) -> tuple[FrozenRecord, ...]:
+    reasons: list[FrozenRecord] = []
+    for region in sorted(normalize_injury_regions(injury_list)):
         rules = INJURY_RULES.get(region, {})
         for risk_level in ("exclude", "flag"):
             if risk_level not in risk_levels:
@@ -964,17 +1213,15 @@ def injury_match_details(
                                 )
             if field_hits or tag_hits:
                 reasons.append(
-                    {
-                        "region": region,
-                        "fields": sorted(field_hits),
-                        "patterns": sorted(matched_patterns),
-                        "tags": tag_hits,
-                        "risk_level": risk_level,
-                    }
+                    FrozenRecord(
+                        region=region,
+                        fields=tuple(sorted(field_hits)),
+                        patterns=tuple(sorted(matched_patterns)),
+                        tags=tuple(tag_hits),
+                        risk_level=risk_level,
+                    )
                 )
-
-    _INJURY_MATCH_DETAILS_CACHE[cache_key] = copy.deepcopy(reasons)
-    return reasons
+    return tuple(reasons)
 
 def _load_style_specific_exercises() -> list[dict]:
     paths = [
@@ -1016,31 +1263,22 @@ def _load_bank_items(filename: str) -> list[dict]:
 
 
 def collect_banks() -> dict[str, list[dict]]:
+    """Every selection bank for tooling, keyed by bank name.
+
+    Strength and coordination banks come from the shared bank registry. The
+    conditioning banks are re-read here because the registry copies have
+    already had invalid energy systems dropped and aliases resolved, which
+    the audits need to see.
+    """
     banks: dict[str, list[dict]] = {}
-    banks["exercise_bank"] = _load_bank_items("exercise_bank.json")
+    banks["exercise_bank"] = BANK_REGISTRY.get("exercise_bank")
     banks["conditioning_bank"] = _load_bank_items("conditioning_bank.json")
     banks["style_conditioning_bank"] = _load_bank_items("style_conditioning_bank.json")
-    banks["universal_gpp_strength"] = _load_bank_items("universal_gpp_strength.json")
+    banks["universal_gpp_strength"] = BANK_REGISTRY.get("universal_gpp_strength")
     banks["universal_gpp_conditioning"] = _load_bank_items("universal_gpp_conditioning.json")
     banks["style_taper_conditioning"] = _load_bank_items("style_taper_conditioning.json")
-    banks["style_specific_exercises"] = _load_style_specific_exercises()
-
-    coord_data = json.loads((DATA_DIR / "coordination_bank.json").read_text(encoding="utf-8"))
-    coordination_bank: list[dict] = []
-    if isinstance(coord_data, list):
-        for item in coord_data:
-            validate_training_item(item, source="coordination_bank.json", require_phases=True)
-            normalize_item_tags(item)
-            coordination_bank.append(item)
-    elif isinstance(coord_data, dict):
-        for val in coord_data.values():
-            if isinstance(val, list):
-                for item in val:
-                    validate_training_item(item, source="coordination_bank.json", require_phases=True)
-                    normalize_item_tags(item)
-                    coordination_bank.append(item)
-    banks["coordination_bank"] = coordination_bank
-
+    banks["style_specific_exercises"] = BANK_REGISTRY.get("style_specific_exercises")
+    banks["coordination_bank"] = BANK_REGISTRY.get("coordination_bank")
     return banks
 
 
@@ -1052,7 +1290,7 @@ def build_bank_inferred_tags() -> list[dict]:
             item_id = f"{bank_name}:{name}"
             explicit_tags = normalize_tags(item.get("tags", []))
             normalized_tags = ensure_tags(item)
-            inferred_tags = sorted(infer_tags_from_name(name))
+            inferred_tags = sorted(_infer_tags_from_name_live(name))
             entries.append(
                 {
                     "item_id": item_id,
@@ -1072,7 +1310,7 @@ def build_injury_exclusion_map() -> dict[str, list[str]]:
             name = item.get("name", "")
             item_id = f"{bank_name}:{name}"
             tags = set(ensure_tags(item))
-            tags |= infer_tags_from_name(name)
+            tags |= _infer_tags_from_name_live(name)
             tags |= expand_injury_tags(tags, item=item)
             for region, rule in INJURY_RULES.items():
                 ban_keywords = rule.get("exclude_keywords", rule.get("ban_keywords", []))
@@ -1099,6 +1337,26 @@ def audit_missing_tags() -> dict[str, int]:
     return counts
 
 
+def audit_inferred_tag_table(path: Path | None = None) -> list[str]:
+    """Item ids whose entries in ``bank_inferred_tags.json`` are missing, extra or outdated."""
+    path = path or DATA_DIR / INFERRED_TAGS_FILE
+    recorded = json.loads(path.read_text(encoding="utf-8")) if path.is_file() else []
+
+    def _by_id(entries: list[dict]) -> dict[str, list[str]]:
+        grouped: dict[str, list[str]] = {}
+        for entry in entries:
+            grouped.setdefault(str(entry.get("item_id")), []).append(json.dumps(entry, sort_keys=True))
+        return {item_id: sorted(rows) for item_id, rows in grouped.items()}
+
+    recorded_by_id = _by_id(recorded)
+    current_by_id = _by_id(build_bank_inferred_tags())
+    return sorted(
+        item_id
+        for item_id in recorded_by_id.keys() | current_by_id.keys()
+        if recorded_by_id.get(item_id) != current_by_id.get(item_id)
+    )
+
+
 def write_injury_exclusion_files(output_dir: Path | None = None) -> None:
     output_dir = output_dir or DATA_DIR
     inferred_path = output_dir / "bank_inferred_tags.json"
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 from collections import OrderedDict
-import hashlib
 import json
 import logging
 import os
 import re
+from threading import Lock
 from typing import Callable, Iterable
 
 from .injury_models import Decision
@@ -14,8 +14,10 @@ from .injury_filtering import injury_match_details, match_forbidden, normalize_i
 from .injury_formatting import parse_injury_entry
 from .restriction_parsing import is_restriction_phrase
 from .injury_synonyms import parse_injury_phrase, remove_negated_phrases, split_injury_text
-from .tagging import normalize_tags
+from .tagging import item_tag_ids, normalize_tags
+from .tracing import add_counter
 # Import injury rules version for cache invalidation
+from .bank_registry import BANK_REGISTRY
 from .config import INJURY_RULES_VERSION
 
 logger = logging.getLogger(__name__)
@@ -337,7 +339,10 @@ _INJURY_DECISION_LOGGED: set[tuple] = set()
 # - Scoring thresholds change (threshold_version)
 # - Item identity changes (item_id)
 _INJURY_DECISION_CACHE_MAX_SIZE = max(128, int(os.environ.get("INJURY_DECISION_CACHE_MAX_SIZE", "10000")))
-_INJURY_DECISION_CACHE: OrderedDict[tuple[str, ...], dict[str, object]] = OrderedDict()
+_INJURY_DECISION_CACHE: OrderedDict[tuple, dict[str, object]] = OrderedDict()
+# Plan units run on a shared thread pool (see plan_pipeline_blocks), so LRU
+# reads and evictions must not interleave.
+_INJURY_DECISION_CACHE_LOCK = Lock()
 _INJURY_SEVERITY_DEBUGGED = False
 _INJURY_PARSED_DEBUGGED = False
 _SEVERITY_SYNONYM_PATTERN_CACHE: dict[str, re.Pattern[str]] = {}
@@ -375,24 +380,6 @@ def _find_severity_hits(text: str) -> list[tuple[str, str]]:
     return [(level, synonym) for _, level, synonym in hits]
 
 
-def _compute_tags_hash(tags: Iterable[str]) -> str:
-    """
-    Compute a stable hash of exercise/drill tags for cache key.
-    
-    Tags are sorted to ensure consistent hash regardless of order.
-    This allows cache invalidation when tags change.
-    
-    Args:
-        tags: List of tags to hash
-        
-    Returns:
-        Hex digest of SHA256 hash (first 16 chars for brevity)
-    """
-    normalized = sorted(normalize_tags(str(tag) for tag in tags if tag))
-    tags_str = ",".join(normalized)
-    return hashlib.sha256(tags_str.encode()).hexdigest()[:16]
-
-
 def clear_injury_decision_cache() -> int:
     """
     Clear the injury decision cache.
@@ -404,18 +391,37 @@ def clear_injury_decision_cache() -> int:
         Number of cache entries cleared
     """
     global _INJURY_DECISION_CACHE
-    count = len(_INJURY_DECISION_CACHE)
-    _INJURY_DECISION_CACHE.clear()
+    with _INJURY_DECISION_CACHE_LOCK:
+        count = len(_INJURY_DECISION_CACHE)
+        _INJURY_DECISION_CACHE.clear()
     if count > 0:
         logger.info("[injury-guard] Cache cleared: %d entries invalidated", count)
     return count
 
 
+def _clear_on_bank_swap(_swapped: frozenset[str]) -> None:
+    # Cached decisions are keyed by item name and tags; other bank fields can
+    # change underneath them, so any bank swap drops the whole cache.
+    clear_injury_decision_cache()
+
+
+BANK_REGISTRY.on_swap(__name__, _clear_on_bank_swap)
+
+
 def _cache_injury_decision(cache_key: tuple[str, ...], payload: dict[str, object]) -> None:
-    _INJURY_DECISION_CACHE[cache_key] = payload
-    _INJURY_DECISION_CACHE.move_to_end(cache_key)
-    while len(_INJURY_DECISION_CACHE) > _INJURY_DECISION_CACHE_MAX_SIZE:
-        _INJURY_DECISION_CACHE.popitem(last=False)
+    with _INJURY_DECISION_CACHE_LOCK:
+        _INJURY_DECISION_CACHE[cache_key] = payload
+        _INJURY_DECISION_CACHE.move_to_end(cache_key)
+        while len(_INJURY_DECISION_CACHE) > _INJURY_DECISION_CACHE_MAX_SIZE:
+            _INJURY_DECISION_CACHE.popitem(last=False)
+
+
+def _cached_injury_decision(cache_key: tuple[str, ...]) -> dict[str, object] | None:
+    with _INJURY_DECISION_CACHE_LOCK:
+        cached = _INJURY_DECISION_CACHE.get(cache_key)
+        if cached:
+            _INJURY_DECISION_CACHE.move_to_end(cache_key)
+        return cached
 
 
 def _normalize_injury_list(injuries: Iterable[str | dict] | str | dict | None) -> list[str | dict]:
@@ -829,8 +835,8 @@ def injury_decision(exercise: dict, injuries: Iterable[str | dict] | str | dict,
     bank = exercise.get("bank", "") or exercise.get("source", "") or "unknown"
     
     # Compute tags hash for cache invalidation when tags change
-    exercise_tags = exercise.get("tags", [])
-    tags_hash = _compute_tags_hash(exercise_tags)
+    tags_hash = item_tag_ids(exercise)
+    rules_version = f"{INJURY_RULES_VERSION}+banks.{BANK_REGISTRY.generation}"
 
     for region, region_details in details_by_region.items():
         severity = region_severity.get(region, "moderate")
@@ -839,19 +845,22 @@ def injury_decision(exercise: dict, injuries: Iterable[str | dict] | str | dict,
         # - region: injury region being evaluated
         # - severity: injury severity level
         # - threshold_version: scoring thresholds (changes with phase/fatigue)
-        # - rules_version: injury rules version (from config)
-        # - tags_hash: hash of exercise tags (detects tag changes)
+        # - rules_version: injury rules version (from config) plus the bank
+        #   registry generation, so decisions computed against banks that
+        #   were swapped out mid-request are never reused
+        # - tags_hash: frozenset of normalized tag IDs (detects tag changes)
         # - module: strength vs conditioning
         # - bank: which bank the exercise came from
-        cache_key = (item_id, region, severity, threshold_version, INJURY_RULES_VERSION, tags_hash, module, bank)
-        cached = _INJURY_DECISION_CACHE.get(cache_key)
+        cache_key = (item_id, region, severity, threshold_version, rules_version, tags_hash, module, bank)
+        cached = _cached_injury_decision(cache_key)
         if cached:
-            _INJURY_DECISION_CACHE.move_to_end(cache_key)
+            add_counter("injury_guard.decision_cache_hit")
             risk = float(cached["risk"])
             matched_tags = list(cached["matched_tags"])
             bucket = str(cached["bucket"])
             action = str(cached["action"])
         else:
+            add_counter("injury_guard.decision_cache_miss")
             region_weight = REGION_RISK_WEIGHTS.get(region, 1.0)
             severity_weight = SEVERITY_WEIGHTS.get(severity, 1.0)
             max_region_detail = None
@@ -40,6 +40,20 @@ def _normalize(text: str) -> str:
     return " ".join((text or "").lower().strip().split())
 
 
+# Compiled boundary patterns per normalized phrase. The location, medical and
+# red-flag vocabularies alone outnumber the ``re`` module's own cache, so
+# without this every triage chunk recompiles most of them.
+_PHRASE_PATTERN_CACHE: dict[str, re.Pattern[str]] = {}
+
+
+def _phrase_pattern(phrase: str) -> re.Pattern[str]:
+    pattern = _PHRASE_PATTERN_CACHE.get(phrase)
+    if pattern is None:
+        pattern = re.compile(rf"(?:^|\W){re.escape(phrase)}(?:\W|$)")
+        _PHRASE_PATTERN_CACHE[phrase] = pattern
+    return pattern
+
+
 def safe_phrase_search(phrase: str, text: str) -> bool:
     """
     Boundary match that works for:
@@ -51,8 +65,7 @@ def safe_phrase_search(phrase: str, text: str) -> bool:
     p = _normalize(phrase)
     if not p or not t:
         return False
-    pattern = rf"(?:^|\W){re.escape(p)}(?:\W|$)"
-    return re.search(pattern, t) is not None
+    return _phrase_pattern(p).search(t) is not None
 
 
 def _build_location_map(location_map: dict[str, str]) -> dict[str, list[str]]:
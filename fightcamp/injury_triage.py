@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import asdict, dataclass, field
+import hashlib
+import json
+import os
 import re
+from threading import Lock
 from typing import Any
 
 from .input_parsing import PlanInput
@@ -70,6 +75,16 @@ _TRAUMA_CONTEXT_PATTERNS = (
 
 _NEURO_CONTEXT_PATTERN = r"\bneurolog(?:ic|ical)\b|\bnerve\b"
 
+_TRAUMA_CONTEXT_RE = re.compile("|".join(_TRAUMA_CONTEXT_PATTERNS))
+_NEURO_CONTEXT_RE = re.compile(_NEURO_CONTEXT_PATTERN)
+
+# Triage is a pure function of the injury fields of the intake, and the same
+# intake is regenerated often (resumes, retries, admin re-runs), so results
+# are cached by a hash of exactly those fields.
+_TRIAGE_CACHE_MAX_SIZE = max(0, int(os.environ.get("UNLXCK_TRIAGE_CACHE_MAX_SIZE", "1024")))
+_TRIAGE_CACHE: OrderedDict[str, InjuryTriageResult] = OrderedDict()
+_TRIAGE_CACHE_LOCK = Lock()
+
 
 @dataclass(frozen=True)
 class InjuryTriageResult:
@@ -87,7 +102,61 @@ class InjuryTriageResult:
         return asdict(self)
 
 
+def triage_cache_key(plan_input: PlanInput) -> str:
+    """Content hash of the intake fields triage reads."""
+    guided = plan_input.guided_injury
+    material = {
+        "injuries": plan_input.injuries,
+        "parsed_injuries": plan_input.parsed_injuries,
+        "guided_injury": asdict(guided) if guided is not None else None,
+        "restrictions": plan_input.restrictions,
+    }
+    encoded = json.dumps(material, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def clear_injury_triage_cache() -> int:
+    """Drop every cached triage result; returns how many were cached."""
+    with _TRIAGE_CACHE_LOCK:
+        count = len(_TRIAGE_CACHE)
+        _TRIAGE_CACHE.clear()
+    return count
+
+
+def _copy_triage_result(result: InjuryTriageResult) -> InjuryTriageResult:
+    # asdict deep-copies the list fields, so callers never share the cached lists.
+    return InjuryTriageResult(**asdict(result))
+
+
+def lookup_injury_triage(plan_input: PlanInput) -> tuple[InjuryTriageResult, bool]:
+    """Triage ``plan_input``, reusing a cached result for identical injury fields.
+
+    Returns ``(result, served_from_cache)``.
+    """
+    if not _TRIAGE_CACHE_MAX_SIZE:
+        return _triage_injuries_uncached(plan_input), False
+    key = triage_cache_key(plan_input)
+    with _TRIAGE_CACHE_LOCK:
+        cached = _TRIAGE_CACHE.get(key)
+        if cached is not None:
+            _TRIAGE_CACHE.move_to_end(key)
+    if cached is not None:
+        return _copy_triage_result(cached), True
+
+    result = _triage_injuries_uncached(plan_input)
+    with _TRIAGE_CACHE_LOCK:
+        _TRIAGE_CACHE[key] = _copy_triage_result(result)
+        _TRIAGE_CACHE.move_to_end(key)
+        while len(_TRIAGE_CACHE) > _TRIAGE_CACHE_MAX_SIZE:
+            _TRIAGE_CACHE.popitem(last=False)
+    return result, False
+
+
 def triage_injuries(plan_input: PlanInput) -> InjuryTriageResult:
+    return lookup_injury_triage(plan_input)[0]
+
+
+def _triage_injuries_uncached(plan_input: PlanInput) -> InjuryTriageResult:
     features = build_triage_features(
         injuries=plan_input.injuries,
         parsed_injuries=plan_input.parsed_injuries,
@@ -172,7 +241,7 @@ def triage_injuries(plan_input: PlanInput) -> InjuryTriageResult:
     chest_with_systemic = "chest_pain" in red_flags and (
         "shortness_of_breath" in red_flags
         or "coughing_blood" in red_flags
-        or any(re.search(pattern, combined_text) for pattern in _TRAUMA_CONTEXT_PATTERNS)
+        or bool(_TRAUMA_CONTEXT_RE.search(combined_text))
         or "worsening_course" in red_flags
     )
     if chest_with_systemic:
@@ -181,7 +250,7 @@ def triage_injuries(plan_input: PlanInput) -> InjuryTriageResult:
 
     rib_breathing_unsafe = rib_or_chest_context and ("breathing_pain" in red_flags) and (
         any(category in matched_categories for category in ("broken_rib", "fracture", "open_fracture"))
-        or any(re.search(pattern, combined_text) for pattern in _TRAUMA_CONTEXT_PATTERNS)
+        or bool(_TRAUMA_CONTEXT_RE.search(combined_text))
         or "shortness_of_breath" in red_flags
     )
     if rib_breathing_unsafe:
@@ -189,7 +258,7 @@ def triage_injuries(plan_input: PlanInput) -> InjuryTriageResult:
         routing_reasons.add("rib_breathing_red_flag_combination")
 
     neuro_combo = (
-        bool(re.search(_NEURO_CONTEXT_PATTERN, combined_text))
+        bool(_NEURO_CONTEXT_RE.search(combined_text))
         and any(flag in red_flags for flag in ("loss_of_consciousness", "numbness", "weakness", "confusion"))
     ) or (
         "loss_of_consciousness" in red_flags
@@ -5,7 +5,7 @@ from pathlib import Path
 from time import perf_counter
 
 from .input_parsing import PlanInput
-from .injury_triage import FULL_PLAN, blocked_mode_output, triage_injuries
+from .injury_triage import FULL_PLAN, blocked_mode_output, lookup_injury_triage
 from .logging_utils import configure_logging
 from .plan_pipeline import (
     _filter_mindset_blocks,
@@ -21,7 +21,9 @@ from .plan_rendering_utils import (
     _sanitize_phase_text,
     _sanitize_stage_output,
 )
+from .profiling import profile_run
 from .strength import get_exercise_bank as get_strength_exercise_bank
+from .tracing import record_span
 
 # PDF export is off by default; set UNLXCK_ENABLE_PLAN_PDF=1 to enable.
 _PDF_ENABLED_BY_DEFAULT: bool = os.environ.get("UNLXCK_ENABLE_PLAN_PDF", "0") == "1"
@@ -101,7 +103,12 @@ class _LazyListProxy:
 exercise_bank = _LazyListProxy(get_strength_exercise_bank)
 
 
-def generate_plan_sync(data: dict, *, generate_pdf: bool | None = None):
+def generate_plan_sync(
+    data: dict,
+    *,
+    generate_pdf: bool | None = None,
+    timings: dict[str, float] | None = None,
+):
     """Generate a fight-camp plan.
 
     Parameters
@@ -113,10 +120,24 @@ def generate_plan_sync(data: dict, *, generate_pdf: bool | None = None):
         value of the ``UNLXCK_ENABLE_PLAN_PDF`` environment variable is used
         (defaults to ``False``).  Pass ``True`` explicitly to force PDF
         generation regardless of the environment flag.
+    timings:
+        Optional dict that receives the per-stage timings (seconds) recorded
+        during the run, e.g. for batch runs and benchmarks.
     """
+    with profile_run("generate_plan_sync", data):
+        return _generate_plan_sync(data, generate_pdf=generate_pdf, timings=timings)
+
+
+def _generate_plan_sync(
+    data: dict,
+    *,
+    generate_pdf: bool | None,
+    timings: dict[str, float] | None,
+):
     configure_logging()
     logger = logging.getLogger(__name__)
-    timings: dict[str, float] = {}
+    if timings is None:
+        timings = {}
 
     if generate_pdf is None:
         generate_pdf = _PDF_ENABLED_BY_DEFAULT
@@ -124,6 +145,7 @@ def generate_plan_sync(data: dict, *, generate_pdf: bool | None = None):
     def _record_timing(label: str, start: float) -> None:
         elapsed = perf_counter() - start
         timings[label] = elapsed
+        record_span(f"stage1.{label}", start)
         logger.info("[timing] %s=%.2fs", label, elapsed)
 
     timer_start = perf_counter()
@@ -148,8 +170,14 @@ def generate_plan_sync(data: dict, *, generate_pdf: bool | None = None):
         )
 
     timer_start = perf_counter()
-    triage_result = triage_injuries(plan_input)
+    triage_result, triage_cache_hit = lookup_injury_triage(plan_input)
     _record_timing("injury_triage", timer_start)
+    # Reported to callers only: the Stage 2 payload must not differ between a
+    # first run and a cached rerun of the same intake.
+    parsing_metadata = {
+        **plan_input.parsing_metadata,
+        "injury_triage": {"source": "cache" if triage_cache_hit else "computed"},
+    }
     triage_mode = str(triage_result.mode or "").strip().lower()
     triage_resume_override_applied = _triage_resume_override_allows_continuation(
         data,
@@ -157,7 +185,7 @@ def generate_plan_sync(data: dict, *, generate_pdf: bool | None = None):
     )
     if triage_result.mode != FULL_PLAN and not triage_resume_override_applied:
         blocked = blocked_mode_output(triage=triage_result)
-        blocked["parsing_metadata"] = plan_input.parsing_metadata
+        blocked["parsing_metadata"] = parsing_metadata
         return blocked
 
     timer_start = perf_counter()
@@ -219,7 +247,7 @@ def generate_plan_sync(data: dict, *, generate_pdf: bool | None = None):
         "stage2_payload": stage2_payload,
         "planning_brief": planning_brief,
         "stage2_handoff_text": stage2_handoff_text,
-        "parsing_metadata": plan_input.parsing_metadata,
+        "parsing_metadata": parsing_metadata,
     }
     if triage_resume_override_applied:
         why_log = result.get("why_log")
@@ -9,6 +9,8 @@ Import from here. Do not redefine locally.
 """
 from __future__ import annotations
 
+import hashlib
+import json
 import re
 from typing import Any
 
@@ -136,3 +138,11 @@ def ordered_weekdays(values: Any) -> list[str]:
         if k and k not in seen:
             seen[k] = v.strip()
     return sorted(seen.values(), key=lambda d: (WEEKDAY_ORDER.get(d.lower(), 99), d.lower()))
+
+
+# ── Hashing ───────────────────────────────────────────────────────────────────
+
+def stable_payload_hash(payload: Any) -> str:
+    """SHA-256 of *payload* serialised as canonical JSON (sorted keys, compact)."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
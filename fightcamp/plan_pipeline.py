@@ -25,6 +25,7 @@ from .plan_pipeline_runtime import (
     _normalize_selection_format,
     build_runtime_context,
     prime_plan_banks,
+    reload_plan_banks,
 )
 
 
@@ -67,5 +68,6 @@ __all__ = [
     'export_plan_pdf',
     'generate_plan_blocks',
     'prime_plan_banks',
+    'reload_plan_banks',
     'render_plan_bundle',
 ]
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import contextvars
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
 from time import perf_counter
+from typing import Any, Callable
 
 from .coach_review import run_coach_review
 from .conditioning import generate_conditioning_block
@@ -23,10 +28,62 @@ from .rehab_protocols import (
     generate_support_notes,
 )
 from .strength import generate_strength_block
+from .tracing import span
 from .training_context import TrainingContext, allocate_sessions
 
-def _build_phase_mindsets(training_context: TrainingContext) -> tuple[dict[str, str], dict[str, str]]:
-    phase_mindset_cues = get_phase_mindset_cues(training_context.mental_block)
+# Independent plan units (conditioning per phase, the rehab/support bundle and
+# the phase mindsets) run on a shared, process-wide thread pool while strength
+# keeps its cross-phase ``prev_exercises`` chain on the calling thread.  A
+# process pool does not pay off here: every unit reads the full banks carried
+# on PlanRuntimeContext, which would have to be pickled per request.
+# Set UNLXCK_PLAN_BLOCK_WORKERS=0 to run every unit serially.
+_PLAN_BLOCK_WORKERS = max(0, int(os.environ.get("UNLXCK_PLAN_BLOCK_WORKERS", "4")))
+_PLAN_BLOCK_EXECUTOR: ThreadPoolExecutor | None = None
+_PLAN_BLOCK_EXECUTOR_LOCK = Lock()
+
+
+def _plan_block_executor() -> ThreadPoolExecutor | None:
+    global _PLAN_BLOCK_EXECUTOR
+    if _PLAN_BLOCK_WORKERS <= 0:
+        return None
+    with _PLAN_BLOCK_EXECUTOR_LOCK:
+        if _PLAN_BLOCK_EXECUTOR is None:
+            _PLAN_BLOCK_EXECUTOR = ThreadPoolExecutor(
+                max_workers=_PLAN_BLOCK_WORKERS,
+                thread_name_prefix="plan-blocks",
+            )
+    return _PLAN_BLOCK_EXECUTOR
+
+
+def _timed_unit(key: str, unit: Callable[[], Any]) -> Callable[[], tuple[Any, float]]:
+    def _run() -> tuple[Any, float]:
+        start = perf_counter()
+        with span(f"plan_blocks.{key}"):
+            result = unit()
+        return result, perf_counter() - start
+
+    return _run
+
+
+def _start_units(units: dict[str, Callable[[], Any]]) -> Callable[[], dict[str, tuple[Any, float]]]:
+    """Start *units* and return a collector yielding ``{key: (result, elapsed)}``.
+
+    With the shared executor the units start immediately (carrying the caller's
+    log context); without it they run lazily, in insertion order, when the
+    collector is called.  Results are always merged in insertion order.
+    """
+    timed_units = {key: _timed_unit(key, unit) for key, unit in units.items()}
+    executor = _plan_block_executor()
+    if executor is None:
+        return lambda: {key: unit() for key, unit in timed_units.items()}
+    futures = {
+        key: executor.submit(contextvars.copy_context().run, unit)
+        for key, unit in timed_units.items()
+    }
+    return lambda: {key: future.result() for key, future in futures.items()}
+
+
+def _build_phase_mindset_texts(training_context: TrainingContext) -> dict[str, str]:
     phase_mindsets: dict[str, str] = {}
     # Compute once; reused for every non-generic phase below.
     base_flags = training_context.to_flags()
@@ -40,7 +97,7 @@ def _build_phase_mindsets(training_context: TrainingContext) -> tuple[dict[str,
         else:
             phase_mindsets[phase] = get_mindset_by_phase(phase, {"mental_block": ["generic"]})
 
-    return phase_mindset_cues, phase_mindsets
+    return phase_mindsets
 
 
 def _generate_strength_blocks(context: PlanRuntimeContext, phase_mindset_cues: dict[str, str]) -> tuple[dict[str, dict | None], dict[str, list[dict]]]:
@@ -83,62 +140,73 @@ def _generate_strength_blocks(context: PlanRuntimeContext, phase_mindset_cues: d
     return strength_blocks, strength_reason_log
 
 
-def _generate_conditioning_blocks(context: PlanRuntimeContext) -> tuple[dict[str, dict], dict[str, list[dict]]]:
-    conditioning_blocks: dict[str, dict] = {}
-    conditioning_reason_log: dict[str, list[dict]] = {}
-    # Compute once per request; spread into per-phase flags dict below.
+def _generate_conditioning_phase_block(context: PlanRuntimeContext, phase: str, base_flags: dict) -> dict:
+    (
+        block_text,
+        names,
+        reasons,
+        grouped_drills,
+        missing_systems,
+        candidate_reservoir,
+    ) = generate_conditioning_block(
+        {
+            **base_flags,
+            "phase": phase,
+            "sport": context.mapped_format,
+            "random_seed": context.random_seed,
+            "time_to_fight_days": context.plan_input.days_until_fight,
+            "weeks_out": context.plan_input.weeks_out,
+            "restrictions": context.plan_input.restrictions,
+            "ignore_restrictions": context.selection_ignore_restrictions,
+        }
+    )
+    render_metadata = {
+        "num_sessions": allocate_sessions(context.training_context.training_frequency, phase).get("conditioning", 1),
+        "diagnostic_context": {
+            "phase": phase,
+            "sport": context.mapped_format,
+            "time_to_fight_days": context.plan_input.days_until_fight,
+            "days_until_fight": context.plan_input.days_until_fight,
+            "weeks_out": context.plan_input.weeks_out,
+            "fatigue_level": context.training_context.fatigue,
+            "injuries": context.training_context.injuries,
+            "fight_format": context.training_context.fight_format,
+        },
+        "sport": context.mapped_format,
+    }
+    return {
+        "block": block_text,
+        "names": names,
+        "why_log": reasons,
+        "grouped_drills": grouped_drills,
+        "missing_systems": missing_systems,
+        "candidate_reservoir": candidate_reservoir,
+        "phase_color": PHASE_COLORS[phase],
+        "num_sessions": render_metadata.get("num_sessions", 1),
+        "diagnostic_context": render_metadata.get("diagnostic_context", {}),
+        "sport": render_metadata.get("sport"),
+    }
+
+
+def _conditioning_units(context: PlanRuntimeContext) -> dict[str, Callable[[], dict]]:
+    # Compute once per request; spread into per-phase flags dict by each unit.
     base_flags = context.training_context.to_flags()
+    return {
+        phase: (lambda phase=phase: _generate_conditioning_phase_block(context, phase, base_flags))
+        for phase in PHASES
+        if context.phase_active(phase)
+    }
 
+
+def _merge_conditioning_blocks(phase_blocks: dict[str, dict]) -> tuple[dict[str, dict], dict[str, list[dict]]]:
+    conditioning_blocks: dict[str, dict] = {}
+    conditioning_reason_log: dict[str, list[dict]] = {}
     for phase in PHASES:
-        if not context.phase_active(phase):
+        block = phase_blocks.get(phase)
+        if block is None:
             continue
-        (
-            block_text,
-            names,
-            reasons,
-            grouped_drills,
-            missing_systems,
-            candidate_reservoir,
-        ) = generate_conditioning_block(
-            {
-                **base_flags,
-                "phase": phase,
-                "sport": context.mapped_format,
-                "random_seed": context.random_seed,
-                "time_to_fight_days": context.plan_input.days_until_fight,
-                "weeks_out": context.plan_input.weeks_out,
-                "restrictions": context.plan_input.restrictions,
-                "ignore_restrictions": context.selection_ignore_restrictions,
-            }
-        )
-        render_metadata = {
-            "num_sessions": allocate_sessions(context.training_context.training_frequency, phase).get("conditioning", 1),
-            "diagnostic_context": {
-                "phase": phase,
-                "sport": context.mapped_format,
-                "time_to_fight_days": context.plan_input.days_until_fight,
-                "days_until_fight": context.plan_input.days_until_fight,
-                "weeks_out": context.plan_input.weeks_out,
-                "fatigue_level": context.training_context.fatigue,
-                "injuries": context.training_context.injuries,
-                "fight_format": context.training_context.fight_format,
-            },
-            "sport": context.mapped_format,
-        }
-        conditioning_reason_log[phase] = reasons
-        conditioning_blocks[phase] = {
-            "block": block_text,
-            "names": names,
-            "why_log": reasons,
-            "grouped_drills": grouped_drills,
-            "missing_systems": missing_systems,
-            "candidate_reservoir": candidate_reservoir,
-            "phase_color": PHASE_COLORS[phase],
-            "num_sessions": render_metadata.get("num_sessions", 1),
-            "diagnostic_context": render_metadata.get("diagnostic_context", {}),
-            "sport": render_metadata.get("sport"),
-        }
-
+        conditioning_reason_log[phase] = block["why_log"]
+        conditioning_blocks[phase] = block
     return conditioning_blocks, conditioning_reason_log
 
 
@@ -265,10 +333,6 @@ def generate_plan_blocks(
     record_timing: TimingRecorder,
     logger: logging.Logger,
 ) -> PlanBlocksBundle:
-    timer_start = perf_counter()
-    phase_mindset_cues, phase_mindsets = _build_phase_mindsets(context.training_context)
-    record_timing("mindset", timer_start)
-
     logger.info(
         "[stage] selection_ignore_restrictions=%s restrictions_present=%s restrictions_count=%d",
         context.selection_ignore_restrictions,
@@ -276,15 +340,36 @@ def generate_plan_blocks(
         len(context.plan_input.restrictions or []),
     )
 
+    # Strength needs the mindset cues, so only the per-phase mindset text runs
+    # alongside it.  Unit keys double as the deterministic merge order.
+    phase_mindset_cues = get_phase_mindset_cues(context.training_context.mental_block)
+    conditioning_units = _conditioning_units(context)
+    collect_units = _start_units(
+        {
+            "mindset": lambda: _build_phase_mindset_texts(context.training_context),
+            **{f"conditioning:{phase}": unit for phase, unit in conditioning_units.items()},
+            "rehab_support_bundle": lambda: _generate_rehab_support_bundle(context),
+        }
+    )
+
     timer_start = perf_counter()
-    strength_blocks, strength_reason_log = _generate_strength_blocks(context, phase_mindset_cues)
+    with span("plan_blocks.strength"):
+        strength_blocks, strength_reason_log = _generate_strength_blocks(context, phase_mindset_cues)
     record_timing("strength", timer_start)
 
-    timer_start = perf_counter()
-    conditioning_blocks, conditioning_reason_log = _generate_conditioning_blocks(context)
-    record_timing("conditioning", timer_start)
+    unit_results = collect_units()
+    # Each unit reports its own elapsed time so stage timings stay comparable
+    # with the serial path even when units overlap.
+    phase_mindsets, mindset_elapsed = unit_results["mindset"]
+    record_timing("mindset", perf_counter() - mindset_elapsed)
 
-    timer_start = perf_counter()
+    conditioning_elapsed = sum(unit_results[f"conditioning:{phase}"][1] for phase in conditioning_units)
+    conditioning_blocks, conditioning_reason_log = _merge_conditioning_blocks(
+        {phase: unit_results[f"conditioning:{phase}"][0] for phase in conditioning_units}
+    )
+    record_timing("conditioning", perf_counter() - conditioning_elapsed)
+
+    rehab_support_bundle, rehab_elapsed = unit_results["rehab_support_bundle"]
     (
         rehab_blocks,
         guardrails,
@@ -293,8 +378,8 @@ def generate_plan_blocks(
         current_phase,
         recovery_block,
         nutrition_block,
-    ) = _generate_rehab_support_bundle(context)
-    record_timing("rehab_support_bundle", timer_start)
+    ) = rehab_support_bundle
+    record_timing("rehab_support_bundle", perf_counter() - rehab_elapsed)
 
     timer_start = perf_counter()
     coach_review_notes, strength_blocks, conditioning_blocks, substitutions = run_coach_review(
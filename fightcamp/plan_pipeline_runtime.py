@@ -6,6 +6,8 @@ from dataclasses import dataclass
 from time import perf_counter
 from typing import Any, Callable
 
+from .bank_registry import BANK_REGISTRY
+from .bank_snapshot import prime_from_snapshot
 from .camp_phases import calculate_phase_weeks
 from .conditioning import (
     get_conditioning_bank,
@@ -86,14 +88,17 @@ TimingRecorder = Callable[[str, float], None]
 # unsynchronised. In multi-worker deployments (for example uvicorn --workers 2),
 # each worker warms its own in-memory caches on first use. In a rare concurrent
 # cold-start race, two threads in the same process could both run the cold path;
-# this is acceptable because the bank loaders are idempotent.
+# this is acceptable because the bank loaders are idempotent. reload_plan_banks()
+# clears the flag after a hot reload so the derived indexes are re-primed.
 _BANKS_WARM: bool = False
 
 
 def prime_plan_banks(*, logger: logging.Logger | None = None) -> None:
     """Prime all plan banks, loading JSON data into memory the first time.
 
-    On the first call (cold path) all three bank modules are primed and a
+    On the first call (cold path) the banks are installed from the prebuilt
+    snapshot when it is fresh (see ``fightcamp/bank_snapshot.py``), otherwise
+    loaded from JSON; then all three bank modules are primed and a
     module-level flag is set.  Subsequent calls (warm path) short-circuit
     immediately, logging a lightweight debug message rather than re-entering
     each bank's load function.
@@ -107,11 +112,38 @@ def prime_plan_banks(*, logger: logging.Logger | None = None) -> None:
         _log.debug("[bank-prime] path=warm (all caches populated, skipping)")
         return
     _t = perf_counter()
+    source = "snapshot" if prime_from_snapshot() else "json"
     prime_strength_banks()
     prime_conditioning_banks()
     prime_rehab_bank()
     _BANKS_WARM = True
-    _log.info("[bank-prime] path=cold elapsed=%.3fs", perf_counter() - _t)
+    _log.info("[bank-prime] path=cold source=%s elapsed=%.3fs", source, perf_counter() - _t)
+
+
+def reload_plan_banks(*, force: bool = False, logger: logging.Logger | None = None) -> list[str]:
+    """Reload banks whose JSON changed on disk and re-prime the derived indexes.
+
+    The registry builds the new banks before swapping them in and its swap
+    callbacks drop every derived cache (including injury decisions); the
+    warm flag is then reset so ``prime_plan_banks`` rebuilds the conditioning
+    views before the next request needs them. Returns the reloaded bank
+    names (every loaded bank with *force*).
+    """
+    global _BANKS_WARM
+    _log = logger or logging.getLogger(__name__)
+    _t = perf_counter()
+    reloaded = BANK_REGISTRY.refresh(force=force)
+    if not reloaded:
+        return []
+    _BANKS_WARM = False
+    prime_plan_banks(logger=_log)
+    _log.info(
+        "[bank-reload] banks=%s generation=%d elapsed=%.3fs",
+        ",".join(reloaded),
+        BANK_REGISTRY.generation,
+        perf_counter() - _t,
+    )
+    return reloaded
 
 
 @dataclass(frozen=True)
@@ -0,0 +1,98 @@
+"""Process warm-up, heap freezing and memory reporting for forked workers.
+
+``api/preload_server.py`` calls :func:`warm_process` and :func:`freeze_heap`
+in the parent before forking its uvicorn workers, so the banks, the spaCy
+pipeline, the injury PhraseMatchers and the regex config are built once and
+shared copy-on-write. ``gc.freeze()`` moves everything allocated so far into
+the permanent generation; without it the first collection in each child walks
+(and so writes to) every object header, un-sharing the pages.
+
+Nothing called here may start threads or open network connections: the
+children inherit the parent's memory, not its threads or sockets' state.
+"""
+
+from __future__ import annotations
+
+import gc
+import logging
+import os
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+from .injury_synonyms import get_matchers, get_nlp
+from .plan_pipeline_runtime import prime_plan_banks
+from .regex_config import _load_regex_config
+from .tagging import get_tag_vocabulary
+
+logger = logging.getLogger(__name__)
+
+# smaps_rollup fields reported, all in KiB.
+_SMAPS_FIELDS = {
+    "Rss": "rss_kib",
+    "Pss": "pss_kib",
+    "Shared_Clean": "shared_clean_kib",
+    "Shared_Dirty": "shared_dirty_kib",
+    "Private_Clean": "private_clean_kib",
+    "Private_Dirty": "private_dirty_kib",
+    "Swap": "swap_kib",
+}
+
+
+def warm_process(*, logger: logging.Logger | None = None) -> dict[str, float]:
+    """Build every lazily-loaded process-wide resource; returns per-step seconds."""
+    _log = logger or logging.getLogger(__name__)
+    timings: dict[str, float] = {}
+
+    def _step(name: str, fn) -> None:
+        started = perf_counter()
+        fn()
+        timings[name] = round(perf_counter() - started, 4)
+
+    _step("banks", lambda: prime_plan_banks(logger=_log))
+    _step("regex_config", _load_regex_config)
+    _step("tag_vocabulary", get_tag_vocabulary)
+    _step("nlp", lambda: get_matchers(get_nlp()))
+    _log.info(
+        "[preload] warmed %s",
+        " ".join(f"{name}={elapsed:.2f}s" for name, elapsed in timings.items()),
+    )
+    return timings
+
+
+def freeze_heap() -> int:
+    """Collect, then move every live object to the permanent GC generation."""
+    gc.collect()
+    gc.freeze()
+    return gc.get_freeze_count()
+
+
+def memory_report(pid: int | None = None) -> dict[str, Any]:
+    """RSS/PSS breakdown of ``pid`` (default: this process).
+
+    PSS splits shared pages between the processes mapping them, so summing
+    it across workers gives the real footprint; ``shared_*`` is what
+    copy-on-write sharing is saving.
+    """
+    pid = os.getpid() if pid is None else pid
+    report: dict[str, Any] = {"pid": pid}
+    if pid == os.getpid():
+        report["gc_frozen"] = gc.get_freeze_count()
+    try:
+        lines = Path(f"/proc/{pid}/smaps_rollup").read_text(encoding="utf-8").splitlines()
+    except OSError:
+        if pid == os.getpid():
+            import resource  # POSIX only; /proc is missing on macOS
+
+            report["max_rss_kib"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return report
+    for line in lines:
+        field, _, value = line.partition(":")
+        key = _SMAPS_FIELDS.get(field.strip())
+        if key is not None:
+            report[key] = int(value.split()[0])
+    return report
+
+
+def format_memory_report(report: dict[str, Any]) -> str:
+    return " ".join(f"{key}={value}" for key, value in report.items())
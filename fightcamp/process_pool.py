@@ -0,0 +1,63 @@
+"""Long-lived ``spawn`` process pools for batch work inside the API server.
+
+The API process is multithreaded (request threads, the bank reload watcher,
+Stage 2 clients), so forking it could copy locks held by other threads into
+the children. :class:`SharedProcessPool` starts its workers with ``spawn`` on
+first use, reuses them for later requests until :meth:`shutdown` (called from
+the app lifespan) and replaces a pool broken by a dead worker.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+def default_pool_workers(env_name: str) -> int:
+    """``env_name`` as a worker count, defaulting to up to 4 CPUs."""
+    raw_value = os.getenv(env_name, "").strip()
+    if raw_value:
+        try:
+            return max(0, int(raw_value))
+        except ValueError:
+            logger.warning("[process-pool] invalid %s=%r", env_name, raw_value)
+    return min(4, os.cpu_count() or 1)
+
+
+class SharedProcessPool:
+    """Lazily started ``spawn`` pool, safe to share across server threads."""
+
+    def __init__(self, workers: int, *, initializer: Callable[[], None] | None = None):
+        self.workers = workers
+        self._initializer = initializer
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self._initializer,
+                )
+            return self._executor
+
+    def discard(self, executor: ProcessPoolExecutor) -> None:
+        """Drop a broken ``executor`` so the next :meth:`executor` call starts a new pool."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,296 @@
+"""Opt-in profiling for slow or sampled generations.
+
+``profile_run`` wraps ``generate_plan_sync`` and Stage 2 ``finalize``. It is
+configured through the environment:
+
+``UNLXCK_PROFILE_DIR``
+    Where captures are written. Profiling is off when unset.
+``UNLXCK_PROFILE_THRESHOLD_SECONDS``
+    Run a low-overhead stack sampler on every call and keep the capture only
+    when the call takes at least this long (``0`` disables).
+``UNLXCK_PROFILE_SAMPLE_PERCENT``
+    Percentage of calls (0-100) profiled with ``cProfile`` and always kept.
+
+Each capture writes a profile (``.prof`` for cProfile, ``.stacks`` collapsed
+stacks for the sampler) plus a ``.json`` sidecar holding the label, elapsed
+time, trigger and the input's content hash, never the intake itself.
+``tools/aggregate_profiles.py`` folds a directory of captures into a hot
+function table via :func:`aggregate_profiles`.
+
+cProfile only sees the calling thread (plan-block units on the thread pool
+are missed, and for async Stage 2 every task on the event loop is included);
+the sampler also walks the ``plan-blocks`` pool threads.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import logging
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+from .normalization import stable_payload_hash
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR_ENV = "UNLXCK_PROFILE_DIR"
+PROFILE_THRESHOLD_ENV = "UNLXCK_PROFILE_THRESHOLD_SECONDS"
+PROFILE_SAMPLE_PERCENT_ENV = "UNLXCK_PROFILE_SAMPLE_PERCENT"
+SAMPLER_INTERVAL_SECONDS = 0.005
+_POOL_THREAD_PREFIX = "plan-blocks"
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Only one cProfile session runs at a time (it is process-wide on 3.12+); a
+# concurrent sampled call falls back to the stack sampler instead.
+_CPROFILE_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ProfileConfig:
+    directory: Path | None
+    threshold_seconds: float
+    sample_percent: float
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None and (self.threshold_seconds > 0 or self.sample_percent > 0)
+
+
+def _env_float(name: str) -> float:
+    raw_value = os.environ.get(name, "").strip()
+    if not raw_value:
+        return 0.0
+    try:
+        return max(0.0, float(raw_value))
+    except ValueError:
+        logger.warning("[profile] invalid %s=%r; ignoring", name, raw_value)
+        return 0.0
+
+
+def profile_config() -> ProfileConfig:
+    directory = os.environ.get(PROFILE_DIR_ENV, "").strip()
+    return ProfileConfig(
+        directory=Path(directory) if directory else None,
+        threshold_seconds=_env_float(PROFILE_THRESHOLD_ENV),
+        sample_percent=min(100.0, _env_float(PROFILE_SAMPLE_PERCENT_ENV)),
+    )
+
+
+def _frame_label(code: Any) -> str:
+    filename = code.co_filename
+    try:
+        filename = Path(filename).resolve().relative_to(_REPO_ROOT).as_posix()
+    except ValueError:
+        filename = "/".join(Path(filename).parts[-2:])
+    return f"{filename}:{code.co_name}"
+
+
+class _StackSampler:
+    """Samples the target thread and the plan-block pool into collapsed stacks."""
+
+    def __init__(self, target_ident: int, interval: float = SAMPLER_INTERVAL_SECONDS):
+        self.target_ident = target_ident
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            pool_idents = {
+                thread.ident
+                for thread in threading.enumerate()
+                if thread.name.startswith(_POOL_THREAD_PREFIX)
+            }
+            self.samples += 1
+            for ident, frame in sys._current_frames().items():
+                if ident != self.target_ident and ident not in pool_idents:
+                    continue
+                labels: list[str] = []
+                while frame is not None:
+                    labels.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                # Idle pool workers sit in the executor queue; only keep them
+                # while they run repo code.
+                if ident != self.target_ident and not any(label.startswith(("fightcamp/", "api/")) for label in labels):
+                    continue
+                self.stacks[";".join(reversed(labels))] += 1
+
+
+def _capture_stem(label: str, input_hash: str) -> str:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    return f"{label}-{stamp}-{input_hash[:12]}"
+
+
+def _write_capture(
+    directory: Path,
+    *,
+    label: str,
+    input_hash: str,
+    elapsed: float,
+    trigger: str,
+    profiler: cProfile.Profile | None,
+    sampler: _StackSampler | None,
+    threshold_seconds: float,
+) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = _capture_stem(label, input_hash)
+    meta: dict[str, Any] = {
+        "label": label,
+        "input_hash": input_hash,
+        "elapsed_s": round(elapsed, 4),
+        "trigger": trigger,
+        "threshold_s": threshold_seconds,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    if profiler is not None:
+        profiler.dump_stats(directory / f"{stem}.prof")
+        meta["format"] = "cprofile"
+    if sampler is not None:
+        lines = [f"{stack} {count}" for stack, count in sampler.stacks.most_common()]
+        (directory / f"{stem}.stacks").write_text("\n".join(lines) + "\n", encoding="utf-8")
+        meta["format"] = "stacks"
+        meta["sample_interval_s"] = sampler.interval
+        meta["samples"] = sampler.samples
+    meta_path = directory / f"{stem}.json"
+    meta_path.write_text(json.dumps(meta, indent=2) + "\n", encoding="utf-8")
+    return meta_path
+
+
+@contextmanager
+def profile_run(label: str, hash_source: Any) -> Iterator[None]:
+    """Profile the enclosed call when sampled or when it turns out slow."""
+    config = profile_config()
+    if not config.enabled:
+        yield
+        return
+
+    profiler: cProfile.Profile | None = None
+    sampler: _StackSampler | None = None
+    sampled = config.sample_percent > 0 and random.random() * 100 < config.sample_percent
+    if sampled and _CPROFILE_LOCK.acquire(blocking=False):
+        profiler = cProfile.Profile()
+    elif config.threshold_seconds > 0 or sampled:
+        sampler = _StackSampler(threading.get_ident())
+    input_hash = stable_payload_hash(hash_source)
+
+    started = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    elif sampler is not None:
+        sampler.start()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            _CPROFILE_LOCK.release()
+        elif sampler is not None:
+            sampler.stop()
+        elapsed = time.perf_counter() - started
+        slow = config.threshold_seconds > 0 and elapsed >= config.threshold_seconds
+        if sampled or slow:
+            try:
+                meta_path = _write_capture(
+                    config.directory,
+                    label=label,
+                    input_hash=input_hash,
+                    elapsed=elapsed,
+                    trigger="sampled" if sampled else "threshold",
+                    profiler=profiler,
+                    sampler=sampler,
+                    threshold_seconds=config.threshold_seconds,
+                )
+                logger.info("[profile] captured label=%s elapsed=%.2fs path=%s", label, elapsed, meta_path)
+            except OSError:
+                logger.exception("[profile] capture_failed label=%s", label)
+
+
+def aggregate_profiles(directory: Path, *, label: str | None = None, top: int = 25) -> dict[str, Any]:
+    """Fold every capture in ``directory`` into hot-function tables."""
+    metas = []
+    for meta_path in sorted(directory.glob("*.json")):
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            continue
+        if label and meta.get("label") != label:
+            continue
+        metas.append((meta_path.with_suffix(""), meta))
+
+    prof_paths = [str(stem.with_suffix(".prof")) for stem, meta in metas if meta.get("format") == "cprofile"]
+    cprofile_rows: list[dict[str, Any]] = []
+    if prof_paths:
+        stats = pstats.Stats(prof_paths[0])
+        for path in prof_paths[1:]:
+            stats.add(path)
+        for (filename, line, func), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            cprofile_rows.append(
+                {
+                    "function": f"{filename}:{line}({func})",
+                    "calls": calls,
+                    "tottime_s": round(tottime, 4),
+                    "cumtime_s": round(cumtime, 4),
+                }
+            )
+        cprofile_rows.sort(key=lambda row: row["tottime_s"], reverse=True)
+
+    self_samples: Counter[str] = Counter()
+    inclusive_samples: Counter[str] = Counter()
+    for stem, meta in metas:
+        if meta.get("format") != "stacks":
+            continue
+        stacks_path = stem.with_suffix(".stacks")
+        if not stacks_path.exists():
+            continue
+        for line in stacks_path.read_text(encoding="utf-8").splitlines():
+            stack, _, count_text = line.rpartition(" ")
+            if not stack or not count_text.isdigit():
+                continue
+            count = int(count_text)
+            frames = stack.split(";")
+            self_samples[frames[-1]] += count
+            for frame in set(frames):
+                inclusive_samples[frame] += count
+    total_samples = sum(self_samples.values()) or 1
+    sampled_rows = [
+        {
+            "function": function,
+            "self_samples": self_samples[function],
+            "inclusive_samples": inclusive_samples[function],
+            "self_pct": round(100.0 * self_samples[function] / total_samples, 2),
+            "inclusive_pct": round(100.0 * inclusive_samples[function] / total_samples, 2),
+        }
+        for function in inclusive_samples
+    ]
+    sampled_rows.sort(key=lambda row: (row["self_samples"], row["inclusive_samples"]), reverse=True)
+
+    return {
+        "captures": len(metas),
+        "slowest": sorted(
+            ({"label": meta.get("label"), "input_hash": meta.get("input_hash"), "elapsed_s": meta.get("elapsed_s")} for _, meta in metas),
+            key=lambda item: float(item["elapsed_s"] or 0.0),
+            reverse=True,
+        )[:top],
+        "cprofile": cprofile_rows[:top],
+        "sampled": sampled_rows[:top],
+    }
@@ -1,7 +1,9 @@
 import json
 import logging
+from dataclasses import dataclass
 from typing import Iterable
 
+from .bank_registry import BANK_REGISTRY
 from .injury_formatting import format_injury_summary, parse_injury_entry
 from .injury_guard import INJURY_TYPE_SEVERITY, normalize_severity
 from .injury_synonyms import parse_injury_phrase, split_injury_text
@@ -22,15 +24,18 @@ logger = logging.getLogger(__name__)
 # }
 _REHAB_BANK_CACHE = None
 _REHAB_LOCATIONS_CACHE = None
-_EXERCISE_BANK_CACHE = None
+_REHAB_INDEX_CACHE = None
+_REHAB_LOCATION_CANDIDATES: dict[str | None, tuple[str, ...]] = {}
+
+
+def _load_rehab_bank() -> list[dict]:
+    return json.loads((DATA_DIR / "rehab_bank.json").read_text(encoding="utf-8"))
 
 
 def get_rehab_bank() -> list[dict]:
     global _REHAB_BANK_CACHE
     if _REHAB_BANK_CACHE is None:
-        _REHAB_BANK_CACHE = json.loads(
-            (DATA_DIR / "rehab_bank.json").read_text(encoding="utf-8")
-        )
+        _REHAB_BANK_CACHE = BANK_REGISTRY.get("rehab_bank")
     return _REHAB_BANK_CACHE
 
 
@@ -46,13 +51,23 @@ def get_rehab_locations() -> set[str]:
 def prime_rehab_bank() -> None:
     get_rehab_bank()
     get_rehab_locations()
+    get_rehab_index()
+
+
+def _reset_bank_caches(_swapped: frozenset[str]) -> None:
+    global _REHAB_BANK_CACHE, _REHAB_LOCATIONS_CACHE, _REHAB_INDEX_CACHE
+    _REHAB_BANK_CACHE = None
+    _REHAB_LOCATIONS_CACHE = None
+    _REHAB_INDEX_CACHE = None
+    _REHAB_LOCATION_CANDIDATES.clear()
+
+
+BANK_REGISTRY.on_swap(__name__, _reset_bank_caches)
 
 
 def get_exercise_bank() -> list[dict]:
-    global _EXERCISE_BANK_CACHE
-    if _EXERCISE_BANK_CACHE is None:
-        _EXERCISE_BANK_CACHE = json.loads((DATA_DIR / "exercise_bank.json").read_text(encoding="utf-8"))
-    return _EXERCISE_BANK_CACHE
+    """The shared strength exercise bank (read-only records)."""
+    return BANK_REGISTRY.get("exercise_bank")
 REHAB_LOCATION_ALIASES = {
     "biceps": ["bicep"],
     "bicep": ["biceps"],
@@ -66,6 +81,14 @@ REHAB_LOCATION_ALIASES = {
 
 
 def normalize_rehab_location(location: str | None) -> list[str]:
+    cached = _REHAB_LOCATION_CANDIDATES.get(location)
+    if cached is None:
+        cached = tuple(_rehab_location_candidates(location))
+        _REHAB_LOCATION_CANDIDATES[location] = cached
+    return list(cached)
+
+
+def _rehab_location_candidates(location: str | None) -> list[str]:
     if not location:
         return ["unspecified"]
     candidates: list[str] = []
@@ -109,6 +132,66 @@ def _split_notes_by_phase(notes: str) -> list[tuple[str, str]]:
             results.append((phase.strip().upper(), desc.strip()))
     return results
 
+
+@dataclass(frozen=True)
+class RehabPhaseEntry:
+    """A rehab bank entry as seen from one phase, drill notes already split."""
+
+    position: int  # index in the rehab bank, to merge keys back into bank order
+    entry: dict
+    drills: tuple[tuple[str, str], ...]  # (name, notes for this phase)
+
+
+@dataclass(frozen=True)
+class RehabIndex:
+    entries: dict[tuple[str, str], tuple[tuple[int, dict], ...]]  # (position, entry)
+    by_phase: dict[tuple[str, str, str], tuple[RehabPhaseEntry, ...]]
+    types: frozenset[str]
+
+
+def _phase_drills(entry: dict, phase: str) -> tuple[tuple[str, str], ...]:
+    """(name, notes) for each drill of ``entry`` that applies to ``phase``."""
+    drills = []
+    for drill in entry.get("drills", []):
+        name = drill.get("name")
+        notes = drill.get("notes", "")
+        if not name:
+            continue
+        parsed = _split_notes_by_phase(notes)
+        if not parsed:
+            drills.append((name, notes))
+            continue
+        for phase_label, text in parsed:
+            if phase_label == phase:
+                drills.append((name, text))
+                break
+    return tuple(drills)
+
+
+def _build_rehab_index(bank: list[dict]) -> RehabIndex:
+    entries: dict[tuple[str, str], list[tuple[int, dict]]] = {}
+    by_phase: dict[tuple[str, str, str], list[RehabPhaseEntry]] = {}
+    for position, entry in enumerate(bank):
+        key = (entry.get("type"), entry.get("location"))
+        entries.setdefault(key, []).append((position, entry))
+        for phase in dict.fromkeys(_entry_phases(entry)):
+            by_phase.setdefault((*key, phase), []).append(
+                RehabPhaseEntry(position, entry, _phase_drills(entry, phase))
+            )
+    return RehabIndex(
+        entries={key: tuple(items) for key, items in entries.items()},
+        by_phase={key: tuple(items) for key, items in by_phase.items()},
+        types=frozenset(itype for itype, _ in entries),
+    )
+
+
+def get_rehab_index() -> RehabIndex:
+    """Rehab bank entries keyed by (type, location) and (type, location, phase)."""
+    global _REHAB_INDEX_CACHE
+    if _REHAB_INDEX_CACHE is None:
+        _REHAB_INDEX_CACHE = _build_rehab_index(get_rehab_bank())
+    return _REHAB_INDEX_CACHE
+
 INJURY_TYPES = [
     "sprain",
     "strain",
@@ -652,38 +735,23 @@ def generate_rehab_protocols(
     lines = []
 
     for itype, loc in unique_entries:
-        loc_candidates = normalize_rehab_location(loc)
-        matches = [
-            entry
-            for entry in get_rehab_bank()
-            if (
-                entry.get("type") == itype
-                or entry.get("type") == "unspecified"
-                or itype is None
-            )
-            and (
-                entry.get("location") in loc_candidates
-                or entry.get("location") == "unspecified"
-            )
-            and current_phase.upper() in _entry_phases(entry)
-        ]
+        index = get_rehab_index()
+        phase_key = current_phase.upper()
+        type_candidates = index.types if itype is None else {itype, "unspecified"}
+        loc_candidates = set(normalize_rehab_location(loc)) | {"unspecified"}
+        matches = sorted(
+            (
+                phase_entry
+                for c_type in type_candidates
+                for c_loc in loc_candidates
+                for phase_entry in index.by_phase.get((c_type, c_loc, phase_key), ())
+            ),
+            key=lambda phase_entry: phase_entry.position,
+        )
         if matches:
             drills: list[tuple[str, str]] = []  # (name, notes_for_phase)
             for m in matches:
-                for d in m.get("drills", []):
-                    name = d.get("name")
-                    notes = d.get("notes", "")
-                    if not name:
-                        continue
-
-                    parsed = _split_notes_by_phase(notes)
-                    if parsed:
-                        for phase_label, text in parsed:
-                            if phase_label == current_phase.upper():
-                                drills.append((name, text))
-                                break
-                    else:
-                        drills.append((name, notes))
+                drills.extend(m.drills)
 
             # Apply volume ceiling.  Function classification is recorded as
             # a tag but does NOT hard-block same-function drills — the model
@@ -730,21 +798,18 @@ def combine_three_phase_drills(location: str, injury_type: str) -> list[dict]:
         if phase_list[1] in phases and phases[phase_list[1]] is None:
             phases[phase_list[1]] = drills[1]
 
-    for entry in get_rehab_bank():
-        if entry.get("type") != injury_type:
-            continue
-        if entry.get("location") in location_candidates:
+    index = get_rehab_index()
+    for c_type in (injury_type, "unspecified"):
+        # Entries for every location alias, merged back into bank order.
+        entries = sorted(
+            item for c_loc in set(location_candidates) for item in index.entries.get((c_type, c_loc), ())
+        )
+        for _position, entry in entries:
             apply_entry(entry)
             if all(phases.values()):
                 break
-    if not all(phases.values()):
-        for entry in get_rehab_bank():
-            if entry.get("type") != "unspecified":
-                continue
-            if entry.get("location") in location_candidates:
-                apply_entry(entry)
-                if all(phases.values()):
-                    break
+        if all(phases.values()):
+            break
 
     if all(phases.values()):
         return [phases["GPP"], phases["SPP"], phases["TAPER"]]
@@ -959,27 +1024,7 @@ def build_coach_review_entries(
 def _rehab_drills_for_phase(itype: str, loc: str | None, phase: str, limit: int = 4) -> list[str]:
     phase = phase.upper()
     drills: list[str] = []
-
-    def _append_drills(entry):
-        for drill in entry.get("drills", []):
-            name = drill.get("name")
-            notes = drill.get("notes", "")
-            if not name:
-                continue
-            parsed = _split_notes_by_phase(notes)
-            if parsed:
-                for phase_label, text in parsed:
-                    if phase_label == phase:
-                        entry_text = name if not text else f"{name} – {text}"
-                        if entry_text not in drills:
-                            drills.append(entry_text)
-                        break
-            else:
-                entry_text = name if not notes else f"{name} – {notes}"
-                if entry_text not in drills:
-                    drills.append(entry_text)
-            if len(drills) >= limit:
-                return
+    by_phase = get_rehab_index().by_phase
 
     loc_candidates = normalize_rehab_location(loc)
     type_candidates = [itype, "unspecified"]
@@ -989,16 +1034,13 @@ def _rehab_drills_for_phase(itype: str, loc: str | None, phase: str, limit: int
             if (c_type, c_loc) in seen_keys:
                 continue
             seen_keys.add((c_type, c_loc))
-            for entry in get_rehab_bank():
-                if entry.get("type") != c_type:
-                    continue
-                if entry.get("location") != c_loc:
-                    continue
-                if phase not in _entry_phases(entry):
-                    continue
-                _append_drills(entry)
-                if len(drills) >= limit:
-                    return drills[:limit]
+            for phase_entry in by_phase.get((c_type, c_loc, phase), ()):
+                for name, notes in phase_entry.drills:
+                    entry_text = name if not notes else f"{name} – {notes}"
+                    if entry_text not in drills:
+                        drills.append(entry_text)
+                    if len(drills) >= limit:
+                        return drills[:limit]
     return drills[:limit]
 
 
@@ -0,0 +1,290 @@
+"""Deterministic local fixes for mechanically fixable Stage 2 validator items.
+
+Some validator findings do not need a model retry: the right replacement is
+already in the planning brief. :func:`apply_stage2_autofixes` rewrites only
+the flagged lines of a plan:
+
+- ``restriction_violation``: swap the named candidate for the first option in
+  the same candidate slot that clears every restriction and the athlete's
+  equipment;
+- ``equipment_incongruent_selection``: swap the named candidate for a same-slot
+  option the athlete has equipment for;
+- ``overstyled_drill_name``: drop the overstyled label when the line already
+  names its Stage 1 candidate;
+- ``sport_language_leak``: substitute the athlete's sport terms
+  (``SPORT_TERM_REPLACEMENTS``), leaving terms that are part of a candidate or
+  bank exercise name on the line untouched.
+
+Each replacement line is checked against the restriction guard before it is
+used; a finding with no safe fix is left for the model retry.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable
+
+from .bank_registry import BANK_REGISTRY
+from .normalization import phrase_in_text
+from .stage2_section_repair import split_plan_sections
+from .stage2_validator import (
+    _BULLET_PREFIX,
+    _OVERSTYLED_PATTERNS,
+    _SPORT_LANGUAGE_LEAKS,
+    _athlete_snapshot,
+    _find_restricted_hits,
+    _normalize_equipment_set,
+)
+
+# Plain replacements for the validator's sport-language leak terms, longest
+# first so "thai clinch" wins over shorter overlaps. "single-leg" has no
+# replacement: it is far more often a lift stance (Single-Leg RDL) than a
+# takedown, so those lines are left for the model.
+SPORT_TERM_REPLACEMENTS = {
+    "boxing": {
+        "ground and pound": "downward punching",
+        "thai clinch": "inside tie-up",
+        "clinch knee": "inside tie-up",
+        "double-leg": "level change",
+        "double leg": "level change",
+        "grappling": "tie-up work",
+        "takedown": "level change",
+        "octagon": "ring",
+        "sprawl": "drop step",
+        "cage": "ring",
+    }
+}
+
+_FIX_ORDER = (
+    "restriction_violation",
+    "equipment_incongruent_selection",
+    "overstyled_drill_name",
+    "sport_language_leak",
+)
+_LEADING_SEPARATORS = " :-–—|,"
+
+
+def _match_case(source: str, replacement: str) -> str:
+    return replacement[:1].upper() + replacement[1:] if source[:1].isupper() else replacement
+
+
+@lru_cache(maxsize=1024)
+def _name_pattern(name: str) -> re.Pattern[str]:
+    parts = [re.escape(part) for part in re.split(r"[\s-]+", name.strip()) if part]
+    return re.compile(r"\b" + r"[\s-]+".join(parts) + r"\b", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class _FixContext:
+    planning_brief: dict
+    slots_by_phase: dict[str, list[list[dict]]]
+    athlete_equipment: frozenset[str]
+    plan_text: str
+    sport: str
+    protected_names: tuple[str, ...] = ()
+
+    def equipment_ok(self, option: dict) -> bool:
+        required = _normalize_equipment_set(option.get("required_equipment", []))
+        return bool(option.get("universally_available")) or required <= self.athlete_equipment
+
+    def line_is_compliant(self, line: str) -> bool:
+        return not _find_restricted_hits(self.planning_brief, [line])
+
+    def candidate_names(self, phase: str) -> list[str]:
+        phases = [phase] if phase in self.slots_by_phase else list(self.slots_by_phase)
+        return [
+            str(option.get("name") or "").strip()
+            for key in phases
+            for options in self.slots_by_phase[key]
+            for option in options
+            if str(option.get("name") or "").strip()
+        ]
+
+
+def _fix_context(planning_brief: dict, plan_text: str) -> _FixContext:
+    slots_by_phase: dict[str, list[list[dict]]] = defaultdict(list)
+    for phase, phase_pool in (planning_brief.get("candidate_pools") or {}).items():
+        for slot_group in ("strength_slots", "conditioning_slots", "rehab_slots"):
+            for slot in (phase_pool or {}).get(slot_group, []) or []:
+                options = [slot.get("selected") or {}] + list(slot.get("alternates") or [])
+                options = [option for option in options if str(option.get("name") or "").strip()]
+                if options:
+                    slots_by_phase[str(phase).upper()].append(options)
+    athlete = _athlete_snapshot(planning_brief)
+    sport = str(
+        athlete.get("sport") or (planning_brief.get("sport_load_profile", {}) or {}).get("key") or ""
+    ).strip().lower()
+    leaks = _SPORT_LANGUAGE_LEAKS.get(sport, set())
+    candidate_names = {
+        str(option["name"]).strip() for slots in slots_by_phase.values() for options in slots for option in options
+    }
+    return _FixContext(
+        planning_brief=planning_brief,
+        slots_by_phase=dict(slots_by_phase),
+        athlete_equipment=frozenset(_normalize_equipment_set(athlete.get("equipment", []))),
+        plan_text=plan_text.lower(),
+        sport=sport,
+        protected_names=tuple(
+            sorted(
+                {name for name in candidate_names if any(term in name.lower() for term in leaks)}
+                | set(_bank_names_with_leaks(sport, BANK_REGISTRY.generation)),
+                key=len,
+                reverse=True,
+            )
+        ),
+    )
+
+
+@lru_cache(maxsize=8)
+def _bank_names_with_leaks(sport: str, _generation: int) -> tuple[str, ...]:
+    """Bank exercise names containing one of ``sport``'s leak terms."""
+    leaks = _SPORT_LANGUAGE_LEAKS.get(sport, set())
+    if not leaks:
+        return ()
+    names: set[str] = set()
+    for bank in BANK_REGISTRY.names:
+        items = BANK_REGISTRY.get(bank)
+        if not isinstance(items, (list, tuple)):
+            continue
+        for item in items:
+            name = str(item.get("name") or "").strip() if isinstance(item, dict) else ""
+            if name and any(term in name.lower() for term in leaks):
+                names.add(name)
+    return tuple(names)
+
+
+def _swap_slot_option(
+    context: _FixContext, line: str, phase: str, needs_swap: Callable[[dict], bool]
+) -> tuple[str, str, str] | None:
+    """``(fixed_line, from_name, to_name)`` swapping a flagged option for a same-slot one."""
+    phases = [phase] if phase in context.slots_by_phase else list(context.slots_by_phase)
+    for key in phases:
+        for options in context.slots_by_phase[key]:
+            for option in options:
+                name = str(option["name"]).strip()
+                if not phrase_in_text(line, name) or not needs_swap(option):
+                    continue
+                replacements = [
+                    other
+                    for other in options
+                    if other is not option and context.equipment_ok(other) and not phrase_in_text(line, other["name"])
+                ]
+                # Prefer options the plan does not already use elsewhere.
+                replacements.sort(key=lambda other: phrase_in_text(context.plan_text, other["name"]))
+                for replacement in replacements:
+                    to_name = str(replacement["name"]).strip()
+                    fixed = _name_pattern(name).sub(lambda _match: to_name, line)
+                    if context.line_is_compliant(fixed):
+                        return fixed, name, to_name
+    return None
+
+
+def _fix_restriction(context: _FixContext, line: str, item: dict, phase: str) -> tuple[str, str, str] | None:
+    return _swap_slot_option(context, line, phase, lambda _option: True)
+
+
+def _fix_equipment(context: _FixContext, line: str, item: dict, phase: str) -> tuple[str, str, str] | None:
+    return _swap_slot_option(context, line, str(item.get("phase") or phase), lambda option: not context.equipment_ok(option))
+
+
+def _fix_overstyled_name(context: _FixContext, line: str, item: dict, phase: str) -> tuple[str, str, str] | None:
+    names = [name for name in context.candidate_names(phase) if phrase_in_text(line, name)]
+    labels = [match.group(0) for pattern in _OVERSTYLED_PATTERNS for match in pattern.finditer(line)]
+    if not names or not labels:
+        return None
+    fixed = line
+    for pattern in _OVERSTYLED_PATTERNS:
+        fixed = pattern.sub("", fixed)
+    name = max(names, key=len)
+    fixed = re.sub(r"\(\s*(" + _name_pattern(name).pattern + r")\s*\)", r"\1", fixed, flags=re.IGNORECASE)
+    fixed = re.sub(r"\(\s*\)|\"\s*\"|'\s*'", "", fixed)
+    fixed = re.sub(r"\s{2,}", " ", fixed).strip(_LEADING_SEPARATORS)
+    if not phrase_in_text(fixed, name) or any(pattern.search(fixed) for pattern in _OVERSTYLED_PATTERNS):
+        return None
+    return fixed, ", ".join(labels), name
+
+
+def _fix_sport_language(context: _FixContext, line: str, item: dict, phase: str) -> tuple[str, str, str] | None:
+    replacements = SPORT_TERM_REPLACEMENTS.get(context.sport)
+    if not replacements:
+        return None
+    # Exercise names are never rewritten: "Sprawl-to-Burpee" stays a real drill.
+    protected = [match.span() for name in context.protected_names for match in _name_pattern(name).finditer(line)]
+    terms = sorted(replacements, key=len, reverse=True)
+    pattern = re.compile(r"\b(?:" + "|".join(re.escape(term) for term in terms) + r")\b", re.IGNORECASE)
+    replaced: list[str] = []
+
+    def _replace(match: re.Match[str]) -> str:
+        if any(start < match.end() and match.start() < end for start, end in protected):
+            return match.group(0)
+        term = match.group(0).lower()
+        replaced.append(term)
+        return _match_case(match.group(0), replacements[term])
+
+    fixed = pattern.sub(_replace, line)
+    remainder = fixed.lower()
+    for name in context.protected_names:
+        remainder = _name_pattern(name).sub(" ", remainder)
+    leaks = _SPORT_LANGUAGE_LEAKS.get(context.sport, set())
+    if not replaced or any(term in remainder for term in leaks) or not context.line_is_compliant(fixed):
+        return None
+    replaced = list(dict.fromkeys(replaced))
+    return fixed, ", ".join(replaced), ", ".join(dict.fromkeys(replacements[term] for term in replaced))
+
+
+_FIXERS: dict[str, tuple[str, Callable[[_FixContext, str, dict, str], tuple[str, str, str] | None]]] = {
+    "restriction_violation": ("swap_restricted_option", _fix_restriction),
+    "equipment_incongruent_selection": ("swap_equipment_alternate", _fix_equipment),
+    "overstyled_drill_name": ("rename_to_candidate", _fix_overstyled_name),
+    "sport_language_leak": ("replace_sport_terms", _fix_sport_language),
+}
+
+
+def apply_stage2_autofixes(*, planning_brief: dict, final_plan_text: str, validator_report: dict) -> tuple[str, list[dict]]:
+    """Return ``(fixed_plan_text, fixes)``; the text is unchanged when nothing was fixable."""
+    items_by_line: dict[str, list[dict]] = defaultdict(list)
+    for item in list(validator_report.get("errors") or []) + list(validator_report.get("warnings") or []):
+        line = str(item.get("line") or "").strip()
+        if line and item.get("code") in _FIXERS:
+            items_by_line[line.lower()].append(item)
+    if not items_by_line:
+        return final_plan_text, []
+
+    context = _fix_context(planning_brief, final_plan_text)
+    lines: list[str] = []
+    fixes: list[dict] = []
+    recorded: set[tuple[str, str]] = set()
+    for section in split_plan_sections(final_plan_text):
+        for raw_line in section.lines:
+            cleaned = _BULLET_PREFIX.sub("", raw_line).strip()
+            items = items_by_line.get(cleaned.lower())
+            if not items:
+                lines.append(raw_line)
+                continue
+            current = cleaned
+            for item in sorted(items, key=lambda entry: _FIX_ORDER.index(entry["code"])):
+                action, fixer = _FIXERS[item["code"]]
+                result = fixer(context, current, item, section.key)
+                if result is None or result[0] == current:
+                    continue
+                fixed_line, from_text, to_text = result
+                if (item["code"], cleaned.lower()) not in recorded:
+                    recorded.add((item["code"], cleaned.lower()))
+                    fixes.append(
+                        {
+                            "code": item["code"],
+                            "action": action,
+                            "line": current,
+                            "fixed_line": fixed_line,
+                            "from": from_text,
+                            "to": to_text,
+                        }
+                    )
+                current = fixed_line
+            lines.append(raw_line.replace(cleaned, current, 1) if current != cleaned else raw_line)
+    if not fixes:
+        return final_plan_text, []
+    return "\n".join(lines), fixes
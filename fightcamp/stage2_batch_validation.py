@@ -0,0 +1,184 @@
+"""Batch Stage 2 validation for admin review and validator rule changes.
+
+Takes ``{"plan_id", "final_plan_text", "planning_brief"}`` items, runs
+:func:`fightcamp.stage2_pipeline.review_stage2_output` on each and returns one
+compact record per plan: status, counts, failing codes and only the failing
+validator items. Items fan out across a process pool with a bounded number in
+flight, so a lazily paged source (the whole plans table) never sits in memory
+at once.
+
+Briefs may be dicts or the JSON text stored in the plans table; they are cut
+down to :data:`VALIDATOR_BRIEF_KEYS`, the sections the validator reads,
+before they are shipped to workers.
+
+Long-running, multithreaded callers (the API) use :class:`ValidationPool`,
+which keeps one ``spawn`` pool (:mod:`fightcamp.process_pool`) for the life of
+the process instead of forking a new one per batch.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Iterable, Iterator
+
+from .process_pool import SharedProcessPool, default_pool_workers
+from .stage2_compaction import compact_validator_report
+from .stage2_pipeline import review_stage2_output
+
+logger = logging.getLogger(__name__)
+
+VALIDATION_RECORD_ERROR = "error"
+
+# Top-level planning brief sections read by validate_stage2_output and the
+# review enrichment; everything else only feeds the Stage 2 prompts.
+VALIDATOR_BRIEF_KEYS = (
+    "schema_version",
+    "athlete_model",
+    "athlete_snapshot",
+    "candidate_pools",
+    "late_fight_plan_spec",
+    "phase_strategy",
+    "restrictions",
+    "sport_load_profile",
+    "weekly_role_map",
+)
+
+
+def project_planning_brief(planning_brief: dict[str, Any]) -> dict[str, Any]:
+    return {key: planning_brief[key] for key in VALIDATOR_BRIEF_KEYS if key in planning_brief}
+
+
+def _error_record(plan_id: str, error: str) -> dict[str, Any]:
+    return {"plan_id": plan_id, "status": VALIDATION_RECORD_ERROR, "error": error}
+
+
+def compact_review_record(plan_id: str, review: dict[str, Any]) -> dict[str, Any]:
+    report = review["validator_report"]
+    failing = list(report.get("errors") or []) + list(report.get("warnings") or [])
+    return {
+        "plan_id": plan_id,
+        "status": review["status"],
+        "needs_retry": review["needs_retry"],
+        "error_count": len(report.get("errors") or []),
+        "warning_count": len(report.get("warnings") or []),
+        "blocking_warning_count": int(report.get("blocking_warning_count") or 0),
+        "codes": dict(sorted(Counter(str(item.get("code") or "") for item in failing).items())),
+        "report": compact_validator_report(report),
+    }
+
+
+def validate_plan(item: dict[str, Any]) -> dict[str, Any]:
+    """Compact validation record for one item; problems become ``error`` records."""
+    plan_id = str(item.get("plan_id") or "")
+    planning_brief = item.get("planning_brief")
+    final_plan_text = str(item.get("final_plan_text") or "").strip()
+    if not isinstance(planning_brief, dict) or not planning_brief:
+        return _error_record(plan_id, "planning_brief is missing")
+    if not final_plan_text:
+        return _error_record(plan_id, "final_plan_text is empty")
+    try:
+        review = review_stage2_output(planning_brief=planning_brief, final_plan_text=final_plan_text)
+    except Exception as exc:
+        logger.exception("[stage2-validate] plan_id=%s failed", plan_id)
+        return _error_record(plan_id, f"{type(exc).__name__}: {exc}")
+    return compact_review_record(plan_id, review)
+
+
+def _decode_planning_brief(value: Any) -> dict[str, Any] | None:
+    if isinstance(value, str):
+        try:
+            value = json.loads(value) if value.strip() else None
+        except json.JSONDecodeError:
+            return None
+    return value if isinstance(value, dict) else None
+
+
+def _worker_item(item: dict[str, Any]) -> dict[str, Any]:
+    planning_brief = _decode_planning_brief(item.get("planning_brief"))
+    if planning_brief is not None:
+        planning_brief = project_planning_brief(planning_brief)
+    return {**item, "planning_brief": planning_brief}
+
+
+def run_validation_batch(
+    items: Iterable[dict[str, Any]],
+    *,
+    workers: int = 0,
+    executor: Executor | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield one record per item.
+
+    ``workers <= 1`` (and no ``executor``) validates in-process, in input
+    order. Otherwise items go to ``executor`` (or a pool of ``workers``
+    processes that lives for this call) with at most ``4 * workers`` in
+    flight; records are then yielded in completion order and carry their
+    ``plan_id``.
+    """
+    if executor is not None:
+        yield from _run_on_executor(items, executor, max_in_flight=4 * max(workers, 1))
+        return
+    if workers <= 1:
+        for item in items:
+            yield validate_plan(_worker_item(item))
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from _run_on_executor(items, pool, max_in_flight=4 * workers)
+
+
+def _run_on_executor(items: Iterable[dict[str, Any]], executor: Executor, *, max_in_flight: int) -> Iterator[dict[str, Any]]:
+    in_flight: dict[Future, str] = {}
+
+    def _drain() -> Iterator[dict[str, Any]]:
+        done, _pending = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            plan_id = in_flight.pop(future)
+            try:
+                yield future.result()
+            except Exception as exc:
+                # A worker crash (e.g. BrokenProcessPool) still gets a record.
+                yield _error_record(plan_id, f"{type(exc).__name__}: {exc}")
+
+    for item in items:
+        if len(in_flight) >= max_in_flight:
+            yield from _drain()
+        in_flight[executor.submit(validate_plan, _worker_item(item))] = str(item.get("plan_id") or "")
+    while in_flight:
+        yield from _drain()
+
+
+def default_validation_workers() -> int:
+    """``UNLXCK_STAGE2_VALIDATION_WORKERS``, defaulting to up to 4 CPUs."""
+    return default_pool_workers("UNLXCK_STAGE2_VALIDATION_WORKERS")
+
+
+class ValidationPool(SharedProcessPool):
+    """Shared ``spawn`` pool for batch validation in the API.
+
+    A pool broken by a dead worker is replaced and the batch retried once.
+    ``workers <= 1`` validates in the calling thread.
+    """
+
+    def run(self, items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        if self.workers <= 1:
+            return list(run_validation_batch(items))
+        executor = self.executor()
+        try:
+            return list(run_validation_batch(items, workers=self.workers, executor=executor))
+        except BrokenProcessPool:
+            logger.warning("[stage2-validate] process pool broken; starting a new one")
+            self.discard(executor)
+            return list(run_validation_batch(items, workers=self.workers, executor=self.executor()))
+
+
+def summarize_records(records: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """Status counts plus the most frequent failing codes across a batch."""
+    statuses: Counter[str] = Counter()
+    codes: Counter[str] = Counter()
+    for record in records:
+        statuses[str(record.get("status") or "")] += 1
+        codes.update(record.get("codes") or {})
+    return {"statuses": dict(sorted(statuses.items())), "codes": dict(codes.most_common())}
@@ -0,0 +1,307 @@
+"""Token-budgeted compaction of the planning brief for Stage 2 prompts.
+
+Stage 2 latency tracks prompt size, and the planning brief is most of it:
+candidate pools carry full option records, while ``weekly_role_map`` and
+``week_by_week_progression`` repeat the same role and phase metadata week
+after week. :func:`compact_planning_brief` rewrites a copy of the brief in
+stages, lossless first, and stops at the first stage that fits the budget:
+
+1. ``dedupe`` drops empty fields and slot fields that repeat the selected
+   option, hoists session-role metadata shared across weeks into
+   ``role_defaults``/``role_catalog``, and lets progression weeks inherit the
+   ``weekly_stress_map[phase]`` fields every week of that phase repeats
+   (named in ``inherited_stress_fields``).
+2. ``abbreviate_alternates`` keeps only what is needed to swap an alternate
+   in safely: name, mechanical risk tags, equipment and rehab function.
+3. ``trim_options`` drops the tag lists and scoring notes of selected options
+   that ``mechanical_risk_tags`` and ``quality_class`` already summarize; the
+   slot ``purpose`` stays as the rationale.
+
+Only the prompt copy is compacted; the validator always checks Stage 2
+output against the full brief.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Estimated prompt tokens for the compacted brief; 0 sends the brief as is.
+DEFAULT_BRIEF_TOKEN_BUDGET = max(0, int(os.environ.get("UNLXCK_STAGE2_BRIEF_TOKEN_BUDGET", "24000")))
+# JSON and English prose both average about four characters per token.
+_CHARS_PER_TOKEN = 4
+
+COMPACTION_STAGES = ("dedupe", "abbreviate_alternates", "trim_options")
+
+_COMPACTION_NOTES = {
+    "dedupe": [
+        "Empty fields are omitted.",
+        "Candidate slots omit fields that repeat their selected option.",
+        "Each weekly_role_map session role is role_defaults, then role_catalog[role_key], then its own fields (nested objects merge).",
+        "Each week_by_week_progression week also carries the weekly_stress_map[phase] fields named in week_by_week_progression.inherited_stress_fields[phase].",
+    ],
+    "abbreviate_alternates": [
+        "Candidate alternates list only name, mechanical_risk_tags, required_equipment and rehab function.",
+    ],
+    "trim_options": [
+        "Selected options omit movement_patterns, restriction_tags and scoring notes; mechanical_risk_tags is the restriction check.",
+    ],
+}
+_SLOT_FIELDS_SHARED_WITH_SELECTED = (
+    "quality_class",
+    "anchor_capable",
+    "support_only",
+    "base_categories",
+    "function_class",
+    "rehab_function_label",
+    "session_index",
+)
+_ALTERNATE_FIELDS = ("name", "mechanical_risk_tags", "required_equipment", "function_class", "generic_fallback")
+_MISSING = object()
+_TRIMMED_OPTION_FIELDS = ("movement_patterns", "restriction_tags", "why", "source", "base_categories", "universally_available")
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / _CHARS_PER_TOKEN)
+
+
+def _json_size(value: Any) -> int:
+    return len(json.dumps(value, separators=(",", ":"), ensure_ascii=False))
+
+
+@dataclass(frozen=True)
+class BriefCompaction:
+    brief: dict
+    stage: str
+    chars_before: int
+    chars_after: int
+    token_budget: int
+
+    @property
+    def tokens_before(self) -> int:
+        return math.ceil(self.chars_before / _CHARS_PER_TOKEN)
+
+    @property
+    def tokens_after(self) -> int:
+        return math.ceil(self.chars_after / _CHARS_PER_TOKEN)
+
+    @property
+    def within_budget(self) -> bool:
+        return not self.token_budget or self.tokens_after <= self.token_budget
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _drop_empty(value: Any) -> Any:
+    if isinstance(value, dict):
+        pruned = {key: _drop_empty(item) for key, item in value.items()}
+        return {key: item for key, item in pruned.items() if not _is_empty(item)}
+    if isinstance(value, list):
+        return [_drop_empty(item) for item in value]
+    return value
+
+
+def _split_common(items: list[dict]) -> tuple[dict, list[dict]]:
+    """Hoist fields equal across every item; nested dicts are split recursively."""
+    if len(items) < 2:
+        return {}, items
+    common: dict = {}
+    residuals = [dict(item) for item in items]
+    for key, value in items[0].items():
+        values = [item.get(key, _MISSING) for item in items]
+        if all(other == value for other in values[1:]):
+            common[key] = value
+            for residual in residuals:
+                residual.pop(key, None)
+        elif all(isinstance(other, dict) for other in values):
+            nested_common, nested_residuals = _split_common(values)
+            if nested_common:
+                common[key] = nested_common
+                for residual, nested in zip(residuals, nested_residuals):
+                    if nested:
+                        residual[key] = nested
+                    else:
+                        residual.pop(key, None)
+    return common, residuals
+
+
+def _dedupe_role_map(role_map: dict) -> dict:
+    weeks = role_map.get("weeks")
+    if not isinstance(weeks, list):
+        return role_map
+    roles = [
+        role
+        for week in weeks
+        if isinstance(week, dict)
+        for role in week.get("session_roles") or []
+        if isinstance(role, dict)
+    ]
+    defaults, residuals = _split_common(roles)
+    by_key: dict[str, list[int]] = {}
+    for index, role in enumerate(residuals):
+        by_key.setdefault(str(roles[index].get("role_key") or ""), []).append(index)
+    catalog: dict[str, dict] = {}
+    for role_key, indexes in by_key.items():
+        shared, split = _split_common([residuals[index] for index in indexes])
+        shared.pop("role_key", None)
+        if not role_key or not shared:
+            continue
+        catalog[role_key] = shared
+        for index, residual in zip(indexes, split):
+            residuals[index] = {"role_key": role_key, **residual}
+    residual_iter = iter(residuals)
+    compact_weeks = []
+    for week in weeks:
+        if not isinstance(week, dict) or not week.get("session_roles"):
+            compact_weeks.append(week)
+            continue
+        compact_weeks.append(
+            {
+                **week,
+                "session_roles": [next(residual_iter) if isinstance(role, dict) else role for role in week["session_roles"]],
+            }
+        )
+    compact = dict(role_map)
+    if defaults:
+        compact["role_defaults"] = defaults
+    if catalog:
+        compact["role_catalog"] = catalog
+    compact["weeks"] = compact_weeks
+    return compact
+
+
+def _dedupe_progression(progression: dict, stress_map: Any) -> dict:
+    """Drop the stress-map fields that every week of a phase repeats verbatim.
+
+    Only those keys are inherited, and they are listed per phase, so
+    expanding a week never adds a stress-map field it did not have.
+    """
+    weeks = progression.get("weeks")
+    if not isinstance(weeks, list) or not isinstance(stress_map, dict):
+        return progression
+    weeks_by_phase: dict[str, list[dict]] = {}
+    for week in weeks:
+        if isinstance(week, dict) and isinstance(stress_map.get(week.get("phase")), dict):
+            weeks_by_phase.setdefault(week["phase"], []).append(week)
+    inherited: dict[str, list[str]] = {}
+    for phase, phase_weeks in weeks_by_phase.items():
+        keys = [
+            key
+            for key, value in stress_map[phase].items()
+            if key != "phase" and all(week.get(key, _MISSING) == value for week in phase_weeks)
+        ]
+        if keys:
+            inherited[phase] = keys
+    if not inherited:
+        return progression
+    compact_weeks = [
+        {key: value for key, value in week.items() if key not in inherited.get(week.get("phase"), ())}
+        if isinstance(week, dict)
+        else week
+        for week in weeks
+    ]
+    return {**progression, "inherited_stress_fields": inherited, "weeks": compact_weeks}
+
+
+def _compact_slot(slot: dict, stage: int) -> dict:
+    selected = slot.get("selected")
+    compact = dict(slot)
+    if isinstance(selected, dict):
+        for key in _SLOT_FIELDS_SHARED_WITH_SELECTED:
+            if key in compact and selected.get(key, _MISSING) == compact[key]:
+                compact.pop(key)
+        # trim_options drops selected.why, so purpose is then the only rationale.
+        if stage < 2 and compact.get("purpose") == selected.get("why"):
+            compact.pop("purpose", None)
+        if stage >= 2:
+            compact["selected"] = {key: value for key, value in selected.items() if key not in _TRIMMED_OPTION_FIELDS}
+    if stage >= 1 and isinstance(slot.get("alternates"), list):
+        compact["alternates"] = [
+            {key: alternate[key] for key in _ALTERNATE_FIELDS if key in alternate} if isinstance(alternate, dict) else alternate
+            for alternate in slot["alternates"]
+        ]
+    return compact
+
+
+def _compact_pools(pools: Any, stage: int) -> Any:
+    if not isinstance(pools, dict):
+        return pools
+    return {
+        phase: {
+            pool: [_compact_slot(slot, stage) if isinstance(slot, dict) else slot for slot in slots]
+            if isinstance(slots, list)
+            else slots
+            for pool, slots in phase_pools.items()
+        }
+        if isinstance(phase_pools, dict)
+        else phase_pools
+        for phase, phase_pools in pools.items()
+    }
+
+
+def _compact_at_stage(brief: dict, stage: int) -> dict:
+    compact = dict(brief)
+    if isinstance(compact.get("weekly_role_map"), dict):
+        compact["weekly_role_map"] = _dedupe_role_map(compact["weekly_role_map"])
+    if isinstance(compact.get("week_by_week_progression"), dict):
+        compact["week_by_week_progression"] = _dedupe_progression(
+            compact["week_by_week_progression"], compact.get("weekly_stress_map")
+        )
+    if "candidate_pools" in compact:
+        compact["candidate_pools"] = _compact_pools(compact["candidate_pools"], stage)
+    # Top-level keys stay even when empty: "restrictions": [] is a statement.
+    compact = {key: _drop_empty(value) for key, value in compact.items()}
+    compact["compaction"] = [note for name in COMPACTION_STAGES[: stage + 1] for note in _COMPACTION_NOTES[name]]
+    return compact
+
+
+def compact_planning_brief(brief: dict, *, token_budget: int | None = None) -> BriefCompaction:
+    """Compact ``brief`` for a Stage 2 prompt, stopping at the first stage within budget.
+
+    ``token_budget`` defaults to ``UNLXCK_STAGE2_BRIEF_TOKEN_BUDGET``; ``0``
+    returns the brief unchanged. The input brief is never mutated.
+    """
+    budget = DEFAULT_BRIEF_TOKEN_BUDGET if token_budget is None else max(0, token_budget)
+    chars_before = _json_size(brief)
+    if not budget:
+        return BriefCompaction(brief, "none", chars_before, chars_before, budget)
+    if math.ceil(chars_before / _CHARS_PER_TOKEN) <= budget:
+        return BriefCompaction(brief, "none", chars_before, chars_before, budget)
+    for stage, name in enumerate(COMPACTION_STAGES):
+        compact = _compact_at_stage(brief, stage)
+        result = BriefCompaction(compact, name, chars_before, _json_size(compact), budget)
+        if result.within_budget:
+            break
+    log = logger.info if result.within_budget else logger.warning
+    log(
+        "[stage2] compacted planning brief stage=%s chars=%s->%s tokens~%s->%s budget=%s",
+        result.stage,
+        result.chars_before,
+        result.chars_after,
+        result.tokens_before,
+        result.tokens_after,
+        budget,
+    )
+    return result
+
+
+def compact_validator_report(validator_report: dict) -> dict:
+    """Only the failing items: errors and warnings, without empty fields.
+
+    The per-category warning lists, blocking/review buckets and counts all
+    repeat entries of ``warnings``, so they are left out.
+    """
+    compact: dict[str, list] = {}
+    for key in ("errors", "warnings"):
+        items = [_drop_empty(item) for item in validator_report.get(key) or []]
+        if items:
+            compact[key] = items
+    return compact
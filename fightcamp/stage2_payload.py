@@ -32,6 +32,8 @@ from .normalization import clean_list, normalize_text, phrase_in_text, slugify,
 from .restriction_parsing import CANONICAL_RESTRICTIONS
 from .rehab_protocols import _rehab_drills_for_phase, classify_drill_function, _FUNCTION_LABELS
 from .sparring_dose_planner import compute_hard_sparring_plan, effective_hard_day_count, effective_hard_days
+from .stage2_compaction import compact_planning_brief
+from .stage2_prompt import Stage2Prompt, join_sections, split_static_brief_sections
 from .strength_session_quality import classify_strength_item, infer_strength_sessions
 from .training_context import TrainingContext, allocate_sessions
 from .weight_cut import compute_cut_severity_score, cut_severity_bucket
@@ -4698,13 +4700,14 @@ def _athlete_profile_block(planning_brief: dict | None, stage2_payload: dict) ->
     return athlete_model if isinstance(athlete_model, dict) else {}
 
 
-def build_stage2_handoff_text(
+def build_stage2_handoff_parts(
     *,
     stage2_payload: dict,
     plan_text: str,
     coach_notes: str = "",
     planning_brief: dict | None = None,
-) -> str:
+) -> Stage2Prompt:
+    """Stage 2 handoff split into a cacheable prefix and the athlete's data."""
     context_block = planning_brief or {
         "athlete_snapshot": stage2_payload.get("athlete_model", {}),
         "restrictions": stage2_payload.get("restrictions", []),
@@ -4713,24 +4716,47 @@ def build_stage2_handoff_text(
         "omission_ledger": stage2_payload.get("omission_ledger", {}),
         "decision_rules": stage2_payload.get("rewrite_guidance", {}),
     }
+    context_block, catalogs = split_static_brief_sections(context_block)
+    context_block = compact_planning_brief(context_block).brief
     athlete_profile = _athlete_profile_block(planning_brief, stage2_payload)
     payload_mode = stage2_payload.get("payload_mode") or stage2_payload.get("effective_stage2_mode") or "camp_payload"
 
     # ── Payload-mode-sensitive hard instructions ──────────────────
     mode_instructions = _handoff_mode_instructions(payload_mode)
 
-    sections = [
-        STAGE2_FINALIZER_PROMPT.strip(),
-    ]
+    # Static sections first: they are identical for every athlete in this
+    # payload mode, so the provider can serve them from its prompt cache.
+    static_sections = []
     if mode_instructions:
-        sections.append("PAYLOAD MODE INSTRUCTIONS\n" + mode_instructions)
-    sections.append("PLANNING BRIEF\n" + _json_block(context_block))
-    sections.append("ATHLETE PROFILE\n" + _json_block(athlete_profile))
+        static_sections.append("PAYLOAD MODE INSTRUCTIONS\n" + mode_instructions)
+    static_sections.extend(f"{heading}\n" + _json_block(catalog) for heading, catalog in catalogs)
+
+    athlete_sections = ["PLANNING BRIEF\n" + _json_block(context_block)]
+    athlete_sections.append("ATHLETE PROFILE\n" + _json_block(athlete_profile))
     injury_context = stage2_payload.get("injury_context")
     if isinstance(injury_context, dict):
-        sections.append("INJURY CONTEXT\n" + _json_block(injury_context))
+        athlete_sections.append("INJURY CONTEXT\n" + _json_block(injury_context))
     cleaned_notes = (coach_notes or "").strip()
     if cleaned_notes:
-        sections.append("COACH NOTES\n" + cleaned_notes)
-    sections.append("STAGE 1 DRAFT PLAN\n" + (plan_text or "").strip())
-    return "\n\n---\n\n".join(section for section in sections if section.strip())
+        athlete_sections.append("COACH NOTES\n" + cleaned_notes)
+    athlete_sections.append("STAGE 1 DRAFT PLAN\n" + (plan_text or "").strip())
+    return Stage2Prompt(
+        instructions=STAGE2_FINALIZER_PROMPT.strip(),
+        static_context=join_sections(static_sections),
+        athlete_context=join_sections(athlete_sections),
+    )
+
+
+def build_stage2_handoff_text(
+    *,
+    stage2_payload: dict,
+    plan_text: str,
+    coach_notes: str = "",
+    planning_brief: dict | None = None,
+) -> str:
+    return build_stage2_handoff_parts(
+        stage2_payload=stage2_payload,
+        plan_text=plan_text,
+        coach_notes=coach_notes,
+        planning_brief=planning_brief,
+    ).text
@@ -1,8 +1,9 @@
 from __future__ import annotations
 from .normalization import clean_list, dedupe_preserve_order, ordered_weekdays as _ordered_weekdays
 
-from itertools import combinations, permutations
-from typing import Any
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Any, Callable
 
 
 _PAYLOAD_MODE_MAP = {
@@ -1658,145 +1659,230 @@ def _late_fight_public_role(role: dict[str, Any]) -> dict[str, Any]:
     }
 
 
-def _late_fight_assignment_score(
-    assigned_roles: list[dict[str, Any]],
-    legal_countdown_labels: list[str],
+def _late_fight_role_label_score(
+    role: dict[str, Any],
+    label: str,
+    min_offset: int,
     label_to_weekday: dict[str, str],
 ) -> int:
-    if not assigned_roles:
-        return 0
+    offset = _countdown_offset(label) or 0
+    score = int(role.get("_selection_priority") or 0) * 1000
+    cost_class = str(role.get("cost_class") or "")
+    if cost_class == "high":
+        score += offset * 40
+    elif cost_class == "medium":
+        score += offset * 20
+    elif role.get("role_key") == "technical_touch_day":
+        score += offset * 8
+
+    if role.get("role_key") == "fight_week_freshness_day":
+        if offset == min_offset:
+            score += 300
+        else:
+            score -= (offset - min_offset) * 120
+
+    if role.get("role_key") == "technical_touch_day":
+        preferred_day = str(role.get("_preferred_day") or "").strip().lower()
+        actual_day = str(label_to_weekday.get(label) or "").strip().lower()
+        distance = _weekday_distance(actual_day, preferred_day)
+        score += max(0, 120 - (distance * 35))
+        if actual_day and actual_day == preferred_day:
+            score += 80
+        score -= int(role.get("_declared_day_order") or 0)
+    return score
+
+
+def _late_fight_back_to_back_penalty(first_role: dict[str, Any], second_role: dict[str, Any]) -> int:
+    penalty = -90
+    if (
+        first_role.get("stress_class") == "meaningful_stress"
+        and second_role.get("stress_class") == "meaningful_stress"
+    ):
+        penalty -= 180
+    elif (
+        first_role.get("cost_class") in {"high", "medium"}
+        and second_role.get("cost_class") in {"high", "medium"}
+    ):
+        penalty -= 120
+    return penalty
+
+
+def _late_fight_min_offset(legal_countdown_labels: list[str]) -> int | None:
     offsets = [
-        _countdown_offset(label)
-        for label in legal_countdown_labels
-        if _countdown_offset(label) is not None
+        offset
+        for offset in (_countdown_offset(label) for label in legal_countdown_labels)
+        if offset is not None
     ]
-    if not offsets:
-        return 0
-    min_offset = min(offsets)
-    score = 0
-    ordered_roles = sorted(
-        assigned_roles,
-        key=lambda role: _countdown_offset(role.get("scheduled_countdown_label", "")) or -1,
-        reverse=True,
-    )
+    return min(offsets) if offsets else None
 
-    for role in ordered_roles:
-        label = str(role.get("scheduled_countdown_label") or "")
-        offset = _countdown_offset(label) or 0
-        score += int(role.get("_selection_priority") or 0) * 1000
-        cost_class = str(role.get("cost_class") or "")
-        if cost_class == "high":
-            score += offset * 40
-        elif cost_class == "medium":
-            score += offset * 20
-        elif role.get("role_key") == "technical_touch_day":
-            score += offset * 8
 
-        if role.get("role_key") == "fight_week_freshness_day":
-            if offset == min_offset:
-                score += 300
-            else:
-                score -= (offset - min_offset) * 120
-
-        if role.get("role_key") == "technical_touch_day":
-            preferred_day = str(role.get("_preferred_day") or "").strip().lower()
-            actual_day = str(label_to_weekday.get(label) or "").strip().lower()
-            distance = _weekday_distance(actual_day, preferred_day)
-            score += max(0, 120 - (distance * 35))
-            if actual_day and actual_day == preferred_day:
-                score += 80
-
-    for first_role, second_role in zip(ordered_roles, ordered_roles[1:]):
-        first_offset = _countdown_offset(first_role.get("scheduled_countdown_label", "")) or 0
-        second_offset = _countdown_offset(second_role.get("scheduled_countdown_label", "")) or 0
-        gap = first_offset - second_offset
-        score += gap * 35
-        if gap == 1:
-            score -= 90
-            if (
-                first_role.get("stress_class") == "meaningful_stress"
-                and second_role.get("stress_class") == "meaningful_stress"
-            ):
-                score -= 180
-            elif (
-                first_role.get("cost_class") in {"high", "medium"}
-                and second_role.get("cost_class") in {"high", "medium"}
-            ):
-                score -= 120
-
-    score -= sum(
-        int(role.get("_declared_day_order") or 0)
-        for role in ordered_roles
-        if role.get("role_key") == "technical_touch_day"
-    )
-    return score
+@dataclass(frozen=True)
+class _LateFightPlacementTables:
+    """Everything the placement search reads, precomputed per allocation.
+
+    ``allowed[j]`` is the only label index role ``j`` may take (locked
+    declared days), ``-1`` when it has none, or ``None`` when any day will
+    do. ``label_scores[j][i]`` and ``penalties[j][k]`` are the per-role/per-day
+    and back-to-back terms of a placement's score (each role's label score,
+    plus ``35`` per day of gap between consecutive roles and the penalty for
+    consecutive days); ``day_order`` lists label indexes latest offset first,
+    with their ``offsets``.
+    """
+
+    role_count: int
+    label_count: int
+    allowed: tuple[int | None, ...]
+    label_scores: tuple[tuple[int, ...], ...]
+    penalties: tuple[tuple[int, ...], ...]
+    day_order: tuple[int, ...]
+    offsets: tuple[int, ...]
+
+    @property
+    def label_bits(self) -> int:
+        # One field per role, wide enough for every label index plus the
+        # all-ones "unplaced" value.
+        return max(1, self.label_count.bit_length())
+
+    def unpack(self, packed: int, mask: int) -> tuple[int, ...]:
+        bits = self.label_bits
+        field = (1 << bits) - 1
+        return tuple(
+            (packed >> ((self.role_count - 1 - index) * bits)) & field if mask >> index & 1 else -1
+            for index in range(self.role_count)
+        )
 
 
-def _late_fight_best_assignment(
-    selected_roles: list[dict[str, Any]],
+def _late_fight_placement_tables(
+    roles: list[dict[str, Any]],
     legal_countdown_labels: list[str],
     label_to_weekday: dict[str, str],
-) -> tuple[int, list[dict[str, Any]]] | None:
-    locked_labels: dict[int, str] = {}
-    occupied_labels: set[str] = set()
-    unlocked_roles: list[dict[str, Any]] = []
-
-    for role in selected_roles:
-        locked_label = _late_fight_locked_label(role, label_to_weekday)
-        candidate_id = int(role.get("_candidate_id") or 0)
+) -> _LateFightPlacementTables | None:
+    min_offset = _late_fight_min_offset(legal_countdown_labels)
+    if min_offset is None or not roles:
+        return None
+    allowed: list[int | None] = []
+    for role in roles:
         if role.get("locked_day") and label_to_weekday:
-            if not locked_label or locked_label in occupied_labels:
-                return None
-            locked_labels[candidate_id] = locked_label
-            occupied_labels.add(locked_label)
+            locked_label = _late_fight_locked_label(role, label_to_weekday)
+            allowed.append(legal_countdown_labels.index(locked_label) if locked_label else -1)
         else:
-            unlocked_roles.append(role)
-
-    open_labels = [label for label in legal_countdown_labels if label not in occupied_labels]
-    if len(unlocked_roles) > len(open_labels):
-        return None
-
-    best_score: int | None = None
-    best_roles: list[dict[str, Any]] | None = None
-
-    for label_perm in permutations(open_labels, len(unlocked_roles)):
-        assigned_labels = dict(locked_labels)
-        for index, role in enumerate(unlocked_roles):
-            assigned_labels[int(role.get("_candidate_id") or 0)] = label_perm[index]
-
-        scored_roles: list[dict[str, Any]] = []
-        for role in selected_roles:
-            role_copy = dict(role)
-            candidate_id = int(role.get("_candidate_id") or 0)
-            assigned_label = assigned_labels.get(candidate_id)
-            role_copy["scheduled_countdown_label"] = assigned_label
-            role_copy["countdown_label"] = assigned_label
-            offset = _countdown_offset(assigned_label)
-            if offset is not None:
-                role_copy["countdown_offset"] = offset
-            real_weekday = str(label_to_weekday.get(assigned_label) or "").strip()
-            if real_weekday:
-                role_copy["scheduled_day_hint"] = real_weekday
-                role_copy["real_weekday"] = real_weekday
-                role_copy["countdown_display_label"] = _countdown_display_label(assigned_label, real_weekday)
-            elif assigned_label:
-                role_copy["countdown_display_label"] = assigned_label
-            if role_copy.get("locked_day"):
-                role_copy["declared_day_locked"] = True
-                role_copy["placement_basis"] = "locked"
-            else:
-                role_copy["placement_basis"] = str(role_copy.get("cost_class") or "medium")
-            role_copy["day_assignment_reason"] = _late_fight_assignment_reason(role_copy)
-            scored_roles.append(role_copy)
+            allowed.append(None)
+    day_order = sorted(
+        range(len(legal_countdown_labels)),
+        key=lambda index: _countdown_offset(legal_countdown_labels[index]) or 0,
+        reverse=True,
+    )
+    return _LateFightPlacementTables(
+        role_count=len(roles),
+        label_count=len(legal_countdown_labels),
+        allowed=tuple(allowed),
+        label_scores=tuple(
+            tuple(_late_fight_role_label_score(role, label, min_offset, label_to_weekday) for label in legal_countdown_labels)
+            for role in roles
+        ),
+        penalties=tuple(tuple(_late_fight_back_to_back_penalty(first, second) for second in roles) for first in roles),
+        day_order=tuple(day_order),
+        offsets=tuple(_countdown_offset(legal_countdown_labels[index]) or 0 for index in day_order),
+    )
 
-        score = _late_fight_assignment_score(scored_roles, legal_countdown_labels, label_to_weekday)
-        if best_score is None or score > best_score:
-            best_score = score
-            best_roles = scored_roles
 
-    if best_score is None or best_roles is None:
-        return None
-    return best_score, best_roles
+def _late_fight_search_placements(
+    tables: _LateFightPlacementTables,
+    viable: Callable[[int], bool],
+) -> tuple[dict[int, tuple[int, int]], int]:
+    """Best ``(score, packed labels)`` per feasible role mask, plus placements tried.
+
+    Days are visited latest offset first. A partial placement only needs
+    which roles it has used and which role (if any) sits on the day just
+    visited, so that is the whole DP state: the spread term (35 per day
+    between the first and last session) accrues while a placement is open,
+    and the back-to-back penalty needs just the previous day's role.
+
+    A placement is one int holding each role's label index in a fixed-width
+    field, role 0 most significant and unplaced roles all ones, so placing a
+    role is integer arithmetic and, between placements of the same roles,
+    ``<`` is lexicographic order on the label indexes. Nothing is allocated
+    per placement beyond the state tables. Equal scores keep the smallest
+    packed placement, the one a label-order enumeration of the roles meets
+    first; ``tables.unpack`` turns it back into label indexes.
+    """
+    role_count = tables.role_count
+    bits = tables.label_bits
+    unplaced = (1 << bits) - 1
+    shifts = [(role_count - 1 - index) * bits for index in range(role_count)]
+    empty = 0
+    for shift in shifts:
+        empty |= unplaced << shift
+    allowed = tables.allowed
+    label_scores = tables.label_scores
+    penalties = tables.penalties
+
+    solved: dict[int, tuple[int, int]] = {0: (0, empty)}
+    # (used mask, role on the previous day or -1) -> (score, packed labels)
+    open_states: dict[tuple[int, int], tuple[int, int]] = {(0, -1): (0, empty)}
+    placements = 0
+    previous_offset: int | None = None
+    for label_index, offset in zip(tables.day_order, tables.offsets):
+        step = 0 if previous_offset is None else previous_offset - offset
+        previous_offset = offset
+        next_states: dict[tuple[int, int], tuple[int, int]] = {}
+        for (mask, previous_role), (score, packed) in open_states.items():
+            if mask:
+                score += step * 35
+            key = (mask, -1)
+            current = next_states.get(key)
+            if current is None or score > current[0] or (score == current[0] and packed < current[1]):
+                next_states[key] = (score, packed)
+            for role_index in range(role_count):
+                if mask >> role_index & 1:
+                    continue
+                role_label = allowed[role_index]
+                if role_label is not None and role_label != label_index:
+                    continue
+                placed_mask = mask | (1 << role_index)
+                if not viable(placed_mask):
+                    continue
+                placements += 1
+                placed_score = score + label_scores[role_index][label_index]
+                if previous_role >= 0 and step == 1:
+                    placed_score += penalties[previous_role][role_index]
+                placed = packed - ((unplaced - label_index) << shifts[role_index])
+                key = (placed_mask, role_index)
+                current = next_states.get(key)
+                if current is None or placed_score > current[0] or (placed_score == current[0] and placed < current[1]):
+                    next_states[key] = (placed_score, placed)
+                current = solved.get(placed_mask)
+                if current is None or placed_score > current[0] or (placed_score == current[0] and placed < current[1]):
+                    solved[placed_mask] = (placed_score, placed)
+        open_states = next_states
+    return solved, placements
+
+
+def _late_fight_scheduled_role(
+    role: dict[str, Any],
+    assigned_label: str | None,
+    label_to_weekday: dict[str, str],
+) -> dict[str, Any]:
+    role_copy = dict(role)
+    role_copy["scheduled_countdown_label"] = assigned_label
+    role_copy["countdown_label"] = assigned_label
+    offset = _countdown_offset(assigned_label)
+    if offset is not None:
+        role_copy["countdown_offset"] = offset
+    real_weekday = str(label_to_weekday.get(assigned_label) or "").strip()
+    if real_weekday:
+        role_copy["scheduled_day_hint"] = real_weekday
+        role_copy["real_weekday"] = real_weekday
+        role_copy["countdown_display_label"] = _countdown_display_label(assigned_label, real_weekday)
+    elif assigned_label:
+        role_copy["countdown_display_label"] = assigned_label
+    if role_copy.get("locked_day"):
+        role_copy["declared_day_locked"] = True
+        role_copy["placement_basis"] = "locked"
+    else:
+        role_copy["placement_basis"] = str(role_copy.get("cost_class") or "medium")
+    role_copy["day_assignment_reason"] = _late_fight_assignment_reason(role_copy)
+    return role_copy
 
 
 def _late_fight_suppression_entry(role: dict[str, Any], reason: str) -> dict[str, Any]:
@@ -1869,25 +1955,61 @@ def _late_fight_allocation_plan(days_until_fight: Any, athlete_model: dict[str,
 
     required_roles = [role for role in eligible_candidates if role.get("_required")]
     optional_roles = [role for role in eligible_candidates if not role.get("_required")]
+    ordered_candidates = required_roles + optional_roles
+    required_mask = (1 << len(required_roles)) - 1
+
+    def _within_budget(roles: list[dict[str, Any]]) -> bool:
+        if isinstance(max_active_roles, int) and len(roles) > max_active_roles:
+            return False
+        if isinstance(max_meaningful_stress_exposures, int) and _late_fight_meaningful_stress_count(roles) > max_meaningful_stress_exposures:
+            return False
+        if isinstance(max_support_roles, int) and _late_fight_support_role_count(roles) > max_support_roles:
+            return False
+        return True
 
-    best_roles: list[dict[str, Any]] = []
+    viable_masks: dict[int, bool] = {}
+
+    def _viable(mask: int) -> bool:
+        # Every selection includes the required roles, so a partial set that
+        # breaks a cap together with them can never become a valid one.
+        mask |= required_mask
+        viable = viable_masks.get(mask)
+        if viable is None:
+            viable = _within_budget([role for index, role in enumerate(ordered_candidates) if mask >> index & 1])
+            viable_masks[mask] = viable
+        return viable
+
+    tables = _late_fight_placement_tables(ordered_candidates, legal_countdown_labels, label_to_weekday)
+    if tables is None:
+        solved: dict[int, tuple[int, int]] = {0: (0, 0)}
+    else:
+        solved, _ = _late_fight_search_placements(tables, _viable)
+
+    # Subsets are compared in the same order as before (fewest optional roles
+    # first, then candidate order), so equal scores keep the same winner.
+    best_mask: int | None = None
     best_score: int | None = None
     for optional_count in range(len(optional_roles) + 1):
-        for optional_subset in combinations(optional_roles, optional_count):
-            selected_roles = required_roles + list(optional_subset)
-            if isinstance(max_active_roles, int) and len(selected_roles) > max_active_roles:
+        for optional_subset in combinations(range(len(optional_roles)), optional_count):
+            mask = required_mask
+            for optional_index in optional_subset:
+                mask |= 1 << (len(required_roles) + optional_index)
+            solution = solved.get(mask)
+            if solution is None:
                 continue
-            if isinstance(max_meaningful_stress_exposures, int) and _late_fight_meaningful_stress_count(selected_roles) > max_meaningful_stress_exposures:
-                continue
-            if isinstance(max_support_roles, int) and _late_fight_support_role_count(selected_roles) > max_support_roles:
-                continue
-            assignment = _late_fight_best_assignment(selected_roles, legal_countdown_labels, label_to_weekday)
-            if assignment is None:
-                continue
-            score, assigned_roles = assignment
-            if best_score is None or score > best_score:
-                best_score = score
-                best_roles = assigned_roles
+            if best_score is None or solution[0] > best_score:
+                best_score = solution[0]
+                best_mask = mask
+
+    # Role dicts are only built for the winning placement.
+    best_roles: list[dict[str, Any]] = []
+    if best_mask and tables is not None:
+        label_indexes = tables.unpack(solved[best_mask][1], best_mask)
+        best_roles = [
+            _late_fight_scheduled_role(role, legal_countdown_labels[label_indexes[index]], label_to_weekday)
+            for index, role in enumerate(ordered_candidates)
+            if best_mask >> index & 1
+        ]
 
     ordered_roles = sorted(
         best_roles,
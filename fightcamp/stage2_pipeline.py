@@ -2,7 +2,11 @@ from __future__ import annotations
 
 from typing import Any
 
-from .stage2_repair import build_stage2_repair_prompt
+from .stage2_autofix import apply_stage2_autofixes
+from .stage2_payload import build_stage2_handoff_parts
+from .stage2_prompt import Stage2Prompt
+from .stage2_repair import build_stage2_repair_prompt_parts
+from .stage2_section_repair import plan_section_repair
 from .stage2_validator import validate_stage2_output
 
 
@@ -196,6 +200,19 @@ def _build_review_summary(validator_report: dict, status: str) -> tuple[str, lis
 
 
 
+def _handoff_parts(stage1_result: dict, stage2_payload: dict, planning_brief: dict, handoff_text: str) -> Stage2Prompt:
+    parts = build_stage2_handoff_parts(
+        stage2_payload=stage2_payload,
+        plan_text=str(stage1_result.get("plan_text", "") or ""),
+        coach_notes=str(stage1_result.get("coach_notes", "") or ""),
+        planning_brief=planning_brief,
+    )
+    if parts.text == handoff_text:
+        return parts
+    # Stored handoffs from an older layout: send the saved text as one part.
+    return Stage2Prompt(instructions="", athlete_context=handoff_text)
+
+
 def build_stage2_package(*, stage1_result: dict) -> dict:
     stage1_result = _require_dict(stage1_result, name="stage1_result")
     planning_brief = _require_dict(_require_stage1_field(stage1_result, "planning_brief"), name="planning_brief")
@@ -211,6 +228,7 @@ def build_stage2_package(*, stage1_result: dict) -> dict:
         "planning_brief": planning_brief,
         "stage2_payload": stage2_payload,
         "handoff_text": handoff_text,
+        "handoff_parts": _handoff_parts(stage1_result, stage2_payload, planning_brief, handoff_text),
         "draft_plan_text": str(stage1_result.get("plan_text", "") or ""),
         "coach_notes": str(stage1_result.get("coach_notes", "") or ""),
         "summary": f"Stage 2 package ready: {phase_count} phase(s), {restriction_count} restriction(s), {slot_count} candidate slot(s).",
@@ -236,6 +254,32 @@ def review_stage2_output(*, planning_brief: dict, final_plan_text: str) -> dict:
 
 
 
+def autofix_stage2_output(*, planning_brief: dict, final_plan_text: str, validator_report: dict) -> dict:
+    """Apply local fixes for mechanically fixable validator items and review again.
+
+    ``review`` is ``None`` when nothing was fixed, or when the fixed plan
+    reviews worse than the original (the fixes are then discarded).
+    """
+    planning_brief = _require_dict(planning_brief, name="planning_brief")
+    fixed_text, fixes = apply_stage2_autofixes(
+        planning_brief=planning_brief,
+        final_plan_text=final_plan_text,
+        validator_report=validator_report,
+    )
+    if fixes:
+        review = review_stage2_output(planning_brief=planning_brief, final_plan_text=fixed_text)
+        fixed_report = review["validator_report"]
+        if _blocking_item_count(fixed_report) <= _blocking_item_count(_enrich_validator_report(validator_report)):
+            review["validator_report"] = {**fixed_report, "auto_fixes": fixes}
+            return {"plan_text": fixed_text, "fixes": fixes, "review": review}
+    return {"plan_text": final_plan_text, "fixes": [], "review": None}
+
+
+def _blocking_item_count(validator_report: dict) -> int:
+    return len(validator_report.get("errors") or []) + len(validator_report.get("blocking_warnings") or [])
+
+
+
 def build_stage2_retry(
     *,
     stage1_result: dict,
@@ -264,9 +308,11 @@ def build_stage2_retry(
             "summary_lines": summary_lines,
             "needs_retry": False,
             "repair_prompt": None,
+            "repair_prompt_parts": None,
+            "section_repair": None,
         }
 
-    repair_prompt = build_stage2_repair_prompt(
+    repair_prompt_parts = build_stage2_repair_prompt_parts(
         planning_brief=planning_brief,
         failed_plan_text=final_plan_text,
         validator_report=validator_report,
@@ -277,5 +323,13 @@ def build_stage2_retry(
         "summary": summary,
         "summary_lines": summary_lines,
         "needs_retry": True,
-        "repair_prompt": repair_prompt,
+        "repair_prompt": repair_prompt_parts.text,
+        "repair_prompt_parts": repair_prompt_parts,
+        # Automated retries regenerate only the failing sections when they can
+        # be located; the full repair prompt stays the manual/fallback path.
+        "section_repair": plan_section_repair(
+            planning_brief=planning_brief,
+            failed_plan_text=final_plan_text,
+            validator_report=validator_report,
+        ),
     }
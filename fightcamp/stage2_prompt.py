@@ -0,0 +1,57 @@
+"""Stage 2 prompts laid out for provider-side prompt caching.
+
+Providers reuse the longest prompt prefix they have already seen, so every
+Stage 2 prompt is built as three parts ordered from most to least stable:
+
+- ``instructions``: the system prompt for the call kind (finalizer or repair),
+  byte-identical on every call;
+- ``static_context``: payload-mode instructions and the fixed rule catalogs
+  from the planning brief, shared by every athlete in the same mode;
+- ``athlete_context``: the planning brief, draft, validator report and
+  anything else specific to one athlete or attempt.
+
+``Stage2Prompt.text`` joins the parts back into the single prompt string that
+is stored with each plan and shown to coaches.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+
+SECTION_SEPARATOR = "\n\n---\n\n"
+
+# Planning-brief entries that are fixed catalogs, not athlete data. They are
+# rendered once in the static context instead of inside the brief JSON.
+STATIC_BRIEF_SECTIONS = (
+    ("decision_hierarchy", "DECISION HIERARCHY"),
+    ("decision_rules", "DECISION RULES"),
+)
+
+
+@dataclass(frozen=True)
+class Stage2Prompt:
+    instructions: str
+    static_context: str = ""
+    athlete_context: str = ""
+
+    @property
+    def text(self) -> str:
+        return join_sections((self.instructions, self.static_context, self.athlete_context))
+
+    @property
+    def prefix_text(self) -> str:
+        """The cacheable part: everything before the first athlete-specific byte."""
+        return join_sections((self.instructions, self.static_context))
+
+
+def join_sections(sections: Iterable[str]) -> str:
+    return SECTION_SEPARATOR.join(section for section in sections if section.strip())
+
+
+def split_static_brief_sections(brief: dict) -> tuple[dict, list[tuple[str, dict | list]]]:
+    """Return ``(athlete_brief, [(heading, catalog), ...])`` for a planning brief."""
+    static_keys = {key for key, _heading in STATIC_BRIEF_SECTIONS}
+    athlete_brief = {key: value for key, value in brief.items() if key not in static_keys}
+    catalogs = [(heading, brief[key]) for key, heading in STATIC_BRIEF_SECTIONS if brief.get(key)]
+    return athlete_brief, catalogs
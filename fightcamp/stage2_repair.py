@@ -1,5 +1,7 @@
 from __future__ import annotations
 from .normalization import clean_list
+from .stage2_compaction import compact_planning_brief, compact_validator_report
+from .stage2_prompt import Stage2Prompt, join_sections, split_static_brief_sections
 
 import json
 from typing import Any
@@ -62,6 +64,10 @@ def _json_block_pretty(value: dict | list) -> str:
     return "```json\n" + json.dumps(value, indent=2) + "\n```"
 
 
+def _json_block(value: dict | list) -> str:
+    return "```json\n" + json.dumps(value, separators=(",", ":"), ensure_ascii=False) + "\n```"
+
+
 
 def _build_revision_priorities(validator_report: dict) -> dict[str, list[dict]]:
     restriction_fixes: list[dict] = []
@@ -372,13 +378,36 @@ def _build_revision_priorities(validator_report: dict) -> dict[str, list[dict]]:
 
 
 
-def build_stage2_repair_prompt(*, planning_brief: dict, failed_plan_text: str, validator_report: dict) -> str:
+def build_stage2_repair_prompt_parts(
+    *, planning_brief: dict, failed_plan_text: str, validator_report: dict
+) -> Stage2Prompt:
+    """Repair prompt split into a cacheable prefix and the attempt's data.
+
+    The planning brief comes before the validator report and failed plan so
+    repeated repairs for one athlete share as long a prefix as possible. The
+    brief is compacted and sent as compact JSON, and the report is cut down
+    to its failing items; revision priorities still read the full report.
+    """
     revision_priorities = _build_revision_priorities(validator_report)
-    sections = [
-        REPAIR_PROMPT_TEMPLATE.strip(),
-        "REVISION PRIORITIES\n" + _json_block_pretty(revision_priorities),
-        "VALIDATOR REPORT\n" + _json_block_pretty(validator_report),
-        "PLANNING BRIEF\n" + _json_block_pretty(planning_brief),
-        "PREVIOUS FINAL PLAN\n" + (failed_plan_text or "").strip(),
-    ]
-    return "\n\n---\n\n".join(section for section in sections if section.strip())
+    athlete_brief, catalogs = split_static_brief_sections(planning_brief)
+    athlete_brief = compact_planning_brief(athlete_brief).brief
+    return Stage2Prompt(
+        instructions=REPAIR_PROMPT_TEMPLATE.strip(),
+        static_context=join_sections(f"{heading}\n" + _json_block_pretty(catalog) for heading, catalog in catalogs),
+        athlete_context=join_sections(
+            [
+                "PLANNING BRIEF\n" + _json_block(athlete_brief),
+                "REVISION PRIORITIES\n" + _json_block_pretty(revision_priorities),
+                "VALIDATOR REPORT\n" + _json_block_pretty(compact_validator_report(validator_report)),
+                "PREVIOUS FINAL PLAN\n" + (failed_plan_text or "").strip(),
+            ]
+        ),
+    )
+
+
+def build_stage2_repair_prompt(*, planning_brief: dict, failed_plan_text: str, validator_report: dict) -> str:
+    return build_stage2_repair_prompt_parts(
+        planning_brief=planning_brief,
+        failed_plan_text=failed_plan_text,
+        validator_report=validator_report,
+    ).text
@@ -0,0 +1,235 @@
+"""Section-level Stage 2 repair.
+
+When validation fails in only part of a plan (one phase missing a required
+element, a restriction hit on one line), regenerating the whole plan doubles
+the job's wall time for text that already passed. :func:`plan_section_repair`
+maps each failing validator item onto the plan's top-level sections, split
+exactly where the validator switches phase, and returns a
+:class:`SectionRepair` whose prompt asks for only those sections, with the
+approved sections as fixed context. :meth:`SectionRepair.splice` puts the
+model's sections back into the original plan for re-validation.
+
+Plans where a failing item cannot be placed in a section, or where every
+phase section fails, get no section repair; the caller falls back to the
+full-plan repair prompt.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+from .phases import PHASE_VALUES
+from .stage2_compaction import compact_planning_brief, compact_validator_report
+from .stage2_prompt import Stage2Prompt, join_sections, split_static_brief_sections
+from .stage2_repair import REPAIR_PROMPT_TEMPLATE, _build_revision_priorities, _json_block, _json_block_pretty
+from .stage2_validator import (
+    _BULLET_PREFIX,
+    _MARKDOWN_HEADER,
+    _NON_PHASE_TOP_LEVEL_SECTIONS,
+    _PHASE_HEADER,
+    _extract_plan_lines,
+)
+
+# Key of the text before the first phase or top-level section heading.
+OPENING_SECTION_KEY = "plan opening"
+_SECTION_MARKER = re.compile(r"^\s*@@\s*SECTION:\s*(.+?)\s*@@\s*$", re.IGNORECASE)
+
+SECTION_REPAIR_INSTRUCTIONS = """SECTION REPAIR MODE
+Only the sections listed under SECTIONS TO REVISE failed validation. This replaces the OUTPUT rule above.
+1. APPROVED SECTIONS passed validation. Treat them as fixed context: do not rewrite, repeat or contradict them.
+2. Fix every validator item in the report; each one belongs to a section you are revising.
+3. Return only the revised sections, in the order listed. Start each with its marker line exactly as given (for example `@@ SECTION: SPP @@`), then the complete replacement section starting with its heading.
+4. A section listed as missing does not exist yet: write it from the planning brief for that phase.
+5. Write nothing before the first marker."""
+
+
+@dataclass(frozen=True)
+class PlanSection:
+    key: str
+    lines: tuple[str, ...]
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+
+def _section_key(raw_line: str, current_key: str) -> str:
+    """Key of the section ``raw_line`` belongs to, mirroring the validator's phase split."""
+    cleaned = _BULLET_PREFIX.sub("", raw_line).strip()
+    if not cleaned:
+        return current_key
+    header_match = _MARKDOWN_HEADER.match(raw_line)
+    header_text = header_match.group(2).strip() if header_match else cleaned
+    phase_match = _PHASE_HEADER.search(header_text)
+    if phase_match:
+        return phase_match.group(0).upper()
+    if header_text.lower() in _NON_PHASE_TOP_LEVEL_SECTIONS:
+        return header_text.lower()
+    return current_key
+
+
+def split_plan_sections(plan_text: str) -> list[PlanSection]:
+    """Top-level sections in plan order; joining their text gives back ``plan_text``."""
+    sections: list[PlanSection] = []
+    current_key = OPENING_SECTION_KEY
+    current_lines: list[str] = []
+    for raw_line in (plan_text or "").split("\n"):
+        key = _section_key(raw_line, current_key)
+        if key != current_key:
+            if current_lines:
+                sections.append(PlanSection(current_key, tuple(current_lines)))
+            current_key, current_lines = key, []
+        current_lines.append(raw_line)
+    if current_lines:
+        sections.append(PlanSection(current_key, tuple(current_lines)))
+    return sections
+
+
+def _item_section_keys(item: dict, section_lines: dict[str, set[str]]) -> set[str] | None:
+    phase = str(item.get("phase") or "").strip().upper()
+    if phase in PHASE_VALUES:
+        return {phase}
+    line = str(item.get("line") or "").strip()
+    if not line:
+        return None
+    keys = {key for key, lines in section_lines.items() if line in lines}
+    return keys or None
+
+
+def _new_phase_index(sections: list[PlanSection], phase: str) -> int:
+    order = PHASE_VALUES.index(phase)
+    phase_indexes = [index for index, section in enumerate(sections) if section.key in PHASE_VALUES]
+    earlier = [index for index in phase_indexes if PHASE_VALUES.index(sections[index].key) < order]
+    if earlier:
+        return earlier[-1] + 1
+    return phase_indexes[0] if phase_indexes else len(sections)
+
+
+@dataclass(frozen=True)
+class SectionRepair:
+    sections: tuple[PlanSection, ...]
+    target_keys: tuple[str, ...]
+    validator_report: dict
+    prompt: Stage2Prompt
+
+    @property
+    def missing_keys(self) -> tuple[str, ...]:
+        present = {section.key for section in self.sections}
+        return tuple(key for key in self.target_keys if key not in present)
+
+    def splice(self, repaired_text: str) -> str | None:
+        """The original plan with the repaired sections swapped in, or ``None``
+        when the output does not contain every target section under its own heading."""
+        replacements: dict[str, list[str]] = {}
+        current: list[str] | None = None
+        for raw_line in (repaired_text or "").split("\n"):
+            marker = _SECTION_MARKER.match(raw_line)
+            if marker:
+                current = replacements.setdefault(_normalize_key(marker.group(1)), [])
+                continue
+            if current is not None:
+                current.append(raw_line)
+
+        repaired: dict[str, str] = {}
+        for key in self.target_keys:
+            text = "\n".join(replacements.get(key, [])).strip("\n")
+            heading_keys = [section.key for section in split_plan_sections(text) if section.text.strip()]
+            if not heading_keys or heading_keys[0] != key:
+                return None
+            repaired[key] = text
+
+        sections = list(self.sections)
+        texts = [
+            repaired[section.key] + ("\n" if section.text.endswith("\n") else "") if section.key in repaired else section.text
+            for section in sections
+        ]
+        for phase in self.missing_keys:
+            index = _new_phase_index(sections, phase)
+            sections.insert(index, PlanSection(phase, ()))
+            texts.insert(index, repaired[phase] + ("\n" if index < len(texts) else ""))
+        return "\n".join(texts)
+
+
+def _normalize_key(key: str) -> str:
+    key = key.strip()
+    return key.upper() if key.upper() in PHASE_VALUES else key.lower()
+
+
+def _targeted_report(validator_report: dict, target_keys: set[str], section_lines: dict[str, set[str]]) -> dict:
+    def _in_targets(item: dict) -> bool:
+        keys = _item_section_keys(item, section_lines)
+        return bool(keys) and keys <= target_keys
+
+    return {
+        "errors": [item for item in validator_report.get("errors") or [] if _in_targets(item)],
+        "warnings": [item for item in validator_report.get("warnings") or [] if _in_targets(item)],
+        "restricted_hits": [item for item in validator_report.get("restricted_hits") or [] if _in_targets(item)],
+        "missing_required_elements": [
+            item for item in validator_report.get("missing_required_elements") or [] if _in_targets(item)
+        ],
+    }
+
+
+def _section_repair_prompt(
+    *, planning_brief: dict, sections: list[PlanSection], target_keys: tuple[str, ...], report: dict
+) -> Stage2Prompt:
+    athlete_brief, catalogs = split_static_brief_sections(planning_brief)
+    athlete_brief = compact_planning_brief(athlete_brief).brief
+    approved = "\n".join(section.text for section in sections if section.key not in target_keys).strip()
+    by_key = {section.key: section for section in sections}
+    to_revise = [
+        f"@@ SECTION: {key} @@\n" + (by_key[key].text.strip() if key in by_key else f"(missing: write the {key} phase section)")
+        for key in target_keys
+    ]
+    return Stage2Prompt(
+        instructions=REPAIR_PROMPT_TEMPLATE.strip(),
+        static_context=join_sections(
+            [SECTION_REPAIR_INSTRUCTIONS]
+            + [f"{heading}\n" + _json_block_pretty(catalog) for heading, catalog in catalogs]
+        ),
+        athlete_context=join_sections(
+            [
+                "PLANNING BRIEF\n" + _json_block(athlete_brief),
+                "REVISION PRIORITIES\n" + _json_block_pretty(_build_revision_priorities(report)),
+                "VALIDATOR REPORT\n" + _json_block_pretty(compact_validator_report(report)),
+                "APPROVED SECTIONS\n" + approved,
+                "SECTIONS TO REVISE\n" + "\n\n".join(to_revise),
+            ]
+        ),
+    )
+
+
+def plan_section_repair(*, planning_brief: dict, failed_plan_text: str, validator_report: dict) -> SectionRepair | None:
+    """Section repair for the errors and blocking warnings of an enriched
+    validator report, or ``None`` when only a full-plan repair will do."""
+    failing = list(validator_report.get("errors") or []) + list(validator_report.get("blocking_warnings") or [])
+    if not failing:
+        return None
+    sections = split_plan_sections(failed_plan_text)
+    keys_in_plan = [section.key for section in sections]
+    section_lines = {section.key: set(_extract_plan_lines(section.text)) for section in sections}
+
+    target_keys: set[str] = set()
+    for item in failing:
+        keys = _item_section_keys(item, section_lines)
+        if keys is None:
+            return None
+        target_keys |= keys
+    if any(keys_in_plan.count(key) > 1 for key in target_keys):
+        return None
+    if not any(key in PHASE_VALUES and key not in target_keys for key in keys_in_plan):
+        return None
+
+    ordered_keys = tuple(key for key in keys_in_plan if key in target_keys) + tuple(
+        phase for phase in PHASE_VALUES if phase in target_keys and phase not in keys_in_plan
+    )
+    report = _targeted_report(validator_report, target_keys, section_lines)
+    return SectionRepair(
+        sections=tuple(sections),
+        target_keys=ordered_keys,
+        validator_report=report,
+        prompt=_section_repair_prompt(
+            planning_brief=planning_brief, sections=sections, target_keys=ordered_keys, report=report
+        ),
+    )
@@ -9,16 +9,17 @@ from .training_context import (
     allocate_sessions,
     calculate_exercise_numbers,
 )
-from .bank_schema import validate_training_item
-from .tagging import normalize_item_tags, normalize_tags
+from .bank_registry import BANK_REGISTRY
+from .bank_schema import FrozenRecord, validate_training_item
+from .tagging import normalize_item_tags, normalize_tags, tag_ids
 from .tag_maps import GOAL_TAG_MAP, STYLE_TAG_MAP
 # Refactored: Import centralized constants from config
 from .config import PHASE_EQUIPMENT_BOOST, PHASE_TAG_BOOST, DATA_DIR, INJURY_GUARD_SHORTLIST
 from .injury_filtering import (
-    _load_style_specific_exercises,
     _log_exclusion,
     _log_replacement,
     injury_match_details,
+    with_ensured_tags,
 )
 # Refactored: Import factory function for guarded decision making
 from .injury_guard import Decision, pick_safe_replacement, make_guarded_decision_factory
@@ -47,10 +48,21 @@ _universal_strength_names_cache = None
 def get_style_exercises() -> list[dict]:
     global _style_exercises_cache
     if _style_exercises_cache is None:
-        _style_exercises_cache = _load_style_specific_exercises()
+        _style_exercises_cache = BANK_REGISTRY.get("style_specific_exercises")
     return _style_exercises_cache
 
 
+def _reset_bank_caches(_swapped: frozenset[str]) -> None:
+    global _style_exercises_cache, _exercise_bank_cache, _universal_strength_cache, _universal_strength_names_cache
+    _style_exercises_cache = None
+    _exercise_bank_cache = None
+    _universal_strength_cache = None
+    _universal_strength_names_cache = None
+
+
+BANK_REGISTRY.on_swap(__name__, _reset_bank_caches)
+
+
 
 CANONICAL_STYLE_TAGS = {
     "brawler",
@@ -131,6 +143,9 @@ def equipment_score_adjust(entry_equip, user_equipment, known_equipment):
     return 0
 
 
+MUST_HAVE_BONUS_TAGS = ("compound", "posterior_chain", "unilateral", "rate_of_force", "explosive")
+
+
 def score_exercise(
     exercise_tags,
     weakness_tags,
@@ -146,12 +161,13 @@ def score_exercise(
     rng: random.Random | None = None,
 ):
     """Return a weighted score and breakdown for a candidate exercise."""
-    exercise_tags = normalize_tags(exercise_tags or [])
-    weakness_tags = normalize_tags(weakness_tags or [])
-    goal_tags = normalize_tags(goal_tags or [])
-    style_tags = normalize_tags(style_tags or [])
-    must_have_tags = normalize_tags(must_have_tags or [])
-    phase_tags = normalize_tags(phase_tags or [])
+    # Tag lists are compared as memoized frozensets of tag IDs.
+    exercise_ids = tag_ids(exercise_tags or ())
+    weakness_ids = tag_ids(weakness_tags or ())
+    goal_ids = tag_ids(goal_tags or ())
+    style_ids = tag_ids(style_tags or ())
+    must_have_ids = tag_ids(must_have_tags or ())
+    phase_ids = tag_ids(phase_tags or ())
     score = 0.0
     reasons = {
         "goal_hits": 0,
@@ -165,39 +181,36 @@ def score_exercise(
         "penalties": 0.0,
     }
 
-    weakness_matches = len(set(exercise_tags) & set(weakness_tags))
+    weakness_matches = len(exercise_ids & weakness_ids)
     score += weakness_matches * 0.6
     reasons["weakness_hits"] = weakness_matches
 
-    goal_matches = len(set(exercise_tags) & set(goal_tags))
+    goal_matches = len(exercise_ids & goal_ids)
     score += goal_matches * 0.5
     reasons["goal_hits"] = goal_matches
 
-    matched_style_tags = list(set(exercise_tags) & set(style_tags))
-    style_score = len(matched_style_tags) * 0.3
-    if len(matched_style_tags) == 2:
+    style_matches = len(exercise_ids & style_ids)
+    style_score = style_matches * 0.3
+    if style_matches == 2:
         style_score += 0.2
-    elif len(matched_style_tags) >= 3:
+    elif style_matches >= 3:
         style_score += 0.1
     score += style_score
-    reasons["style_hits"] = len(matched_style_tags)
+    reasons["style_hits"] = style_matches
 
-    must_have_matches = len(set(exercise_tags) & set(must_have_tags))
+    must_have_matches = len(exercise_ids & must_have_ids)
     if must_have_matches:
         score += must_have_matches * 0.35
     reasons["must_have_hits"] = must_have_matches
-    must_have_bonus_tags = {"compound", "posterior_chain", "unilateral", "rate_of_force", "explosive"}
-    must_have_bonus = len(set(exercise_tags) & must_have_bonus_tags) * 0.15
+    must_have_bonus = len(exercise_ids & tag_ids(MUST_HAVE_BONUS_TAGS)) * 0.15
     score += must_have_bonus
     reasons["must_have_bonus"] = round(must_have_bonus, 2)
 
-    total_matches = len(
-        set(exercise_tags) & set(weakness_tags + goal_tags + style_tags)
-    )
+    total_matches = len(exercise_ids & (weakness_ids | goal_ids | style_ids))
     if total_matches >= 3:
         score += 0.2
 
-    phase_matches = len(set(exercise_tags) & set(phase_tags))
+    phase_matches = len(exercise_ids & phase_ids)
     score += phase_matches * 0.4
     reasons["phase_hits"] = phase_matches
 
@@ -297,32 +310,37 @@ def _has_isometric_setup_equipment(equipment_access: list[str]) -> bool:
     valid = {"power_rack", "squat_rack", "rack", "safety_pins", "pins"}
     return bool(eq & valid)
 
+def _load_exercise_bank() -> list[dict]:
+    items = json.loads((DATA_DIR / "exercise_bank.json").read_text(encoding="utf-8"))
+    for item in items:
+        validate_training_item(item, source="exercise_bank.json", require_phases=True)
+        normalize_item_tags(item)
+    return items
+
+
+def _load_universal_strength() -> list[dict]:
+    try:
+        items = json.loads((DATA_DIR / "universal_gpp_strength.json").read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        logger.warning("[bank-load] optional universal_gpp_strength bank missing")
+        return []
+    for item in items:
+        validate_training_item(item, source="universal_gpp_strength.json", require_phases=True)
+        normalize_item_tags(item)
+    return items
+
+
 def get_exercise_bank() -> list[dict]:
     global _exercise_bank_cache
     if _exercise_bank_cache is None:
-        _exercise_bank_cache = json.loads(
-            (DATA_DIR / "exercise_bank.json").read_text(encoding="utf-8")
-        )
-        for item in _exercise_bank_cache:
-            validate_training_item(item, source="exercise_bank.json", require_phases=True)
-            normalize_item_tags(item)
+        _exercise_bank_cache = BANK_REGISTRY.get("exercise_bank")
     return _exercise_bank_cache
 
 
 def get_universal_strength() -> list[dict]:
     global _universal_strength_cache
     if _universal_strength_cache is None:
-        try:
-            _universal_strength_cache = json.loads(
-                (DATA_DIR / "universal_gpp_strength.json").read_text(encoding="utf-8")
-            )
-        except FileNotFoundError:
-            logger.warning("[bank-load] optional universal_gpp_strength bank missing")
-            _universal_strength_cache = []
-        else:
-            for item in _universal_strength_cache:
-                validate_training_item(item, source="universal_gpp_strength.json", require_phases=True)
-                normalize_item_tags(item)
+        _universal_strength_cache = BANK_REGISTRY.get("universal_gpp_strength")
     return _universal_strength_cache
 
 
@@ -385,12 +403,31 @@ def _detect_movement_pattern(exercise: dict) -> str:
 
 
 def normalize_exercise_movement(exercise: dict) -> str:
-    """Ensure exercises expose a canonical movement key."""
+    """Ensure exercises expose a canonical movement key.
+
+    Shared bank records are never written to: their movement is memoized on
+    the record and applied when the exercise is copied into a block.
+    """
+    if isinstance(exercise, FrozenRecord):
+        return exercise.derived("movement", _detect_movement_pattern)
     movement = _detect_movement_pattern(exercise)
     exercise["movement"] = movement
     return movement
 
 
+def _exercise_for_block(exercise: dict) -> dict:
+    """Return ``exercise`` with its canonical movement and resolved tags.
+
+    Mutable dicts are updated in place; shared bank records get a decorated
+    copy so nothing is written back into the bank.
+    """
+    movement = normalize_exercise_movement(exercise)
+    if isinstance(exercise, FrozenRecord):
+        exercise = with_ensured_tags(exercise)
+        exercise["movement"] = movement
+    return exercise
+
+
 def _classify_prescription_type(exercise: dict) -> str:
     tags = set(normalize_tags(exercise.get("tags") or []))
     equipment = set(normalize_equipment_list(exercise.get("equipment", [])))
@@ -463,8 +500,10 @@ def _build_strength_candidate_reservoir(
         name = exercise.get("name")
         if not name:
             continue
-        exercise_copy = exercise.copy()
-        movement = normalize_exercise_movement(exercise_copy)
+        exercise_copy = _exercise_for_block(
+            exercise if isinstance(exercise, FrozenRecord) else exercise.copy()
+        )
+        movement = exercise_copy["movement"]
         role = movement if movement != "unknown" else "strength_support"
         if name in seen_by_role[role]:
             continue
@@ -1359,8 +1398,7 @@ def generate_strength_block(*, flags: dict, weaknesses=None, mindset_cue=None):
     base_exercises = _enforce_session_quality(base_exercises)
     base_exercises = _apply_movement_caps(base_exercises)
 
-    for ex in base_exercises:
-        normalize_exercise_movement(ex)
+    base_exercises = [_exercise_for_block(ex) for ex in base_exercises]
 
     if injury_trace and restrictions:
         active_restrictions = sorted({r.get("restriction", "generic_constraint") for r in restrictions})
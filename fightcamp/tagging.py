@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import json
+import sys
+from threading import Lock
 from typing import Iterable
+
+from .bank_schema import FrozenRecord
 # Refactored: Import centralized DATA_DIR from config
 from .config import DATA_DIR
 
@@ -23,6 +27,13 @@ TAG_SYNONYMS = {
 }
 
 _TAG_VOCAB_CACHE: set[str] | None = None
+_COMPILED_VOCAB_CACHE: TagVocabulary | None = None
+# Raw tag tuples seen by normalize_tags / tag_ids. Bank items and request tag
+# lists repeat constantly, so both are bounded by a small working set; the cap
+# only guards against unbounded free-text input.
+_NORMALIZED_TAGS_CACHE: dict[tuple, tuple[str, ...]] = {}
+_TAG_IDS_CACHE: dict[tuple, frozenset[int]] = {}
+_TAG_CACHE_MAX_SIZE = 20000
 
 
 def normalize_tag(tag: str) -> str | None:
@@ -38,7 +49,7 @@ def normalize_tag(tag: str) -> str | None:
     return TAG_SYNONYMS.get(normalized, normalized)
 
 
-def normalize_tags(tags: Iterable[str]) -> list[str]:
+def _normalize_tag_sequence(tags: Iterable[str]) -> tuple[str, ...]:
     normalized: list[str] = []
     seen: set[str] = set()
     for tag in tags:
@@ -47,9 +58,28 @@ def normalize_tags(tags: Iterable[str]) -> list[str]:
             continue
         normalized.append(canonical)
         seen.add(canonical)
+    return tuple(normalized)
+
+
+def normalized_tag_tuple(tags: Iterable[str]) -> tuple[str, ...]:
+    """Canonical tags in first-seen order, memoized on the raw tags."""
+    key = tuple(tags)
+    try:
+        return _NORMALIZED_TAGS_CACHE[key]
+    except KeyError:
+        pass
+    except TypeError:  # unhashable entries are normalized uncached
+        return _normalize_tag_sequence(key)
+    if len(_NORMALIZED_TAGS_CACHE) >= _TAG_CACHE_MAX_SIZE:
+        _NORMALIZED_TAGS_CACHE.clear()
+    normalized = _NORMALIZED_TAGS_CACHE[key] = _normalize_tag_sequence(key)
     return normalized
 
 
+def normalize_tags(tags: Iterable[str]) -> list[str]:
+    return list(normalized_tag_tuple(tags))
+
+
 def normalize_item_tags(item: dict) -> list[str]:
     tags = item.get("tags", [])
     normalized = normalize_tags(tags)
@@ -69,3 +99,85 @@ def load_tag_vocabulary() -> set[str]:
     vocab = normalize_tags(json.loads(vocab_path.read_text(encoding="utf-8")))
     _TAG_VOCAB_CACHE = set(vocab)
     return _TAG_VOCAB_CACHE
+
+
+class TagVocabulary:
+    """Interned integer ID space for canonical tags.
+
+    IDs for ``tag_vocabulary.json`` are assigned at compile time in sorted order;
+    tags outside the vocabulary (inferred mechanism tags, aliases, free text)
+    get the next free ID on first sight. IDs are never reused, so frozensets of
+    IDs stay valid for the life of the process and compare like the tag sets
+    they stand for.
+    """
+
+    def __init__(self, tags: Iterable[str] = ()):
+        self._ids: dict[str, int] = {}
+        self._names: list[str] = []
+        self._lock = Lock()
+        for tag in tags:
+            self.id_for(tag)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, tag: object) -> bool:
+        return tag in self._ids
+
+    def id_for(self, tag: str) -> int:
+        """ID of an already-canonical tag string."""
+        tag_id = self._ids.get(tag)
+        if tag_id is None:
+            with self._lock:
+                tag_id = self._ids.get(tag)
+                if tag_id is None:
+                    tag_id = len(self._names)
+                    self._names.append(sys.intern(tag))
+                    self._ids[self._names[tag_id]] = tag_id
+        return tag_id
+
+    def name(self, tag_id: int) -> str:
+        return self._names[tag_id]
+
+    def names(self, tag_ids: Iterable[int]) -> list[str]:
+        return sorted(self._names[tag_id] for tag_id in tag_ids)
+
+
+def get_tag_vocabulary() -> TagVocabulary:
+    """The process-wide tag ID space, compiled from ``tag_vocabulary.json``."""
+    global _COMPILED_VOCAB_CACHE
+    if _COMPILED_VOCAB_CACHE is None:
+        _COMPILED_VOCAB_CACHE = TagVocabulary(sorted(load_tag_vocabulary()))
+    return _COMPILED_VOCAB_CACHE
+
+
+def tag_ids(tags: Iterable[str]) -> frozenset[int]:
+    """Normalized ``tags`` as a frozenset of tag IDs, memoized on the raw tags."""
+    key = tuple(tags)
+    try:
+        return _TAG_IDS_CACHE[key]
+    except KeyError:
+        pass
+    except TypeError:
+        return frozenset(map(get_tag_vocabulary().id_for, _normalize_tag_sequence(key)))
+    if len(_TAG_IDS_CACHE) >= _TAG_CACHE_MAX_SIZE:
+        _TAG_IDS_CACHE.clear()
+    ids = _TAG_IDS_CACHE[key] = frozenset(map(get_tag_vocabulary().id_for, normalized_tag_tuple(key)))
+    return ids
+
+
+def _record_tag_ids(item: dict) -> frozenset[int]:
+    return tag_ids(item.get("tags", ()) or ())
+
+
+def item_tag_ids(item: dict) -> frozenset[int]:
+    """Tag IDs of ``item``; precomputed once per shared bank record."""
+    if isinstance(item, FrozenRecord):
+        return item.derived("tag_ids", _record_tag_ids)
+    return _record_tag_ids(item)
+
+
+def prime_item_tag_ids(items: Iterable) -> None:
+    for item in items:
+        if isinstance(item, FrozenRecord):
+            item_tag_ids(item)
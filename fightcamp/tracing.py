@@ -0,0 +1,289 @@
+"""Lightweight per-job tracing: nested spans with attributes and counters.
+
+A trace is opened per generation job with :func:`start_trace`; code anywhere
+below it (Stage 1 pipeline, injury guard, Stage 2, store calls) opens child
+spans with :func:`span` and bumps counters with :func:`add_counter`. The
+active trace and span live in context variables, so they follow
+``asyncio.to_thread`` and the plan-block thread pool.
+
+Tracing is off unless ``UNLXCK_TRACING=1``. With no active trace every helper
+is a context-variable lookup that returns a shared no-op span. When
+``UNLXCK_TRACE_OTLP_FILE`` is set, finished traces are also appended to that
+file as OTLP/JSON, one export request per line.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import secrets
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from threading import Lock
+from typing import Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+TRACING_ENV = "UNLXCK_TRACING"
+TRACE_OTLP_FILE_ENV = "UNLXCK_TRACE_OTLP_FILE"
+MAX_SPANS_PER_TRACE = 2000
+_SERVICE_NAME = "unlxck-fightcamp"
+_OTLP_STATUS_CODES = {"unset": 0, "ok": 1, "error": 2}
+
+
+class Span:
+    __slots__ = (
+        "trace",
+        "name",
+        "span_id",
+        "parent_id",
+        "start",
+        "end",
+        "attributes",
+        "counters",
+        "status",
+        "error",
+    )
+
+    def __init__(self, trace: "Trace", name: str, parent_id: str | None, start: float, attributes: dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start = start
+        self.end: float | None = None
+        self.attributes = attributes
+        self.counters: dict[str, float] = {}
+        self.status = "unset"
+        self.error: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add_counter(self, name: str, value: float = 1) -> None:
+        # Plan units on the thread pool share their parent span.
+        with self.trace._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_error(self, exc: BaseException) -> None:
+        self.status = "error"
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def to_dict(self) -> dict[str, Any]:
+        record: dict[str, Any] = {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ms": round((self.start - self.trace.start) * 1000, 3),
+            "duration_ms": round(self.duration * 1000, 3),
+            "status": self.status,
+        }
+        if self.attributes:
+            record["attributes"] = self.attributes
+        if self.counters:
+            record["counters"] = self.counters
+        if self.error:
+            record["error"] = self.error
+        return record
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        return None
+
+    def add_counter(self, name: str, value: float = 1) -> None:
+        return None
+
+    def record_error(self, exc: BaseException) -> None:
+        return None
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    def __init__(self, name: str, attributes: dict[str, Any]):
+        self.trace_id = secrets.token_hex(16)
+        self.start = time.perf_counter()
+        self.start_unix_ns = time.time_ns()
+        self.spans: list[Span] = []
+        self.dropped_spans = 0
+        self._lock = Lock()
+        self.root = Span(self, name, None, self.start, attributes)
+        self.spans.append(self.root)
+
+    def _new_span(self, name: str, parent: Span | None, start: float, attributes: dict[str, Any]) -> Span | None:
+        with self._lock:
+            if len(self.spans) >= MAX_SPANS_PER_TRACE:
+                self.dropped_spans += 1
+                return None
+            created = Span(self, name, (parent or self.root).span_id, start, attributes)
+            self.spans.append(created)
+            return created
+
+    def to_dict(self) -> dict[str, Any]:
+        """Compact trace blob persisted on the ``generation_jobs`` row."""
+        with self._lock:
+            spans = [item.to_dict() for item in self.spans]
+        return {
+            "trace_id": self.trace_id,
+            "name": self.root.name,
+            "duration_ms": round(self.root.duration * 1000, 3),
+            "dropped_spans": self.dropped_spans,
+            "spans": spans,
+        }
+
+    def to_otlp_json(self) -> dict[str, Any]:
+        """Render the trace as an OTLP/JSON ``ExportTraceServiceRequest``."""
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _otlp_attributes({"service.name": _SERVICE_NAME})},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [self._otlp_span(item) for item in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def _otlp_span(self, item: Span) -> dict[str, Any]:
+        start_ns = self.start_unix_ns + int((item.start - self.start) * 1e9)
+        attributes = dict(item.attributes)
+        attributes.update({f"counter.{name}": value for name, value in item.counters.items()})
+        record: dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": item.span_id,
+            "name": item.name,
+            "kind": 1,
+            "startTimeUnixNano": str(start_ns),
+            "endTimeUnixNano": str(start_ns + int(item.duration * 1e9)),
+            "attributes": _otlp_attributes(attributes),
+            "status": {"code": _OTLP_STATUS_CODES[item.status]},
+        }
+        if item.parent_id:
+            record["parentSpanId"] = item.parent_id
+        if item.error:
+            record["status"]["message"] = item.error
+        return record
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, str):
+        return {"stringValue": value}
+    return {"stringValue": json.dumps(value, default=str)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+_CURRENT_TRACE: ContextVar[Trace | None] = ContextVar("unlxck_trace", default=None)
+_CURRENT_SPAN: ContextVar[Span | None] = ContextVar("unlxck_span", default=None)
+
+
+def tracing_enabled() -> bool:
+    return os.environ.get(TRACING_ENV, "0").strip() == "1"
+
+
+def current_trace() -> Trace | None:
+    return _CURRENT_TRACE.get()
+
+
+@contextmanager
+def start_trace(name: str, **attributes: Any) -> Iterator[Trace | None]:
+    """Open a trace for the enclosed work; yields ``None`` when tracing is off."""
+    if not tracing_enabled():
+        yield None
+        return
+    trace = Trace(name, attributes)
+    trace_token = _CURRENT_TRACE.set(trace)
+    span_token = _CURRENT_SPAN.set(trace.root)
+    try:
+        yield trace
+    except BaseException as exc:
+        trace.root.record_error(exc)
+        raise
+    finally:
+        trace.root.end = time.perf_counter()
+        if trace.root.status == "unset":
+            trace.root.status = "ok"
+        _CURRENT_SPAN.reset(span_token)
+        _CURRENT_TRACE.reset(trace_token)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | _NoopSpan]:
+    """Open a child of the current span; a no-op outside an active trace."""
+    trace = _CURRENT_TRACE.get()
+    if trace is None:
+        yield NOOP_SPAN
+        return
+    created = trace._new_span(name, _CURRENT_SPAN.get(), time.perf_counter(), attributes)
+    if created is None:
+        yield NOOP_SPAN
+        return
+    token = _CURRENT_SPAN.set(created)
+    try:
+        yield created
+    except BaseException as exc:
+        created.record_error(exc)
+        raise
+    finally:
+        created.end = time.perf_counter()
+        if created.status == "unset":
+            created.status = "ok"
+        _CURRENT_SPAN.reset(token)
+
+
+def record_span(name: str, start: float, **attributes: Any) -> None:
+    """Record an already-finished child span that began at ``start`` (perf_counter)."""
+    trace = _CURRENT_TRACE.get()
+    if trace is None:
+        return
+    created = trace._new_span(name, _CURRENT_SPAN.get(), start, attributes)
+    if created is not None:
+        created.end = time.perf_counter()
+        created.status = "ok"
+
+
+def add_counter(name: str, value: float = 1) -> None:
+    """Increment ``name`` on the current span."""
+    current = _CURRENT_SPAN.get()
+    if current is not None:
+        current.add_counter(name, value)
+
+
+def export_trace(trace: Trace, path: str | os.PathLike[str] | None = None) -> bool:
+    """Append ``trace`` as one OTLP/JSON line to ``path`` (or the env-configured file)."""
+    target = path or os.environ.get(TRACE_OTLP_FILE_ENV, "").strip()
+    if not target:
+        return False
+    try:
+        target_path = Path(target)
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        with target_path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(trace.to_otlp_json(), default=str) + "\n")
+    except OSError:
+        logger.exception("[trace] export_failed path=%s", target)
+        return False
+    return True
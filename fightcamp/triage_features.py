@@ -156,6 +156,7 @@ _NEGATED_SEVERE_PATTERNS = (
     r"\b(?:acl|pcl)\s+intact\b",
     r"\bno\s+fracture\s+seen\b",
 )
+_NEGATED_SEVERE_PATTERN = re.compile("|".join(f"(?:{pattern})" for pattern in _NEGATED_SEVERE_PATTERNS))
 
 _ACL_HISTORY_TERMS = (
     "history of",
@@ -320,20 +321,55 @@ def _parsed_injury_chunks(parsed_injuries: list[dict[str, Any]] | None) -> list[
     return chunks
 
 
+@dataclass(frozen=True)
+class _CompiledPatternSet:
+    """One ``(pattern, label)`` tuple compiled for repeated scans.
+
+    ``screen`` is the alternation of every pattern: most chunks match none of
+    them, and one combined search rejects those without trying each pattern.
+    """
+
+    screen: re.Pattern[str]
+    patterns: tuple[tuple[re.Pattern[str], str], ...]
+
+
+# Keyed by the pattern tuple itself; the tuples are module constants, so this
+# holds one entry per tuple and never needs invalidating.
+_COMPILED_PATTERN_SETS: dict[tuple[tuple[str, str], ...], _CompiledPatternSet] = {}
+_TERM_PATTERN_CACHE: dict[tuple[str, ...], re.Pattern[str]] = {}
+
+
+def _compiled_pattern_set(patterns: tuple[tuple[str, str], ...]) -> _CompiledPatternSet:
+    compiled = _COMPILED_PATTERN_SETS.get(patterns)
+    if compiled is None:
+        compiled = _CompiledPatternSet(
+            screen=re.compile("|".join(f"(?:{pattern})" for pattern, _ in patterns) or r"$^"),
+            patterns=tuple((re.compile(pattern), label) for pattern, label in patterns),
+        )
+        _COMPILED_PATTERN_SETS[patterns] = compiled
+    return compiled
+
+
 def _collect_matches(text: str, patterns: tuple[tuple[str, str], ...]) -> set[str]:
     lowered = str(text or "").lower()
-    matches: set[str] = set()
-    for pattern, label in patterns:
-        if re.search(pattern, lowered):
-            matches.add(label)
-    return matches
+    compiled = _compiled_pattern_set(patterns)
+    if not compiled.screen.search(lowered):
+        return set()
+    return {label for pattern, label in compiled.patterns if pattern.search(lowered)}
+
+
+def _term_pattern(terms: tuple[str, ...]) -> re.Pattern[str]:
+    pattern = _TERM_PATTERN_CACHE.get(terms)
+    if pattern is None:
+        pattern = re.compile(rf"(?<!\w)(?:{'|'.join(re.escape(t) for t in terms)})(?!\w)")
+        _TERM_PATTERN_CACHE[terms] = pattern
+    return pattern
 
 
 def _contains_any_term(text: str, terms: tuple[str, ...]) -> bool:
     if not terms:
         return False
-    pattern = rf"(?<!\w)(?:{'|'.join(re.escape(t) for t in terms)})(?!\w)"
-    return bool(re.search(pattern, text))
+    return bool(_term_pattern(terms).search(text))
 
 
 def _is_structural_severe_signal(*, text: str, scored_injury_type: str) -> bool:
@@ -349,7 +385,7 @@ def _is_structural_severe_signal(*, text: str, scored_injury_type: str) -> bool:
 
 def _is_negated_severe_chunk(text: str) -> bool:
     lowered = str(text or "").lower()
-    return any(re.search(pattern, lowered) for pattern in _NEGATED_SEVERE_PATTERNS)
+    return bool(_NEGATED_SEVERE_PATTERN.search(lowered))
 
 
 def _is_acl_history_only_chunk(text: str) -> bool:
@@ -98,6 +98,7 @@ create table if not exists public.generation_jobs (
   intake_id uuid references public.athlete_intakes(id) on delete set null,
   stage1_result jsonb,
   final_result jsonb,
+  trace jsonb,
   plan_id uuid references public.plans(id) on delete set null,
   attempt_count integer not null default 0,
   heartbeat_at timestamptz,
@@ -123,6 +124,7 @@ alter table public.generation_jobs add column if not exists error text;
 alter table public.generation_jobs add column if not exists intake_id uuid references public.athlete_intakes(id) on delete set null;
 alter table public.generation_jobs add column if not exists stage1_result jsonb;
 alter table public.generation_jobs add column if not exists final_result jsonb;
+alter table public.generation_jobs add column if not exists trace jsonb;
 alter table public.generation_jobs add column if not exists plan_id uuid references public.plans(id) on delete set null;
 alter table public.generation_jobs add column if not exists attempt_count integer not null default 0;
 alter table public.generation_jobs add column if not exists heartbeat_at timestamptz;
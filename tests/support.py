@@ -158,6 +158,17 @@ class FakeStore:
     def get_plan(self, plan_id: str) -> dict | None:
         return self.plans.get(plan_id)
 
+    def get_plan_validation_rows(self, plan_ids: list[str]) -> list[dict]:
+        return [
+            {key: self.plans[plan_id][key] for key in ("id", "planning_brief", "final_plan_text")}
+            for plan_id in plan_ids
+            if plan_id in self.plans
+        ]
+
+    def list_plan_validation_rows(self, *, limit: int = 500, offset: int = 0) -> list[dict]:
+        rows = sorted(self.plans.values(), key=lambda row: (row["created_at"], row["id"]))
+        return self.get_plan_validation_rows([row["id"] for row in rows[offset:offset + limit]])
+
     def get_latest_plan(self, athlete_id: str) -> dict | None:
         plans = self.list_user_plans(athlete_id)
         return plans[0] if plans else None
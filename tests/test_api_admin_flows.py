@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import json
+
 from fastapi.testclient import TestClient
 
 from api.app import create_app
@@ -568,3 +570,72 @@ def test_curated_review_required_scenarios_are_fast_for_admin_to_resolve():
             raise AssertionError(f"Unexpected resolution strategy: {scenario.expected_resolution}")
 
         assert store.get_plan(plan_id)["status"] == "ready"
+
+
+def test_admin_plan_batch_dedupes_intakes_and_streams_jsonl_records():
+    client, _, _ = _build_client()
+    first = _build_request().model_dump_json()
+    second = _build_request({"fight_date": "2026-05-02"}).model_dump_json()
+    body = "\n".join([first, second, "", first])
+
+    forbidden = client.post(
+        "/api/admin/plans/batch",
+        headers={"Authorization": "Bearer athlete-token"},
+        content=body,
+    )
+    assert forbidden.status_code == 403
+
+    response = client.post(
+        "/api/admin/plans/batch",
+        headers={"Authorization": "Bearer admin-token"},
+        content=body,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines() if line]
+    assert [record["sources"] for record in records] == [[1, 4], [2]]
+    assert all(record["status"] == "ok" for record in records)
+    assert all(record["result"]["plan_text"] for record in records)
+    assert all("elapsed_s" in record and "timings" in record for record in records)
+
+    resumed = client.post(
+        "/api/admin/plans/batch",
+        headers={"Authorization": "Bearer admin-token"},
+        params={"skip_hash": records[0]["intake_hash"]},
+        content=body,
+    )
+    resumed_records = [json.loads(line) for line in resumed.text.splitlines() if line]
+    assert [record["intake_hash"] for record in resumed_records] == [records[1]["intake_hash"]]
+
+
+def test_admin_plan_batch_runs_the_stock_planner_on_the_shared_pool(monkeypatch):
+    monkeypatch.setenv("UNLXCK_ADMIN_BATCH_WORKERS", "2")
+    admin = AuthenticatedUser(user_id="admin-1", email="ops@unlxck.test", full_name="Ops Admin", metadata={})
+    app = create_app(
+        store=FakeStore(),
+        auth_service=FakeAuthService({"admin-token": admin}),
+        stage2_automator=FakeStage2Automator(result=finalized_result()),
+    )
+    body = "\n".join([_build_request().model_dump_json(), _build_request({"fight_date": "2026-05-02"}).model_dump_json()])
+
+    with TestClient(app) as client:
+        response = client.post("/api/admin/plans/batch", headers={"Authorization": "Bearer admin-token"}, content=body)
+        records = [json.loads(line) for line in response.text.splitlines() if line]
+        assert app.state.plan_batch_pool._executor is not None
+
+    assert app.state.plan_batch_pool._executor is None
+    assert sorted(record["sources"] for record in records) == [[1], [2]]
+    assert all(record["status"] == "ok" and record["timings"] for record in records)
+
+
+def test_admin_plan_batch_rejects_invalid_lines():
+    client, _, _ = _build_client()
+
+    response = client.post(
+        "/api/admin/plans/batch",
+        headers={"Authorization": "Bearer admin-token"},
+        content=_build_request().model_dump_json() + "\n{\"athlete\": {}}",
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"]["line"] == 2
@@ -262,6 +262,55 @@ def test_run_generation_job_updates_existing_plan_for_same_intake_after_resume()
     assert len(store.list_user_plans(athlete.user_id)) == 1
 
 
+def test_run_generation_job_persists_trace_blob_when_tracing_enabled(monkeypatch, tmp_path):
+    monkeypatch.setenv("UNLXCK_TRACING", "1")
+    otlp_path = tmp_path / "otlp.jsonl"
+    monkeypatch.setenv("UNLXCK_TRACE_OTLP_FILE", str(otlp_path))
+    store = FakeStore()
+    athlete = AuthenticatedUser(
+        user_id="athlete-1",
+        email="ari@example.com",
+        full_name="Ari Mensah",
+        metadata={},
+    )
+    store.ensure_profile(athlete)
+    job = store.create_or_get_generation_job(
+        athlete_id=athlete.user_id,
+        client_request_id="traced-job",
+        source="self_service",
+        request_payload=_build_request().model_dump(mode="json"),
+    )
+
+    asyncio.run(
+        run_generation_job(
+            job_id=job["id"],
+            store=store,
+            planner_fn=_planner,
+            stage2=FakeStage2Automator(result=finalized_result()),
+            active_tasks=set(),
+        )
+    )
+
+    refreshed_job = store.get_generation_job(job["id"])
+    trace = refreshed_job["trace"]
+    spans = {item["name"]: item for item in trace["spans"]}
+    assert refreshed_job["status"] == "completed"
+    assert spans["generation_job"]["attributes"] == {"job_id": job["id"]}
+    assert spans["stage1"]["parent_id"] == spans["generation_job"]["span_id"]
+    assert spans["stage2.finalize"]["attributes"] == {"stage2_status": "stage2_pass"}
+    assert len(otlp_path.read_text(encoding="utf-8").splitlines()) == 1
+
+
+def test_run_generation_job_skips_trace_when_tracing_disabled(monkeypatch):
+    monkeypatch.delenv("UNLXCK_TRACING", raising=False)
+    client, store, _ = _build_client()
+
+    _, job = _start_generation(client)
+
+    assert job["status"] == "completed"
+    assert "trace" not in store.get_generation_job(job["job_id"])
+
+
 def test_should_skip_stage2_when_triage_blocked_status_has_no_nested_flag():
     assert (
         should_skip_stage2(
@@ -0,0 +1,180 @@
+"""Tests for read-only shared bank records.
+
+Covers:
+1. FrozenRecord rejects in-place mutation and copies out as a plain dict.
+2. Records survive pickling (process pools) and memoize derived values.
+3. Selection banks are loaded as FrozenRecords.
+4. ensure_tags / normalize_exercise_movement never write into a shared record.
+5. A full generation leaves every shared bank untouched, so repeated
+   requests in one process produce identical plans.
+"""
+from __future__ import annotations
+
+import copy
+import json
+import pickle
+import random
+from pathlib import Path
+
+import pytest
+
+from fightcamp.bank_schema import FrozenRecord, freeze_bank
+from fightcamp.conditioning import get_conditioning_bank, get_coordination_bank, get_style_conditioning_bank
+from fightcamp.injury_filtering import ensure_tags, ensured_tags, with_ensured_tags
+from fightcamp.main import generate_plan_sync
+from fightcamp.strength import get_exercise_bank, get_style_exercises, get_universal_strength, normalize_exercise_movement
+
+_DATA_PATH = Path(__file__).resolve().parents[1] / "test_data.json"
+
+
+def _record(**fields) -> FrozenRecord:
+    base = {"name": "Trap Bar Deadlift Hold", "tags": ["hinge"], "phases": ["GPP"]}
+    base.update(fields)
+    return FrozenRecord(base)
+
+
+# ---------------------------------------------------------------------------
+# 1. Read-only records
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda r: r.__setitem__("name", "x"),
+        lambda r: r.__delitem__("name"),
+        lambda r: r.update(name="x"),
+        lambda r: r.setdefault("movement", "hinge"),
+        lambda r: r.pop("name"),
+        lambda r: r.popitem(),
+        lambda r: r.clear(),
+    ],
+)
+def test_frozen_record_rejects_mutation(mutate):
+    record = _record()
+
+    with pytest.raises(TypeError, match="read-only"):
+        mutate(record)
+    assert record["name"] == "Trap Bar Deadlift Hold"
+
+
+def test_copies_and_overlays_are_plain_dicts():
+    record = _record()
+
+    for copied in (record.copy(), copy.copy(record), copy.deepcopy(record), record.overlay(name="Renamed")):
+        assert type(copied) is dict
+        copied["extra"] = True
+    assert record.overlay(name="Renamed")["name"] == "Renamed"
+    assert "extra" not in record
+    assert json.loads(json.dumps(record)) == dict(record)
+
+
+# ---------------------------------------------------------------------------
+# 2. Pickling and memoized derived values
+# ---------------------------------------------------------------------------
+
+def test_frozen_record_pickles_and_memoizes_derived_values():
+    record = _record()
+    calls = []
+
+    def factory(item):
+        calls.append(item)
+        return "hinge"
+
+    assert record.derived("movement", factory) == "hinge"
+    assert record.derived("movement", factory) == "hinge"
+    assert len(calls) == 1
+
+    restored = pickle.loads(pickle.dumps(record))
+    assert isinstance(restored, FrozenRecord)
+    assert restored == record
+    with pytest.raises(TypeError):
+        restored["name"] = "x"
+
+
+def test_freeze_bank_keeps_existing_records():
+    record = _record()
+
+    frozen = freeze_bank([record, {"name": "Plank", "tags": []}])
+
+    assert frozen[0] is record
+    assert isinstance(frozen[1], FrozenRecord)
+
+
+# ---------------------------------------------------------------------------
+# 3. Loaders
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize(
+    "loader",
+    [
+        get_exercise_bank,
+        get_style_exercises,
+        get_universal_strength,
+        get_conditioning_bank,
+        get_style_conditioning_bank,
+        get_coordination_bank,
+    ],
+)
+def test_selection_banks_load_frozen_records(loader):
+    bank = loader()
+
+    assert bank
+    assert all(isinstance(item, FrozenRecord) for item in bank)
+
+
+# ---------------------------------------------------------------------------
+# 4. Derived values are not written back
+# ---------------------------------------------------------------------------
+
+def test_tag_resolution_does_not_write_into_shared_records():
+    record = _record()
+
+    tags, tag_source = ensured_tags(record)
+
+    assert tag_source == "explicit"
+    assert "mech_grip_static" in tags
+    assert ensure_tags(record) == tags
+    assert record["tags"] == ["hinge"]
+    assert "_tag_source" not in record
+    decorated = with_ensured_tags(record)
+    assert decorated["tags"] == tags and decorated["_tag_source"] == "explicit"
+
+
+def test_mutable_items_keep_resolving_tags_in_place():
+    item = {"name": "Trap Bar Deadlift Hold", "tags": ["hinge"]}
+
+    tags = ensure_tags(item)
+
+    assert item["tags"] == tags
+    assert item["_tag_source"] == "explicit"
+    assert with_ensured_tags(item) is item
+
+
+def test_movement_normalization_does_not_write_into_shared_records():
+    record = _record(movement="Hinge variation")
+
+    movement = normalize_exercise_movement(record)
+
+    assert movement == normalize_exercise_movement(dict(record))
+    assert record["movement"] == "Hinge variation"
+
+
+# ---------------------------------------------------------------------------
+# 5. Generation leaves banks untouched
+# ---------------------------------------------------------------------------
+
+def test_generation_does_not_mutate_shared_banks():
+    payload = json.loads(_DATA_PATH.read_text(encoding="utf-8"))
+    payload["random_seed"] = 11
+    banks = [get_exercise_bank(), get_conditioning_bank(), get_style_conditioning_bank()]
+    before = [[dict(item) for item in bank] for bank in banks]
+
+    random.seed(0)
+    first = generate_plan_sync(copy.deepcopy(payload), generate_pdf=False)
+    second = generate_plan_sync(copy.deepcopy(payload), generate_pdf=False)
+
+    assert [[dict(item) for item in bank] for bank in banks] == before
+    assert first["plan_text"] == second["plan_text"]
+    assert json.dumps(first["stage2_payload"], sort_keys=True, default=str) == json.dumps(
+        second["stage2_payload"], sort_keys=True, default=str
+    )
@@ -0,0 +1,117 @@
+"""Tests for the shared single-load bank registry.
+
+Covers:
+1. Every consumer of a bank gets the same registry items (loaded once).
+2. Tag strings are interned and list banks are frozen.
+3. Bank versions are content hashes of the source files.
+4. swap() installs new banks atomically and runs the invalidation callbacks.
+"""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+import fightcamp.conditioning as conditioning
+import fightcamp.injury_guard as injury_guard
+import fightcamp.rehab_protocols as rehab_protocols
+import fightcamp.strength as strength
+from fightcamp.bank_registry import BANK_REGISTRY, BankEntry, BankRegistry, BankSpec
+from fightcamp.bank_schema import FrozenRecord
+from fightcamp.injury_filtering import collect_banks
+
+
+@pytest.fixture
+def restore_registry():
+    saved = dict(BANK_REGISTRY._entries)
+    yield
+    BANK_REGISTRY.swap(saved)
+
+
+# ---------------------------------------------------------------------------
+# 1. Shared single load
+# ---------------------------------------------------------------------------
+
+def test_exercise_bank_is_shared_across_modules():
+    bank = BANK_REGISTRY.get("exercise_bank")
+
+    assert strength.get_exercise_bank() is bank
+    assert rehab_protocols.get_exercise_bank() is bank
+    assert collect_banks()["exercise_bank"] is bank
+
+
+def test_conditioning_getters_read_the_registry():
+    assert conditioning.get_conditioning_bank() is BANK_REGISTRY.get("conditioning_bank")
+    assert conditioning.get_format_weights() is BANK_REGISTRY.get("format_energy_weights")
+    assert rehab_protocols.get_rehab_bank() is BANK_REGISTRY.get("rehab_bank")
+
+
+# ---------------------------------------------------------------------------
+# 2. Interning and freezing
+# ---------------------------------------------------------------------------
+
+def test_tags_are_interned_and_records_frozen():
+    bank = BANK_REGISTRY.get("conditioning_bank")
+    seen: dict[str, str] = {}
+
+    for item in bank:
+        assert isinstance(item, FrozenRecord)
+        for tag in item["tags"]:
+            assert seen.setdefault(tag, tag) is tag
+
+
+# ---------------------------------------------------------------------------
+# 3. Content-hash versions
+# ---------------------------------------------------------------------------
+
+def test_source_version_tracks_file_content(tmp_path):
+    registry = BankRegistry([BankSpec("demo", ("demo.json",), "unused:loader")], data_dir=tmp_path)
+    missing = registry.source_version("demo")
+
+    (tmp_path / "demo.json").write_text(json.dumps([{"name": "a"}]), encoding="utf-8")
+    first = registry.source_version("demo")
+    (tmp_path / "demo.json").write_text(json.dumps([{"name": "b"}]), encoding="utf-8")
+
+    assert len({missing, first, registry.source_version("demo")}) == 3
+
+
+def test_loaded_banks_report_their_versions():
+    BANK_REGISTRY.get("exercise_bank")
+
+    assert BANK_REGISTRY.versions()["exercise_bank"] == BANK_REGISTRY.source_version("exercise_bank")
+
+
+# ---------------------------------------------------------------------------
+# 4. Atomic swap and invalidation
+# ---------------------------------------------------------------------------
+
+def test_swap_replaces_bank_and_invalidates_derived_caches(restore_registry):
+    old_bank = strength.get_exercise_bank()
+    conditioning.prime_conditioning_views()
+    injury_guard._cache_injury_decision(("probe",), {"action": "allow"})
+    generation = BANK_REGISTRY.generation
+
+    replacement = BankEntry(name="exercise_bank", items=[FrozenRecord(old_bank[0])], version="test")
+    assert BANK_REGISTRY.swap({"exercise_bank": replacement}) == generation + 1
+
+    assert strength.get_exercise_bank() is replacement.items
+    assert rehab_protocols.get_exercise_bank() is replacement.items
+    assert BANK_REGISTRY.versions()["exercise_bank"] == "test"
+    assert not conditioning._conditioning_view_cache
+    assert injury_guard._cached_injury_decision(("probe",)) is None
+
+
+def test_swap_rejects_unknown_banks():
+    with pytest.raises(KeyError):
+        BANK_REGISTRY.swap({"nope": BankEntry(name="nope", items=[], version="x")})
+
+
+def test_on_swap_callbacks_are_deduplicated_by_key():
+    registry = BankRegistry([])
+    calls = []
+
+    registry.on_swap("module", lambda swapped: calls.append("first"))
+    registry.on_swap("module", lambda swapped: calls.append("second"))
+    registry.swap({})
+
+    assert calls == ["second"]
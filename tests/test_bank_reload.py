@@ -0,0 +1,195 @@
+"""Tests for hot-reloading edited data banks.
+
+Covers:
+1. changed_banks() only reports banks whose source content changed.
+2. refresh() swaps in rebuilt banks and keeps serving old ones on load errors,
+   and warns about edited data files that are not reloadable banks.
+3. reload_plan_banks() re-primes derived indexes and retires cached injury
+   decisions.
+4. The polling watcher and the admin reload endpoint.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+
+import pytest
+
+import fightcamp.conditioning as conditioning
+import fightcamp.injury_guard as injury_guard
+import fightcamp.plan_pipeline_runtime as runtime
+from fightcamp.bank_registry import BANK_REGISTRY, BankRegistry, BankSpec
+from fightcamp.bank_reload import BANK_RELOAD_INTERVAL_ENV, BankReloadWatcher, start_bank_reload_watcher
+from support import _build_client
+
+
+def _demo_registry(tmp_path) -> BankRegistry:
+    def load_demo():
+        return json.loads((tmp_path / "demo.json").read_text(encoding="utf-8"))
+
+    (tmp_path / "demo.json").write_text(json.dumps([{"name": "Sled Push", "tags": ["legs"]}]), encoding="utf-8")
+    return BankRegistry([BankSpec("demo", ("demo.json",), load_demo)], data_dir=tmp_path)
+
+
+def _touch_later(path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def restore_registry():
+    saved = dict(BANK_REGISTRY._entries)
+    yield
+    BANK_REGISTRY.swap(saved)
+    runtime._BANKS_WARM = False
+    runtime.prime_plan_banks()
+
+
+# ---------------------------------------------------------------------------
+# 1. Change detection
+# ---------------------------------------------------------------------------
+
+def test_changed_banks_ignores_touch_without_content_change(tmp_path):
+    registry = _demo_registry(tmp_path)
+    registry.get("demo")
+
+    _touch_later(tmp_path / "demo.json")
+    assert registry.changed_banks() == []
+
+    (tmp_path / "demo.json").write_text(json.dumps([{"name": "Sled Drag", "tags": []}]), encoding="utf-8")
+    _touch_later(tmp_path / "demo.json")
+    assert registry.changed_banks() == ["demo"]
+
+
+def test_unloaded_banks_are_never_reported(tmp_path):
+    registry = _demo_registry(tmp_path)
+
+    (tmp_path / "demo.json").write_text("[]", encoding="utf-8")
+    assert registry.changed_banks() == []
+
+
+# ---------------------------------------------------------------------------
+# 2. refresh()
+# ---------------------------------------------------------------------------
+
+def test_refresh_swaps_in_the_edited_bank(tmp_path):
+    registry = _demo_registry(tmp_path)
+    before = registry.get("demo")
+    swaps = []
+    registry.on_swap("test", swaps.append)
+
+    (tmp_path / "demo.json").write_text(json.dumps([{"name": "Sled Drag", "tags": ["legs"]}]), encoding="utf-8")
+    _touch_later(tmp_path / "demo.json")
+
+    assert registry.refresh() == ["demo"]
+    assert registry.get("demo") is not before
+    assert registry.get("demo")[0]["name"] == "Sled Drag"
+    assert swaps == [frozenset({"demo"})]
+    assert registry.refresh() == []
+
+
+def test_refresh_keeps_old_bank_when_new_json_is_broken(tmp_path):
+    registry = _demo_registry(tmp_path)
+    before = registry.get("demo")
+
+    (tmp_path / "demo.json").write_text("[{broken", encoding="utf-8")
+    _touch_later(tmp_path / "demo.json")
+
+    assert registry.refresh() == []
+    assert registry.get("demo") is before
+    assert registry.generation == 0
+
+
+def test_refresh_warns_when_an_unwatched_data_file_changes(tmp_path, caplog):
+    (tmp_path / "regex_patterns.json").write_text("{}", encoding="utf-8")
+    registry = _demo_registry(tmp_path)
+    registry.get("demo")
+
+    _touch_later(tmp_path / "regex_patterns.json")
+    assert registry.unwatched_changes() == []
+
+    (tmp_path / "regex_patterns.json").write_text('{"a": {}}', encoding="utf-8")
+    (tmp_path / "tag_vocabulary.json").write_text("[]", encoding="utf-8")
+    with caplog.at_level(logging.WARNING, logger="fightcamp.bank_registry"):
+        assert registry.refresh() == []
+
+    assert "not_reloadable files=regex_patterns.json,tag_vocabulary.json" in caplog.text
+    assert registry.unwatched_changes() == []
+
+
+# ---------------------------------------------------------------------------
+# 3. reload_plan_banks()
+# ---------------------------------------------------------------------------
+
+def test_reload_plan_banks_reprimes_and_retires_decisions(restore_registry):
+    runtime.prime_plan_banks()
+    old_bank = conditioning.get_conditioning_bank()
+    injury_guard._cache_injury_decision(("probe",), {"action": "allow"})
+    generation = BANK_REGISTRY.generation
+
+    reloaded = runtime.reload_plan_banks(force=True)
+
+    assert "conditioning_bank" in reloaded
+    assert BANK_REGISTRY.generation == generation + 1
+    assert runtime._BANKS_WARM is True
+    assert conditioning.get_conditioning_bank() is not old_bank
+    assert conditioning.get_conditioning_bank() == old_bank
+    assert ("conditioning_bank.json", "mma", "GPP") in conditioning._conditioning_view_cache
+    assert injury_guard._cached_injury_decision(("probe",)) is None
+
+
+def test_decision_cache_keys_carry_bank_generation(restore_registry):
+    injury_guard.clear_injury_decision_cache()
+    exercise = {"id": "bench", "name": "Bench Press", "tags": ["press_heavy"]}
+    injuries = [{"region": "shoulder", "severity": "high"}]
+
+    injury_guard.injury_decision(exercise, injuries, "GPP", "low")
+    BANK_REGISTRY.swap({})
+    injury_guard.injury_decision(exercise, injuries, "GPP", "low")
+
+    rules_versions = {key[4] for key in injury_guard._INJURY_DECISION_CACHE}
+    assert rules_versions == {f"{injury_guard.INJURY_RULES_VERSION}+banks.{BANK_REGISTRY.generation}"}
+
+
+def test_reload_without_changes_is_a_no_op():
+    runtime.prime_plan_banks()
+    generation = BANK_REGISTRY.generation
+
+    assert runtime.reload_plan_banks() == []
+    assert BANK_REGISTRY.generation == generation
+
+
+# ---------------------------------------------------------------------------
+# 4. Watcher and admin endpoint
+# ---------------------------------------------------------------------------
+
+def test_watcher_polls_until_stopped():
+    polled = threading.Event()
+    watcher = BankReloadWatcher(0.01, reload=lambda: polled.set() or [])
+
+    watcher.start()
+    assert polled.wait(2)
+    watcher.stop()
+    assert not watcher._thread.is_alive()
+
+
+def test_watcher_is_off_by_default(monkeypatch):
+    monkeypatch.delenv(BANK_RELOAD_INTERVAL_ENV, raising=False)
+
+    assert start_bank_reload_watcher() is None
+
+
+def test_admin_bank_reload_endpoint_requires_admin():
+    client, _, _ = _build_client()
+
+    forbidden = client.post("/api/admin/banks/reload", headers={"Authorization": "Bearer athlete-token"})
+    allowed = client.post("/api/admin/banks/reload", headers={"Authorization": "Bearer admin-token"})
+
+    assert forbidden.status_code == 403
+    assert allowed.status_code == 200
+    body = allowed.json()
+    assert body["reloaded"] == []
+    assert body["generation"] == BANK_REGISTRY.generation
+    assert "exercise_bank" in body["versions"]
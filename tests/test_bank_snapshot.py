@@ -0,0 +1,159 @@
+"""Tests for the pre-normalized bank snapshot.
+
+Covers:
+1. build_snapshot() round-trips every bank as frozen records with shared strings.
+2. Stale, corrupt, missing or disabled snapshots fall back to JSON (None).
+3. prime_from_snapshot() installs the banks into a cold process only.
+4. Drills selected from snapshot banks match the JSON-loaded banks.
+"""
+from __future__ import annotations
+
+import json
+import pickle
+import random
+
+import pytest
+
+import fightcamp.bank_snapshot as bank_snapshot
+from fightcamp.bank_registry import BANK_REGISTRY
+import fightcamp.conditioning as conditioning
+import fightcamp.rehab_protocols as rehab_protocols
+import fightcamp.strength as strength
+from fightcamp.bank_schema import FrozenRecord
+
+
+@pytest.fixture(scope="module")
+def snapshot_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp("snapshot") / "banks.snapshot"
+    bank_snapshot.build_snapshot(path)
+    return path
+
+
+@pytest.fixture
+def cold_banks():
+    saved = dict(BANK_REGISTRY._entries)
+    BANK_REGISTRY.swap({})
+    BANK_REGISTRY._entries = {}
+    yield
+    BANK_REGISTRY.swap(saved)
+
+
+def _flags() -> dict:
+    return {
+        "phase": "SPP",
+        "fatigue": "moderate",
+        "style_technical": ["boxing"],
+        "style_tactical": ["pressure fighter"],
+        "key_goals": ["conditioning"],
+        "weaknesses": ["gas tank"],
+        "injuries": [],
+        "equipment": ["bike", "heavy bag", "rower"],
+        "training_frequency": 4,
+        "days_until_fight": 30,
+    }
+
+
+# ---------------------------------------------------------------------------
+# 1. Round trip
+# ---------------------------------------------------------------------------
+
+def test_snapshot_round_trips_every_bank(snapshot_file):
+    banks = bank_snapshot.load_bank_snapshot(snapshot_file)
+
+    assert banks is not None
+    assert set(banks) == set(BANK_REGISTRY.names) | {"conditioning_views"}
+    for name in BANK_REGISTRY.names:
+        assert banks[name].items == BANK_REGISTRY.get(name)
+        assert banks[name].version == BANK_REGISTRY.source_version(name)
+    assert all(isinstance(item, FrozenRecord) for item in banks["exercise_bank"].items)
+    # Strings were interned before pickling, so equal strings load as one object.
+    first, second = banks["exercise_bank"].items[:2]
+    assert next(iter(first)) is next(iter(second))
+    view = banks["conditioning_views"][("conditioning_bank.json", "boxing", "SPP")]
+    assert [entry.drill for entry in view] == [
+        entry.drill for entry in conditioning.get_conditioning_view("conditioning_bank.json", "boxing", "SPP")
+    ]
+
+
+def test_snapshot_header_records_source_hash(snapshot_file):
+    header = bank_snapshot.read_snapshot_header(snapshot_file)
+
+    assert header["format"] == bank_snapshot.SNAPSHOT_FORMAT_VERSION
+    assert header["source_hash"] == bank_snapshot.bank_source_hash()
+    assert "conditioning_views" in header["banks"]
+
+
+# ---------------------------------------------------------------------------
+# 2. Fallbacks
+# ---------------------------------------------------------------------------
+
+def test_stale_snapshot_is_ignored(snapshot_file):
+    assert bank_snapshot.load_bank_snapshot(snapshot_file, source_hash="0" * 64) is None
+
+
+def test_source_hash_tracks_data_content(tmp_path):
+    (tmp_path / "bank.json").write_text(json.dumps([{"name": "a"}]), encoding="utf-8")
+    before = bank_snapshot.bank_source_hash(tmp_path)
+    (tmp_path / "banks.snapshot").write_bytes(b"ignored")
+    assert bank_snapshot.bank_source_hash(tmp_path) == before
+
+    (tmp_path / "bank.json").write_text(json.dumps([{"name": "b"}]), encoding="utf-8")
+    assert bank_snapshot.bank_source_hash(tmp_path) != before
+
+
+def test_corrupt_and_missing_snapshots_are_ignored(tmp_path, snapshot_file):
+    truncated = tmp_path / "truncated.snapshot"
+    truncated.write_bytes(snapshot_file.read_bytes()[:4096])
+    garbage = tmp_path / "garbage.snapshot"
+    garbage.write_bytes(b"not a pickle")
+    foreign = tmp_path / "foreign.snapshot"
+    foreign.write_bytes(pickle.dumps({"format": 0}, protocol=5))
+
+    for path in (truncated, garbage, foreign, tmp_path / "missing.snapshot"):
+        assert bank_snapshot.load_bank_snapshot(path) is None
+
+
+def test_snapshot_can_be_disabled(monkeypatch):
+    monkeypatch.setenv(bank_snapshot.SNAPSHOT_PATH_ENV, "0")
+
+    assert bank_snapshot.snapshot_path() is None
+    assert bank_snapshot.load_bank_snapshot() is None
+
+
+# ---------------------------------------------------------------------------
+# 3. Installing
+# ---------------------------------------------------------------------------
+
+def test_prime_from_snapshot_installs_into_cold_process(snapshot_file, cold_banks):
+    assert bank_snapshot.prime_from_snapshot(snapshot_file) is True
+
+    exercise_bank = strength.get_exercise_bank()
+    assert exercise_bank is BANK_REGISTRY.get("exercise_bank")
+    assert isinstance(exercise_bank[0], FrozenRecord)
+    assert conditioning.get_coordination_bank() is BANK_REGISTRY.get("coordination_bank")
+    assert ("style_conditioning_bank.json", "mma", "TAPER") in conditioning._conditioning_view_cache
+    assert rehab_protocols.get_rehab_locations()
+
+
+def test_prime_from_snapshot_skips_warm_process(snapshot_file):
+    before = strength.get_exercise_bank()
+
+    assert bank_snapshot.prime_from_snapshot(snapshot_file) is False
+    assert strength.get_exercise_bank() is before
+
+
+# ---------------------------------------------------------------------------
+# 4. Same selections
+# ---------------------------------------------------------------------------
+
+def test_snapshot_banks_select_the_same_drills(snapshot_file, cold_banks):
+    random.seed(3)
+    expected = conditioning.generate_conditioning_block(_flags())
+
+    BANK_REGISTRY.swap({})
+    BANK_REGISTRY._entries = {}
+    assert bank_snapshot.prime_from_snapshot(snapshot_file) is True
+    random.seed(3)
+    actual = conditioning.generate_conditioning_block(_flags())
+
+    assert json.dumps(actual, default=str, sort_keys=True) == json.dumps(expected, default=str, sort_keys=True)
@@ -0,0 +1,121 @@
+"""Tests for the ``python -m fightcamp.batch`` cohort planner.
+
+Covers:
+1. Identical intakes are deduped and keep every source line.
+2. Records stream to the output with per-stage timings.
+3. --resume skips intakes that already have an ok record.
+4. The API's shared spawn pool streams records in completion order.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+from fightcamp import batch
+
+_DATA_PATH = Path(__file__).resolve().parents[1] / "test_data.json"
+
+
+def _load_data() -> dict:
+    return json.loads(_DATA_PATH.read_text(encoding="utf-8"))
+
+
+def _read_records(path: Path) -> list[dict]:
+    records = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return records
+
+
+# ---------------------------------------------------------------------------
+# 1 – dedupe
+# ---------------------------------------------------------------------------
+
+def test_dedupe_intakes_is_key_order_insensitive():
+    payload = _load_data()
+    reordered = dict(reversed(list(payload.items())))
+    other = {**payload, "random_seed": 99}
+
+    intakes = batch.dedupe_intakes([(1, payload), (2, other), (3, reordered)])
+
+    assert [intake.sources for intake in intakes] == [[1, 3], [2]]
+    assert intakes[0].intake_hash == batch.intake_hash(reordered)
+
+
+def test_read_intake_lines_reports_bad_line_numbers():
+    try:
+        batch.read_intake_lines(['{"a": 1}', "", "[1, 2]"])
+    except ValueError as exc:
+        assert "line 3" in str(exc)
+    else:  # pragma: no cover
+        raise AssertionError("expected ValueError")
+
+
+def test_batch_cli_rejects_malformed_input_without_a_traceback(tmp_path, capsys):
+    input_path = tmp_path / "intakes.jsonl"
+    input_path.write_text('{"a": 1}\n{broken\n', encoding="utf-8")
+
+    assert batch.main([str(input_path), "--workers", "1"]) == 2
+    assert "line 2: invalid JSON" in capsys.readouterr().err
+
+
+# ---------------------------------------------------------------------------
+# 2 & 3 – streaming output and resume
+# ---------------------------------------------------------------------------
+
+def test_batch_cli_writes_timed_records_and_resumes(tmp_path):
+    payload = _load_data()
+    seeded = {**payload, "random_seed": 7}
+    input_path = tmp_path / "intakes.jsonl"
+    input_path.write_text(
+        "\n".join(json.dumps(item) for item in [payload, seeded, payload]) + "\n",
+        encoding="utf-8",
+    )
+    output_path = tmp_path / "results.jsonl"
+
+    # Checkpoint with the first intake done plus a record truncated mid-write.
+    done = {"intake_hash": batch.intake_hash(payload), "sources": [1, 3], "status": "ok"}
+    output_path.write_text(json.dumps(done) + '\n{"intake_hash": "trunc\n', encoding="utf-8")
+
+    exit_code = batch.main([str(input_path), "--output", str(output_path), "--workers", "1", "--resume"])
+
+    assert exit_code == 0
+    records = _read_records(output_path)
+    assert [record["intake_hash"] for record in records] == [done["intake_hash"], batch.intake_hash(seeded)]
+    new_record = records[-1]
+    assert new_record["status"] == "ok"
+    assert new_record["sources"] == [2]
+    assert new_record["result"]["plan_text"]
+    assert {"parse_input", "injury_triage", "render_bundle", "stage2_outputs"} <= set(new_record["timings"])
+
+
+
+# ---------------------------------------------------------------------------
+# 4 – shared planning pool
+# ---------------------------------------------------------------------------
+
+def test_planning_pool_streams_records_and_reuses_spawned_workers():
+    payload = _load_data()
+    intakes = batch.dedupe_intakes([(1, payload), (2, {**payload, "random_seed": 7}), (3, payload)])
+    pool = batch.PlanningPool(workers=2)
+
+    async def _collect():
+        return [record async for record in pool.stream(intakes)]
+
+    try:
+        first = asyncio.run(_collect())
+        executor = pool._executor
+        second = asyncio.run(_collect())
+        assert pool._executor is executor
+    finally:
+        pool.shutdown()
+
+    assert executor._mp_context.get_start_method() == "spawn"
+    for records in (first, second):
+        assert sorted(record["sources"] for record in records) == [[1, 3], [2]]
+        assert all(record["status"] == "ok" and record["result"]["plan_text"] for record in records)
+        assert all(record["timings"] for record in records)
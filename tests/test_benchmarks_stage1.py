@@ -0,0 +1,60 @@
+"""Tests for the Stage 1 benchmark corpus and regression gate."""
+from __future__ import annotations
+
+from datetime import date
+
+from benchmarks import stage1
+from benchmarks.corpus import build_corpus
+from fightcamp.input_parsing import PlanInput
+
+
+def test_corpus_scenarios_are_plannable_and_keep_their_days_out():
+    corpus = build_corpus(reference_date=date.today())
+
+    assert set(corpus) == {
+        "sample_intake",
+        "short_notice",
+        "late_fight",
+        "multi_injury",
+        "boxing_crowded_week",
+        "heavy_weight_cut",
+    }
+    for payload in corpus.values():
+        assert PlanInput.from_payload(payload).generation_issues() == []
+    assert PlanInput.from_payload(corpus["late_fight"]).days_until_fight <= 7
+    assert PlanInput.from_payload(corpus["short_notice"]).days_until_fight <= 14
+
+
+def test_percentile_interpolates():
+    assert stage1.percentile([], 50) == 0.0
+    assert stage1.percentile([1.0, 3.0], 50) == 2.0
+    assert stage1.percentile([4.0, 1.0, 2.0, 3.0, 5.0], 95) == 4.8
+
+
+def test_compare_flags_regressions_past_threshold_and_ignores_noise():
+    baseline = {
+        "warm": {
+            "stages": {
+                "strength": {"p50": 0.40, "p95": 0.80},
+                "parse_input": {"p50": 0.002, "p95": 0.004},
+            },
+            "peak_rss_mb": 120.0,
+        }
+    }
+    current = {
+        "warm": {
+            "stages": {
+                "strength": {"p50": 0.60, "p95": 0.85},
+                "parse_input": {"p50": 0.006, "p95": 0.009},
+            },
+            "peak_rss_mb": 200.0,
+        }
+    }
+
+    regressions = stage1.compare(current, baseline, threshold=0.25)
+
+    assert regressions == [
+        "warm strength p50: 0.4000s -> 0.6000s",
+        "warm peak_rss_mb: 120.0 -> 200.0",
+    ]
+    assert stage1.compare(baseline, baseline) == []
@@ -0,0 +1,125 @@
+"""Tests for the precomputed (format, phase) conditioning bank views.
+
+Covers:
+1. prime_conditioning_banks() builds a view for every bank, format and phase.
+2. View entries are read-only.
+3. Views only hold drills that pass the request-independent filters.
+4. Boxing views carry renamed drill names and muay_thai -> boxing tag rewrites.
+5. Drills handed out by generate_conditioning_block are copies, so decorating
+   them never leaks into the shared views.
+"""
+from __future__ import annotations
+
+import copy
+import dataclasses
+import json
+import random
+
+import pytest
+
+import fightcamp.conditioning as conditioning
+from fightcamp.conditioning_boxing import BOXING_NAME_MAP, _violates_sport_language_blacklist
+
+
+def _flags(**overrides) -> dict:
+    flags = {
+        "phase": "SPP",
+        "fatigue": "moderate",
+        "style_technical": ["boxing"],
+        "style_tactical": ["pressure fighter"],
+        "key_goals": ["conditioning"],
+        "weaknesses": ["gas tank"],
+        "injuries": [],
+        "equipment": ["bike", "heavy bag", "rower"],
+        "training_frequency": 4,
+        "days_until_fight": 30,
+    }
+    flags.update(overrides)
+    return flags
+
+
+# ---------------------------------------------------------------------------
+# 1. Priming
+# ---------------------------------------------------------------------------
+
+def test_prime_builds_every_format_phase_view():
+    conditioning.prime_conditioning_banks()
+
+    for source in ("conditioning_bank.json", "style_conditioning_bank.json"):
+        for selection_format in ("mma", "boxing", "kickboxing"):
+            for phase in conditioning.VIEW_PHASES:
+                assert (source, selection_format, phase) in conditioning._conditioning_view_cache
+
+
+def test_view_lookup_is_case_insensitive_on_phase():
+    view = conditioning.get_conditioning_view("conditioning_bank.json", "mma", "gpp")
+
+    assert view is conditioning.get_conditioning_view("conditioning_bank.json", "mma", "GPP")
+
+
+# ---------------------------------------------------------------------------
+# 2. Immutability
+# ---------------------------------------------------------------------------
+
+def test_view_entries_are_read_only():
+    entry = conditioning.get_conditioning_view("conditioning_bank.json", "mma", "GPP")[0]
+
+    with pytest.raises(TypeError):
+        entry.drill["name"] = "changed"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        entry.system = "alactic"
+    assert isinstance(entry.tags, tuple)
+    assert entry.tag_set == frozenset(entry.tags)
+
+
+# ---------------------------------------------------------------------------
+# 3. Request-independent filters
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("selection_format", ["mma", "boxing", "kickboxing"])
+@pytest.mark.parametrize("phase", ["GPP", "SPP", "TAPER"])
+def test_view_entries_pass_format_and_phase_filters(selection_format, phase):
+    view = conditioning.get_conditioning_view("conditioning_bank.json", selection_format, phase)
+
+    assert view
+    for entry in view:
+        assert phase in entry.drill["phases"]
+        assert entry.system in {"aerobic", "glycolytic", "alactic"}
+        assert not _violates_sport_language_blacklist(entry.drill, fight_format=selection_format)
+        if entry.system == "alactic":
+            assert conditioning._alactic_structure_ok(entry.drill)
+
+
+# ---------------------------------------------------------------------------
+# 4. Boxing renames
+# ---------------------------------------------------------------------------
+
+def test_boxing_view_applies_renames_and_tag_rewrites():
+    view = conditioning.get_conditioning_view("conditioning_bank.json", "boxing", "SPP")
+
+    names = {entry.drill["name"] for entry in view}
+    assert not names & (set(BOXING_NAME_MAP) - set(BOXING_NAME_MAP.values()))
+    assert all("muay_thai" not in entry.tag_set for entry in view)
+
+
+# ---------------------------------------------------------------------------
+# 5. Per-request copies
+# ---------------------------------------------------------------------------
+
+def test_generated_drills_do_not_leak_into_views():
+    view = conditioning.get_conditioning_view("conditioning_bank.json", "boxing", "SPP")
+    before = [copy.deepcopy(dict(entry.drill)) for entry in view]
+
+    random.seed(7)
+    _, _, _, grouped_drills, _, _ = conditioning.generate_conditioning_block(_flags())
+    assert any(grouped_drills.values())
+    for drills in grouped_drills.values():
+        for drill in drills:
+            drill["name"] = "mutated"
+
+    assert [dict(entry.drill) for entry in view] == before
+    random.seed(7)
+    second = conditioning.generate_conditioning_block(_flags())
+    random.seed(7)
+    third = conditioning.generate_conditioning_block(_flags())
+    assert json.dumps(second, default=str, sort_keys=True) == json.dumps(third, default=str, sort_keys=True)
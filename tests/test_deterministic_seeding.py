@@ -132,3 +132,28 @@ def test_seed_zero_is_valid():
     
     # Seed 0 should be deterministic
     assert result1["plan_text"] == result2["plan_text"]
+
+
+def test_parallel_plan_blocks_match_serial_generation(monkeypatch):
+    """Running plan units on the shared executor must not change the output."""
+    import json
+
+    import fightcamp.plan_pipeline_blocks as blocks_module
+
+    data = json.loads((Path(__file__).resolve().parents[1] / "test_data.json").read_text(encoding="utf-8"))
+    data["random_seed"] = 11
+
+    monkeypatch.setattr(blocks_module, "_PLAN_BLOCK_WORKERS", 0)
+    # The first generation in a process lazily decorates bank items with
+    # inferred tags; compare warm runs only.
+    asyncio.run(generate_plan(json.loads(json.dumps(data))))
+    serial = asyncio.run(generate_plan(json.loads(json.dumps(data))))
+
+    monkeypatch.setattr(blocks_module, "_PLAN_BLOCK_WORKERS", 4)
+    parallel = asyncio.run(generate_plan(json.loads(json.dumps(data))))
+
+    assert blocks_module._PLAN_BLOCK_EXECUTOR is not None
+    assert parallel["plan_text"] == serial["plan_text"]
+    assert parallel["why_log"] == serial["why_log"]
+    assert parallel["coach_notes"] == serial["coach_notes"]
+    assert parallel["stage2_handoff_text"] == serial["stage2_handoff_text"]
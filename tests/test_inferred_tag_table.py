@@ -0,0 +1,80 @@
+"""Tests for the build-time inferred-tag table.
+
+Covers:
+1. data/bank_inferred_tags.json is current with the inference rules.
+2. Bank item names are answered from the table, identically to live inference.
+3. Names outside every bank fall back to the live rules.
+"""
+from __future__ import annotations
+
+import json
+
+from fightcamp import injury_filtering
+from fightcamp.injury_filtering import (
+    _infer_tags_from_name_live,
+    audit_inferred_tag_table,
+    collect_banks,
+    get_inferred_tag_table,
+    infer_tags_from_name,
+)
+
+
+# ---------------------------------------------------------------------------
+# 1. Freshness
+# ---------------------------------------------------------------------------
+
+def test_inferred_tag_table_is_current():
+    assert audit_inferred_tag_table() == []
+
+
+def test_audit_reports_outdated_entries(tmp_path):
+    entries = json.loads((injury_filtering.DATA_DIR / "bank_inferred_tags.json").read_text(encoding="utf-8"))
+    entries[0]["inferred_tags"] = ["made_up_tag"]
+    path = tmp_path / "bank_inferred_tags.json"
+    path.write_text(json.dumps(entries[:-1]), encoding="utf-8")
+
+    stale = audit_inferred_tag_table(path)
+
+    assert entries[0]["item_id"] in stale
+    assert entries[-1]["item_id"] in stale
+
+
+# ---------------------------------------------------------------------------
+# 2. Table lookups
+# ---------------------------------------------------------------------------
+
+def test_bank_names_resolve_from_table_like_live_inference():
+    table = get_inferred_tag_table()
+
+    for items in collect_banks().values():
+        for item in items:
+            name = item.get("name", "")
+            if name.strip():
+                assert injury_filtering.normalize_text(name) in table.by_name
+            assert infer_tags_from_name(name) == _infer_tags_from_name_live(name)
+
+
+def test_table_lookup_skips_live_rules(monkeypatch):
+    name = "Trap Bar Deadlift"
+    expected = _infer_tags_from_name_live(name)
+    monkeypatch.setattr(injury_filtering, "_infer_tags_from_name_live", lambda _name: {"live"})
+
+    assert infer_tags_from_name(name) == expected
+    assert infer_tags_from_name("trap-bar  DEADLIFT") == expected
+
+
+# ---------------------------------------------------------------------------
+# 3. Live fallback
+# ---------------------------------------------------------------------------
+
+def test_unknown_names_use_live_rules(monkeypatch):
+    calls = []
+
+    def _live(name):
+        calls.append(name)
+        return {"live"}
+
+    monkeypatch.setattr(injury_filtering, "_infer_tags_from_name_live", _live)
+
+    assert infer_tags_from_name("Heavy Sled Drag Finisher For Stage Two") == {"live"}
+    assert calls == ["Heavy Sled Drag Finisher For Stage Two"]
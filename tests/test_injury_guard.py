@@ -26,6 +26,7 @@ from fightcamp.injury_filtering import (
     match_forbidden,
     normalize_injury_regions,
 )
+from fightcamp.tagging import item_tag_ids, tag_ids
 
 
 def test_match_forbidden_avoids_substrings():
@@ -178,7 +179,7 @@ def test_injury_guard_region_false_positives():
 def test_injury_guard_field_restrictions():
     name_only = {"name": "Pressure Fighter Stomp", "purpose": "bench press power", "tags": []}
     name_only_reasons = _drill_text_injury_reasons(name_only, ["shoulder injury"])
-    assert name_only_reasons == []
+    assert name_only_reasons == ()
 
 
 def test_normalize_injury_regions_parses_phrases():
@@ -261,10 +262,20 @@ def test_severity_synonym_pattern_multi_word_separators():
     assert not pattern.search("areallyxtight")
 
 
-def test_compute_tags_hash_uses_normalized_tags():
-    assert injury_guard_module._compute_tags_hash(["Muay Thai", "skill refinement", "muay_thai"]) == injury_guard_module._compute_tags_hash(
-        ["muay_thai", "skill_refinement"]
-    )
+def test_decision_cache_tags_key_uses_normalized_tag_ids():
+    injury_guard_module.clear_injury_decision_cache()
+    injury = {"region": "shoulder", "severity": "high"}
+    raw = {"id": "tags-key-probe", "name": "Bench Press", "tags": ["Press Heavy", "upper push", "press_heavy"]}
+    canonical = {**raw, "tags": ["press_heavy", "upper_push"]}
+
+    injury_decision(raw, [injury], "GPP", "low")
+    injury_decision(canonical, [injury], "GPP", "low")
+
+    keys = [key for key in injury_guard_module._INJURY_DECISION_CACHE if key[0] == "tags-key-probe"]
+    assert len(keys) == 1
+    # Keyed on the resolved tags written back to the item, as tag IDs.
+    assert keys[0][5] == item_tag_ids(raw) == item_tag_ids(canonical)
+    assert keys[0][5] >= tag_ids(["press_heavy", "upper_push"])
 
 
 def test_dict_severity_normalization():
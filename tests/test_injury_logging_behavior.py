@@ -4,7 +4,7 @@ from fightcamp import injury_filtering
 
 
 def _run_match() -> None:
-    injury_filtering._INJURY_MATCH_DETAILS_CACHE.clear()
+    injury_filtering.clear_injury_match_cache()
     item = {"name": "DB Split Squat", "tags": []}
     injury_filtering.injury_match_details(item, ["knee pain"])
 
@@ -0,0 +1,166 @@
+"""Tests for the two-level injury_match_details cache.
+
+Covers:
+1. Repeat lookups are answered before any tag resolution.
+2. Results are shared read-only records, not copies.
+3. Mutable items still get their resolved tags written back on a hit.
+4. Changed item fields miss the first level.
+5. Both levels are bounded and report hits, misses and evictions.
+"""
+from __future__ import annotations
+
+import pytest
+
+from fightcamp import injury_filtering
+from fightcamp.bank_schema import FrozenRecord
+from fightcamp.injury_filtering import (
+    _MatchDetailsCache,
+    clear_injury_match_cache,
+    injury_match_cache_stats,
+    injury_match_details,
+)
+
+
+@pytest.fixture(autouse=True)
+def _empty_match_cache():
+    clear_injury_match_cache()
+    yield
+    clear_injury_match_cache()
+
+
+def _count_tag_resolution(monkeypatch) -> list[dict]:
+    calls: list[dict] = []
+    resolve = injury_filtering._resolve_tags
+
+    def _counting(item):
+        calls.append(item)
+        return resolve(item)
+
+    monkeypatch.setattr(injury_filtering, "_resolve_tags", _counting)
+    return calls
+
+
+# ---------------------------------------------------------------------------
+# 1. Cache before compute
+# ---------------------------------------------------------------------------
+
+def test_bank_record_hits_skip_tag_resolution(monkeypatch):
+    calls = _count_tag_resolution(monkeypatch)
+    record = FrozenRecord(name="Barbell Overhead Press", tags=["overhead", "press_heavy"])
+
+    first = injury_match_details(record, ["shoulder"])
+    second = injury_match_details(record, ["shoulder"])
+
+    assert first and second is first
+    assert len(calls) == 1
+    assert injury_match_cache_stats()["by_item"]["hits"] == 1
+
+
+def test_equal_mutable_items_skip_tag_resolution(monkeypatch):
+    calls = _count_tag_resolution(monkeypatch)
+
+    first = injury_match_details({"name": "Overhead Press", "tags": ["overhead"]}, ["shoulder"])
+    second = injury_match_details({"name": "Overhead Press", "tags": ["overhead"]}, ["shoulder"])
+
+    assert second is first
+    assert len(calls) == 1
+
+
+# ---------------------------------------------------------------------------
+# 2. Immutable results
+# ---------------------------------------------------------------------------
+
+def test_results_are_read_only_records():
+    details = injury_match_details({"name": "Overhead Press", "tags": ["overhead"]}, ["shoulder"])
+
+    assert isinstance(details, tuple)
+    for detail in details:
+        assert isinstance(detail, FrozenRecord)
+        assert all(isinstance(detail[key], tuple) for key in ("fields", "patterns", "tags"))
+        with pytest.raises(TypeError):
+            detail["risk_level"] = "flag"
+
+
+def test_no_injuries_returns_empty_tuple():
+    assert injury_match_details({"name": "Overhead Press"}, ["", None]) == ()
+
+
+# ---------------------------------------------------------------------------
+# 3. Tag write-back
+# ---------------------------------------------------------------------------
+
+def test_hits_write_resolved_tags_back_to_mutable_items():
+    injury_match_details({"name": "Overhead Press", "tags": []}, ["shoulder"])
+    item = {"name": "Overhead Press", "tags": []}
+
+    injury_match_details(item, ["shoulder"])
+
+    assert item["_tag_source"] == "inferred"
+    assert item["tags"] and item["tags"] != ["untagged"]
+    assert injury_match_cache_stats()["by_item"]["hits"] == 1
+
+
+def test_resolved_items_hit_after_write_back(monkeypatch):
+    calls = _count_tag_resolution(monkeypatch)
+    item = {"name": "Overhead Press", "tags": []}
+
+    first = injury_match_details(item, ["shoulder"])
+
+    assert "_tag_source" in item
+    assert injury_match_details(item, ["shoulder"]) is first
+    assert len(calls) == 1
+
+
+# ---------------------------------------------------------------------------
+# 4. Invalidation
+# ---------------------------------------------------------------------------
+
+def test_changed_fields_miss_the_item_level():
+    pressing = injury_match_details({"name": "Overhead Press", "tags": ["overhead"]}, ["shoulder"])
+    walking = injury_match_details({"name": "Easy Walk", "tags": ["low_impact"]}, ["shoulder"])
+
+    assert pressing and not walking
+    assert injury_match_cache_stats()["by_item"]["misses"] == 2
+
+
+def test_bank_swap_clears_both_levels():
+    injury_match_details(FrozenRecord(name="Overhead Press", tags=["overhead"]), ["shoulder"])
+
+    injury_filtering._reset_bank_caches(frozenset({"exercise_bank"}))
+
+    stats = injury_match_cache_stats()
+    assert stats["by_item"]["size"] == stats["by_content"]["size"] == 0
+
+
+# ---------------------------------------------------------------------------
+# 5. Bounds and stats
+# ---------------------------------------------------------------------------
+
+def test_levels_are_bounded_and_count_evictions(monkeypatch):
+    monkeypatch.setattr(injury_filtering, "_MATCH_DETAILS_BY_ITEM", _MatchDetailsCache(2))
+    monkeypatch.setattr(injury_filtering, "_MATCH_DETAILS_BY_CONTENT", _MatchDetailsCache(2))
+
+    for name in ("Overhead Press", "Push Press", "Arnold Press"):
+        injury_match_details(FrozenRecord(name=name, tags=["overhead"]), ["shoulder"])
+
+    stats = injury_match_cache_stats()
+    assert stats["by_item"]["size"] == 2
+    assert stats["by_item"]["evictions"] == 1
+    assert stats["by_content"]["evictions"] == 1
+
+
+def test_zero_size_disables_caching(monkeypatch):
+    monkeypatch.setattr(injury_filtering, "_MATCH_DETAILS_BY_ITEM", _MatchDetailsCache(0))
+    monkeypatch.setattr(injury_filtering, "_MATCH_DETAILS_BY_CONTENT", _MatchDetailsCache(0))
+    record = FrozenRecord(name="Overhead Press", tags=["overhead"])
+
+    first = injury_match_details(record, ["shoulder"])
+
+    assert injury_match_details(record, ["shoulder"]) == first
+    assert injury_match_cache_stats()["by_item"] == {
+        "hits": 0,
+        "misses": 2,
+        "evictions": 0,
+        "size": 0,
+        "max_size": 0,
+    }
@@ -0,0 +1,134 @@
+"""Tests for the memoized injury triage and its precompiled pattern scans.
+
+Covers:
+1. Identical injury fields are served from the content-hash cache.
+2. Cached results are copies; changed injury fields miss the cache.
+3. Combined pattern scans match the one-pattern-at-a-time reference.
+4. parsing_metadata reports whether triage came from the cache.
+"""
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from fightcamp import injury_triage, triage_features
+from fightcamp.injury_triage import (
+    clear_injury_triage_cache,
+    lookup_injury_triage,
+    triage_cache_key,
+    triage_injuries,
+)
+from fightcamp.input_parsing import PlanInput
+from fightcamp.main import generate_plan_sync
+
+
+def _payload_with_injury(injury_text: str) -> dict:
+    data = json.loads((Path(__file__).resolve().parents[1] / "test_data.json").read_text(encoding="utf-8"))
+    for field in data["data"]["fields"]:
+        if field.get("label") == "Any injuries or areas you need to work around?":
+            field["value"] = injury_text
+            break
+    return data
+
+
+@pytest.fixture(autouse=True)
+def _empty_triage_cache():
+    clear_injury_triage_cache()
+    yield
+    clear_injury_triage_cache()
+
+
+# ---------------------------------------------------------------------------
+# 1. Cache hits
+# ---------------------------------------------------------------------------
+
+def test_identical_injury_fields_hit_the_cache(monkeypatch):
+    calls = []
+    uncached = injury_triage._triage_injuries_uncached
+
+    def _counting(plan_input):
+        calls.append(plan_input)
+        return uncached(plan_input)
+
+    monkeypatch.setattr(injury_triage, "_triage_injuries_uncached", _counting)
+    first, first_hit = lookup_injury_triage(PlanInput.from_payload(_payload_with_injury("fractured left wrist")))
+    second, second_hit = lookup_injury_triage(PlanInput.from_payload(_payload_with_injury("fractured left wrist")))
+
+    assert (first_hit, second_hit) == (False, True)
+    assert len(calls) == 1
+    assert second == first
+
+
+def test_cache_key_ignores_non_injury_fields():
+    plan_input = PlanInput.from_payload(_payload_with_injury("mild calf soreness"))
+    other = replace(plan_input, training_frequency=plan_input.training_frequency + 1)
+
+    assert triage_cache_key(plan_input) == triage_cache_key(other)
+
+
+# ---------------------------------------------------------------------------
+# 2. Isolation
+# ---------------------------------------------------------------------------
+
+def test_cached_results_are_copies():
+    plan_input = PlanInput.from_payload(_payload_with_injury("torn acl, cannot bear weight"))
+    first = triage_injuries(plan_input)
+    first.red_flags.append("mutated")
+
+    assert "mutated" not in triage_injuries(plan_input).red_flags
+
+
+def test_changed_injury_text_misses_the_cache():
+    mild = PlanInput.from_payload(_payload_with_injury("mild calf soreness"))
+    severe = PlanInput.from_payload(_payload_with_injury("open fracture of the shin"))
+
+    assert triage_cache_key(mild) != triage_cache_key(severe)
+    assert lookup_injury_triage(mild)[0].mode != lookup_injury_triage(severe)[0].mode
+    assert lookup_injury_triage(severe)[1] is True
+
+
+# ---------------------------------------------------------------------------
+# 3. Precompiled scans
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize(
+    "patterns",
+    [
+        triage_features._RED_FLAG_PATTERNS,
+        triage_features._FUNCTION_LOSS_PATTERNS,
+        triage_features._CLINICIAN_RESTRICTION_PATTERNS,
+        triage_features._HIGH_RISK_PATTERNS,
+    ],
+)
+@pytest.mark.parametrize(
+    "text",
+    [
+        "mild calf soreness",
+        "knocked out after a hit, numbness and tingling, cannot bear weight",
+        "doctor said no sparring, in a walking boot, post-op acl reconstruction",
+        "stress fracture and dislocated shoulder, achilles rupture",
+    ],
+)
+def test_collect_matches_equals_per_pattern_scan(patterns, text):
+    lowered = text.lower()
+    expected = {label for pattern, label in patterns if re.search(pattern, lowered)}
+
+    assert triage_features._collect_matches(text, patterns) == expected
+
+
+# ---------------------------------------------------------------------------
+# 4. parsing_metadata
+# ---------------------------------------------------------------------------
+
+def test_parsing_metadata_reports_triage_cache_source():
+    payload = _payload_with_injury("fractured left wrist")
+
+    first = generate_plan_sync(payload, generate_pdf=False)
+    second = generate_plan_sync(payload, generate_pdf=False)
+
+    assert first["parsing_metadata"]["injury_triage"] == {"source": "computed"}
+    assert second["parsing_metadata"]["injury_triage"] == {"source": "cache"}
@@ -0,0 +1,227 @@
+"""Tests for the late-fight role assignment solver.
+
+Covers:
+1. The solver picks the same roles, days and tie-breaks as exhaustive search.
+2. Search scores equal a brute-force score of the unpacked placement.
+3. Budget caps and locked declared days are respected.
+4. The allocator and search benchmarks cover every legal countdown window.
+"""
+from __future__ import annotations
+
+from itertools import combinations, permutations
+
+import pytest
+
+from benchmarks import late_fight_allocator
+from fightcamp.stage2_payload_late_fight import (
+    _countdown_offset,
+    _late_fight_allocation_plan,
+    _late_fight_back_to_back_penalty,
+    _late_fight_candidate_roles,
+    _late_fight_locked_label,
+    _late_fight_meaningful_stress_count,
+    _late_fight_min_offset,
+    _late_fight_permission_policy,
+    _late_fight_placement_tables,
+    _late_fight_role_budget,
+    _late_fight_role_label_score,
+    _late_fight_scheduled_role,
+    _late_fight_search_placements,
+    _late_fight_support_role_count,
+)
+
+
+def _reference_score(assigned_roles: list[dict], legal_countdown_labels: list[str], label_to_weekday: dict[str, str]) -> int:
+    """Brute-force placement score: role-on-day terms, spread, back-to-back penalties."""
+    min_offset = _late_fight_min_offset(legal_countdown_labels)
+    if not assigned_roles or min_offset is None:
+        return 0
+    ordered_roles = sorted(
+        assigned_roles,
+        key=lambda role: _countdown_offset(role.get("scheduled_countdown_label", "")) or -1,
+        reverse=True,
+    )
+    score = sum(
+        _late_fight_role_label_score(role, str(role.get("scheduled_countdown_label") or ""), min_offset, label_to_weekday)
+        for role in ordered_roles
+    )
+    for first_role, second_role in zip(ordered_roles, ordered_roles[1:]):
+        gap = (_countdown_offset(first_role["scheduled_countdown_label"]) or 0) - (
+            _countdown_offset(second_role["scheduled_countdown_label"]) or 0
+        )
+        score += gap * 35
+        if gap == 1:
+            score += _late_fight_back_to_back_penalty(first_role, second_role)
+    return score
+
+
+def _search(roles: list[dict], labels: list[str], label_to_weekday: dict[str, str]) -> dict[int, tuple[int, tuple[int, ...]]]:
+    """``{mask: (score, label_indexes)}`` from the production search and unpack."""
+    tables = _late_fight_placement_tables(roles, labels, label_to_weekday)
+    solved, _ = _late_fight_search_placements(tables, lambda _mask: True)
+    return {mask: (score, tables.unpack(packed, mask)) for mask, (score, packed) in solved.items()}
+
+
+def _allocation_inputs(days: int, athlete: dict) -> tuple[list[dict], list[str], dict[str, str], dict]:
+    policy = _late_fight_permission_policy(days, athlete)
+    candidates = _late_fight_candidate_roles(days, athlete, policy)
+    for index, role in enumerate(candidates, start=1):
+        role["_candidate_id"] = index
+    labels = list(policy.get("legal_countdown_labels", []))
+    weekday_map = policy.get("countdown_weekday_map", {})
+    label_to_weekday = {
+        label: str(weekday_map.get(label) or "").strip().lower()
+        for label in labels
+        if str(weekday_map.get(label) or "").strip()
+    }
+    eligible = [
+        role
+        for role in candidates
+        if not (role.get("locked_day") and label_to_weekday and _late_fight_locked_label(role, label_to_weekday) is None)
+    ]
+    return eligible, labels, label_to_weekday, _late_fight_role_budget(days, athlete)
+
+
+def _exhaustive_session_roles(days: int, athlete: dict) -> list[tuple]:
+    """Reference: every optional subset, every permutation of open days."""
+    eligible, labels, label_to_weekday, budget = _allocation_inputs(days, athlete)
+    required = [role for role in eligible if role.get("_required")]
+    optional = [role for role in eligible if not role.get("_required")]
+    best_score, best_roles = None, []
+    for count in range(len(optional) + 1):
+        for subset in combinations(optional, count):
+            selected = required + list(subset)
+            if isinstance(budget.get("max_active_roles"), int) and len(selected) > budget["max_active_roles"]:
+                continue
+            if isinstance(budget.get("max_meaningful_stress_exposures"), int) and (
+                _late_fight_meaningful_stress_count(selected) > budget["max_meaningful_stress_exposures"]
+            ):
+                continue
+            if isinstance(budget.get("max_support_roles"), int) and (
+                _late_fight_support_role_count(selected) > budget["max_support_roles"]
+            ):
+                continue
+            locked, unlocked, occupied, feasible = {}, [], set(), True
+            for role in selected:
+                if role.get("locked_day") and label_to_weekday:
+                    label = _late_fight_locked_label(role, label_to_weekday)
+                    if not label or label in occupied:
+                        feasible = False
+                        break
+                    locked[role["_candidate_id"]] = label
+                    occupied.add(label)
+                else:
+                    unlocked.append(role)
+            open_labels = [label for label in labels if label not in occupied]
+            if not feasible or len(unlocked) > len(open_labels):
+                continue
+            for perm in permutations(open_labels, len(unlocked)):
+                assigned = dict(locked)
+                assigned.update({role["_candidate_id"]: label for role, label in zip(unlocked, perm)})
+                roles = [
+                    _late_fight_scheduled_role(role, assigned[role["_candidate_id"]], label_to_weekday)
+                    for role in selected
+                ]
+                score = _reference_score(roles, labels, label_to_weekday)
+                if best_score is None or score > best_score:
+                    best_score, best_roles = score, roles
+    return sorted((role["role_key"], role["scheduled_countdown_label"], role.get("locked_day")) for role in best_roles)
+
+
+def _solver_session_roles(days: int, athlete: dict) -> list[tuple]:
+    roles = _late_fight_allocation_plan(days, athlete)["session_roles"]
+    return sorted((role["role_key"], role["scheduled_countdown_label"], role.get("locked_day")) for role in roles)
+
+
+def _reference_athletes() -> list[tuple[int, dict]]:
+    cases = []
+    for days in (2, 4, 7, 9, 12):
+        athletes = late_fight_allocator.window_athletes(days)
+        cases.extend((days, athlete) for athlete in athletes[::9])
+    return cases
+
+
+# ---------------------------------------------------------------------------
+# 1. Parity with exhaustive search
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize(("days", "athlete"), _reference_athletes())
+def test_solver_matches_exhaustive_search(days, athlete):
+    assert _solver_session_roles(days, athlete) == _exhaustive_session_roles(days, athlete)
+
+
+def test_ties_break_towards_earliest_label_order():
+    roles = [
+        {"role_key": "technical_touch_day", "cost_class": "low", "stress_class": "support"},
+        {"role_key": "technical_touch_day", "cost_class": "low", "stress_class": "support"},
+    ]
+    labels = ["D-3", "D-2", "D-1"]
+
+    solved = _search(roles, labels, {})
+
+    # Both roles are interchangeable; enumeration order gives the first role the earlier day.
+    assert solved[0b11][1] == (0, 2)
+
+
+# ---------------------------------------------------------------------------
+# 2. Score consistency
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("days", [3, 8, 11, 13])
+def test_solver_scores_equal_reference_score(days):
+    for athlete in late_fight_allocator.window_athletes(days)[::7]:
+        eligible, labels, label_to_weekday, _ = _allocation_inputs(days, athlete)
+        solved = _search(eligible, labels, label_to_weekday)
+        for mask, (score, label_indexes) in solved.items():
+            roles = [
+                _late_fight_scheduled_role(role, labels[label_indexes[index]], label_to_weekday)
+                for index, role in enumerate(eligible)
+                if mask >> index & 1
+            ]
+            assert score == _reference_score(roles, labels, label_to_weekday)
+
+
+# ---------------------------------------------------------------------------
+# 3. Constraints
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("days", list(late_fight_allocator.WINDOW_DAYS))
+def test_allocations_respect_budget_and_locks(days):
+    for athlete in late_fight_allocator.window_athletes(days):
+        plan = _late_fight_allocation_plan(days, athlete)
+        roles = plan["session_roles"]
+        budget = plan["role_budget"]
+        labels = [role["scheduled_countdown_label"] for role in roles]
+
+        assert len(labels) == len(set(labels))
+        assert set(labels) <= set(plan["allocator"]["legal_countdown_labels"])
+        if isinstance(budget.get("max_active_roles"), int):
+            assert len(roles) <= budget["max_active_roles"]
+        for role in roles:
+            if role.get("locked_day") and role.get("real_weekday"):
+                assert role["real_weekday"] == role["locked_day"]
+
+
+# ---------------------------------------------------------------------------
+# 4. Benchmark
+# ---------------------------------------------------------------------------
+
+def test_benchmark_reports_every_window_and_flags_budget_overruns():
+    results = late_fight_allocator.run(iterations=1, windows=(13, 1))
+
+    assert set(results) == {"D-13", "D-1"}
+    assert results["D-13"]["max_candidates"] >= results["D-1"]["max_candidates"]
+    assert late_fight_allocator.over_budget(results, max_ms=1e9) == []
+    assert late_fight_allocator.over_budget(results, max_ms=0.0) == [
+        f"D-13 max {results['D-13']['max_ms']:.3f}ms > 0.000ms",
+        f"D-1 max {results['D-1']['max_ms']:.3f}ms > 0.000ms",
+    ]
+
+
+def test_search_microbenchmark_reports_per_placement_cost():
+    results = late_fight_allocator.run_search(iterations=1, windows=(3,))
+
+    summary = results["D-3"]
+    assert summary["days"] == 3
+    assert summary["placements"] > 0
+    assert summary["ns_per_placement"] > 0
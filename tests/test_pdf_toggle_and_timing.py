@@ -104,7 +104,9 @@ def test_stage2_outputs_present_when_pdf_disabled(monkeypatch):
     assert result["stage2_payload"] is not None
     assert result["planning_brief"] is not None
     assert result["stage2_handoff_text"]
-    assert result["parsing_metadata"] == result["stage2_payload"]["input_parsing_metadata"]
+    parsing_metadata = dict(result["parsing_metadata"])
+    assert parsing_metadata.pop("injury_triage")["source"] in {"cache", "computed"}
+    assert parsing_metadata == result["stage2_payload"]["input_parsing_metadata"]
 
 
 def test_stage2_outputs_present_when_pdf_enabled(monkeypatch):
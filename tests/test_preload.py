@@ -0,0 +1,175 @@
+"""Tests for the pre-fork warm-up and the preload server.
+
+Covers:
+1. warm_process builds the banks, regex config and injury matchers.
+2. freeze_heap moves live objects into the permanent GC generation.
+3. memory_report reads the RSS/PSS breakdown of a process.
+4. The preload server forks workers that serve requests from one socket.
+5. Dead workers restart with backoff; a slot that keeps dying stops the server.
+"""
+from __future__ import annotations
+
+import gc
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from api.preload_server import RestartBackoff
+from fightcamp import injury_synonyms
+from fightcamp import plan_pipeline_runtime as runtime
+from fightcamp.bank_registry import BANK_REGISTRY
+from fightcamp.preload import format_memory_report, freeze_heap, memory_report, warm_process
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+# ---------------------------------------------------------------------------
+# 1. Warm-up
+# ---------------------------------------------------------------------------
+
+def test_warm_process_builds_process_wide_resources():
+    timings = warm_process()
+
+    assert set(timings) == {"banks", "regex_config", "tag_vocabulary", "nlp"}
+    assert runtime._BANKS_WARM
+    assert BANK_REGISTRY.is_loaded("exercise_bank")
+    assert injury_synonyms._NLP_INITIALIZED
+    assert injury_synonyms._MATCHERS_INITIALIZED
+
+
+# ---------------------------------------------------------------------------
+# 2. Heap freezing
+# ---------------------------------------------------------------------------
+
+def test_freeze_heap_moves_objects_to_permanent_generation():
+    gc.unfreeze()
+    try:
+        assert freeze_heap() > 0
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+    assert gc.get_freeze_count() == 0
+
+
+# ---------------------------------------------------------------------------
+# 3. Memory report
+# ---------------------------------------------------------------------------
+
+@pytest.mark.skipif(not Path("/proc/self/smaps_rollup").exists(), reason="needs /proc smaps_rollup")
+def test_memory_report_reads_smaps_rollup():
+    report = memory_report()
+
+    assert report["pid"] == os.getpid()
+    assert report["rss_kib"] > 0 and report["pss_kib"] > 0
+    assert "shared_clean_kib" in report and "private_dirty_kib" in report
+    assert "gc_frozen" in report
+    assert f"rss_kib={report['rss_kib']}" in format_memory_report(report)
+
+
+def test_memory_report_of_missing_process_only_has_pid():
+    assert memory_report(pid=2**22 + 1) == {"pid": 2**22 + 1}
+
+
+# ---------------------------------------------------------------------------
+# 4. Preload server
+# ---------------------------------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_preload_server_forks_workers_onto_one_socket(tmp_path):
+    (tmp_path / "tiny_app.py").write_text(
+        "import os\n"
+        "async def app(scope, receive, send):\n"
+        "    if scope['type'] != 'http':\n"
+        "        return\n"
+        "    await send({'type': 'http.response.start', 'status': 200, 'headers': []})\n"
+        "    await send({'type': 'http.response.body', 'body': str(os.getpid()).encode()})\n",
+        encoding="utf-8",
+    )
+    port = _free_port()
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([str(tmp_path), str(_REPO_ROOT)]),
+        "UNLXCK_BANK_SNAPSHOT": "0",
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "api.preload_server", "--app", "tiny_app:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", "2"],
+        cwd=_REPO_ROOT,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    try:
+        body = None
+        deadline = time.monotonic() + 120
+        while body is None and time.monotonic() < deadline:
+            assert proc.poll() is None, proc.stdout.read().decode()
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=2) as response:
+                    body = response.read().decode()
+            except OSError:
+                time.sleep(0.5)
+        assert body is not None, "preload server never answered"
+        assert int(body) != proc.pid
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        output = proc.communicate(timeout=30)[0].decode()
+    assert proc.returncode == 0
+    assert "[preload] warmed" in output
+    assert output.count("[preload] worker=") >= 2
+    assert "[preload] stopped" in output
+
+
+# ---------------------------------------------------------------------------
+# 5. Restart backoff
+# ---------------------------------------------------------------------------
+
+def test_restart_backoff_doubles_resets_and_gives_up():
+    backoff = RestartBackoff(max_failures=7, initial_seconds=0.5, max_seconds=4.0, stable_seconds=30.0)
+
+    assert [backoff.next_delay(0.1) for _ in range(5)] == [0.5, 1.0, 2.0, 4.0, 4.0]
+    assert backoff.next_delay(60.0) == 0.5
+    assert [backoff.next_delay(0.1) for _ in range(7)][-1] is None
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_preload_server_exits_nonzero_when_workers_keep_failing_at_startup(tmp_path):
+    (tmp_path / "broken_app.py").write_text(
+        "async def app(scope, receive, send):\n"
+        "    if scope['type'] == 'lifespan':\n"
+        "        await receive()\n"
+        "        await send({'type': 'lifespan.startup.failed', 'message': 'boom'})\n",
+        encoding="utf-8",
+    )
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([str(tmp_path), str(_REPO_ROOT)]),
+        "UNLXCK_BANK_SNAPSHOT": "0",
+    }
+    proc = subprocess.run(
+        [sys.executable, "-m", "api.preload_server", "--app", "broken_app:app", "--host", "127.0.0.1",
+         "--port", str(_free_port()), "--workers", "1", "--max-restarts", "2"],
+        cwd=_REPO_ROOT,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        timeout=180,
+    )
+    output = proc.stdout.decode()
+
+    assert proc.returncode == 1, output
+    assert "restarting in 0.5s" in output and "restarting in 1.0s" in output
+    assert "after 2 quick restarts; stopping server" in output
@@ -0,0 +1,116 @@
+"""Tests for the opt-in generation profiling hook.
+
+Covers:
+1. No captures without UNLXCK_PROFILE_DIR or a trigger.
+2. Threshold captures keep slow calls only, as collapsed stacks.
+3. Sampled captures use cProfile and record the input hash, not the input.
+4. aggregate_profiles folds captures into hot-function tables.
+"""
+from __future__ import annotations
+
+import json
+import time
+
+from fightcamp import profiling
+from fightcamp.normalization import stable_payload_hash
+
+
+def _busy_wait(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(200))
+
+
+def _metas(directory) -> list[dict]:
+    return [json.loads(path.read_text(encoding="utf-8")) for path in sorted(directory.glob("*.json"))]
+
+
+# ---------------------------------------------------------------------------
+# 1 – disabled
+# ---------------------------------------------------------------------------
+
+def test_profile_run_is_inert_without_directory_or_trigger(monkeypatch, tmp_path):
+    monkeypatch.delenv(profiling.PROFILE_DIR_ENV, raising=False)
+    monkeypatch.setenv(profiling.PROFILE_SAMPLE_PERCENT_ENV, "100")
+    with profiling.profile_run("generate_plan_sync", {"a": 1}):
+        pass
+
+    monkeypatch.setenv(profiling.PROFILE_DIR_ENV, str(tmp_path))
+    monkeypatch.delenv(profiling.PROFILE_SAMPLE_PERCENT_ENV)
+    monkeypatch.delenv(profiling.PROFILE_THRESHOLD_ENV, raising=False)
+    with profiling.profile_run("generate_plan_sync", {"a": 1}):
+        pass
+
+    assert list(tmp_path.iterdir()) == []
+
+
+# ---------------------------------------------------------------------------
+# 2 – threshold
+# ---------------------------------------------------------------------------
+
+def test_threshold_keeps_only_slow_calls_as_sampled_stacks(monkeypatch, tmp_path):
+    monkeypatch.setenv(profiling.PROFILE_DIR_ENV, str(tmp_path))
+    monkeypatch.setenv(profiling.PROFILE_THRESHOLD_ENV, "0.05")
+    monkeypatch.delenv(profiling.PROFILE_SAMPLE_PERCENT_ENV, raising=False)
+
+    with profiling.profile_run("generate_plan_sync", {"fast": True}):
+        pass
+    with profiling.profile_run("generate_plan_sync", {"slow": True}):
+        _busy_wait(0.1)
+
+    metas = _metas(tmp_path)
+    assert len(metas) == 1
+    assert metas[0]["trigger"] == "threshold"
+    assert metas[0]["format"] == "stacks"
+    assert metas[0]["elapsed_s"] >= 0.05
+    assert metas[0]["input_hash"] == stable_payload_hash({"slow": True})
+    stacks = next(tmp_path.glob("*.stacks")).read_text(encoding="utf-8")
+    assert "tests/test_profiling.py:_busy_wait" in stacks
+
+
+# ---------------------------------------------------------------------------
+# 3 – sampled cProfile
+# ---------------------------------------------------------------------------
+
+def test_sampled_calls_write_cprofile_with_hash_only(monkeypatch, tmp_path):
+    monkeypatch.setenv(profiling.PROFILE_DIR_ENV, str(tmp_path))
+    monkeypatch.setenv(profiling.PROFILE_SAMPLE_PERCENT_ENV, "100")
+    monkeypatch.delenv(profiling.PROFILE_THRESHOLD_ENV, raising=False)
+    payload = {"data": {"fields": [{"label": "Full name", "value": "Ari Mensah"}]}}
+
+    with profiling.profile_run("stage2_finalize", payload):
+        _busy_wait(0.01)
+
+    metas = _metas(tmp_path)
+    assert [meta["format"] for meta in metas] == ["cprofile"]
+    assert metas[0]["trigger"] == "sampled"
+    assert metas[0]["label"] == "stage2_finalize"
+    assert list(tmp_path.glob("*.prof"))
+    assert "Ari Mensah" not in next(tmp_path.glob("*.json")).read_text(encoding="utf-8")
+
+
+# ---------------------------------------------------------------------------
+# 4 – aggregation
+# ---------------------------------------------------------------------------
+
+def test_aggregate_profiles_combines_cprofile_and_stack_captures(monkeypatch, tmp_path):
+    monkeypatch.setenv(profiling.PROFILE_DIR_ENV, str(tmp_path))
+    monkeypatch.setenv(profiling.PROFILE_SAMPLE_PERCENT_ENV, "100")
+    for index in range(2):
+        with profiling.profile_run("generate_plan_sync", {"run": index}):
+            _busy_wait(0.01)
+    monkeypatch.setenv(profiling.PROFILE_SAMPLE_PERCENT_ENV, "0")
+    monkeypatch.setenv(profiling.PROFILE_THRESHOLD_ENV, "0.02")
+    with profiling.profile_run("stage2_finalize", {"run": "slow"}):
+        _busy_wait(0.08)
+
+    report = profiling.aggregate_profiles(tmp_path)
+    assert report["captures"] == 3
+    assert report["slowest"][0]["label"] == "stage2_finalize"
+    busy_rows = [row for row in report["cprofile"] if "_busy_wait" in row["function"]]
+    assert busy_rows and busy_rows[0]["calls"] == 2
+    assert any(row["function"] == "tests/test_profiling.py:_busy_wait" for row in report["sampled"])
+
+    only_stage2 = profiling.aggregate_profiles(tmp_path, label="stage2_finalize")
+    assert only_stage2["captures"] == 1
+    assert only_stage2["cprofile"] == []
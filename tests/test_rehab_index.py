@@ -0,0 +1,119 @@
+"""Tests for the (type, location, phase) rehab bank index.
+
+Covers:
+1. The index holds every bank entry under its phases with pre-split notes.
+2. Indexed lookups return what a full bank scan returns, in bank order.
+3. Location alias expansion is memoized and cleared on a bank swap.
+"""
+from __future__ import annotations
+
+import itertools
+
+import pytest
+
+from fightcamp import rehab_protocols
+from fightcamp.bank_registry import BANK_REGISTRY
+from fightcamp.rehab_protocols import (
+    _entry_phases,
+    _rehab_drills_for_phase,
+    _split_notes_by_phase,
+    get_rehab_bank,
+    get_rehab_index,
+    normalize_rehab_location,
+)
+
+
+def _scan_drills_for_phase(itype: str, loc: str | None, phase: str, limit: int = 4) -> list[str]:
+    """Reference implementation: walk the whole bank per (type, location) pair."""
+    phase = phase.upper()
+    drills: list[str] = []
+    keys = dict.fromkeys(
+        (c_type, c_loc)
+        for c_type in (itype, "unspecified")
+        for c_loc in normalize_rehab_location(loc) + ["unspecified"]
+    )
+    for c_type, c_loc in keys:
+        for entry in get_rehab_bank():
+            if entry.get("type") != c_type or entry.get("location") != c_loc:
+                continue
+            if phase not in _entry_phases(entry):
+                continue
+            for drill in entry.get("drills", []):
+                name, notes = drill.get("name"), drill.get("notes", "")
+                if not name:
+                    continue
+                parsed = _split_notes_by_phase(notes)
+                if parsed:
+                    notes = next((text for label, text in parsed if label == phase), None)
+                    if notes is None:
+                        continue
+                text = name if not notes else f"{name} – {notes}"
+                if text not in drills:
+                    drills.append(text)
+    return drills[:limit]
+
+
+# ---------------------------------------------------------------------------
+# 1. Index contents
+# ---------------------------------------------------------------------------
+
+def test_index_covers_every_entry_and_phase():
+    bank = get_rehab_bank()
+    index = get_rehab_index()
+
+    assert sum(len(items) for items in index.entries.values()) == len(bank)
+    for position, entry in enumerate(bank):
+        for phase in _entry_phases(entry):
+            indexed = index.by_phase[(entry["type"], entry["location"], phase)]
+            assert any(item.position == position and item.entry is entry for item in indexed)
+
+
+def test_index_pre_splits_phase_notes():
+    index = get_rehab_index()
+    split = next(
+        item
+        for (_, _, phase), items in index.by_phase.items()
+        for item in items
+        if any(_split_notes_by_phase(drill.get("notes", "")) for drill in item.entry["drills"])
+    )
+
+    assert all("→" not in notes for _, notes in split.drills)
+
+
+# ---------------------------------------------------------------------------
+# 2. Lookup parity with a full scan
+# ---------------------------------------------------------------------------
+
+def test_drills_for_phase_match_full_scan():
+    bank = get_rehab_bank()
+    types = sorted({entry["type"] for entry in bank})
+    locations = sorted({entry["location"] for entry in bank}) + ["bicep", "lower back", None, "elbow pit"]
+
+    for itype, loc, phase in itertools.product(types, locations, ("GPP", "SPP", "taper")):
+        assert _rehab_drills_for_phase(itype, loc, phase) == _scan_drills_for_phase(itype, loc, phase)
+
+
+@pytest.mark.parametrize("phase", ["GPP", "SPP", "TAPER"])
+def test_generated_protocol_uses_bank_order_across_keys(phase):
+    text, _ = rehab_protocols.generate_rehab_protocols(
+        injury_string="lower back strain", exercise_data=[], current_phase=phase
+    )
+
+    assert text.startswith("- Lower Back (Strain):")
+
+
+# ---------------------------------------------------------------------------
+# 3. Location candidates
+# ---------------------------------------------------------------------------
+
+def test_location_candidates_are_memoized_and_reset_on_swap():
+    first = normalize_rehab_location("lower_back")
+    first.append("mutated")
+
+    assert "mutated" not in normalize_rehab_location("lower_back")
+    assert "lower_back" in rehab_protocols._REHAB_LOCATION_CANDIDATES
+
+    BANK_REGISTRY.swap({"rehab_bank": BANK_REGISTRY.entry("rehab_bank")})
+
+    assert rehab_protocols._REHAB_LOCATION_CANDIDATES == {}
+    assert rehab_protocols._REHAB_INDEX_CACHE is None
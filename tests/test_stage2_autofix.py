@@ -0,0 +1,258 @@
+"""Tests for the deterministic Stage 2 auto-fixers.
+
+Covers:
+1. Each fixable validator code gets its local rewrite.
+2. Unsafe or unmatched findings are left for the model retry.
+3. autofix_stage2_output re-reviews and never keeps a worse plan.
+4. The automator skips the model retry when local fixes pass and records them.
+"""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from api.stage2_automation import OpenAIStage2Automator
+from fightcamp import stage2_pipeline
+from fightcamp.stage2_autofix import SPORT_TERM_REPLACEMENTS, apply_stage2_autofixes
+from fightcamp.stage2_pipeline import autofix_stage2_output, review_stage2_output
+from fightcamp.stage2_validator import _SPORT_LANGUAGE_LEAKS
+
+_BRIEF = {
+    "schema_version": "planning_brief.v1",
+    "athlete_model": {"sport": "boxing", "equipment": ["dumbbells", "bands"]},
+    "restrictions": [
+        {
+            "restriction": "heavy_overhead_pressing",
+            "strength": "avoid",
+            "blocked_patterns": ["push press", "overhead press"],
+            "mechanical_equivalents": ["thruster", "jerk"],
+        }
+    ],
+    "phase_strategy": {"GPP": {"must_keep": []}, "SPP": {"must_keep": []}},
+    "candidate_pools": {
+        "GPP": {
+            "strength_slots": [
+                {
+                    "role": "hinge",
+                    "selected": {"name": "Trap Bar Deadlift", "required_equipment": ["trap_bar"]},
+                    "alternates": [{"name": "Dumbbell Romanian Deadlift", "required_equipment": ["dumbbells"]}],
+                }
+            ],
+            "conditioning_slots": [
+                {"role": "aerobic", "selected": {"name": "Sled Push", "universally_available": True}, "alternates": []}
+            ],
+        },
+        "SPP": {
+            "strength_slots": [
+                {
+                    "role": "push",
+                    "selected": {"name": "Push Press", "required_equipment": ["dumbbells"]},
+                    "alternates": [
+                        {"name": "Landmine Press", "required_equipment": ["landmine"]},
+                        {"name": "Half-Kneeling Dumbbell Press", "required_equipment": ["dumbbells"]},
+                    ],
+                }
+            ]
+        },
+    },
+}
+
+_PLAN = """## PHASE 1: GPP
+### Monday - Strength
+- Trap Bar Deadlift - 4x5
+### Tuesday - Conditioning
+- Death March (Sled Push) - 4 x 40 m
+- Sprawl to sprint - 6 x 10 sec
+
+## PHASE 2: SPP
+### Monday - Strength
+- Push Press - 4x3
+"""
+
+
+def _report(plan_text: str, brief: dict = _BRIEF) -> dict:
+    return review_stage2_output(planning_brief=brief, final_plan_text=plan_text)["validator_report"]
+
+
+def _fixes_by_code(plan_text: str, brief: dict = _BRIEF) -> tuple[str, dict[str, dict]]:
+    fixed, fixes = apply_stage2_autofixes(
+        planning_brief=brief, final_plan_text=plan_text, validator_report=_report(plan_text, brief)
+    )
+    return fixed, {fix["code"]: fix for fix in fixes}
+
+
+# ---------------------------------------------------------------------------
+# 1. Fixers
+# ---------------------------------------------------------------------------
+
+def test_restricted_line_swaps_to_a_compliant_same_slot_option():
+    fixed, fixes = _fixes_by_code(_PLAN)
+
+    # Landmine Press clears the restriction but needs equipment the athlete lacks.
+    assert fixes["restriction_violation"]["fixed_line"] == "Half-Kneeling Dumbbell Press - 4x3"
+    assert "- Half-Kneeling Dumbbell Press - 4x3" in fixed
+
+
+def test_equipment_incongruent_pick_swaps_to_an_available_alternate():
+    _fixed, fixes = _fixes_by_code(_PLAN)
+
+    assert fixes["equipment_incongruent_selection"]["from"] == "Trap Bar Deadlift"
+    assert fixes["equipment_incongruent_selection"]["to"] == "Dumbbell Romanian Deadlift"
+
+
+def test_overstyled_label_collapses_to_the_candidate_name():
+    _fixed, fixes = _fixes_by_code(_PLAN)
+
+    assert fixes["overstyled_drill_name"]["fixed_line"] == "Sled Push - 4 x 40 m"
+
+
+def test_sport_terms_are_substituted_keeping_case():
+    _fixed, fixes = _fixes_by_code(_PLAN)
+
+    assert fixes["sport_language_leak"]["fixed_line"] == "Drop step to sprint - 6 x 10 sec"
+
+
+def test_every_leak_term_but_single_leg_has_a_replacement():
+    for sport, terms in _SPORT_LANGUAGE_LEAKS.items():
+        assert set(terms) - set(SPORT_TERM_REPLACEMENTS[sport]) == {"single-leg", "single leg"}
+        assert not any(term in replacement for replacement in SPORT_TERM_REPLACEMENTS[sport].values() for term in terms)
+
+
+def test_exercise_names_are_never_rewritten():
+    plan = """## PHASE 1: GPP
+### Monday - Strength
+- Single-Leg Romanian Deadlift Hold - 3x8
+- Single Leg Hop and Stick - 3x5
+- Sprawl-to-Burpee - 5 x 20 sec
+- Sled Push, then sprawl and sprint - 4 rounds
+"""
+    fixed, fixes = _fixes_by_code(plan)
+
+    assert "- Single-Leg Romanian Deadlift Hold - 3x8" in fixed
+    assert "- Single Leg Hop and Stick - 3x5" in fixed
+    assert "- Sprawl-to-Burpee - 5 x 20 sec" in fixed
+    assert "- Sled Push, then drop step and sprint - 4 rounds" in fixed
+    assert fixes["sport_language_leak"]["from"] == "sprawl"
+
+
+def test_untouched_lines_and_bullets_are_preserved():
+    fixed, _fixes = _fixes_by_code(_PLAN)
+
+    assert fixed.splitlines()[0:2] == _PLAN.splitlines()[0:2]
+    assert fixed.endswith("\n")
+
+
+# ---------------------------------------------------------------------------
+# 2. Left for the model
+# ---------------------------------------------------------------------------
+
+def test_restricted_line_without_a_pool_option_is_left_alone():
+    plan = _PLAN.replace("Push Press - 4x3", "Barbell Overhead Press - 5x3")
+
+    _fixed, fixes = _fixes_by_code(plan)
+
+    assert "restriction_violation" not in fixes
+
+
+def test_no_compliant_alternate_means_no_swap():
+    brief = {**_BRIEF, "athlete_model": {"sport": "boxing", "equipment": []}}
+
+    _fixed, fixes = _fixes_by_code(_PLAN, brief)
+
+    assert "restriction_violation" not in fixes
+    assert "equipment_incongruent_selection" not in fixes
+
+
+def test_overstyled_line_without_a_candidate_name_is_left_alone():
+    plan = _PLAN.replace("Death March (Sled Push)", "Death March Hill Walk")
+
+    _fixed, fixes = _fixes_by_code(plan)
+
+    assert "overstyled_drill_name" not in fixes
+
+
+# ---------------------------------------------------------------------------
+# 3. Re-review
+# ---------------------------------------------------------------------------
+
+def test_autofix_output_passes_review_and_records_fixes():
+    result = autofix_stage2_output(planning_brief=_BRIEF, final_plan_text=_PLAN, validator_report=_report(_PLAN))
+
+    assert result["review"]["status"] == "PASS"
+    assert result["review"]["validator_report"]["auto_fixes"] == result["fixes"]
+    assert len(result["fixes"]) == 4
+
+
+def test_autofix_with_nothing_to_fix_returns_no_review():
+    plan = "## PHASE 2: SPP\n- Barbell Overhead Press - 5x3"
+
+    result = autofix_stage2_output(planning_brief=_BRIEF, final_plan_text=plan, validator_report=_report(plan))
+
+    assert result == {"plan_text": plan, "fixes": [], "review": None}
+
+
+def test_fixes_that_review_worse_are_discarded(monkeypatch):
+    monkeypatch.setattr(
+        stage2_pipeline,
+        "apply_stage2_autofixes",
+        lambda **_kwargs: ("## PHASE 2: SPP\n- Push Press - 4x3\n- Push Press - 5x5 overhead press", [{"code": "x"}]),
+    )
+    plan = "## PHASE 2: SPP\n- Landmine Press - 4x5"
+
+    result = autofix_stage2_output(planning_brief=_BRIEF, final_plan_text=plan, validator_report=_report(plan))
+
+    assert result["review"] is None and result["plan_text"] == plan
+
+
+# ---------------------------------------------------------------------------
+# 4. Automator
+# ---------------------------------------------------------------------------
+
+class _ScriptedResponses:
+    def __init__(self, outputs: list[str]):
+        self.requests: list[dict] = []
+        self._outputs = list(outputs)
+
+    async def create(self, **request):
+        self.requests.append(request)
+        return SimpleNamespace(id=f"resp-{len(self.requests)}", output_text=self._outputs.pop(0), usage=None)
+
+
+def _finalize(outputs: list[str], **automator_fields) -> tuple[dict, _ScriptedResponses]:
+    responses = _ScriptedResponses(outputs)
+    automator = OpenAIStage2Automator(
+        client=SimpleNamespace(responses=responses), model="test-model", **automator_fields
+    )
+    stage1 = {
+        "planning_brief": _BRIEF,
+        "stage2_payload": {"schema_version": "stage2_payload.v1"},
+        "stage2_handoff_text": "handoff text",
+        "plan_text": "draft",
+        "coach_notes": "",
+    }
+    return asyncio.run(automator.finalize(stage1_result=stage1)), responses
+
+
+def test_automator_skips_the_model_retry_when_local_fixes_pass():
+    result, responses = _finalize([_PLAN])
+
+    assert len(responses.requests) == 1
+    assert result["stage2_status"] == "stage2_autofix_pass"
+    assert result["stage2_attempt_count"] == 1
+    assert "Half-Kneeling Dumbbell Press - 4x3" in result["final_plan_text"]
+    assert [fix["code"] for fix in result["stage2_validator_report"]["auto_fixes"]] == [
+        "equipment_incongruent_selection",
+        "overstyled_drill_name",
+        "sport_language_leak",
+        "restriction_violation",
+    ]
+
+
+def test_autofix_can_be_disabled():
+    repaired = _fixes_by_code(_PLAN)[0]
+
+    result, responses = _finalize([_PLAN, repaired], autofix=False, section_repair=False)
+
+    assert len(responses.requests) == 2
+    assert result["stage2_status"] == "stage2_retry_pass"
+    assert "auto_fixes" not in result["stage2_validator_report"]
@@ -0,0 +1,240 @@
+"""Tests for batch Stage 2 validation.
+
+Covers:
+1. The validator-only brief projection reviews exactly like the full brief.
+2. Records are compact, and bad items become error records.
+3. The process pools return the same records as in-process validation, and the
+   API's spawn pool is reused across batches.
+4. The admin endpoint validates stored or supplied text for many plans.
+5. The CLI pages through the store, reports missing plans and rejects
+   malformed input lines.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import io
+import json
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+
+from api.auth import AuthenticatedUser
+from fightcamp.main import generate_plan
+from fightcamp.stage2_batch_validation import (
+    VALIDATOR_BRIEF_KEYS,
+    ValidationPool,
+    compact_review_record,
+    default_validation_workers,
+    project_planning_brief,
+    run_validation_batch,
+    summarize_records,
+    validate_plan,
+)
+from fightcamp.stage2_pipeline import review_stage2_output
+from support import _build_client, _build_request, finalized_result
+
+ROOT = Path(__file__).resolve().parents[1]
+_BROKEN_PLAN = "## PHASE 1: GPP\n- Barbell Overhead Press - 5x3"
+
+
+@pytest.fixture(scope="module")
+def stage1_result() -> dict:
+    return asyncio.run(generate_plan(json.loads((ROOT / "test_data.json").read_text(encoding="utf-8"))))
+
+
+def _items(stage1_result: dict) -> list[dict]:
+    brief = stage1_result["planning_brief"]
+    return [
+        {"plan_id": "plan-draft", "final_plan_text": stage1_result["plan_text"], "planning_brief": brief},
+        {"plan_id": "plan-broken", "final_plan_text": _BROKEN_PLAN, "planning_brief": json.dumps(brief)},
+        {"plan_id": "plan-empty", "final_plan_text": "  ", "planning_brief": brief},
+        {"plan_id": "plan-no-brief", "final_plan_text": _BROKEN_PLAN, "planning_brief": None},
+    ]
+
+
+# ---------------------------------------------------------------------------
+# 1. Projection
+# ---------------------------------------------------------------------------
+
+def test_projected_brief_reviews_like_the_full_brief(stage1_result):
+    brief = stage1_result["planning_brief"]
+    projected = project_planning_brief(brief)
+
+    assert set(projected) <= set(VALIDATOR_BRIEF_KEYS) and len(json.dumps(projected)) < len(json.dumps(brief))
+    for text in (stage1_result["plan_text"], _BROKEN_PLAN):
+        full = review_stage2_output(planning_brief=brief, final_plan_text=text)
+        slim = review_stage2_output(planning_brief=projected, final_plan_text=text)
+        assert compact_review_record("p", slim) == compact_review_record("p", full)
+
+
+# ---------------------------------------------------------------------------
+# 2. Records
+# ---------------------------------------------------------------------------
+
+def test_records_are_compact_and_bad_items_become_errors(stage1_result):
+    records = {record["plan_id"]: record for record in run_validation_batch(_items(stage1_result))}
+
+    broken = records["plan-broken"]
+    assert broken["status"] != "PASS" and broken["needs_retry"] is True
+    assert sum(broken["codes"].values()) == broken["error_count"] + broken["warning_count"]
+    assert set(broken["report"]) <= {"errors", "warnings"}
+    assert records["plan-empty"] == {"plan_id": "plan-empty", "status": "error", "error": "final_plan_text is empty"}
+    assert records["plan-no-brief"]["error"] == "planning_brief is missing"
+
+
+def test_summary_counts_statuses_and_codes():
+    records = [
+        {"status": "PASS", "codes": {}},
+        {"status": "FAIL", "codes": {"restriction_violation": 2}},
+        {"status": "FAIL", "codes": {"restriction_violation": 1, "sport_language_leak": 1}},
+        {"status": "error"},
+    ]
+
+    assert summarize_records(records) == {
+        "statuses": {"FAIL": 2, "PASS": 1, "error": 1},
+        "codes": {"restriction_violation": 3, "sport_language_leak": 1},
+    }
+
+
+# ---------------------------------------------------------------------------
+# 3. Process pool
+# ---------------------------------------------------------------------------
+
+def test_process_pool_matches_in_process_validation(stage1_result):
+    items = _items(stage1_result) * 3
+    items = [{**item, "plan_id": f"{item['plan_id']}-{index}"} for index, item in enumerate(items)]
+
+    pooled = {record["plan_id"]: record for record in run_validation_batch(iter(items), workers=2)}
+    serial = {record["plan_id"]: record for record in run_validation_batch(items, workers=1)}
+
+    assert pooled == serial and len(pooled) == len(items)
+
+
+def test_validation_pool_spawns_once_and_reuses_workers(stage1_result):
+    items = _items(stage1_result)
+    serial = list(run_validation_batch(items))
+    pool = ValidationPool(workers=2)
+    try:
+        first = sorted(pool.run(items), key=lambda record: record["plan_id"])
+        executor = pool._executor
+        second = sorted(pool.run(items), key=lambda record: record["plan_id"])
+        assert pool._executor is executor
+    finally:
+        pool.shutdown()
+
+    assert executor._mp_context.get_start_method() == "spawn"
+    assert pool._executor is None
+    assert first == second == sorted(serial, key=lambda record: record["plan_id"])
+
+
+def test_validation_workers_default_to_parallel(monkeypatch):
+    monkeypatch.delenv("UNLXCK_STAGE2_VALIDATION_WORKERS", raising=False)
+    monkeypatch.setattr("os.cpu_count", lambda: 8)
+    assert default_validation_workers() == 4
+
+    monkeypatch.setenv("UNLXCK_STAGE2_VALIDATION_WORKERS", "0")
+    assert default_validation_workers() == 0
+
+
+# ---------------------------------------------------------------------------
+# 4. Admin endpoint
+# ---------------------------------------------------------------------------
+
+def _stored_plans(store, stage1_result: dict) -> list[dict]:
+    store.ensure_profile(_athlete())
+    intake = store.create_intake("athlete-1", _build_request())
+    return [
+        store.create_plan(
+            athlete_id="athlete-1",
+            intake_id=intake["id"],
+            request=_build_request(),
+            result=finalized_result(planning_brief=stage1_result["planning_brief"], final_plan_text=text),
+        )
+        for text in (stage1_result["plan_text"], _BROKEN_PLAN)
+    ]
+
+
+def _athlete() -> AuthenticatedUser:
+    return AuthenticatedUser(user_id="athlete-1", email="ari@example.com", full_name="Ari Mensah", metadata={})
+
+
+def test_admin_validates_stored_and_supplied_text(stage1_result):
+    client, store, _ = _build_client()
+    good, broken = _stored_plans(store, stage1_result)
+    body = {
+        "items": [
+            {"plan_id": broken["id"]},
+            {"plan_id": "plan_missing"},
+            {"plan_id": good["id"], "final_plan_text": _BROKEN_PLAN},
+        ]
+    }
+
+    forbidden = client.post("/api/admin/plans/validate-stage2", json=body, headers={"Authorization": "Bearer athlete-token"})
+    response = client.post("/api/admin/plans/validate-stage2", json=body, headers={"Authorization": "Bearer admin-token"})
+
+    assert forbidden.status_code == 403
+    results = response.json()["results"]
+    assert [record["plan_id"] for record in results] == [broken["id"], "plan_missing", good["id"]]
+    assert results[1]["error"] == "plan not found"
+    expected = validate_plan(
+        {"plan_id": good["id"], "final_plan_text": _BROKEN_PLAN, "planning_brief": stage1_result["planning_brief"]}
+    )
+    assert results[2]["codes"] == results[0]["codes"] == expected["codes"]
+    assert response.json()["summary"]["statuses"]["error"] == 1
+
+
+def test_duplicate_plan_ids_are_rejected():
+    client, _, _ = _build_client()
+
+    response = client.post(
+        "/api/admin/plans/validate-stage2",
+        json={"items": [{"plan_id": "plan_1"}, {"plan_id": "plan_1"}]},
+        headers={"Authorization": "Bearer admin-token"},
+    )
+
+    assert response.status_code == 422
+
+
+# ---------------------------------------------------------------------------
+# 5. CLI
+# ---------------------------------------------------------------------------
+
+def _tool():
+    spec = importlib.util.spec_from_file_location("validate_stage2_batch", ROOT / "tools" / "validate_stage2_batch.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_cli_pages_through_every_plan_and_reports_missing_pairs(stage1_result, tmp_path):
+    tool = _tool()
+    _client, store, _ = _build_client()
+    good, broken = _stored_plans(store, stage1_result)
+
+    stream = io.StringIO()
+    summary = tool.run(Namespace(all=True, input=None, workers=1, page_size=1), store, stream)
+    assert sorted(json.loads(line)["plan_id"] for line in stream.getvalue().splitlines()) == sorted([good["id"], broken["id"]])
+    assert sum(summary["statuses"].values()) == 2
+
+    pairs = tmp_path / "pairs.jsonl"
+    pairs.write_text(
+        json.dumps({"plan_id": good["id"], "final_text": _BROKEN_PLAN}) + "\n\n" + json.dumps({"plan_id": "plan_missing"}) + "\n",
+        encoding="utf-8",
+    )
+    stream = io.StringIO()
+    summary = tool.run(Namespace(all=False, input=pairs, workers=1, page_size=50), store, stream)
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert records[0]["plan_id"] == good["id"] and records[0]["codes"]
+    assert records[1] == {"plan_id": "plan_missing", "status": "error", "error": "plan not found"}
+    assert summary["statuses"]["error"] == 1
+
+
+def test_cli_rejects_malformed_pairs_without_a_traceback(tmp_path, capsys):
+    tool = _tool()
+    pairs = tmp_path / "pairs.jsonl"
+    pairs.write_text('{"plan_id": "plan_1"}\n["plan_2"]\n', encoding="utf-8")
+
+    assert tool.main(["--input", str(pairs)]) == 2
+    assert "line 2: expected a JSON object" in capsys.readouterr().err
@@ -0,0 +1,234 @@
+"""Tests for the token-budgeted Stage 2 planning brief compaction.
+
+Covers:
+1. Compaction stops at the first stage within budget and never mutates input.
+2. The dedupe stage is lossless: role maps and progression weeks expand back.
+3. Later stages keep every option name and the restriction-relevant fields.
+4. Validator reports shrink to their failing items.
+5. The validator still sees the full brief while prompts carry the compact one.
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+import logging
+from pathlib import Path
+
+import pytest
+
+from fightcamp import stage2_pipeline
+from fightcamp.main import generate_plan
+from fightcamp.stage2_compaction import (
+    _drop_empty,
+    compact_planning_brief,
+    compact_validator_report,
+    estimate_tokens,
+)
+from fightcamp.stage2_pipeline import build_stage2_retry
+from fightcamp.stage2_prompt import split_static_brief_sections
+from fightcamp.stage2_validator import validate_stage2_output
+
+
+@pytest.fixture(scope="module")
+def stage1_result() -> dict:
+    data_path = Path(__file__).resolve().parents[1] / "test_data.json"
+    return asyncio.run(generate_plan(json.loads(data_path.read_text(encoding="utf-8"))))
+
+
+@pytest.fixture()
+def athlete_brief(stage1_result) -> dict:
+    return split_static_brief_sections(stage1_result["planning_brief"])[0]
+
+
+def _size(brief: dict) -> int:
+    return estimate_tokens(json.dumps(brief, separators=(",", ":"), ensure_ascii=False))
+
+
+def _merge(base: dict, override: dict) -> dict:
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _slot_names(brief: dict, field: str) -> list[str]:
+    names = []
+    for phase_pools in brief["candidate_pools"].values():
+        for slots in phase_pools.values():
+            for slot in slots:
+                options = [slot[field]] if field == "selected" else slot.get(field, [])
+                names.extend(option["name"] for option in options if option)
+    return names
+
+
+# ---------------------------------------------------------------------------
+# 1. Budget and stages
+# ---------------------------------------------------------------------------
+
+def test_stops_at_first_stage_within_budget(athlete_brief):
+    full = _size(athlete_brief)
+    dedupe = compact_planning_brief(athlete_brief, token_budget=full - 1)
+    trimmed = compact_planning_brief(athlete_brief, token_budget=1)
+
+    assert dedupe.stage == "dedupe" and dedupe.within_budget
+    assert dedupe.tokens_before == full
+    assert trimmed.stage == "trim_options" and not trimmed.within_budget
+    assert trimmed.chars_after < dedupe.chars_after < dedupe.chars_before
+
+
+def test_briefs_within_budget_and_zero_budget_are_untouched(athlete_brief):
+    assert compact_planning_brief(athlete_brief, token_budget=10**9).brief is athlete_brief
+    assert compact_planning_brief(athlete_brief, token_budget=0).brief is athlete_brief
+
+
+def test_input_brief_is_not_mutated(athlete_brief):
+    snapshot = copy.deepcopy(athlete_brief)
+
+    compact_planning_brief(athlete_brief, token_budget=1)
+
+    assert athlete_brief == snapshot
+
+
+def test_logs_sizes_and_warns_when_over_budget(athlete_brief, caplog):
+    with caplog.at_level(logging.INFO, logger="fightcamp.stage2_compaction"):
+        compact_planning_brief(athlete_brief, token_budget=1)
+
+    record = caplog.records[-1]
+    assert record.levelno == logging.WARNING
+    assert "stage=trim_options chars=" in record.getMessage()
+
+
+# ---------------------------------------------------------------------------
+# 2. Lossless dedupe
+# ---------------------------------------------------------------------------
+
+def test_role_map_expands_back_to_the_original(athlete_brief):
+    role_map = compact_planning_brief(athlete_brief, token_budget=_size(athlete_brief) - 1).brief["weekly_role_map"]
+
+    assert role_map["role_defaults"]
+    for week, original in zip(role_map["weeks"], athlete_brief["weekly_role_map"]["weeks"]):
+        expanded = [
+            _merge(_merge(role_map["role_defaults"], role_map.get("role_catalog", {}).get(role["role_key"], {})), role)
+            for role in week.get("session_roles", [])
+        ]
+        assert [role["role_key"] for role in expanded] == [role["role_key"] for role in original.get("session_roles", [])]
+        for role, source in zip(expanded, original.get("session_roles", [])):
+            assert role == _drop_empty(source)
+
+
+def test_progression_weeks_inherit_the_phase_stress_map(athlete_brief):
+    brief = compact_planning_brief(athlete_brief, token_budget=_size(athlete_brief) - 1).brief
+    stress_map = athlete_brief["weekly_stress_map"]
+
+    progression = brief["week_by_week_progression"]
+    inherited = progression["inherited_stress_fields"]
+
+    assert inherited
+    for week, original in zip(progression["weeks"], athlete_brief["week_by_week_progression"]["weeks"]):
+        phase_map = stress_map.get(original["phase"], {})
+        expanded = {**{key: phase_map[key] for key in inherited.get(original["phase"], [])}, **week}
+        assert set(expanded) <= set(original)
+        for key, value in _drop_empty(original).items():
+            assert _drop_empty(expanded[key]) == value, key
+
+
+def test_trimmed_slots_keep_their_rationale(athlete_brief):
+    trimmed = compact_planning_brief(athlete_brief, token_budget=1).brief
+
+    for phase, phase_pools in athlete_brief["candidate_pools"].items():
+        for pool, slots in phase_pools.items():
+            for original, slot in zip(slots, trimmed["candidate_pools"][phase][pool]):
+                if original.get("purpose"):
+                    assert slot["purpose"] == original["purpose"]
+
+
+def test_legend_explains_each_applied_stage(athlete_brief):
+    dedupe = compact_planning_brief(athlete_brief, token_budget=_size(athlete_brief) - 1).brief
+    trimmed = compact_planning_brief(athlete_brief, token_budget=1).brief
+
+    assert any("role_catalog" in note for note in dedupe["compaction"])
+    assert not any("alternates" in note for note in dedupe["compaction"])
+    assert any("alternates" in note for note in trimmed["compaction"])
+
+
+# ---------------------------------------------------------------------------
+# 3. What the model still needs
+# ---------------------------------------------------------------------------
+
+def test_trimmed_brief_keeps_names_restrictions_and_role_keys(athlete_brief):
+    brief = compact_planning_brief(athlete_brief, token_budget=1).brief
+
+    assert brief["restrictions"] == athlete_brief["restrictions"]
+    assert brief["phase_strategy"] == athlete_brief["phase_strategy"]
+    assert _slot_names(brief, "selected") == _slot_names(athlete_brief, "selected")
+    assert _slot_names(brief, "alternates") == _slot_names(athlete_brief, "alternates")
+    for phase_pools in brief["candidate_pools"].values():
+        for slots in phase_pools.values():
+            for slot in slots:
+                for alternate in slot.get("alternates", []):
+                    assert set(alternate) <= {"name", "mechanical_risk_tags", "required_equipment", "function_class", "generic_fallback"}
+    for week, original in zip(brief["weekly_role_map"]["weeks"], athlete_brief["weekly_role_map"]["weeks"]):
+        assert [role["role_key"] for role in week.get("session_roles", [])] == [
+            role["role_key"] for role in original.get("session_roles", [])
+        ]
+
+
+# ---------------------------------------------------------------------------
+# 4. Validator report
+# ---------------------------------------------------------------------------
+
+def test_validator_report_keeps_only_failing_items():
+    warning = {"code": "missing_required_element", "phase": "SPP", "requirement": "alactic", "candidate_names": []}
+    report = {
+        "is_valid": False,
+        "errors": [{"code": "restriction_violation", "line": "Push Press", "details": ""}],
+        "warnings": [warning],
+        "missing_required_elements": [warning],
+        "blocking_warnings": [warning],
+        "gimmick_name_warnings": [],
+        "warning_count": 1,
+    }
+
+    assert compact_validator_report(report) == {
+        "errors": [{"code": "restriction_violation", "line": "Push Press"}],
+        "warnings": [{"code": "missing_required_element", "phase": "SPP", "requirement": "alactic"}],
+    }
+    assert compact_validator_report({"is_valid": True, "errors": [], "warnings": []}) == {}
+
+
+# ---------------------------------------------------------------------------
+# 5. Validator regression
+# ---------------------------------------------------------------------------
+
+def test_validator_sees_the_full_brief_while_the_repair_prompt_is_compact(stage1_result, monkeypatch):
+    brief = stage1_result["planning_brief"]
+    seen: list[dict] = []
+    validate = stage2_pipeline.validate_stage2_output
+
+    def _recording(*, planning_brief, final_plan_text):
+        seen.append(planning_brief)
+        return validate(planning_brief=planning_brief, final_plan_text=final_plan_text)
+
+    monkeypatch.setattr(stage2_pipeline, "validate_stage2_output", _recording)
+    plan_text = "GPP\n- Push Press - 4x3"
+
+    retry = build_stage2_retry(stage1_result=stage1_result, final_plan_text=plan_text)
+
+    assert seen == [brief] and seen[0] is brief
+    assert retry["needs_retry"]
+    assert '"role_catalog"' in retry["repair_prompt"]
+    assert '"role_catalog"' not in json.dumps(brief)
+
+
+def test_validator_report_is_unchanged_by_compaction(stage1_result):
+    brief = stage1_result["planning_brief"]
+    plan_text = stage1_result["plan_text"]
+    before = validate_stage2_output(planning_brief=brief, final_plan_text=plan_text)
+
+    compact_planning_brief(split_static_brief_sections(brief)[0], token_budget=1)
+
+    assert validate_stage2_output(planning_brief=brief, final_plan_text=plan_text) == before
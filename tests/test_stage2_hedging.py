@@ -0,0 +1,201 @@
+"""Tests for hedged Stage 2 requests.
+
+Covers:
+1. Deadlines come from recent primary latencies, with an initial value and floor.
+2. Fast requests never hedge; slow ones race a hedge and cancel the loser.
+3. The first output that validates wins; errors and saturation fall back safely.
+4. finalize uses the validated hedge output, and admins can read the metrics.
+"""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from api import stage2_automation
+from api.stage2_automation import OpenAIStage2Automator, Stage2AutomationError
+from api.stage2_hedging import HedgePolicy, HedgeStats
+from api.stage2_provider import Stage2Limiter
+from fightcamp.stage2_prompt import Stage2Prompt
+from support import _build_client
+
+_POLICY = HedgePolicy(initial_delay_seconds=0.05, min_delay_seconds=0.0, min_samples=3, model="hedge-model")
+_PROMPT = Stage2Prompt(instructions="system", static_context="static", athlete_context="athlete")
+
+
+class _TimedProvider:
+    """Answers each model's requests from a script of ``(delay, text_or_error)``."""
+
+    def __init__(self, scripts: dict[str, list[tuple[float, object]]], limiter: Stage2Limiter | None = None):
+        self.scripts = {model: list(script) for model, script in scripts.items()}
+        self.models: list[str] = []
+        self.cancelled: list[str] = []
+        if limiter is not None:
+            self.limiter = limiter
+
+    async def create(self, request: dict):
+        model = request["model"]
+        self.models.append(model)
+        delay, outcome = self.scripts[model].pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(model)
+            raise
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return SimpleNamespace(id=f"resp-{model}", output_text=outcome, usage=None)
+
+
+@pytest.fixture
+def stats(monkeypatch) -> HedgeStats:
+    fresh = HedgeStats()
+    monkeypatch.setattr(stage2_automation, "get_hedge_stats", lambda: fresh)
+    return fresh
+
+
+def _automator(provider: _TimedProvider, hedge: HedgePolicy | None = _POLICY) -> OpenAIStage2Automator:
+    return OpenAIStage2Automator(client=None, model="primary-model", provider=provider, hedge=hedge)
+
+
+def _generate(automator: OpenAIStage2Automator, accept=None) -> str:
+    return asyncio.run(automator._generate_text(_PROMPT, attempt_label="first_pass", accept=accept))
+
+
+# ---------------------------------------------------------------------------
+# 1. Deadlines
+# ---------------------------------------------------------------------------
+
+def test_deadline_tracks_the_latency_percentile():
+    stats = HedgeStats()
+    policy = HedgePolicy(percentile=90, initial_delay_seconds=30.0, min_delay_seconds=2.0, min_samples=5)
+
+    assert stats.deadline("first_pass", policy) == 30.0
+    for seconds in (1, 1, 1, 1, 1, 1, 1, 1, 12, 40):
+        stats.record("first_pass", seconds, hedged=False)
+    assert stats.deadline("first_pass", policy) == 12
+    assert stats.deadline("retry_pass", policy) == 30.0
+
+    floored = HedgeStats()
+    for _ in range(5):
+        floored.record("first_pass", 0.5, hedged=False)
+    assert floored.deadline("first_pass", policy) == 2.0
+
+
+def test_hedging_is_off_unless_enabled(monkeypatch):
+    monkeypatch.delenv("UNLXCK_STAGE2_HEDGE", raising=False)
+    assert HedgePolicy.from_env() is None
+
+    monkeypatch.setenv("UNLXCK_STAGE2_HEDGE", "1")
+    monkeypatch.setenv("UNLXCK_STAGE2_HEDGE_PERCENTILE", "95")
+    monkeypatch.setenv("UNLXCK_STAGE2_HEDGE_MODEL", "gpt-fallback")
+    assert HedgePolicy.from_env() == HedgePolicy(percentile=95.0, model="gpt-fallback")
+
+
+# ---------------------------------------------------------------------------
+# 2. Racing
+# ---------------------------------------------------------------------------
+
+def test_fast_primary_is_not_hedged(stats):
+    provider = _TimedProvider({"primary-model": [(0.0, "plan")]})
+
+    assert _generate(_automator(provider)) == "plan"
+    assert provider.models == ["primary-model"]
+    assert stats.snapshot()["requests"] == 1 and stats.snapshot()["hedged"] == 0
+
+
+def test_slow_primary_is_hedged_and_cancelled(stats):
+    provider = _TimedProvider({"primary-model": [(5.0, "slow plan")], "hedge-model": [(0.0, "hedge plan")]})
+
+    assert _generate(_automator(provider)) == "hedge plan"
+    assert provider.models == ["primary-model", "hedge-model"]
+    assert provider.cancelled == ["primary-model"]
+    snapshot = stats.snapshot()
+    assert (snapshot["hedge_rate"], snapshot["win_rate"]) == (1.0, 1.0)
+
+
+def test_disabled_policy_waits_for_the_primary(stats):
+    provider = _TimedProvider({"primary-model": [(0.1, "plan")]})
+
+    assert _generate(_automator(provider, hedge=None)) == "plan"
+    assert provider.models == ["primary-model"] and stats.snapshot()["requests"] == 0
+
+
+# ---------------------------------------------------------------------------
+# 3. Validation, errors and saturation
+# ---------------------------------------------------------------------------
+
+def test_first_output_that_validates_wins():
+    provider = _TimedProvider({"primary-model": [(0.1, "bad plan")], "hedge-model": [(0.2, "good plan")]})
+
+    assert _generate(_automator(provider), accept=lambda text: text == "good plan") == "good plan"
+
+
+def test_first_arrival_is_kept_when_nothing_validates(stats):
+    provider = _TimedProvider({"primary-model": [(0.1, "primary plan")], "hedge-model": [(0.2, "hedge plan")]})
+
+    assert _generate(_automator(provider), accept=lambda _text: False) == "primary plan"
+    assert stats.snapshot()["hedge_wins"] == 0
+
+
+def test_failed_primary_falls_back_to_the_hedge_and_both_failing_raises():
+    error = Stage2AutomationError("provider down")
+    provider = _TimedProvider({"primary-model": [(0.1, error)], "hedge-model": [(0.2, "hedge plan")]})
+    assert _generate(_automator(provider)) == "hedge plan"
+
+    both = _TimedProvider({"primary-model": [(0.1, error)], "hedge-model": [(0.0, RuntimeError("also down"))]})
+    with pytest.raises(Stage2AutomationError):
+        _generate(_automator(both))
+
+
+def test_saturated_limiter_skips_the_hedge(stats):
+    limiter = Stage2Limiter(max_concurrency=1)
+    limiter._waiters.append(SimpleNamespace(cancelled=lambda: True))
+    provider = _TimedProvider({"primary-model": [(0.1, "plan")]}, limiter=limiter)
+
+    assert _generate(_automator(provider)) == "plan"
+    assert provider.models == ["primary-model"]
+    assert stats.snapshot()["skipped_saturated"] == 1
+
+
+# ---------------------------------------------------------------------------
+# 4. finalize and metrics
+# ---------------------------------------------------------------------------
+
+def test_finalize_keeps_the_hedge_that_passes_review(stats):
+    brief = {
+        "schema_version": "planning_brief.v1",
+        "athlete_model": {"sport": "boxing"},
+        "restrictions": [
+            {"restriction": "heavy_overhead_pressing", "strength": "avoid", "blocked_patterns": ["push press"]}
+        ],
+    }
+    failing = "## PHASE 1: GPP\n### Monday - Strength\n- Push Press - 4x3"
+    passing = failing.replace("Push Press - 4x3", "Landmine Press - 4x5")
+    provider = _TimedProvider({"primary-model": [(0.1, failing)], "hedge-model": [(0.2, passing)]})
+    stage1 = {
+        "planning_brief": brief,
+        "stage2_payload": {"schema_version": "stage2_payload.v1"},
+        "stage2_handoff_text": "handoff text",
+        "plan_text": "draft",
+        "coach_notes": "",
+    }
+
+    result = asyncio.run(_automator(provider).finalize(stage1_result=stage1))
+
+    assert result["stage2_status"] == "stage2_pass"
+    assert result["final_plan_text"] == passing
+    assert stats.snapshot()["hedge_wins"] == 1
+
+
+def test_admin_can_read_stage2_metrics():
+    client, _, _ = _build_client()
+
+    forbidden = client.get("/api/admin/stage2/metrics", headers={"Authorization": "Bearer athlete-token"})
+    allowed = client.get("/api/admin/stage2/metrics", headers={"Authorization": "Bearer admin-token"})
+
+    assert forbidden.status_code == 403
+    assert allowed.status_code == 200
+    assert {"hedge_rate", "win_rate"} <= set(allowed.json()["hedging"])
+    assert "max_concurrency" in allowed.json()["limiter"]
@@ -0,0 +1,145 @@
+"""Tests for the prompt-cache-friendly Stage 2 prompt layout.
+
+Covers:
+1. The handoff prefix is byte-identical across athletes in one payload mode.
+2. Static rule catalogs leave the planning brief JSON for the static context.
+3. Repair prompts put the planning brief ahead of the per-attempt report.
+4. The automator sends instructions and input parts separately and records
+   cached vs uncached input tokens.
+"""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from api.stage2_automation import OpenAIStage2Automator, _prompt_cache_usage
+from fightcamp import tracing
+from fightcamp.stage2_payload import build_stage2_handoff_parts, build_stage2_handoff_text
+from fightcamp.stage2_prompt import Stage2Prompt
+from fightcamp.stage2_repair import build_stage2_repair_prompt, build_stage2_repair_prompt_parts
+
+_DECISION_RULES = {"selection_rules": ["Prefer strong compliant same-role options first."]}
+
+
+def _handoff(sport: str, mode: str | None = None) -> Stage2Prompt:
+    payload = {"athlete_model": {"sport": sport}, "payload_mode": mode}
+    return build_stage2_handoff_parts(
+        stage2_payload=payload,
+        plan_text=f"Week 1\n- {sport} rounds",
+        planning_brief={
+            "athlete_snapshot": {"sport": sport},
+            "decision_hierarchy": ["restrictions", "planning brief"],
+            "decision_rules": _DECISION_RULES,
+        },
+    )
+
+
+# ---------------------------------------------------------------------------
+# 1. Stable prefix
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("mode", [None, "late_fight_week_payload", "pre_fight_day_payload"])
+def test_prefix_is_identical_across_athletes(mode):
+    boxer, wrestler = _handoff("boxing", mode), _handoff("wrestling", mode)
+
+    assert boxer.prefix_text == wrestler.prefix_text
+    assert '"sport"' not in boxer.prefix_text
+    assert boxer.athlete_context != wrestler.athlete_context
+
+
+def test_payload_mode_instructions_sit_in_the_static_context():
+    handoff = _handoff("boxing", "late_fight_week_payload")
+
+    assert handoff.instructions.startswith("You are Stage 2 (planner/finalizer).")
+    assert handoff.static_context.startswith("PAYLOAD MODE INSTRUCTIONS\nSHARPNESS WEEK")
+    assert handoff.athlete_context.startswith("PLANNING BRIEF\n")
+
+
+def test_handoff_text_joins_the_parts():
+    handoff = _handoff("boxing")
+
+    assert handoff.text == build_stage2_handoff_text(
+        stage2_payload={"athlete_model": {"sport": "boxing"}, "payload_mode": None},
+        plan_text="Week 1\n- boxing rounds",
+        planning_brief={
+            "athlete_snapshot": {"sport": "boxing"},
+            "decision_hierarchy": ["restrictions", "planning brief"],
+            "decision_rules": _DECISION_RULES,
+        },
+    )
+    assert handoff.text.index(handoff.static_context) < handoff.text.index(handoff.athlete_context)
+
+
+# ---------------------------------------------------------------------------
+# 2. Static catalogs
+# ---------------------------------------------------------------------------
+
+def test_decision_catalogs_move_out_of_the_brief_json():
+    handoff = _handoff("boxing")
+
+    assert 'DECISION RULES\n```json\n{"selection_rules"' in handoff.static_context
+    assert "DECISION HIERARCHY\n" in handoff.static_context
+    assert '"decision_rules"' not in handoff.athlete_context
+    assert '"decision_hierarchy"' not in handoff.athlete_context
+
+
+# ---------------------------------------------------------------------------
+# 3. Repair prompt
+# ---------------------------------------------------------------------------
+
+def test_repair_prompt_orders_brief_before_attempt_data():
+    report = {"is_valid": False, "errors": [{"code": "restriction_violation", "message": "Push Press"}]}
+    brief = {"athlete_snapshot": {"sport": "boxing"}, "decision_rules": _DECISION_RULES}
+
+    parts = build_stage2_repair_prompt_parts(planning_brief=brief, failed_plan_text="- Push Press", validator_report=report)
+
+    assert parts.instructions.startswith("You are revising a Stage 2 final plan after validation.")
+    assert parts.static_context.startswith("DECISION RULES\n")
+    assert parts.athlete_context.index("PLANNING BRIEF") < parts.athlete_context.index("VALIDATOR REPORT")
+    assert parts.text == build_stage2_repair_prompt(
+        planning_brief=brief, failed_plan_text="- Push Press", validator_report=report
+    )
+
+
+# ---------------------------------------------------------------------------
+# 4. Automator request layout and cache metric
+# ---------------------------------------------------------------------------
+
+class _FakeResponses:
+    def __init__(self, usage):
+        self.requests: list[dict] = []
+        self._usage = usage
+
+    async def create(self, **request):
+        self.requests.append(request)
+        return SimpleNamespace(id="resp-1", output_text="final plan", usage=self._usage)
+
+
+def test_automator_sends_separate_parts_and_counts_cached_tokens(monkeypatch):
+    monkeypatch.setenv(tracing.TRACING_ENV, "1")
+    usage = SimpleNamespace(
+        input_tokens=5000,
+        output_tokens=800,
+        total_tokens=5800,
+        input_tokens_details=SimpleNamespace(cached_tokens=3968),
+    )
+    responses = _FakeResponses(usage)
+    automator = OpenAIStage2Automator(client=SimpleNamespace(responses=responses), model="test-model")
+    prompt = _handoff("boxing", "late_fight_week_payload")
+
+    with tracing.start_trace("job") as trace:
+        assert asyncio.run(automator._generate_text(prompt, attempt_label="first_pass")) == "final plan"
+
+    request = responses.requests[0]
+    assert request["instructions"] == prompt.instructions
+    assert [part["text"] for part in request["input"][0]["content"]] == [prompt.static_context, prompt.athlete_context]
+    counters = next(span.counters for span in trace.spans if span.name == "stage2.model_request")
+    assert counters["cached_input_tokens"] == 3968
+    assert counters["uncached_input_tokens"] == 1032
+
+
+def test_cache_usage_defaults_to_uncached_without_details():
+    assert _prompt_cache_usage(SimpleNamespace(input_tokens=1200)) == (0, 1200)
+    assert _prompt_cache_usage(None) is None
@@ -0,0 +1,304 @@
+"""Tests for the Stage 2 provider layer.
+
+Covers:
+1. The process-wide limiter caps in-flight requests across tasks and event loops.
+2. The token bucket and cancelled waiters never leak capacity.
+3. Retries: Retry-After parsing, jittered backoff and which failures retry.
+4. Client pooling and provider selection from the environment.
+5. The mock provider, its HTTP server, and offline generation jobs.
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from email.utils import formatdate
+from types import SimpleNamespace
+
+import pytest
+
+from api import stage2_provider
+from api.auth import AuthenticatedUser
+from api.generation_runtime import run_generation_job
+from api.stage2_automation import DisabledStage2Automator, OpenAIStage2Automator
+from api.stage2_mock_server import build_server, parse_args
+from api.stage2_provider import (
+    LimitedStage2Provider,
+    MockStage2Provider,
+    OpenAIStage2Provider,
+    RetryPolicy,
+    Stage2Limiter,
+    Stage2ProviderError,
+    build_stage2_provider_from_env,
+    is_retryable_error,
+    mock_response_text,
+    pooled_openai_client,
+    retry_after_seconds,
+)
+from support import FakeStore, _build_request, stage1_result
+
+
+def _request(*parts: str) -> dict:
+    return {"model": "test-model", "input": [{"role": "user", "content": [{"type": "input_text", "text": part} for part in parts]}]}
+
+
+class _FlakyProvider:
+    def __init__(self, failures: list[BaseException]):
+        self.failures = list(failures)
+        self.calls = 0
+
+    async def create(self, request: dict):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return SimpleNamespace(id="resp-ok", output_text="ok", usage=None)
+
+
+def _no_wait_policy(max_attempts: int = 3) -> RetryPolicy:
+    return RetryPolicy(max_attempts=max_attempts, base_delay_seconds=0.0, max_delay_seconds=0.0)
+
+
+# ---------------------------------------------------------------------------
+# 1. Concurrency
+# ---------------------------------------------------------------------------
+
+async def _hold_slots(limiter: Stage2Limiter, tasks: int, in_flight: list[int], lock: threading.Lock) -> None:
+    async def _one() -> None:
+        async with limiter.slot():
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            await asyncio.sleep(0.005)
+            with lock:
+                in_flight[0] -= 1
+
+    await asyncio.gather(*(_one() for _ in range(tasks)))
+
+
+def test_limiter_caps_in_flight_requests():
+    limiter = Stage2Limiter(max_concurrency=3)
+    in_flight = [0, 0]
+
+    asyncio.run(_hold_slots(limiter, 12, in_flight, threading.Lock()))
+
+    assert in_flight[1] == 3
+    assert limiter.stats()["active"] == 0 and limiter.stats()["peak_active"] == 3
+
+
+def test_limiter_is_shared_across_event_loops():
+    limiter = Stage2Limiter(max_concurrency=2)
+    in_flight, lock = [0, 0], threading.Lock()
+    threads = [
+        threading.Thread(target=lambda: asyncio.run(_hold_slots(limiter, 6, in_flight, lock))) for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert in_flight[1] == 2
+    assert limiter.stats()["active"] == 0
+
+
+# ---------------------------------------------------------------------------
+# 2. Token bucket and cancellation
+# ---------------------------------------------------------------------------
+
+def test_token_bucket_waits_for_refill():
+    now = [0.0]
+    limiter = Stage2Limiter(max_concurrency=4, tokens_per_minute=600, clock=lambda: now[0])
+
+    assert limiter._take_tokens(500) == 0.0
+    assert limiter._take_tokens(200) == pytest.approx(10.0)
+    now[0] = 10.0
+    assert limiter._take_tokens(200) == 0.0
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    limiter = Stage2Limiter(max_concurrency=1)
+
+    async def _scenario() -> None:
+        async with limiter.slot():
+            waiter = asyncio.create_task(limiter.slot().__aenter__())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        async with limiter.slot():
+            assert limiter.stats()["active"] == 1
+
+    asyncio.run(asyncio.wait_for(_scenario(), timeout=5))
+    assert (limiter.stats()["active"], limiter.stats()["waiting"]) == (0, 0)
+
+
+# ---------------------------------------------------------------------------
+# 3. Retries
+# ---------------------------------------------------------------------------
+
+def test_retry_after_headers_are_parsed():
+    def _error(headers: dict) -> Stage2ProviderError:
+        return Stage2ProviderError("limited", status_code=429, headers=headers)
+
+    assert retry_after_seconds(_error({"retry-after": "3"})) == 3.0
+    assert retry_after_seconds(_error({"retry-after-ms": "250", "retry-after": "3"})) == 0.25
+    assert retry_after_seconds(_error({"retry-after": formatdate(1_000_060, usegmt=True)}), now=1_000_000) == 60.0
+    assert retry_after_seconds(_error({"retry-after": "soon"})) is None
+    # SDK errors carry the headers on their response.
+    assert retry_after_seconds(SimpleNamespace(response=SimpleNamespace(headers={"retry-after": "2"}))) == 2.0
+
+
+def test_backoff_is_jittered_and_never_under_retry_after():
+    policy = RetryPolicy(base_delay_seconds=1.0, max_delay_seconds=8.0)
+    rng = random.Random(7)
+    plain = Stage2ProviderError("busy", status_code=503)
+    limited = Stage2ProviderError("limited", status_code=429, headers={"retry-after": "5"})
+
+    delays = [policy.delay(4, plain, rng) for _ in range(50)]
+    assert all(0 <= delay <= 8.0 for delay in delays) and len(set(delays)) > 1
+    assert all(5.0 <= policy.delay(1, limited, rng) <= 6.0 for _ in range(20))
+
+
+def test_retryable_failures_are_retried_until_success():
+    flaky = _FlakyProvider([Stage2ProviderError("limited", status_code=429), ConnectionError("reset")])
+    provider = LimitedStage2Provider(flaky, limiter=Stage2Limiter(2), retry_policy=_no_wait_policy())
+
+    response = asyncio.run(provider.create(_request("hello")))
+
+    assert response.id == "resp-ok" and flaky.calls == 3
+
+
+def test_client_errors_and_exhausted_retries_raise():
+    bad_request = _FlakyProvider([Stage2ProviderError("bad", status_code=400)])
+    with pytest.raises(Stage2ProviderError):
+        asyncio.run(LimitedStage2Provider(bad_request, limiter=Stage2Limiter(1), retry_policy=_no_wait_policy()).create(_request()))
+    assert bad_request.calls == 1
+
+    overloaded = _FlakyProvider([Stage2ProviderError("busy", status_code=503)] * 5)
+    with pytest.raises(Stage2ProviderError):
+        asyncio.run(LimitedStage2Provider(overloaded, limiter=Stage2Limiter(1), retry_policy=_no_wait_policy(2)).create(_request()))
+    assert overloaded.calls == 2
+    assert not is_retryable_error(ValueError("nope"))
+
+
+# ---------------------------------------------------------------------------
+# 4. Pooling and configuration
+# ---------------------------------------------------------------------------
+
+def test_openai_clients_are_pooled_per_loop_without_sdk_retries():
+    async def _clients():
+        first = pooled_openai_client(api_key="sk-test", base_url=None, timeout_seconds=5.0)
+        second = pooled_openai_client(api_key="sk-test", base_url=None, timeout_seconds=5.0)
+        other = pooled_openai_client(api_key="sk-other", base_url=None, timeout_seconds=5.0)
+        return first, second, other
+
+    first, second, other = asyncio.run(_clients())
+
+    assert first is second and first is not other
+    assert first.max_retries == 0
+
+
+def test_provider_selection_from_env(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setenv("UNLXCK_STAGE2_PROVIDER", "mock")
+    assert isinstance(OpenAIStage2Automator.from_env().provider.provider, MockStage2Provider)
+
+    monkeypatch.setenv("UNLXCK_STAGE2_PROVIDER", "openai")
+    assert isinstance(OpenAIStage2Automator.from_env(), DisabledStage2Automator)
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("OPENAI_BASE_URL", "http://127.0.0.1:8765/v1")
+    provider, reason = build_stage2_provider_from_env()
+    assert reason is None and provider.provider == OpenAIStage2Provider(
+        api_key="sk-test", base_url="http://127.0.0.1:8765/v1", timeout_seconds=90.0
+    )
+
+
+def test_limiter_singleton_reads_env(monkeypatch):
+    monkeypatch.setattr(stage2_provider, "_LIMITER", None)
+    monkeypatch.setenv("UNLXCK_STAGE2_MAX_CONCURRENCY", "5")
+    monkeypatch.setenv("UNLXCK_STAGE2_TOKENS_PER_MINUTE", "90000")
+
+    limiter = stage2_provider.get_stage2_limiter()
+
+    assert limiter is stage2_provider.get_stage2_limiter()
+    assert (limiter.max_concurrency, limiter.tokens_per_minute) == (5, 90000)
+
+
+# ---------------------------------------------------------------------------
+# 5. Mock provider
+# ---------------------------------------------------------------------------
+
+def test_mock_echoes_the_plan_the_prompt_carries():
+    first_pass = _request("static catalogs", "PLANNING BRIEF\n{}\n\n---\n\nSTAGE 1 DRAFT PLAN\n## PHASE 1: GPP\n- Easy Bike")
+    repair = _request("PREVIOUS FINAL PLAN\nold plan\n\n---\n\nSECTIONS TO REVISE\n@@ SECTION: SPP @@\n## PHASE 2: SPP")
+
+    assert mock_response_text(first_pass) == "## PHASE 1: GPP\n- Easy Bike"
+    assert mock_response_text(repair) == "@@ SECTION: SPP @@\n## PHASE 2: SPP"
+    assert mock_response_text(repair, mode="canned", canned_text="canned") == "canned"
+
+
+def test_mock_injects_rate_limits():
+    mock = MockStage2Provider(rate_limit_every=2, retry_after_seconds=0.0)
+    provider = LimitedStage2Provider(mock, limiter=Stage2Limiter(1), retry_policy=_no_wait_policy())
+
+    async def _burst():
+        return await asyncio.gather(*(provider.create(_request(f"plan {index}")) for index in range(3)))
+
+    responses = asyncio.run(_burst())
+
+    assert [response.output_text for response in responses] == ["plan 0", "plan 1", "plan 2"]
+    assert mock.requests == 5
+
+
+def test_mock_server_round_trips_through_the_openai_client():
+    server = build_server(parse_args(["--port", "0", "--rate-limit-every", "2", "--retry-after", "0"]))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        provider = LimitedStage2Provider(
+            OpenAIStage2Provider(api_key="mock", base_url=f"http://127.0.0.1:{server.server_port}/v1", timeout_seconds=5.0),
+            limiter=Stage2Limiter(2),
+            retry_policy=_no_wait_policy(),
+        )
+
+        async def _two_requests():
+            return [await provider.create(_request("STAGE 1 DRAFT PLAN\nplan text")) for _ in range(2)]
+
+        responses = asyncio.run(_two_requests())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert [response.output_text for response in responses] == ["plan text", "plan text"]
+    assert responses[0].usage.input_tokens_details.cached_tokens == 0
+
+
+def test_generation_job_runs_offline_against_the_mock():
+    store = FakeStore()
+    athlete = AuthenticatedUser(user_id="athlete-1", email="ari@example.com", full_name="Ari Mensah", metadata={})
+    store.ensure_profile(athlete)
+    job = store.create_or_get_generation_job(
+        athlete_id=athlete.user_id,
+        client_request_id="mock-job",
+        source="load_test",
+        request_payload=_build_request().model_dump(mode="json"),
+    )
+    mock = MockStage2Provider(mode="canned", canned_text="## PHASE 1: GPP\n- Easy Bike - 30 min")
+    automator = OpenAIStage2Automator(
+        client=None,
+        model="mock",
+        provider=LimitedStage2Provider(mock, limiter=Stage2Limiter(1), retry_policy=_no_wait_policy()),
+    )
+    started = time.perf_counter()
+
+    asyncio.run(
+        run_generation_job(
+            job_id=job["id"], store=store, planner_fn=lambda _payload: stage1_result(), stage2=automator, active_tasks=set()
+        )
+    )
+
+    refreshed = store.get_generation_job(job["id"])
+    assert refreshed["status"] == "completed"
+    assert refreshed["final_result"]["final_plan_text"] == "## PHASE 1: GPP\n- Easy Bike - 30 min"
+    assert mock.requests == 1 and time.perf_counter() - started < 30
@@ -0,0 +1,211 @@
+"""Tests for section-level Stage 2 repair.
+
+Covers:
+1. Plans split into top-level sections where the validator switches phase.
+2. Failing validator items map to the sections that hold them.
+3. Unlocatable failures and all-phase failures fall back to full repair.
+4. Repaired sections splice back into the plan and re-validate.
+5. The automator regenerates only the failing sections, with full-plan fallback.
+"""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from api.stage2_automation import OpenAIStage2Automator
+from fightcamp.stage2_pipeline import build_stage2_retry, review_stage2_output
+from fightcamp.stage2_section_repair import OPENING_SECTION_KEY, plan_section_repair, split_plan_sections
+
+_BRIEF = {
+    "schema_version": "planning_brief.v1",
+    "athlete_model": {"sport": "boxing"},
+    "restrictions": [
+        {
+            "restriction": "heavy_overhead_pressing",
+            "strength": "avoid",
+            "blocked_patterns": ["push press", "overhead press"],
+            "mechanical_equivalents": ["thruster", "jerk"],
+        }
+    ],
+    "phase_strategy": {"GPP": {"must_keep": ["aerobic"]}, "SPP": {"must_keep": ["alactic"]}},
+    "candidate_pools": {
+        "GPP": {"conditioning_slots": [{"role": "aerobic", "selected": {"name": "Easy Bike"}, "alternates": []}]},
+        "SPP": {"conditioning_slots": [{"role": "alactic", "selected": {"name": "Air Bike Sprint"}, "alternates": []}]},
+    },
+}
+
+_GPP = """## PHASE 1: GPP
+### Monday - Strength
+- Trap Bar Deadlift - 4x5
+### Tuesday - Conditioning
+- Easy Bike - 30 min aerobic
+"""
+_SPP = """## PHASE 2: SPP
+### Monday - Strength
+- Push Press - 4x3
+### Tuesday - Conditioning
+- Air Bike Sprint - 8 x 8 sec alactic
+"""
+_NOTES = """## Coach Notes
+- Keep the hard days hard and the easy days easy."""
+_PLAN = "\n".join([_GPP, _SPP, _NOTES])
+_REPAIRED_SPP = _SPP.replace("Push Press - 4x3", "Landmine Press - 4x5")
+
+
+def _retry(plan_text: str) -> dict:
+    return build_stage2_retry(stage1_result={"planning_brief": _BRIEF}, final_plan_text=plan_text)
+
+
+# ---------------------------------------------------------------------------
+# 1. Sections
+# ---------------------------------------------------------------------------
+
+def test_sections_follow_phase_and_top_level_headings():
+    sections = split_plan_sections("Camp overview\n\n" + _PLAN)
+
+    assert [section.key for section in sections] == [OPENING_SECTION_KEY, "GPP", "SPP", "coach notes"]
+    assert "\n".join(section.text for section in sections) == "Camp overview\n\n" + _PLAN
+
+
+# ---------------------------------------------------------------------------
+# 2. Locating failures
+# ---------------------------------------------------------------------------
+
+def test_restriction_hit_targets_only_its_phase():
+    repair = _retry(_PLAN)["section_repair"]
+
+    assert repair.target_keys == ("SPP",)
+    context = repair.prompt.athlete_context
+    approved = context.split("APPROVED SECTIONS\n", 1)[1].split("\n\n---\n\n", 1)[0]
+    to_revise = context.split("SECTIONS TO REVISE\n", 1)[1]
+    assert "Trap Bar Deadlift" in approved and "Push Press" not in approved
+    assert to_revise.startswith("@@ SECTION: SPP @@\n## PHASE 2: SPP")
+    assert repair.prompt.static_context.startswith("SECTION REPAIR MODE")
+
+
+def test_missing_phase_is_targeted_as_a_new_section():
+    report = {"errors": [], "blocking_warnings": [{"code": "phase_section_missing", "phase": "TAPER"}]}
+
+    repair = plan_section_repair(planning_brief=_BRIEF, failed_plan_text=_PLAN, validator_report=report)
+
+    assert repair.target_keys == repair.missing_keys == ("TAPER",)
+    assert "(missing: write the TAPER phase section)" in repair.prompt.athlete_context
+
+
+# ---------------------------------------------------------------------------
+# 3. Full-repair fallback
+# ---------------------------------------------------------------------------
+
+def test_unlocatable_failure_needs_a_full_repair():
+    report = {"errors": [], "blocking_warnings": [{"code": "missing_weight_cut_acknowledgement", "line": ""}]}
+
+    assert plan_section_repair(planning_brief=_BRIEF, failed_plan_text=_PLAN, validator_report=report) is None
+
+
+def test_failures_in_every_phase_need_a_full_repair():
+    report = {
+        "errors": [],
+        "blocking_warnings": [
+            {"code": "missing_required_element", "phase": "GPP"},
+            {"code": "missing_required_element", "phase": "SPP"},
+        ],
+    }
+
+    assert plan_section_repair(planning_brief=_BRIEF, failed_plan_text=_PLAN, validator_report=report) is None
+
+
+def test_passing_review_has_no_section_repair():
+    assert _retry(_PLAN.replace("Push Press - 4x3", "Landmine Press - 4x5"))["section_repair"] is None
+
+
+# ---------------------------------------------------------------------------
+# 4. Splicing
+# ---------------------------------------------------------------------------
+
+def test_spliced_plan_keeps_approved_sections_and_revalidates():
+    repair = _retry(_PLAN)["section_repair"]
+
+    spliced = repair.splice("@@ SECTION: SPP @@\n" + _REPAIRED_SPP)
+
+    assert spliced == "\n".join([_GPP, _REPAIRED_SPP, _NOTES])
+    assert review_stage2_output(planning_brief=_BRIEF, final_plan_text=spliced)["status"] == "PASS"
+
+
+def test_new_phase_is_inserted_in_phase_order():
+    plan = "\n".join([_GPP, _NOTES])
+    report = {"errors": [], "blocking_warnings": [{"code": "phase_section_missing", "phase": "SPP"}]}
+    repair = plan_section_repair(planning_brief=_BRIEF, failed_plan_text=plan, validator_report=report)
+
+    spliced = repair.splice("@@ SECTION: SPP @@\n" + _REPAIRED_SPP)
+
+    assert [section.key for section in split_plan_sections(spliced)] == ["GPP", "SPP", "coach notes"]
+
+
+def test_output_without_the_section_or_its_heading_is_rejected():
+    repair = _retry(_PLAN)["section_repair"]
+
+    assert repair.splice(_REPAIRED_SPP) is None
+    assert repair.splice("@@ SECTION: SPP @@\n- Landmine Press - 4x5") is None
+    assert repair.splice("@@ SECTION: GPP @@\n" + _GPP) is None
+
+
+# ---------------------------------------------------------------------------
+# 5. Automator
+# ---------------------------------------------------------------------------
+
+class _ScriptedResponses:
+    def __init__(self, outputs: list[str]):
+        self.requests: list[dict] = []
+        self._outputs = list(outputs)
+
+    async def create(self, **request):
+        self.requests.append(request)
+        return SimpleNamespace(id=f"resp-{len(self.requests)}", output_text=self._outputs.pop(0), usage=None)
+
+
+def _finalize(outputs: list[str], **automator_fields) -> tuple[dict, _ScriptedResponses]:
+    responses = _ScriptedResponses(outputs)
+    automator = OpenAIStage2Automator(
+        client=SimpleNamespace(responses=responses), model="test-model", **automator_fields
+    )
+    stage1 = {
+        "planning_brief": _BRIEF,
+        "stage2_payload": {"schema_version": "stage2_payload.v1"},
+        "stage2_handoff_text": "handoff text",
+        "plan_text": "draft",
+        "coach_notes": "",
+    }
+    return asyncio.run(automator.finalize(stage1_result=stage1)), responses
+
+
+def _input_text(request: dict) -> str:
+    return "\n".join(part["text"] for part in request["input"][0]["content"])
+
+
+def test_automator_regenerates_only_failing_sections():
+    result, responses = _finalize([_PLAN, "@@ SECTION: SPP @@\n" + _REPAIRED_SPP])
+
+    assert result["stage2_status"] == "stage2_retry_pass"
+    assert result["final_plan_text"] == "\n".join([_GPP, _REPAIRED_SPP, _NOTES])
+    assert "SECTIONS TO REVISE" in _input_text(responses.requests[1])
+    # Coaches still get the full-plan repair prompt for manual retries.
+    assert "PREVIOUS FINAL PLAN" in result["stage2_retry_text"]
+
+
+def test_automator_falls_back_to_full_repair_when_sections_are_missing():
+    full_repair = "\n".join([_GPP, _REPAIRED_SPP, _NOTES])
+
+    result, responses = _finalize([_PLAN, "Sorry, here is the plan.", full_repair])
+
+    assert result["stage2_status"] == "stage2_retry_pass"
+    assert result["final_plan_text"] == full_repair
+    assert "PREVIOUS FINAL PLAN" in _input_text(responses.requests[2])
+
+
+def test_section_repair_can_be_disabled():
+    full_repair = "\n".join([_GPP, _REPAIRED_SPP, _NOTES])
+
+    _result, responses = _finalize([_PLAN, full_repair], section_repair=False)
+
+    assert len(responses.requests) == 2
+    assert "PREVIOUS FINAL PLAN" in _input_text(responses.requests[1])
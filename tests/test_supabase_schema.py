@@ -19,3 +19,11 @@ def test_profiles_migration_backfills_avatar_url_column():
     schema = _read_schema()
 
     assert "alter table public.profiles add column if not exists avatar_url text;" in schema
+
+
+def test_generation_jobs_declare_and_backfill_trace_column():
+    schema = _read_schema()
+    jobs_definition = schema.split("create table if not exists public.generation_jobs (", 1)[1].split(");", 1)[0]
+
+    assert "trace jsonb," in jobs_definition
+    assert "alter table public.generation_jobs add column if not exists trace jsonb;" in schema
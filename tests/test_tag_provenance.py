@@ -11,6 +11,8 @@ These tests verify that:
 import sys
 from pathlib import Path
 
+import pytest
+
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 from fightcamp.injury_filtering import ensure_tags, injury_match_details
@@ -71,7 +73,7 @@ def test_inferred_tags_do_not_trigger_exclusion():
     if details:
         for detail in details:
             # tag_hits should be empty because tags are inferred
-            assert detail["tags"] == [], f"Inferred tags should not cause exclusion, but got: {detail['tags']}"
+            assert detail["tags"] == (), f"Inferred tags should not cause exclusion, but got: {detail['tags']}"
 
 
 def test_pattern_exclusions_still_work():
@@ -223,13 +225,16 @@ if __name__ == "__main__":
     print("\nAll tests passed!")
 
 
-def test_injury_match_details_cache_returns_stable_results_without_leaking_mutations():
+def test_injury_match_details_cache_returns_stable_immutable_results():
     item = {"name": "Overhead Press", "tags": []}
 
     first = injury_match_details(item, ["shoulder"], risk_levels=("exclude",))
     assert first
 
-    first[0]["patterns"].append("mutated-pattern")
+    with pytest.raises(AttributeError):
+        first[0]["patterns"].append("mutated-pattern")
+    with pytest.raises(TypeError):
+        first[0]["patterns"] = ["mutated-pattern"]
     second = injury_match_details(item, ["shoulder"], risk_levels=("exclude",))
 
     assert "mutated-pattern" not in second[0]["patterns"]
@@ -1,7 +1,18 @@
 from __future__ import annotations
 
 from fightcamp.tag_maps import GOAL_NORMALIZER, GOAL_TAG_MAP, STYLE_TAG_MAP, WEAKNESS_NORMALIZER, WEAKNESS_TAG_MAP
-from fightcamp.tagging import load_tag_vocabulary, normalize_item_tags, normalize_tag, normalize_tags
+from fightcamp.bank_schema import FrozenRecord
+from fightcamp.strength import get_exercise_bank, score_exercise
+from fightcamp.tagging import (
+    TagVocabulary,
+    get_tag_vocabulary,
+    item_tag_ids,
+    load_tag_vocabulary,
+    normalize_item_tags,
+    normalize_tag,
+    normalize_tags,
+    tag_ids,
+)
 
 
 def test_normalize_tags_canonicalizes_synonyms_and_removes_duplicates():
@@ -64,3 +75,67 @@ def test_style_and_goal_tags_stay_normalized_for_curated_entries():
 
     for tag in sample_tags:
         assert normalize_tag(tag) == tag.lower().replace("-", "_").replace(" ", "_")
+
+
+def test_normalize_tags_returns_fresh_lists_from_memoized_tuples():
+    first = normalize_tags(["Muay Thai", "clinch"])
+    first.append("mutated")
+
+    assert normalize_tags(["Muay Thai", "clinch"]) == ["muay_thai", "clinch"]
+    assert normalize_tags(iter(["Muay Thai"])) == ["muay_thai"]
+
+
+def test_compiled_vocabulary_assigns_stable_ids():
+    vocabulary = get_tag_vocabulary()
+
+    assert len(vocabulary) >= len(load_tag_vocabulary())
+    assert all(tag in vocabulary for tag in load_tag_vocabulary())
+    extra_id = vocabulary.id_for("not_in_vocabulary_tag")
+    assert vocabulary.id_for("not_in_vocabulary_tag") == extra_id
+    assert vocabulary.name(extra_id) == "not_in_vocabulary_tag"
+
+    local = TagVocabulary(["b", "a"])
+    assert (local.id_for("b"), local.id_for("a"), local.id_for("c")) == (0, 1, 2)
+    assert local.names({2, 0}) == ["b", "c"]
+
+
+def test_tag_ids_compare_like_normalized_tag_sets():
+    assert tag_ids(["Muay Thai", "skill refinement", "muay_thai"]) == tag_ids(["skill_refinement", "muay-thai"])
+    assert tag_ids(["muay_thai"]) != tag_ids(["boxing"])
+    assert get_tag_vocabulary().names(tag_ids(["Pressure Fighter", "clinch"])) == ["clinch", "pressure_fighter"]
+
+
+def test_bank_records_carry_precomputed_tag_ids():
+    record = get_exercise_bank()[0]
+
+    assert isinstance(record, FrozenRecord)
+    assert "tag_ids" in record._derived
+    assert item_tag_ids(record) is record._derived["tag_ids"]
+    assert item_tag_ids(record) == tag_ids(record["tags"])
+    assert item_tag_ids({"tags": None}) == frozenset()
+
+
+def test_score_exercise_counts_normalized_tag_overlap():
+    class _NoNoise:
+        @staticmethod
+        def uniform(_low, _high):
+            return 0.0
+
+    score, reasons = score_exercise(
+        exercise_tags=["Posterior Chain", "compound", "explosive"],
+        weakness_tags=["posterior_chain"],
+        goal_tags=["explosive", "Explosive"],
+        style_tags=["pressure fighter"],
+        must_have_tags=["compound"],
+        phase_tags=[],
+        current_phase="GPP",
+        fatigue_level="low",
+        available_equipment=[],
+        required_equipment=[],
+        is_rehab=False,
+        rng=_NoNoise(),
+    )
+
+    assert (reasons["weakness_hits"], reasons["goal_hits"], reasons["style_hits"], reasons["must_have_hits"]) == (1, 1, 0, 1)
+    assert reasons["must_have_bonus"] == 0.45
+    assert score == round(0.6 + 0.5 + 0.35 + 0.45, 4)
@@ -0,0 +1,144 @@
+"""Tests for the per-job tracing spans.
+
+Covers:
+1. Helpers are no-ops without an active trace (tracing disabled).
+2. Nested spans, attributes, counters and errors land in the trace blob.
+3. Spans follow the plan-block thread pool via context propagation.
+4. OTLP/JSON export writes one export request per line.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from fightcamp import tracing
+
+
+# ---------------------------------------------------------------------------
+# 1 – disabled
+# ---------------------------------------------------------------------------
+
+def test_helpers_are_noops_when_tracing_is_disabled(monkeypatch):
+    monkeypatch.delenv(tracing.TRACING_ENV, raising=False)
+
+    with tracing.start_trace("job") as trace:
+        with tracing.span("stage") as current:
+            current.set_attribute("ignored", True)
+            tracing.add_counter("ignored")
+            tracing.record_span("ignored", 0.0)
+
+    assert trace is None
+    assert current is tracing.NOOP_SPAN
+    assert tracing.current_trace() is None
+
+
+# ---------------------------------------------------------------------------
+# 2 – nesting, attributes, counters, errors
+# ---------------------------------------------------------------------------
+
+def test_nested_spans_record_parents_attributes_and_counters(monkeypatch):
+    monkeypatch.setenv(tracing.TRACING_ENV, "1")
+
+    with tracing.start_trace("job", job_id="job-1") as trace:
+        with tracing.span("stage1", sport="boxing") as stage1:
+            tracing.add_counter("cache_hit")
+            tracing.add_counter("cache_hit", 2)
+            with tracing.span("stage1.inner"):
+                pass
+        with pytest.raises(ValueError):
+            with tracing.span("stage2"):
+                raise ValueError("model timeout")
+
+    blob = trace.to_dict()
+    spans = {item["name"]: item for item in blob["spans"]}
+    assert blob["name"] == "job"
+    assert spans["job"]["attributes"] == {"job_id": "job-1"}
+    assert spans["stage1"]["parent_id"] == spans["job"]["span_id"]
+    assert spans["stage1.inner"]["parent_id"] == stage1.span_id
+    assert spans["stage1"]["attributes"] == {"sport": "boxing"}
+    assert spans["stage1"]["counters"] == {"cache_hit": 3}
+    assert spans["stage2"]["status"] == "error"
+    assert spans["stage2"]["error"] == "ValueError: model timeout"
+    assert spans["job"]["status"] == "ok"
+    assert json.loads(json.dumps(blob)) == blob
+
+
+def test_span_cap_counts_dropped_spans(monkeypatch):
+    monkeypatch.setenv(tracing.TRACING_ENV, "1")
+    monkeypatch.setattr(tracing, "MAX_SPANS_PER_TRACE", 3)
+
+    with tracing.start_trace("job") as trace:
+        for index in range(5):
+            with tracing.span(f"unit-{index}"):
+                pass
+
+    blob = trace.to_dict()
+    assert len(blob["spans"]) == 3
+    assert blob["dropped_spans"] == 3
+
+
+# ---------------------------------------------------------------------------
+# 3 – context propagation
+# ---------------------------------------------------------------------------
+
+def test_spans_follow_to_thread_and_plan_block_units(monkeypatch):
+    from fightcamp import plan_pipeline_blocks as blocks_module
+
+    monkeypatch.setenv(tracing.TRACING_ENV, "1")
+
+    def _unit() -> str:
+        tracing.add_counter("unit_calls")
+        return "done"
+
+    async def _run() -> tracing.Trace:
+        with tracing.start_trace("job") as trace:
+            with tracing.span("stage1"):
+                collect = await asyncio.to_thread(blocks_module._start_units, {"a": _unit, "b": _unit})
+                results = await asyncio.to_thread(collect)
+        assert [value for value, _ in results.values()] == ["done", "done"]
+        return trace
+
+    spans = asyncio.run(_run()).to_dict()["spans"]
+    by_name = {item["name"]: item for item in spans}
+    assert by_name["plan_blocks.a"]["parent_id"] == by_name["stage1"]["span_id"]
+    assert by_name["plan_blocks.b"]["counters"] == {"unit_calls": 1}
+
+
+# ---------------------------------------------------------------------------
+# 4 – OTLP/JSON export
+# ---------------------------------------------------------------------------
+
+def test_export_trace_appends_otlp_json(monkeypatch, tmp_path):
+    monkeypatch.setenv(tracing.TRACING_ENV, "1")
+    target = tmp_path / "traces" / "otlp.jsonl"
+    monkeypatch.setenv(tracing.TRACE_OTLP_FILE_ENV, str(target))
+
+    with tracing.start_trace("job", job_id="job-1") as trace:
+        with tracing.span("stage1") as stage1:
+            stage1.add_counter("hits", 2)
+
+    assert tracing.export_trace(trace) is True
+    assert tracing.export_trace(trace) is True
+
+    lines = target.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    exported = json.loads(lines[0])["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    root, child = exported
+    assert root["traceId"] == trace.trace_id and len(root["traceId"]) == 32
+    assert "parentSpanId" not in root
+    assert child["parentSpanId"] == root["spanId"]
+    assert int(child["endTimeUnixNano"]) >= int(child["startTimeUnixNano"])
+    assert {"key": "counter.hits", "value": {"intValue": "2"}} in child["attributes"]
+    assert {"key": "job_id", "value": {"stringValue": "job-1"}} in root["attributes"]
+
+
+def test_export_trace_without_target_is_skipped(monkeypatch):
+    monkeypatch.setenv(tracing.TRACING_ENV, "1")
+    monkeypatch.delenv(tracing.TRACE_OTLP_FILE_ENV, raising=False)
+
+    with tracing.start_trace("job") as trace:
+        pass
+
+    assert tracing.export_trace(trace) is False
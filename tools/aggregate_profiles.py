@@ -0,0 +1,74 @@
+"""Aggregate captured generation profiles into a hot-function report.
+
+Reads the captures written under ``UNLXCK_PROFILE_DIR`` (see
+``fightcamp/profiling.py``) and prints the slowest captures, the cProfile
+functions with the most own time, and the sampled frames with the most
+self/inclusive samples.
+
+Usage:
+    python tools/aggregate_profiles.py --dir /tmp/unlxck-profiles
+    python tools/aggregate_profiles.py --dir /tmp/unlxck-profiles --label stage2_finalize --json
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from fightcamp.profiling import PROFILE_DIR_ENV, aggregate_profiles
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Aggregate hot functions across captured generation profiles.")
+    parser.add_argument(
+        "--dir",
+        default=os.environ.get(PROFILE_DIR_ENV, ""),
+        help=f"Capture directory (defaults to ${PROFILE_DIR_ENV}).",
+    )
+    parser.add_argument("--label", default=None, help="Only include captures with this label (generate_plan_sync, stage2_finalize).")
+    parser.add_argument("--top", type=int, default=25, help="Rows per table.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    return parser.parse_args()
+
+
+def _print_report(report: dict) -> None:
+    print(f"Captures: {report['captures']}")
+    if report["slowest"]:
+        print("\nSlowest captures:")
+        for item in report["slowest"]:
+            print(f"  {item['elapsed_s']:>8.2f}s  {item['label']}  {str(item['input_hash'])[:12]}")
+    if report["cprofile"]:
+        print("\ncProfile (by own time):")
+        print(f"  {'tottime':>9}  {'cumtime':>9}  {'calls':>9}  function")
+        for row in report["cprofile"]:
+            print(f"  {row['tottime_s']:>9.4f}  {row['cumtime_s']:>9.4f}  {row['calls']:>9}  {row['function']}")
+    if report["sampled"]:
+        print("\nSampled stacks (by self samples):")
+        print(f"  {'self%':>7}  {'incl%':>7}  function")
+        for row in report["sampled"]:
+            print(f"  {row['self_pct']:>7.2f}  {row['inclusive_pct']:>7.2f}  {row['function']}")
+
+
+def main() -> int:
+    args = parse_args()
+    if not args.dir:
+        print(f"Pass --dir or set {PROFILE_DIR_ENV}.", file=sys.stderr)
+        return 2
+    directory = Path(args.dir)
+    if not directory.is_dir():
+        print(f"Capture directory not found: {directory}", file=sys.stderr)
+        return 1
+
+    report = aggregate_profiles(directory, label=args.label, top=args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,62 @@
+"""Build the pre-normalized bank snapshot loaded by ``prime_plan_banks``.
+
+Run it in the deploy build step after the code and ``data/`` are in place, so
+each worker installs the banks from one pickle instead of parsing and
+normalizing the JSON (see ``fightcamp/bank_snapshot.py``).
+
+Usage:
+    python tools/build_bank_snapshot.py
+    python tools/build_bank_snapshot.py --output /tmp/banks.snapshot
+    python tools/build_bank_snapshot.py --check   # exit 1 when missing or stale
+"""
+
+import argparse
+from pathlib import Path
+import sys
+import time
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from fightcamp.bank_snapshot import (
+    DEFAULT_SNAPSHOT_PATH,
+    SNAPSHOT_FORMAT_VERSION,
+    bank_source_hash,
+    build_snapshot,
+    read_snapshot_header,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build the pre-normalized bank snapshot.")
+    parser.add_argument("--output", default=str(DEFAULT_SNAPSHOT_PATH), help="Snapshot path.")
+    parser.add_argument("--check", action="store_true", help="Only report whether the snapshot is fresh.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    output = Path(args.output)
+    source_hash = bank_source_hash()
+
+    if args.check:
+        header = read_snapshot_header(output)
+        if header is None:
+            print(f"Snapshot missing or unreadable: {output}", file=sys.stderr)
+            return 1
+        if header.get("format") != SNAPSHOT_FORMAT_VERSION or header.get("source_hash") != source_hash:
+            print(f"Snapshot stale: {output} (built {header.get('created_at')})", file=sys.stderr)
+            return 1
+        print(f"Snapshot fresh: {output} (built {header.get('created_at')})")
+        return 0
+
+    started = time.perf_counter()
+    header = build_snapshot(output, source_hash=source_hash)
+    print(
+        f"Wrote {output} ({output.stat().st_size / 1024:.0f} KiB, {len(header['banks'])} banks, "
+        f"hash {source_hash[:12]}) in {time.perf_counter() - started:.2f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
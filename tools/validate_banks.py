@@ -9,6 +9,8 @@ and tag_vocabulary.json) for:
 - Tag types (tags must be a list of strings)
 - Tag vocabulary presence
 - Injury exclusion rule coverage (prints safe/blocked counts by ban_tags)
+- bank_inferred_tags.json freshness (the runtime reads name-inferred tags from
+  it, so it must match what the inference rules produce for every bank item)
 
 Exit codes:
 - 0: All validations passed
@@ -154,6 +156,26 @@ def load_injury_rules() -> Dict[str, Dict[str, List[str]]]:
     return INJURY_RULES
 
 
+def check_inferred_tag_table() -> bool:
+    """
+    Compare data/bank_inferred_tags.json with a fresh build from the banks.
+    Rebuild it with: python tools/generate_injury_exclusion_maps.py
+    """
+    print("Checking bank_inferred_tags.json against the inference rules...")
+
+    sys.path.insert(0, str(REPO_ROOT))
+
+    from fightcamp.injury_filtering import audit_inferred_tag_table
+
+    stale = audit_inferred_tag_table()
+    if stale:
+        print(f"  ❌ {len(stale)} stale entries, e.g. {', '.join(stale[:5])}")
+        print("     Rebuild with: python tools/generate_injury_exclusion_maps.py\n")
+        return False
+    print("  ✓ bank_inferred_tags.json is current\n")
+    return True
+
+
 def parse_bank_schema(data: Any) -> Tuple[List[Dict], str]:
     """
     Parse bank data and return list of entries with schema description.
@@ -323,6 +345,12 @@ def main():
             print(f"❌ ERROR validating {bank_path.name}: {e}\n")
             all_success = False
     
+    try:
+        all_success = check_inferred_tag_table() and all_success
+    except Exception as e:
+        print(f"❌ ERROR checking bank_inferred_tags.json: {e}\n")
+        all_success = False
+
     # Build comprehensive data structures for diagnostics
     all_ban_tags = set()
     all_bank_tags = all_tags_seen
@@ -0,0 +1,137 @@
+"""Validate many stored Stage 2 plans at once.
+
+Reads ``{"plan_id": ..., "final_text": ...}`` JSONL pairs (``final_text`` is
+optional and defaults to the plan's stored final text), or every plan with
+``--all``. Plans are loaded from Supabase with only ``id, planning_brief,
+final_plan_text`` and validated across a process pool
+(``fightcamp/stage2_batch_validation.py``). One compact JSONL record per plan
+is written, followed by a status/code summary on stderr.
+
+Usage:
+    python tools/validate_stage2_batch.py --input pairs.jsonl --output reports.jsonl
+    python tools/validate_stage2_batch.py --all --workers 8 --output reports.jsonl
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+import sys
+from typing import Any, Iterable, Iterator
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from fightcamp.logging_utils import configure_logging
+from fightcamp.stage2_batch_validation import run_validation_batch, summarize_records
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Validate stored Stage 2 plans in bulk.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", type=Path, help="JSONL of {plan_id, final_text?} pairs.")
+    source.add_argument("--all", action="store_true", help="Validate every plan's stored final text.")
+    parser.add_argument("--output", type=Path, default=None, help="JSONL report file. Defaults to stdout.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Process pool size; 1 runs in-process.")
+    parser.add_argument("--page-size", type=int, default=200, help="Plans loaded from the store per query.")
+    return parser.parse_args(argv)
+
+
+def read_pairs(lines: Iterable[str]) -> list[dict[str, Any]]:
+    pairs = []
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"line {line_number}: invalid JSON ({exc.msg})") from exc
+        if not isinstance(record, dict):
+            raise ValueError(f"line {line_number}: expected a JSON object")
+        plan_id = str(record.get("plan_id") or "").strip()
+        if not plan_id:
+            raise ValueError(f"line {line_number}: plan_id is required")
+        final_text = record.get("final_text", record.get("final_plan_text"))
+        pairs.append({"plan_id": plan_id, "final_plan_text": final_text})
+    return pairs
+
+
+def _pair_items(store, pairs: list[dict[str, Any]], page_size: int, missing: list[str]) -> Iterator[dict[str, Any]]:
+    for start in range(0, len(pairs), page_size):
+        page = pairs[start : start + page_size]
+        rows = {str(row["id"]): row for row in store.get_plan_validation_rows([pair["plan_id"] for pair in page])}
+        for pair in page:
+            row = rows.get(pair["plan_id"])
+            if row is None:
+                missing.append(pair["plan_id"])
+                continue
+            final_text = pair["final_plan_text"]
+            yield {
+                "plan_id": pair["plan_id"],
+                "final_plan_text": final_text if final_text is not None else row.get("final_plan_text"),
+                "planning_brief": row.get("planning_brief"),
+            }
+
+
+def _all_items(store, page_size: int) -> Iterator[dict[str, Any]]:
+    offset = 0
+    while True:
+        rows = store.list_plan_validation_rows(limit=page_size, offset=offset)
+        for row in rows:
+            yield {
+                "plan_id": str(row["id"]),
+                "final_plan_text": row.get("final_plan_text"),
+                "planning_brief": row.get("planning_brief"),
+            }
+        if len(rows) < page_size:
+            return
+        offset += page_size
+
+
+def _read_input(path: Path) -> list[dict[str, Any]]:
+    with path.open("r", encoding="utf-8") as handle:
+        return read_pairs(handle)
+
+
+def run(args: argparse.Namespace, store, stream, *, pairs: list[dict[str, Any]] | None = None) -> dict[str, Any]:
+    missing: list[str] = []
+    if args.all:
+        items = _all_items(store, args.page_size)
+    else:
+        pairs = _read_input(args.input) if pairs is None else pairs
+        items = _pair_items(store, pairs, args.page_size, missing)
+    records = []
+    for record in run_validation_batch(items, workers=args.workers):
+        stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        stream.flush()
+        records.append({"status": record["status"], "codes": record.get("codes")})
+    for plan_id in missing:
+        record = {"plan_id": plan_id, "status": "error", "error": "plan not found"}
+        stream.write(json.dumps(record) + "\n")
+        records.append(record)
+    return summarize_records(records)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    configure_logging()
+    pairs = None
+    if args.input is not None:
+        try:
+            pairs = _read_input(args.input)
+        except ValueError as exc:
+            print(f"{args.input}: {exc}", file=sys.stderr)
+            return 2
+    from api.store import SupabaseAppStore
+
+    store = SupabaseAppStore.from_env()
+    if args.output is None:
+        summary = run(args, store, sys.stdout, pairs=pairs)
+    else:
+        with args.output.open("w", encoding="utf-8") as handle:
+            summary = run(args, store, handle, pairs=pairs)
+    print(json.dumps(summary, indent=2), file=sys.stderr)
+    return 1 if summary["statuses"].get("error") else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())